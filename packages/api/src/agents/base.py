@@ -2,20 +2,56 @@
 """Custom LangGraph graph with safety shields and rule-based model routing.
 
 Graph structure:
-    input_shield -> classify (rule-based) -> agent_fast / agent_capable
-         |                                          |
-         +-(blocked)-> END               tools <-> agent_capable -> output_shield -> END
+    input_shield -> classify (no LLM call) -> manage_context -> agent_fast / agent_capable
+         |                                                            |
+         +-(blocked)-> END                     tools <-> agent_capable -> output_shield -> END
 
 The input_shield node calls Llama Guard on the user's message.  If unsafe, it
 short-circuits to END with a refusal message.  The output_shield node checks the
 agent's completed response and replaces it with a refusal if unsafe.
 
 Shields are active when SAFETY_MODEL is configured; otherwise they are no-ops.
-On any safety-model error the check is skipped (fail-open).
-
-Rule-based routing with confidence escalation:
-  - The classify node uses keyword/pattern rules (no LLM call) to decide
-    SIMPLE vs COMPLEX routing.
+On any safety-model error the check blocks (fail-closed, see inference.safety).
+
+Context budget (see agents.context):
+  manage_context folds turns older than AGENT_CONTEXT_KEEP_TURNS into a
+  rolling summary kept in graph state once the routed tier's prompt would
+  exceed its token budget (models.yaml ``context_budget_tokens``).  Agent
+  calls send the summary plus the unsummarized tail, with older tool
+  outputs compacted, so prompt size stays bounded as conversations grow.
+
+Turn budget (see agents.budget):
+  classify starts a per-turn budget -- agent model calls, tool calls,
+  tokens and wall-clock seconds (AGENT_TURN_* defaults, agent YAML
+  ``turn_budget`` overrides).  The agent and tools nodes check it before
+  every model call or tool run and cut either off at the deadline; a spent
+  budget routes to budget_exhausted, which closes pending tool calls and
+  hands a partial answer to output_shield instead of continuing the tools
+  loop.
+
+Tool selection (see agents.tool_selection):
+  For agents with many tools, agent_capable binds only the pinned tools,
+  the tools used in the recent turns and the AGENT_TOOL_SELECTION_TOP_K
+  tools most similar to the user's message.  Bound LLM variants are cached
+  per subset, and every tool stays executable by the tools node.
+
+Speculative input shield (SAFETY_SPECULATIVE_INPUT_SHIELD):
+    classify -> speculative_agent -> (same edges as agent_fast / agent_capable)
+         |      speculative_agent = input shield || first agent LLM call
+         +-(context fold due)-> input_shield -> manage_context -> agent_fast / agent_capable
+The rule-based classify runs first (no LLM call), then the shield and the
+first agent call run concurrently so the turn no longer waits a full safety
+round trip before the model starts.  The node returns only after the verdict:
+if unsafe, the agent call is cancelled and its output discarded, so no tool
+runs and no agent output leaves the graph for a blocked message.  A turn
+whose history must first be summarized takes the sequential path instead:
+the summarizer is an LLM call over the conversation, so it only runs once
+the shield has cleared the message.
+
+Routing with confidence escalation:
+  - The classify node decides SIMPLE vs COMPLEX without an LLM call, by
+    nearest intent centroid (embedding strategy) or keyword/pattern rules
+    (see inference.router).
   - COMPLEX -> agent_capable directly (tool-calling with reliable model)
   - SIMPLE  -> agent_fast (NO tools bound, text-only).  If the response
     indicates low confidence (via logprobs or hedging phrases), discard
@@ -26,16 +62,23 @@ Confidence escalation catches edge cases where a non-keyword query
 slips through to fast but gets a garbage response.
 """
 
+import asyncio
+import contextlib
 import logging
 import re
+from collections import OrderedDict
 from typing import Any
 
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, MessagesState, StateGraph
 from langgraph.prebuilt import ToolNode
 
+from ..core.config import settings
 from ..inference.safety import get_safety_checker
+from . import budget, context
+from .tool_selection import ToolSelector, recent_tool_names
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +106,9 @@ _HEDGING_PHRASES = [
 _LOGPROB_ESCALATION_THRESHOLD = -1.5  # mean logprob below this -> escalate
 _HEDGING_ESCALATION_COUNT = 2  # 2+ hedging phrases -> escalate
 
+# Tool-bound capable LLM variants kept per graph (one per distinct subset).
+_BOUND_LLM_CACHE_SIZE = 64
+
 
 def _low_confidence(response: AIMessage) -> bool:
     """Check if a fast model response indicates low confidence.
@@ -111,6 +157,10 @@ class AgentState(MessagesState):
     user_name: str
     tool_allowed_roles: dict[str, list[str]]
     decision_proposals: dict
+    context_summary: str
+    summarized_upto: int
+    turn_budget: dict
+    turn_usage: dict
 
 
 def build_routed_graph(
@@ -120,6 +170,10 @@ def build_routed_graph(
     llms: dict[str, ChatOpenAI],
     tool_allowed_roles: dict[str, list[str]] | None = None,
     checkpointer: Any | None = None,
+    speculative_input_shield: bool | None = None,
+    context_budgets: dict[str, int] | None = None,
+    tool_selection: dict[str, Any] | None = None,
+    turn_budget: dict[str, float] | None = None,
 ) -> Any:
     """Build a compiled LangGraph graph with safety shields and rule-based routing.
 
@@ -130,12 +184,92 @@ def build_routed_graph(
         tool_allowed_roles: Mapping of tool name to list of allowed role strings.
             When provided, a pre-tool authorization node checks the user's role
             before each tool invocation (RBAC Layer 3).
+        speculative_input_shield: Overlap the input shield with the first agent
+            LLM call. Defaults to settings.SAFETY_SPECULATIVE_INPUT_SHIELD.
+        context_budgets: Prompt token budget per tier name. Tiers not listed
+            use settings.AGENT_CONTEXT_BUDGET_TOKENS.
+        tool_selection: Bind a per-turn tool subset to the capable model:
+            ``{"top_k": int, "pinned": [tool names]}``. None binds every tool.
+        turn_budget: Per-turn limits (see agents.budget.LIMITS) overriding
+            the settings.AGENT_TURN_* defaults.
 
     Returns:
         A compiled StateGraph with rule-based routing and confidence escalation.
     """
     fast_llm = llms["fast_small"]
     capable_llm = llms["capable_large"]
+    if speculative_input_shield is None:
+        speculative_input_shield = settings.SAFETY_SPECULATIVE_INPUT_SHIELD
+    context_budgets = context_budgets or {}
+    limits = {
+        "max_llm_calls": settings.AGENT_TURN_MAX_LLM_CALLS,
+        "max_tool_calls": settings.AGENT_TURN_MAX_TOOL_CALLS,
+        "max_tokens": settings.AGENT_TURN_MAX_TOKENS,
+        "max_seconds": settings.AGENT_TURN_MAX_SECONDS,
+    }
+    for key, value in (turn_budget or {}).items():
+        if key not in budget.LIMITS:
+            logger.warning("Ignoring unknown turn_budget limit: %s", key)
+            continue
+        limits[key] = value
+    selector = None
+    if tool_selection and tools:
+        selector = ToolSelector(
+            tools,
+            top_k=int(tool_selection["top_k"]),
+            pinned=tool_selection.get("pinned", ()),
+        )
+    bound_llms: OrderedDict[tuple[str, ...], Any] = OrderedDict()
+
+    def _bind_tools(subset: list) -> Any:
+        """Capable LLM with ``subset`` bound, cached per distinct subset."""
+        key = tuple(tool.name for tool in subset)
+        llm = bound_llms.get(key)
+        if llm is None:
+            llm = bound_llms[key] = capable_llm.bind_tools(subset)
+            if len(bound_llms) > _BOUND_LLM_CACHE_SIZE:
+                bound_llms.popitem(last=False)
+        else:
+            bound_llms.move_to_end(key)
+        return llm
+
+    def _context_options(tier: str) -> dict:
+        return {
+            "budget": context_budgets.get(tier, settings.AGENT_CONTEXT_BUDGET_TOKENS),
+            "keep_turns": settings.AGENT_CONTEXT_KEEP_TURNS,
+            "tool_chars": settings.AGENT_CONTEXT_TOOL_OUTPUT_CHARS,
+        }
+
+    def _prompt(state: AgentState, tier: str) -> list:
+        """System prompt, rolling summary and the bounded message window."""
+        return context.prompt_messages(
+            system_prompt,
+            state["messages"],
+            summary=state.get("context_summary", ""),
+            summarized_upto=state.get("summarized_upto", 0),
+            **_context_options(tier),
+        )
+
+    def _usage(state: AgentState) -> dict:
+        return state.get("turn_usage") or budget.new_usage()
+
+    async def _budgeted_call(llm: Any, messages: list, usage: dict) -> tuple[Any, dict]:
+        """Model call bounded by the turn deadline.
+
+        Returns the response (None if the deadline cut it off) and the
+        updated turn usage.
+        """
+        deadline = asyncio.timeout(budget.remaining_seconds(limits, usage))
+        try:
+            async with deadline:
+                response = await llm.ainvoke(messages)
+        except TimeoutError:
+            if not deadline.expired():
+                raise
+            logger.warning("Agent model call cut off at the turn deadline")
+            usage = budget.record_llm_call(usage, messages, None)
+            return None, {**usage, "exhausted": "max_seconds"}
+        return response, budget.record_llm_call(usage, messages, response)
 
     async def input_shield(state: AgentState) -> dict:
         """Check user input against Llama Guard safety categories."""
@@ -155,19 +289,43 @@ def build_routed_graph(
         return {"safety_blocked": False}
 
     def after_input_shield(state: AgentState) -> str:
-        """Route to END if input was blocked, otherwise continue to classify."""
+        """Route to END if input was blocked, otherwise continue the turn."""
         if state.get("safety_blocked"):
             return END
-        return "classify"
+        return "continue"
 
     async def classify(state: AgentState) -> dict:
-        """Rule-based intent classifier -- picks the model tier (no LLM call)."""
-        from ..inference.router import classify_query
+        """Intent classifier -- picks the model tier (no LLM call)."""
+        from ..inference.router import route_query
 
         last_msg = state["messages"][-1]
-        tier = classify_query(last_msg.content)
+        tier = await route_query(last_msg.content)
         logger.info("Routed to '%s' for: %s", tier, last_msg.content[:80])
-        return {"model_tier": tier}
+        return {"model_tier": tier, "turn_budget": dict(limits), "turn_usage": budget.new_usage()}
+
+    def _fold_end(state: AgentState) -> int | None:
+        """End of the turns manage_context would summarize, or None if within budget."""
+        return context.fold_point(
+            state["messages"],
+            system_prompt=system_prompt,
+            summary=state.get("context_summary", ""),
+            summarized_upto=min(state.get("summarized_upto", 0), len(state["messages"])),
+            **_context_options(state.get("model_tier", "capable_large")),
+        )
+
+    async def manage_context(state: AgentState) -> dict:
+        """Fold older turns into the rolling summary when over the tier's budget."""
+        end = _fold_end(state)
+        if end is None:
+            return {}
+        options = _context_options(state.get("model_tier", "capable_large"))
+        summary = state.get("context_summary", "")
+        start = min(state.get("summarized_upto", 0), len(state["messages"]))
+        logger.info("Summarizing messages %d-%d to fit the context budget", start, end)
+        summary = await context.summarize(
+            fast_llm, summary, state["messages"][start:end], options["tool_chars"]
+        )
+        return {"context_summary": summary, "summarized_upto": end}
 
     def after_classify(state: AgentState) -> str:
         """Route to agent_fast for SIMPLE, agent_capable for COMPLEX."""
@@ -189,31 +347,100 @@ def build_routed_graph(
         # When re-enabling, also unskip test_fast_model_low_logprobs_escalates
         # in tests/test_chat.py.
         # llm_with_logprobs = fast_llm.bind(logprobs=True)
-        messages = [SystemMessage(content=system_prompt), *state["messages"]]
+        usage = _usage(state)
+        reason = budget.exhausted(limits, usage)
+        if reason:
+            return {"turn_usage": {**usage, "exhausted": reason}}
+        messages = _prompt(state, "fast_small")
         # response = await llm_with_logprobs.ainvoke(messages)
-        response = await fast_llm.ainvoke(messages)
+        response, usage = await _budgeted_call(fast_llm, messages, usage)
+        if response is None:
+            return {"turn_usage": usage}
 
         # if _low_confidence(response):
         #     logger.info("Fast model low confidence, escalating to capable_large")
         #     return {"escalated": True}
 
-        return {"messages": [response]}
+        return {"messages": [response], "turn_usage": usage}
 
     def after_agent_fast(state: AgentState) -> str:
         """Route to agent_capable if fast model response was low confidence."""
+        if _usage(state)["exhausted"]:
+            return "budget_exhausted"
         if state.get("escalated"):
             return "agent_capable"
         return "output_shield"
 
     async def agent_capable(state: AgentState) -> dict:
         """Call the capable LLM with tools bound (reliable tool-calling)."""
-        llm = capable_llm.bind_tools(tools)
-        messages = [SystemMessage(content=system_prompt), *state["messages"]]
-        response = await llm.ainvoke(messages)
-        return {"messages": [response]}
+        usage = _usage(state)
+        reason = budget.exhausted(limits, usage)
+        if reason:
+            return {"turn_usage": {**usage, "exhausted": reason}}
+        subset = tools
+        if selector is not None:
+            query = next(
+                (m.content for m in reversed(state["messages"]) if isinstance(m, HumanMessage)),
+                "",
+            )
+            subset = await selector.select(
+                query if isinstance(query, str) else "",
+                recent=recent_tool_names(state["messages"], turns=2),
+            )
+        llm = _bind_tools(subset)
+        messages = _prompt(state, "capable_large")
+        response, usage = await _budgeted_call(llm, messages, usage)
+        if response is None:
+            return {"turn_usage": usage}
+        calls = len(getattr(response, "tool_calls", None) or [])
+        if budget.over_tool_budget(limits, usage, calls):
+            usage = {**usage, "exhausted": "max_tool_calls"}
+        else:
+            usage = {**usage, "tool_calls": usage["tool_calls"] + calls}
+        return {"messages": [response], "turn_usage": usage}
+
+    async def speculative_agent(state: AgentState) -> dict:
+        """Input shield and first agent call, run concurrently.
+
+        The shield verdict is always awaited before anything is returned.
+        A blocked message cancels the agent call; a shield error propagates
+        after cancelling it, so nothing unverified leaves the node.
+        """
+        call_agent = agent_fast if state.get("model_tier") == "fast_small" else agent_capable
+        agent_task = asyncio.create_task(call_agent(state))
+        try:
+            verdict = await input_shield(state)
+        except BaseException:
+            agent_task.cancel()
+            raise
+        if verdict["safety_blocked"]:
+            agent_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await agent_task
+            return verdict
+        return {**verdict, **await agent_task}
+
+    def after_classify_speculative(state: AgentState) -> str:
+        """Overlap shield and agent call, unless older turns must be summarized first.
+
+        The summarizer sees the conversation, so it waits for the verdict.
+        """
+        if _fold_end(state) is not None:
+            return "input_shield"
+        return "speculative_agent"
+
+    def after_speculative_agent(state: AgentState) -> str:
+        """END if blocked, otherwise route like the agent node that ran."""
+        if state.get("safety_blocked"):
+            return END
+        if state.get("model_tier") == "fast_small":
+            return after_agent_fast(state)
+        return should_continue(state)
 
     def should_continue(state: AgentState) -> str:
         """Route to tool_auth (or tools) if the LLM made tool calls, else output shield."""
+        if _usage(state)["exhausted"]:
+            return "budget_exhausted"
         last = state["messages"][-1]
         if isinstance(last, AIMessage) and last.tool_calls:
             return "tool_auth" if tool_allowed_roles else "tools"
@@ -271,6 +498,35 @@ def build_routed_graph(
             return "output_shield"
         return "tools"
 
+    async def budget_exhausted(state: AgentState) -> dict:
+        """End the turn with a partial answer once its budget is spent.
+
+        Tool calls the model already requested are answered as not run, so
+        the checkpointed history stays a valid tool-call sequence.
+        """
+        usage = _usage(state)
+        logger.warning(
+            "Turn budget exhausted (%s): llm_calls=%d tool_calls=%d tokens=%d elapsed=%.1fs",
+            usage["exhausted"],
+            usage["llm_calls"],
+            usage["tool_calls"],
+            usage["tokens"],
+            budget.elapsed(usage),
+        )
+        messages: list = []
+        last = state["messages"][-1]
+        if isinstance(last, AIMessage) and last.tool_calls:
+            messages = [
+                ToolMessage(
+                    content="Not run: this turn's compute budget was exhausted.",
+                    tool_call_id=tc["id"],
+                    name=tc["name"],
+                )
+                for tc in last.tool_calls
+            ]
+        messages.append(AIMessage(content=budget.partial_answer(state["messages"])))
+        return {"messages": messages}
+
     async def output_shield(state: AgentState) -> dict:
         """Check agent output against Llama Guard safety categories."""
         checker = get_safety_checker()
@@ -296,20 +552,75 @@ def build_routed_graph(
 
     tool_node = ToolNode(tools)
 
+    async def run_tools(state: AgentState, config: RunnableConfig) -> dict:
+        """Run the pending tool calls, bounded by the turn deadline.
+
+        Calls the model already made are within the call and token limits
+        (the tool-call limit is applied by agent_capable), so only the
+        deadline is checked here: a passed deadline skips the tools and one
+        hit mid-run cancels them.  budget_exhausted then answers the pending
+        calls as not run.
+        """
+        usage = _usage(state)
+        if budget.remaining_seconds(limits, usage) == 0:
+            return {"turn_usage": {**usage, "exhausted": "max_seconds"}}
+        deadline = asyncio.timeout(budget.remaining_seconds(limits, usage))
+        try:
+            async with deadline:
+                return await tool_node.ainvoke(state, config)
+        except TimeoutError:
+            if not deadline.expired():
+                raise
+            logger.warning("Tool calls cut off at the turn deadline")
+            return {"turn_usage": {**usage, "exhausted": "max_seconds"}}
+
+    def after_tools(state: AgentState) -> str:
+        """Back to agent_capable with the results, or budget_exhausted if cut off."""
+        if _usage(state)["exhausted"]:
+            return "budget_exhausted"
+        return "agent_capable"
+
     graph = StateGraph(AgentState)
     graph.add_node("input_shield", input_shield)
     graph.add_node("classify", classify)
+    graph.add_node("manage_context", manage_context)
     graph.add_node("agent_fast", agent_fast)
     graph.add_node("agent_capable", agent_capable)
-    graph.add_node("tools", tool_node)
+    graph.add_node("tools", run_tools)
     graph.add_node("output_shield", output_shield)
+    graph.add_node("budget_exhausted", budget_exhausted)
 
-    graph.set_entry_point("input_shield")
-    graph.add_conditional_edges(
-        "input_shield", after_input_shield, {END: END, "classify": "classify"}
-    )
+    tool_route = "tool_auth" if tool_allowed_roles else "tools"
+    if speculative_input_shield:
+        graph.add_node("speculative_agent", speculative_agent)
+        graph.set_entry_point("classify")
+        graph.add_conditional_edges(
+            "classify",
+            after_classify_speculative,
+            {"speculative_agent": "speculative_agent", "input_shield": "input_shield"},
+        )
+        graph.add_conditional_edges(
+            "input_shield", after_input_shield, {END: END, "continue": "manage_context"}
+        )
+        graph.add_conditional_edges(
+            "speculative_agent",
+            after_speculative_agent,
+            {
+                END: END,
+                "agent_capable": "agent_capable",
+                "output_shield": "output_shield",
+                "budget_exhausted": "budget_exhausted",
+                tool_route: tool_route,
+            },
+        )
+    else:
+        graph.set_entry_point("input_shield")
+        graph.add_conditional_edges(
+            "input_shield", after_input_shield, {END: END, "continue": "classify"}
+        )
+        graph.add_edge("classify", "manage_context")
     graph.add_conditional_edges(
-        "classify",
+        "manage_context",
         after_classify,
         {"agent_fast": "agent_fast", "agent_capable": "agent_capable"},
     )
@@ -318,7 +629,11 @@ def build_routed_graph(
     graph.add_conditional_edges(
         "agent_fast",
         after_agent_fast,
-        {"output_shield": "output_shield", "agent_capable": "agent_capable"},
+        {
+            "output_shield": "output_shield",
+            "agent_capable": "agent_capable",
+            "budget_exhausted": "budget_exhausted",
+        },
     )
 
     # Capable model path: tool calls -> auth/tools loop, text -> output_shield
@@ -327,7 +642,11 @@ def build_routed_graph(
         graph.add_conditional_edges(
             "agent_capable",
             should_continue,
-            {"tool_auth": "tool_auth", "output_shield": "output_shield"},
+            {
+                "tool_auth": "tool_auth",
+                "output_shield": "output_shield",
+                "budget_exhausted": "budget_exhausted",
+            },
         )
         graph.add_conditional_edges(
             "tool_auth",
@@ -338,10 +657,19 @@ def build_routed_graph(
         graph.add_conditional_edges(
             "agent_capable",
             should_continue,
-            {"tools": "tools", "output_shield": "output_shield"},
+            {
+                "tools": "tools",
+                "output_shield": "output_shield",
+                "budget_exhausted": "budget_exhausted",
+            },
         )
 
-    graph.add_edge("tools", "agent_capable")
+    graph.add_conditional_edges(
+        "tools",
+        after_tools,
+        {"agent_capable": "agent_capable", "budget_exhausted": "budget_exhausted"},
+    )
+    graph.add_edge("budget_exhausted", "output_shield")
     graph.add_edge("output_shield", END)
 
     return graph.compile(checkpointer=checkpointer)
@@ -369,7 +697,14 @@ def build_agent_graph(
         if name and allowed:
             tool_allowed_roles[name] = allowed
 
+    selection_cfg = config.get("tool_selection") or {}
+    tool_selection = None
+    top_k = int(selection_cfg.get("top_k", settings.AGENT_TOOL_SELECTION_TOP_K))
+    if top_k > 0 and len(tools) >= settings.AGENT_TOOL_SELECTION_MIN_TOOLS:
+        tool_selection = {"top_k": top_k, "pinned": selection_cfg.get("pinned", [])}
+
     llms: dict[str, ChatOpenAI] = {}
+    context_budgets: dict[str, int] = {}
     for tier in get_model_tiers():
         model_cfg = get_model_config(tier)
         llms[tier] = ChatOpenAI(
@@ -377,6 +712,8 @@ def build_agent_graph(
             base_url=model_cfg["endpoint"],
             api_key=model_cfg.get("api_key", "not-needed"),
         )
+        if model_cfg.get("context_budget_tokens"):
+            context_budgets[tier] = int(model_cfg["context_budget_tokens"])
 
     return build_routed_graph(
         system_prompt=system_prompt,
@@ -384,4 +721,7 @@ def build_agent_graph(
         llms=llms,
         tool_allowed_roles=tool_allowed_roles,
         checkpointer=checkpointer,
+        context_budgets=context_budgets,
+        tool_selection=tool_selection,
+        turn_budget=config.get("turn_budget"),
     )
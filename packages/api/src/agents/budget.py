@@ -0,0 +1,102 @@
+# This project was developed with assistance from AI tools.
+"""Per-turn compute budget for the agent graph.
+
+A turn (one user message) may chain several capable-model calls through the
+tools loop.  The budget bounds it on four axes; a limit of 0 is unlimited:
+
+    max_llm_calls    agent model calls (fast, capable, escalation)
+    max_tool_calls   tool calls executed
+    max_tokens       prompt + completion tokens across those calls
+    max_seconds      wall-clock time since the turn was classified
+
+Limits (``turn_budget``) and running counters (``turn_usage``) are kept in
+graph state and reset at the start of every turn.  Token counts come from
+the response's ``usage_metadata`` when the backend reports it and are
+estimated otherwise (streamed responses often carry no usage).
+"""
+
+import time
+from collections.abc import Sequence
+from typing import Any
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+from .context import estimate_tokens
+
+LIMITS = ("max_llm_calls", "max_tool_calls", "max_tokens", "max_seconds")
+
+BUDGET_EXHAUSTED_MESSAGE = (
+    "I wasn't able to finish this request within the time and effort allowed for a single reply."
+)
+
+
+def new_usage() -> dict[str, Any]:
+    """Counters for a fresh turn."""
+    return {
+        "llm_calls": 0,
+        "tool_calls": 0,
+        "tokens": 0,
+        "started_at": time.time(),
+        "exhausted": "",
+    }
+
+
+def elapsed(usage: dict[str, Any]) -> float:
+    """Seconds since the turn started."""
+    return time.time() - usage.get("started_at", time.time())
+
+
+def remaining_seconds(limits: dict[str, Any], usage: dict[str, Any]) -> float | None:
+    """Wall-clock seconds left in the turn, or None when there is no deadline."""
+    if not limits.get("max_seconds"):
+        return None
+    return max(0.0, limits["max_seconds"] - elapsed(usage))
+
+
+def exhausted(limits: dict[str, Any], usage: dict[str, Any]) -> str:
+    """Name of the first exhausted limit, or "" while the turn may continue."""
+    if usage.get("exhausted"):
+        return usage["exhausted"]
+    if limits.get("max_llm_calls") and usage["llm_calls"] >= limits["max_llm_calls"]:
+        return "max_llm_calls"
+    if limits.get("max_tokens") and usage["tokens"] >= limits["max_tokens"]:
+        return "max_tokens"
+    if remaining_seconds(limits, usage) == 0:
+        return "max_seconds"
+    return ""
+
+
+def over_tool_budget(limits: dict[str, Any], usage: dict[str, Any], calls: int) -> bool:
+    """Whether running ``calls`` more tools would exceed ``max_tool_calls``."""
+    return bool(limits.get("max_tool_calls")) and (
+        usage["tool_calls"] + calls > limits["max_tool_calls"]
+    )
+
+
+def record_llm_call(
+    usage: dict[str, Any], prompt: Sequence[BaseMessage], response: AIMessage | None
+) -> dict[str, Any]:
+    """Counters updated for one model call (``response`` None if it was cut off)."""
+    reported = (getattr(response, "usage_metadata", None) or {}).get("total_tokens")
+    tokens = reported if isinstance(reported, int) and reported > 0 else None
+    if tokens is None:
+        tokens = estimate_tokens([*prompt, *([response] if response else [])])
+    return {**usage, "llm_calls": usage["llm_calls"] + 1, "tokens": usage["tokens"] + tokens}
+
+
+def partial_answer(messages: Sequence[BaseMessage]) -> str:
+    """Budget-exhausted reply naming what the turn managed to look up."""
+    turn: list[BaseMessage] = []
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            break
+        turn.append(message)
+    done = list(
+        dict.fromkeys(m.name for m in reversed(turn) if isinstance(m, ToolMessage) and m.name)
+    )
+    if not done:
+        return f"{BUDGET_EXHAUSTED_MESSAGE} Could you narrow the question or ask again?"
+    return (
+        f"{BUDGET_EXHAUSTED_MESSAGE} I got as far as checking {', '.join(done)}. "
+        "Ask me to continue, or narrow the question, and I'll pick up from there."
+    )
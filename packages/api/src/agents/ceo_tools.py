@@ -23,12 +23,16 @@ from ..services.analytics import get_denial_trends, get_lo_performance, get_pipe
 from ..services.audit import (
     get_decision_trace,
     get_events_by_application,
+    next_audit_cursor,
     search_events,
     write_audit_event,
 )
 from ..services.model_monitoring import get_model_monitoring_summary
 from .shared import user_context_from_state
 
+# Events per ceo_audit_trail call; the tool hands back a cursor for the rest.
+_AUDIT_TRAIL_PAGE_SIZE = 100
+
 
 def _user_context_from_state(state: dict):
     return user_context_from_state(state, default_role="ceo")
@@ -294,16 +298,28 @@ async def ceo_application_lookup(
 @tool
 async def ceo_audit_trail(
     application_id: int,
+    cursor: str | None = None,
     state: Annotated[dict, InjectedState] = {},
 ) -> str:
-    """Get the audit trail for a specific application, showing all events in chronological order.
+    """Get the audit trail for a specific application, showing events in chronological order.
+
+    Long trails are returned a page at a time; when more events remain, the
+    result ends with a cursor to pass back in for the next page.
 
     Args:
         application_id: The application ID to get audit events for.
+        cursor: Cursor from a previous call to continue the trail (omit for the first page).
     """
     user = _user_context_from_state(state)
     async with SessionLocal() as session:
-        events = await get_events_by_application(session, application_id)
+        try:
+            events = await get_events_by_application(
+                session, application_id, limit=_AUDIT_TRAIL_PAGE_SIZE, cursor=cursor
+            )
+        except ValueError:
+            return (
+                "That cursor is not valid. Call again without a cursor to start from the beginning."
+            )
 
         if not events:
             await write_audit_event(
@@ -325,6 +341,11 @@ async def ceo_audit_trail(
                 line += f" (by {evt.user_id})"
             lines.append(line)
 
+        next_cursor = next_audit_cursor(events, _AUDIT_TRAIL_PAGE_SIZE)
+        if next_cursor:
+            lines.append("")
+            lines.append(f"More events remain. Call again with cursor={next_cursor!r}.")
+
         await write_audit_event(
             session,
             event_type="query",
@@ -397,19 +418,34 @@ async def ceo_decision_trace(
 async def ceo_audit_search(
     days: int | None = None,
     event_type: str | None = None,
+    event_data: dict | None = None,
     limit: int = 100,
+    cursor: str | None = None,
     state: Annotated[dict, InjectedState] = {},
 ) -> str:
-    """Search audit events by time range and/or event type.
+    """Search audit events by time range, event type and/or event payload, newest first.
 
     Args:
         days: Time range in days (e.g. 7 for last week, 30 for last month).
         event_type: Filter by event type (e.g. 'stage_transition', 'decision_rendered').
+        event_data: Payload fields the event must contain, e.g. {"tool_name": "uw_risk_assessment"}
+            or {"overall_status": "FAIL"}.
         limit: Maximum events to return (default 100).
+        cursor: Cursor from a previous search to fetch the next (older) page.
     """
     user = _user_context_from_state(state)
     async with SessionLocal() as session:
-        events = await search_events(session, days=days, event_type=event_type, limit=limit)
+        try:
+            events = await search_events(
+                session,
+                days=days,
+                event_type=event_type,
+                event_data=event_data,
+                limit=limit,
+                cursor=cursor,
+            )
+        except ValueError:
+            return "That cursor is not valid. Search again without a cursor."
 
         if not events:
             await write_audit_event(
@@ -421,6 +457,7 @@ async def ceo_audit_search(
                     "tool": "ceo_audit_search",
                     "days": days,
                     "event_type": event_type,
+                    "event_data": event_data,
                     "limit": limit,
                 },
             )
@@ -433,6 +470,8 @@ async def ceo_audit_search(
             lines[0] += f" (last {days} days)"
         if event_type:
             lines[0] += f" (type: {event_type})"
+        if event_data:
+            lines[0] += f" (matching: {event_data})"
         lines.append("")
 
         for evt in events[:50]:  # Cap display at 50 for readability
@@ -447,6 +486,10 @@ async def ceo_audit_search(
         if len(events) > 50:
             lines.append(f"  ... and {len(events) - 50} more events")
 
+        next_cursor = next_audit_cursor(events, limit)
+        if next_cursor:
+            lines.append(f"  Older events remain. Search again with cursor={next_cursor!r}.")
+
         await write_audit_event(
             session,
             event_type="query",
@@ -456,6 +499,7 @@ async def ceo_audit_search(
                 "tool": "ceo_audit_search",
                 "days": days,
                 "event_type": event_type,
+                "event_data": event_data,
                 "limit": limit,
             },
         )
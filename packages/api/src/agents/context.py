@@ -0,0 +1,198 @@
+# This project was developed with assistance from AI tools.
+"""Token-budgeted conversation context for agent LLM calls.
+
+The checkpointed ``messages`` list is never trimmed -- conversation history
+and audit depend on it.  Instead each LLM call sees a bounded view:
+
+    [system prompt + rolling summary] + system context + messages[summarized_upto:]
+
+- Messages before ``summarized_upto`` have been folded into
+  ``context_summary`` (both kept in graph state) by the ``manage_context``
+  node.  It folds once the estimated prompt exceeds the tier's token
+  budget, always on a user-turn boundary, so tool calls and their results
+  are never split.
+- The most recent ``keep_turns`` user turns are sent verbatim; tool outputs
+  in older turns are cut to ``tool_chars`` characters.
+
+Token counts are estimated (about four characters per token) so budgeting
+costs no tokenizer calls.
+"""
+
+import logging
+from collections.abc import Sequence
+
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+
+logger = logging.getLogger(__name__)
+
+_CHARS_PER_TOKEN = 4
+# Per-message overhead (role, separators) in the chat format.
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+_SUMMARY_HEADER = "SUMMARY OF EARLIER CONVERSATION:"
+
+SUMMARY_INSTRUCTIONS = (
+    "You maintain a running summary of a conversation between a user and a "
+    "mortgage assistant. Update the summary with the new messages. Keep "
+    "application IDs, names, amounts, dates, decisions, outstanding requests "
+    "and anything the assistant promised to do. Drop pleasantries. Reply with "
+    "the updated summary only, in under 250 words."
+)
+
+# Longest summary kept when the summarizer is unavailable and we fall back
+# to an extractive summary.
+_FALLBACK_SUMMARY_CHARS = 2000
+
+
+def _text(message: BaseMessage) -> str:
+    content = message.content
+    if isinstance(content, str):
+        return content
+    return " ".join(
+        part.get("text", "") if isinstance(part, dict) else str(part) for part in content
+    )
+
+
+def estimate_tokens(messages: Sequence[BaseMessage]) -> int:
+    """Approximate prompt tokens for ``messages``."""
+    chars = 0
+    for message in messages:
+        chars += len(_text(message))
+        if isinstance(message, AIMessage) and message.tool_calls:
+            chars += len(str(message.tool_calls))
+    return chars // _CHARS_PER_TOKEN + _MESSAGE_OVERHEAD_TOKENS * len(messages)
+
+
+def turn_starts(messages: Sequence[BaseMessage]) -> list[int]:
+    """Indices of the user messages that start each turn."""
+    return [i for i, message in enumerate(messages) if isinstance(message, HumanMessage)]
+
+
+def verbatim_start(messages: Sequence[BaseMessage], keep_turns: int) -> int:
+    """Index of the first message in the most recent ``keep_turns`` turns."""
+    starts = turn_starts(messages)
+    if not starts:
+        return 0
+    return starts[-min(max(keep_turns, 1), len(starts))]
+
+
+def compact_tool_output(message: ToolMessage, max_chars: int) -> ToolMessage:
+    """Copy of a tool result with its content cut to ``max_chars``."""
+    text = _text(message)
+    if len(text) <= max_chars:
+        return message
+    note = f"[... {len(text) - max_chars} characters of earlier tool output omitted]"
+    return message.model_copy(update={"content": f"{text[:max_chars]}\n{note}"})
+
+
+def prompt_messages(
+    system_prompt: str,
+    messages: Sequence[BaseMessage],
+    *,
+    summary: str,
+    summarized_upto: int,
+    budget: int,
+    keep_turns: int,
+    tool_chars: int,
+) -> list[BaseMessage]:
+    """Build the bounded message list sent to an agent LLM call.
+
+    System messages in the summarized prefix (e.g. injected application
+    context) are kept verbatim.  If the prompt is still over ``budget``
+    after summarizing and compacting older turns, tool outputs in all but
+    the current turn are compacted as well.
+    """
+    summarized_upto = min(summarized_upto, len(messages))
+    system = system_prompt
+    if summary:
+        system = f"{system_prompt}\n\n{_SUMMARY_HEADER}\n{summary}"
+    pinned = [m for m in messages[:summarized_upto] if isinstance(m, SystemMessage)]
+    window = list(messages[summarized_upto:])
+
+    def _compact_before(end: int) -> list[BaseMessage]:
+        return [
+            compact_tool_output(m, tool_chars) if i < end and isinstance(m, ToolMessage) else m
+            for i, m in enumerate(window)
+        ]
+
+    window = _compact_before(verbatim_start(window, keep_turns))
+    prompt = [SystemMessage(content=system), *pinned, *window]
+    if estimate_tokens(prompt) > budget:
+        window = _compact_before(verbatim_start(window, 1))
+        prompt = [SystemMessage(content=system), *pinned, *window]
+    return prompt
+
+
+def fold_point(
+    messages: Sequence[BaseMessage],
+    *,
+    system_prompt: str,
+    summary: str,
+    summarized_upto: int,
+    budget: int,
+    keep_turns: int,
+    tool_chars: int,
+) -> int | None:
+    """Index to fold the summary up to, or None while the prompt fits ``budget``."""
+    boundary = verbatim_start(messages, keep_turns)
+    if boundary <= summarized_upto:
+        return None
+    prompt = prompt_messages(
+        system_prompt,
+        messages,
+        summary=summary,
+        summarized_upto=summarized_upto,
+        budget=budget,
+        keep_turns=keep_turns,
+        tool_chars=tool_chars,
+    )
+    if estimate_tokens(prompt) <= budget:
+        return None
+    return boundary
+
+
+def transcript(messages: Sequence[BaseMessage], tool_chars: int) -> str:
+    """Plain-text rendering of messages for the summarizer."""
+    lines = []
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            lines.append(f"User: {_text(message)}")
+        elif isinstance(message, ToolMessage):
+            lines.append(f"Tool {message.name or ''}: {_text(message)[:tool_chars]}".strip())
+        elif isinstance(message, AIMessage):
+            if message.tool_calls:
+                calls = ", ".join(tc["name"] for tc in message.tool_calls)
+                lines.append(f"Assistant called: {calls}")
+            if _text(message):
+                lines.append(f"Assistant: {_text(message)}")
+    return "\n".join(lines)
+
+
+async def summarize(llm, previous: str, messages: Sequence[BaseMessage], tool_chars: int) -> str:
+    """Fold ``messages`` into the rolling summary ``previous``.
+
+    Falls back to an extractive summary (the tail of the transcript) if the
+    summarizer call fails, so a summarizer outage never fails the turn.
+    """
+    new_text = transcript(messages, tool_chars)
+    request = [
+        SystemMessage(content=SUMMARY_INSTRUCTIONS),
+        HumanMessage(
+            content=f"Current summary:\n{previous or '(none)'}\n\nNew messages:\n{new_text}"
+        ),
+    ]
+    try:
+        response = await llm.ainvoke(request)
+        summary = _text(response).strip()
+        if summary:
+            return summary
+    except Exception:
+        logger.warning("Conversation summarizer failed, using extractive summary", exc_info=True)
+    combined = f"{previous}\n{new_text}".strip()
+    return combined[-_FALLBACK_SUMMARY_CHARS:]
@@ -120,3 +120,21 @@ def list_agents() -> list[str]:
     if not _AGENTS_CONFIG_DIR.exists():
         return []
     return [p.stem for p in _AGENTS_CONFIG_DIR.glob("*.yaml")]
+
+
+async def warm_agents(checkpointer=None) -> None:
+    """Build every registered agent's graph and embed its tool descriptions.
+
+    Run at startup so the first chat turn pays for neither. Agents that fail
+    to build are logged and left to load on first use.
+    """
+    from .tool_selection import warm_tool_selectors
+
+    for agent_name in list_agents():
+        if agent_name not in _AGENT_MODULES:
+            continue
+        try:
+            get_agent(agent_name, checkpointer=checkpointer)
+        except Exception:
+            logger.warning("Failed to preload agent %s", agent_name, exc_info=True)
+    await warm_tool_selectors()
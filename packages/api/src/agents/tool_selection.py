@@ -0,0 +1,161 @@
+# This project was developed with assistance from AI tools.
+"""Per-turn tool subset selection for the capable model.
+
+Every bound tool's JSON schema is sent with each capable-model call, so an
+agent with 15-20 tools spends a large share of every prompt on tools the
+turn will never use.  ``ToolSelector`` picks the subset worth binding:
+
+- the agent's pinned core tools (agent YAML ``tool_selection.pinned``),
+- tools called in the recent turns, so follow-ups ("same for #12") and the
+  tool loop of the current turn keep the tools they are already using,
+- the ``top_k`` tools whose ``name: description`` embedding is most similar
+  to the user's message.
+
+Tool descriptions are embedded once per selector, at startup for the
+agents preloaded by ``registry.warm_agents``; query embeddings are cached
+so every step of a tool loop reuses the first one.  Any embedding
+failure falls back to binding every tool, so selection can only ever cost
+prompt tokens, never a tool.
+"""
+
+import asyncio
+import logging
+import math
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage
+
+from .context import turn_starts
+
+logger = logging.getLogger(__name__)
+
+EmbedFn = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+# Recent user messages whose embeddings are kept (one per turn is needed).
+_QUERY_CACHE_SIZE = 256
+
+# Seconds to bind every tool after an embedding failure before retrying.
+_RETRY_AFTER_S = 60.0
+
+
+# Every live selector, so their description vectors can be built at startup.
+_selectors: weakref.WeakSet = weakref.WeakSet()
+
+
+async def _default_embed(texts: list[str]) -> list[list[float]]:
+    from ..inference.embeddings import get_embedding_provider
+
+    return await get_embedding_provider().embed(texts)
+
+
+def _unit(vector: Sequence[float]) -> list[float]:
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else list(vector)
+
+
+def recent_tool_names(messages: Sequence[BaseMessage], turns: int) -> set[str]:
+    """Names of tools called in the last ``turns`` user turns."""
+    starts = turn_starts(messages)
+    start = starts[-turns] if turns and len(starts) >= turns else 0
+    return {
+        call["name"]
+        for message in messages[start:]
+        if isinstance(message, AIMessage)
+        for call in message.tool_calls
+    }
+
+
+class ToolSelector:
+    """Choose the tools to bind for a turn by embedding similarity.
+
+    Args:
+        tools: Every tool available to the agent.
+        top_k: Tools chosen by similarity, on top of pinned and recent ones.
+        pinned: Names of tools that are always bound.
+        embed: Async text embedder; defaults to the configured embedding
+            provider.
+    """
+
+    def __init__(
+        self,
+        tools: Sequence,
+        *,
+        top_k: int,
+        pinned: Iterable[str] = (),
+        embed: EmbedFn | None = None,
+    ) -> None:
+        self._tools = list(tools)
+        self._top_k = top_k
+        names = {tool.name for tool in self._tools}
+        self._pinned = set(pinned) & names
+        unknown = set(pinned) - names
+        if unknown:
+            logger.warning("Pinned tools not available to the agent: %s", sorted(unknown))
+        self._embed = embed or _default_embed
+        self._tool_vectors: list[list[float]] | None = None
+        self._lock = asyncio.Lock()
+        self._queries: OrderedDict[str, list[float]] = OrderedDict()
+        self._retry_at = 0.0
+        _selectors.add(self)
+
+    async def warm(self) -> None:
+        """Embed the tool descriptions now instead of on the first turn.
+
+        A failure is logged; the first ``select`` then tries again.
+        """
+        try:
+            await self._descriptions()
+        except Exception:
+            logger.warning("Tool description embedding failed at warm-up", exc_info=True)
+
+    async def select(self, query: str, recent: Iterable[str] = ()) -> list:
+        """Tools to bind for ``query``, in the agent's original tool order."""
+        keep = self._pinned | set(recent)
+        candidates = [t for t in self._tools if t.name not in keep]
+        if len(candidates) <= self._top_k or not query.strip():
+            return self._tools
+        if time.monotonic() < self._retry_at:
+            return self._tools
+        try:
+            tool_vectors = await self._descriptions()
+            query_vector = await self._query(query)
+        except Exception:
+            logger.warning("Tool selection embedding failed, binding all tools", exc_info=True)
+            self._retry_at = time.monotonic() + _RETRY_AFTER_S
+            return self._tools
+
+        scores = {
+            tool.name: sum(a * b for a, b in zip(query_vector, vector, strict=True))
+            for tool, vector in zip(self._tools, tool_vectors, strict=True)
+        }
+        ranked = sorted(candidates, key=lambda t: scores[t.name], reverse=True)
+        keep |= {t.name for t in ranked[: self._top_k]}
+        return [t for t in self._tools if t.name in keep]
+
+    async def _descriptions(self) -> list[list[float]]:
+        if self._tool_vectors is None:
+            async with self._lock:
+                if self._tool_vectors is None:
+                    texts = [f"{t.name}: {t.description}" for t in self._tools]
+                    self._tool_vectors = [_unit(v) for v in await self._embed(texts)]
+        return self._tool_vectors
+
+    async def _query(self, query: str) -> list[float]:
+        vector = self._queries.get(query)
+        if vector is None:
+            (raw,) = await self._embed([query])
+            vector = _unit(raw)
+            self._queries[query] = vector
+            if len(self._queries) > _QUERY_CACHE_SIZE:
+                self._queries.popitem(last=False)
+        else:
+            self._queries.move_to_end(query)
+        return vector
+
+
+async def warm_tool_selectors() -> None:
+    """Embed the tool descriptions of every live selector."""
+    await asyncio.gather(*(selector.warm() for selector in list(_selectors)))
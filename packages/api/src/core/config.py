@@ -74,6 +74,122 @@ class Settings(BaseSettings):
         description="Secret key for SQLAdmin session cookies. Must be stable across restarts.",
     )
 
+    # -- Audit --
+    AUDIT_WRITER_MAX_BATCH_SIZE: int = Field(
+        default=256,
+        description="Max audit events the group-commit writer inserts per batch.",
+    )
+    AUDIT_WRITER_MAX_WAIT_MS: float = Field(
+        default=5.0,
+        description="How long the audit writer lingers for more events before flushing a batch.",
+    )
+    AUDIT_VERIFY_CHUNK_SIZE: int = Field(
+        default=10_000,
+        description="Audit events per chunk when streaming and hashing the chain for verification.",
+    )
+    AUDIT_VERIFY_WORKERS: int | None = Field(
+        default=None,
+        description="Worker processes for chain verification. Defaults to the CPU count.",
+    )
+    AUDIT_PARTITION_MONTHS_AHEAD: int = Field(
+        default=3,
+        description="Monthly audit_events partitions to pre-create beyond the current month.",
+    )
+    AUDIT_PARTITION_INTERVAL_S: float = Field(
+        default=86_400.0,
+        description=(
+            "Seconds between background audit partition maintenance runs. 0 disables the "
+            "task (partitions are then only created at startup)."
+        ),
+    )
+    AUDIT_MERKLE_BLOCK_SIZE: int = Field(
+        default=1024,
+        description="Audit events per Merkle-anchored block (proof length is log2 of this).",
+    )
+    AUDIT_MERKLE_ANCHOR_INTERVAL_S: float = Field(
+        default=300.0,
+        description="Seconds between background Merkle anchoring runs. 0 disables the task.",
+    )
+    AUDIT_EXPORT_CHUNK_SIZE: int = Field(
+        default=1_000,
+        description="Audit events fetched and serialized per chunk in streaming exports.",
+    )
+    AUDIT_ARCHIVE_AFTER_DAYS: int = Field(
+        default=365,
+        description="Archive monthly audit_events partitions once they are this many days old.",
+    )
+    AUDIT_ARCHIVE_INTERVAL_S: float = Field(
+        default=86_400.0,
+        description="Seconds between background audit archival runs. 0 disables the task.",
+    )
+    AUDIT_ARCHIVE_PREFIX: str = Field(
+        default="audit-archive/",
+        description="Object key prefix for archived audit segments in the S3 bucket.",
+    )
+
+    # -- Analytics --
+    ANALYTICS_CACHE_MAX_STALENESS_S: float = Field(
+        default=60.0,
+        description="Max age in seconds of a cached analytics result. 0 disables the cache.",
+    )
+    ANALYTICS_CACHE_MAX_ENTRIES: int = Field(
+        default=256,
+        description="Max cached analytics results; least recently used entries are evicted.",
+    )
+    ANALYTICS_CONCURRENT_QUERIES: bool = Field(
+        default=True,
+        description="Run independent analytics sub-queries concurrently on separate sessions.",
+    )
+    ANALYTICS_QUERY_CONCURRENCY: int = Field(
+        default=4,
+        description="Max analytics sub-queries in flight at once per process.",
+    )
+
+    # -- Agent context --
+    AGENT_CONTEXT_BUDGET_TOKENS: int = Field(
+        default=16000,
+        description=(
+            "Prompt token budget for model tiers without context_budget_tokens in models.yaml."
+        ),
+    )
+    AGENT_CONTEXT_KEEP_TURNS: int = Field(
+        default=3,
+        description="Most recent user turns sent verbatim; older turns may be summarized.",
+    )
+    AGENT_CONTEXT_TOOL_OUTPUT_CHARS: int = Field(
+        default=800,
+        description="Characters kept from tool outputs outside the verbatim turns.",
+    )
+    AGENT_TOOL_SELECTION_TOP_K: int = Field(
+        default=6,
+        description=(
+            "Tools bound per capable-model call by embedding similarity, in addition to "
+            "pinned and recently used tools. 0 binds every tool."
+        ),
+    )
+    AGENT_TOOL_SELECTION_MIN_TOOLS: int = Field(
+        default=10,
+        description="Agents with fewer tools than this always bind every tool.",
+    )
+
+    # -- Agent turn budget (0 = unlimited; agent YAML turn_budget overrides) --
+    AGENT_TURN_MAX_LLM_CALLS: int = Field(
+        default=8,
+        description="Agent model calls allowed per user turn.",
+    )
+    AGENT_TURN_MAX_TOOL_CALLS: int = Field(
+        default=12,
+        description="Tool calls allowed per user turn.",
+    )
+    AGENT_TURN_MAX_TOKENS: int = Field(
+        default=150000,
+        description="Prompt plus completion tokens allowed per user turn.",
+    )
+    AGENT_TURN_MAX_SECONDS: float = Field(
+        default=90.0,
+        description="Wall-clock seconds allowed per user turn before a partial answer.",
+    )
+
     # -- Safety / Shields --
     SAFETY_MODEL: str | None = Field(
         default=None,
@@ -87,6 +203,41 @@ class Settings(BaseSettings):
         default=None,
         description="Safety model API key. Defaults to LLM_API_KEY if not set.",
     )
+    SAFETY_SPECULATIVE_INPUT_SHIELD: bool = Field(
+        default=False,
+        description=(
+            "Run the input shield concurrently with the first agent LLM call. The call's "
+            "output is discarded unless the shield passes; tools never run before the verdict."
+        ),
+    )
+    SAFETY_VERDICT_CACHE_MAX_ENTRIES: int = Field(
+        default=4096,
+        description="Max cached safe shield verdicts (LRU); 0 disables the verdict cache.",
+    )
+    SAFETY_VERDICT_CACHE_TTL_S: float = Field(
+        default=600.0,
+        description="Seconds a cached safe shield verdict stays valid; 0 disables the cache.",
+    )
+    SAFETY_MAX_CONCURRENCY: int = Field(
+        default=128,
+        description="Max safety-model requests in flight at once per process.",
+    )
+    SAFETY_BATCH_MAX_SIZE: int = Field(
+        default=32,
+        description="Max shield checks held for one release; 1 disables the hold.",
+    )
+    SAFETY_BATCH_MAX_WAIT_MS: float = Field(
+        default=0.0,
+        description="Max milliseconds a shield check is held to go out with others; 0 disables.",
+    )
+    SAFETY_STREAM_SEGMENT_SENTENCES: int = Field(
+        default=2,
+        description="Sentences per output-shield-checked segment streamed to chat clients.",
+    )
+    SAFETY_STREAM_CONTEXT_SENTENCES: int = Field(
+        default=2,
+        description="Already-streamed sentences checked together with each new segment.",
+    )
 
     # -- LLM --
     # These env vars are consumed by config/models.yaml via ${VAR:-default}
@@ -108,6 +259,13 @@ class Settings(BaseSettings):
         default="gpt-4o-mini",
         description="Model name for the capable_large tier (complex reasoning + tools).",
     )
+    MODEL_CONFIG_WATCH_INTERVAL_S: float = Field(
+        default=2.0,
+        description=(
+            "Seconds between config/models.yaml change checks by the background watcher. "
+            "0 disables it; config is then mtime-checked on every access."
+        ),
+    )
 
     # -- Storage (S3 / MinIO) --
     S3_ENDPOINT: str = "http://localhost:9090"
@@ -3,7 +3,7 @@
 
 from .client import get_completion, get_streaming_completion
 from .config import get_model_config, get_routing_config
-from .router import classify_query
+from .router import classify_query, route_query
 
 __all__ = [
     "classify_query",
@@ -11,4 +11,5 @@ __all__ = [
     "get_model_config",
     "get_routing_config",
     "get_streaming_completion",
+    "route_query",
 ]
@@ -2,13 +2,21 @@
 """Model routing configuration loader.
 
 Reads config/models.yaml, substitutes ${ENV_VAR:-default} placeholders,
-validates required fields, and supports mtime-based hot-reload so config
-changes take effect without restarting the server.
+validates required fields, and hot-reloads it so config changes take
+effect without restarting the server.
+
+Reload is push-based while ``watch_config`` runs (started at app startup):
+the watcher checks the file's mtime in the background, swaps in the new
+config and calls the ``on_reload`` subscribers, and ``get_config`` returns
+the cached config without touching the filesystem.  Without a watcher
+(scripts, tests) every ``get_config`` call checks the mtime instead.
 """
 
+import asyncio
 import logging
 import os
 import re
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
@@ -25,12 +33,15 @@ logger = logging.getLogger(__name__)
 _CONFIG_PATH = Path(__file__).resolve().parents[4] / "config" / "models.yaml"
 _cached_config: dict[str, Any] | None = None
 _cached_mtime: float = 0.0
+_watching = False
+_subscribers: list[Callable[[dict[str, Any]], None]] = []
 
 _ENV_VAR_PATTERN = re.compile(r"\$\{(\w+)(?::-(.*?))?\}")
 
 REQUIRED_MODEL_FIELDS = {"provider", "model_name"}
 # Remote providers also need an endpoint
 _REMOTE_PROVIDERS = {"openai_compatible"}
+_ROUTING_STRATEGIES = {"rule_based", "embedding"}
 
 
 def _substitute_env_vars(value: str) -> str:
@@ -70,6 +81,13 @@ def _validate_config(config: dict[str, Any]) -> None:
     if not routing or not isinstance(routing, dict):
         raise ValueError("models.yaml must contain a 'routing' section")
 
+    strategy = routing.get("classification", {}).get("strategy", "rule_based")
+    if strategy not in _ROUTING_STRATEGIES:
+        raise ValueError(
+            f"routing.classification.strategy '{strategy}' must be one of "
+            f"{sorted(_ROUTING_STRATEGIES)}"
+        )
+
     default_tier = routing.get("default_tier")
     if default_tier and default_tier not in models:
         raise ValueError(
@@ -101,17 +119,46 @@ def load_config(path: Path | None = None) -> dict[str, Any]:
     return config
 
 
+def on_reload(callback: Callable[[dict[str, Any]], None]) -> None:
+    """Call ``callback(config)`` whenever a new config is loaded."""
+    _subscribers.append(callback)
+
+
+def _notify(config: dict[str, Any]) -> None:
+    for callback in _subscribers:
+        try:
+            callback(config)
+        except Exception:
+            logger.warning("Config reload subscriber %r failed", callback, exc_info=True)
+
+
+def is_watching() -> bool:
+    """Whether the background watcher is pushing config reloads."""
+    return _watching
+
+
 def get_config(path: Path | None = None) -> dict[str, Any]:
-    """Return cached config, reloading if the file's mtime has changed."""
+    """Return cached config, reloading if the file's mtime has changed.
+
+    While the watcher runs, the default config is served from the cache.
+    """
+    if _watching and path is None and _cached_config is not None:
+        return _cached_config
+    return _reload(path)[0]
+
+
+def _reload(path: Path | None = None) -> tuple[dict[str, Any], bool]:
+    """Reload the config if the file's mtime changed; return it and whether it changed."""
     global _cached_config, _cached_mtime  # noqa: PLW0603
     config_path = path or _CONFIG_PATH
+    changed = False
 
     try:
         current_mtime = config_path.stat().st_mtime
     except FileNotFoundError:
         if _cached_config is not None:
             logger.warning("Config file disappeared, using cached config")
-            return _cached_config
+            return _cached_config, False
         raise
 
     if _cached_config is None or current_mtime > _cached_mtime:
@@ -129,6 +176,7 @@ def get_config(path: Path | None = None) -> dict[str, Any]:
             from .embeddings import reset_embedding_provider
 
             reset_embedding_provider()
+            changed = True
         except (yaml.YAMLError, ValueError) as exc:
             if _cached_config is not None:
                 logger.warning("Failed to reload config (%s), keeping last valid config", exc)
@@ -136,7 +184,34 @@ def get_config(path: Path | None = None) -> dict[str, Any]:
             else:
                 raise
 
-    return _cached_config
+    if changed:
+        _notify(_cached_config)
+    return _cached_config, changed
+
+
+async def watch_config(interval_s: float) -> None:
+    """Push config/models.yaml changes to subscribers until cancelled.
+
+    Checks the file's mtime every ``interval_s`` seconds.  The current
+    config is published once at start so subscribers begin in sync.
+    """
+    global _watching  # noqa: PLW0603
+    _watching = True
+    try:
+        try:
+            config, changed = _reload()
+            if not changed:
+                _notify(config)
+        except Exception:
+            logger.warning("Initial model config load failed", exc_info=True)
+        while True:
+            await asyncio.sleep(interval_s)
+            try:
+                _reload()
+            except Exception:
+                logger.warning("Model config reload failed", exc_info=True)
+    finally:
+        _watching = False
 
 
 def get_model_config(tier: str, path: Path | None = None) -> dict[str, Any]:
@@ -10,8 +10,10 @@ The active provider is determined by the ``embedding`` model config in
 or ``provider: openai_compatible`` to delegate to a remote server.
 """
 
+import asyncio
 import logging
 import os
+import threading
 from abc import ABC, abstractmethod
 
 import numpy as np
@@ -36,23 +38,29 @@ class LocalEmbeddingProvider(EmbeddingProvider):
     The model is loaded lazily on first call and cached for the process
     lifetime.  CPU inference is used by default; nomic-embed-text-v1.5
     (~270 MB) loads in ~2 s and embeds a single query in < 50 ms on CPU.
+    Loading and encoding run in a worker thread so they never block the
+    event loop, and callers' timeouts can fire while they run.
     """
 
     def __init__(self, model_name: str, dimensions: int = 768) -> None:
         self._model_name = model_name
         self._dimensions = dimensions
         self._model: SentenceTransformer | None = None
+        self._load_lock = threading.Lock()
 
     def _load_model(self) -> SentenceTransformer:
-        if self._model is None:
-            logger.info("Loading local embedding model: %s", self._model_name)
-            self._model = SentenceTransformer(self._model_name, trust_remote_code=True)
+        with self._load_lock:
+            if self._model is None:
+                logger.info("Loading local embedding model: %s", self._model_name)
+                self._model = SentenceTransformer(self._model_name, trust_remote_code=True)
         return self._model
 
+    def _encode(self, texts: list[str]):
+        return self._load_model().encode(texts, normalize_embeddings=True)
+
     async def embed(self, texts: list[str]) -> list[list[float]]:
-        model = self._load_model()
         # sentence-transformers returns numpy ndarray
-        vectors = model.encode(texts, normalize_embeddings=True)
+        vectors = await asyncio.to_thread(self._encode, texts)
         if isinstance(vectors, np.ndarray):
             return vectors.tolist()
         return [v.tolist() if hasattr(v, "tolist") else list(v) for v in vectors]
@@ -1,22 +1,161 @@
 # This project was developed with assistance from AI tools.
-"""Rule-based query classifier for model routing.
+"""Query classifier for model routing.
 
 Classifies user queries as 'simple' or 'complex' to select the
 appropriate model tier.  Both tiers currently point to the same model
 for local dev; the routing logic is in place for when two models are
 available.
 
+Two strategies, chosen by ``routing.classification.strategy`` in
+config/models.yaml:
+
+- ``rule_based``: keyword / pattern / word-count rules (``classify_query``).
+- ``embedding``: the query embedding is compared against per-intent
+  centroids built from labelled examples (config/routing-examples.yaml).
+  The keyword rules remain the fallback whenever the centroids are not
+  built yet, the embedding call fails or times out, or the nearest simple
+  and complex intents are closer than ``min_margin``.
+
+Centroids are built once in the background (``warm_router`` at startup),
+never on a user's turn.
+
+The keyword rules are compiled once per config version into an immutable
+``CompiledRouting``: each word list becomes one trie-shaped regex, so a
+query is scanned once per list instead of once per keyword.  A config
+reload swaps the compiled object in a single assignment (see
+``config.on_reload``); while the config watcher runs, routing a message
+touches neither the filesystem nor the raw keyword lists.
+
 Fallback behaviour (per S-1-F21-02):
   - complex model unavailable -> error
   - simple model unavailable  -> fallback to complex
 """
 
+import asyncio
 import logging
+import math
+import re
+from collections.abc import Awaitable, Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any
 
+import yaml
+
+from . import config as config_mod
 from .config import get_routing_config
 
 logger = logging.getLogger(__name__)
 
+EmbedFn = Callable[[list[str]], Awaitable[list[list[float]]]]
+
+TIERS = ("simple", "complex")
+
+_router: "EmbeddingRouter | None" = None
+_warm_task: asyncio.Task | None = None
+
+
+def _trie_pattern(words: Iterable[str]) -> re.Pattern | None:
+    """One regex matching wherever any of ``words`` occurs as a substring.
+
+    The alternation is nested by shared prefix (a trie), so at each position
+    the regex engine follows a single branch per character instead of trying
+    every word.  A word that extends a shorter one is dropped: the shorter
+    word already matches wherever it would.
+    """
+    trie: dict = {}
+    for word in words:
+        if not word:
+            continue
+        node = trie
+        for char in word:
+            if "" in node:
+                break
+            node = node.setdefault(char, {})
+        else:
+            node.clear()
+            node[""] = {}
+    if not trie:
+        return None
+
+    def _emit(node: dict) -> str:
+        if "" in node:
+            return ""
+        branches = [re.escape(char) + _emit(child) for char, child in sorted(node.items())]
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+    return re.compile(_emit(trie))
+
+
+@dataclass(frozen=True)
+class CompiledRouting:
+    """Routing rules compiled once per config version; never mutated."""
+
+    source: dict[str, Any] = field(repr=False, compare=False)
+    default_tier: str
+    complex_keywords: re.Pattern | None
+    simple_patterns: re.Pattern | None
+    max_query_words: int
+    embedding: Mapping[str, Any] | None
+
+
+def compile_routing(routing: dict[str, Any]) -> CompiledRouting:
+    """Compile the ``routing`` config section."""
+    rules = routing.get("classification", {}).get("rules", {})
+    simple_rules = rules.get("simple", {})
+    embedding = _embedding_options(routing)
+    return CompiledRouting(
+        source=routing,
+        default_tier=routing.get("default_tier", "capable_large"),
+        complex_keywords=_trie_pattern(rules.get("complex", {}).get("keywords", [])),
+        simple_patterns=_trie_pattern(simple_rules.get("patterns", [])),
+        max_query_words=simple_rules.get("max_query_words", 10),
+        embedding=MappingProxyType(dict(embedding)) if embedding is not None else None,
+    )
+
+
+_compiled: CompiledRouting | None = None
+
+
+def current_routing() -> CompiledRouting:
+    """The compiled routing rules for the current config.
+
+    Pushed by config reloads while the watcher runs; otherwise compiled on
+    demand when the (mtime-checked) config has changed.
+    """
+    global _compiled  # noqa: PLW0603
+    compiled = _compiled
+    if compiled is not None and config_mod.is_watching():
+        return compiled
+    routing = get_routing_config()
+    if compiled is None or compiled.source is not routing:
+        compiled = _compiled = compile_routing(routing)
+    return compiled
+
+
+def _on_config_reload(config: dict[str, Any]) -> None:
+    """Swap in rules compiled from the new config and refresh the centroids."""
+    global _compiled, _router, _warm_task  # noqa: PLW0603
+    compiled = compile_routing(config["routing"])
+    _compiled = compiled
+    if compiled.embedding is None:
+        _router = None
+        return
+    if not config_mod.is_watching():
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    # The current router keeps serving until the rebuilt one replaces it.
+    if _warm_task is not None and not _warm_task.done():
+        _warm_task.cancel()
+    _warm_task = loop.create_task(warm_router())
+
+
+config_mod.on_reload(_on_config_reload)
+
 
 def classify_query(query: str) -> str:
     """Classify a query and return the model tier name.
@@ -33,32 +172,160 @@ def classify_query(query: str) -> str:
     Returns:
         Model tier key (e.g. 'fast_small' or 'capable_large').
     """
-    routing = get_routing_config()
-    classification = routing.get("classification", {})
-    rules = classification.get("rules", {})
-    simple_rules = rules.get("simple", {})
-    complex_rules = rules.get("complex", {})
+    rules = current_routing()
     query_lower = query.lower()
 
     # Rule 1: Complex keywords always route to capable
-    complex_keywords = complex_rules.get("keywords", [])
-    if any(kw in query_lower for kw in complex_keywords):
-        return _complex_tier(routing)
+    if rules.complex_keywords is not None and rules.complex_keywords.search(query_lower):
+        return rules.default_tier
 
     # Rule 2: Word count exceeds threshold -> capable
-    max_words = simple_rules.get("max_query_words", 10)
-    if len(query.split()) > max_words:
-        return _complex_tier(routing)
+    if len(query.split()) > rules.max_query_words:
+        return rules.default_tier
 
     # Rule 3: Simple pattern match -> fast tier
-    patterns = simple_rules.get("patterns", [])
-    if any(pattern in query_lower for pattern in patterns):
+    if rules.simple_patterns is not None and rules.simple_patterns.search(query_lower):
         return "fast_small"
 
     # Default to complex (safe fallback)
-    return _complex_tier(routing)
+    return rules.default_tier
+
+
+def _unit(vector: Sequence[float]) -> list[float]:
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else list(vector)
+
+
+async def _default_embed(texts: list[str]) -> list[list[float]]:
+    from .embeddings import get_embedding_provider
+
+    return await get_embedding_provider().embed(texts)
+
+
+class EmbeddingRouter:
+    """Nearest-centroid query router over labelled intents.
+
+    Args:
+        intents: Intent name -> ``{"tier": "simple" | "complex", "examples": [...]}``.
+        min_margin: Cosine-similarity gap required between the best simple
+            and best complex intent; closer calls return None.
+        embed: Async text embedder; defaults to the configured embedding
+            provider.
+    """
+
+    def __init__(
+        self,
+        intents: dict[str, dict[str, Any]],
+        *,
+        min_margin: float,
+        embed: EmbedFn | None = None,
+    ) -> None:
+        for name, intent in intents.items():
+            if intent.get("tier") not in TIERS:
+                raise ValueError(f"Routing intent '{name}' must have tier simple or complex")
+            if not intent.get("examples"):
+                raise ValueError(f"Routing intent '{name}' has no examples")
+        if {intent["tier"] for intent in intents.values()} != set(TIERS):
+            raise ValueError("Routing intents must cover both simple and complex tiers")
+        self._intents = intents
+        self._min_margin = min_margin
+        self._embed = embed or _default_embed
+        self._centroids: list[tuple[str, str, list[float]]] = []
+
+    @property
+    def ready(self) -> bool:
+        """Whether the centroids have been built."""
+        return bool(self._centroids)
+
+    async def build(self) -> None:
+        """Embed every example once and store one unit centroid per intent."""
+        texts = [text for intent in self._intents.values() for text in intent["examples"]]
+        vectors = iter(await self._embed(texts))
+        centroids = []
+        for name, intent in self._intents.items():
+            rows = [_unit(next(vectors)) for _ in intent["examples"]]
+            mean = [sum(column) / len(rows) for column in zip(*rows, strict=True)]
+            centroids.append((name, intent["tier"], _unit(mean)))
+        self._centroids = centroids
+
+    async def scores(self, query: str) -> dict[str, float]:
+        """Cosine similarity of ``query`` to the nearest intent of each tier."""
+        (raw,) = await self._embed([query])
+        vector = _unit(raw)
+        best = dict.fromkeys(TIERS, -1.0)
+        for _name, tier, centroid in self._centroids:
+            score = sum(a * b for a, b in zip(vector, centroid, strict=True))
+            best[tier] = max(best[tier], score)
+        return best
+
+    async def classify(self, query: str) -> str | None:
+        """'simple' or 'complex', or None when the call is too close."""
+        best = await self.scores(query)
+        margin = best["simple"] - best["complex"]
+        if abs(margin) < self._min_margin:
+            return None
+        return "simple" if margin > 0 else "complex"
+
+
+def _embedding_options(routing: dict) -> dict[str, Any] | None:
+    """The embedding strategy options, or None when rule-based routing is configured."""
+    classification = routing.get("classification", {})
+    if classification.get("strategy") != "embedding":
+        return None
+    return classification.get("embedding") or {}
+
+
+def load_router(
+    routing: dict, embed: EmbedFn | None = None, *, min_margin: float | None = None
+) -> EmbeddingRouter:
+    """Unbuilt router for the examples file named in the routing config."""
+    options = _embedding_options(routing) or {}
+    path = Path(options.get("examples", "routing-examples.yaml"))
+    if not path.is_absolute():
+        path = config_mod._CONFIG_PATH.parent / path
+    intents = yaml.safe_load(path.read_text())["intents"]
+    if min_margin is None:
+        min_margin = float(options.get("min_margin", 0.03))
+    return EmbeddingRouter(intents, min_margin=min_margin, embed=embed)
+
+
+async def warm_router() -> None:
+    """Build the embedding router's centroids when the embedding strategy is configured.
+
+    Failures are logged and leave routing on the keyword rules.
+    """
+    global _router  # noqa: PLW0603
+    rules = current_routing()
+    if rules.embedding is None:
+        return
+    try:
+        router = load_router(rules.source)
+        await router.build()
+    except Exception:
+        logger.warning("Embedding router unavailable, using keyword routing", exc_info=True)
+        return
+    _router = router
+    logger.info("Embedding router ready")
 
 
-def _complex_tier(routing: dict) -> str:
-    """Return the complex/default tier name."""
-    return routing.get("default_tier", "capable_large")
+async def route_query(query: str) -> str:
+    """Return the model tier for ``query`` using the configured strategy."""
+    router = _router
+    if router is None or not router.ready:
+        return classify_query(query)
+    rules = current_routing()
+    if rules.embedding is not None:
+        timeout = float(rules.embedding.get("timeout_ms", 250)) / 1000
+        try:
+            label = await asyncio.wait_for(router.classify(query), timeout)
+        except TimeoutError:
+            logger.warning("Embedding routing timed out, using keyword rules")
+            label = None
+        except Exception:
+            logger.warning("Embedding routing failed, using keyword rules", exc_info=True)
+            label = None
+        if label == "simple":
+            return "fast_small"
+        if label == "complex":
+            return rules.default_tier
+    return classify_query(query)
@@ -9,10 +9,27 @@ Design principle: shields ON by default when SAFETY_MODEL is set, degrade
 gracefully (no-op + warning) when not configured.  Both input and output
 checks fail-closed (block on error) -- in a regulated lending domain, the
 risk of delivering an unverified response outweighs transient availability.
+
+Safe verdicts are cached (bounded LRU with a TTL) keyed by a hash of the
+normalized message(s) and the check's policy fingerprint (template plus
+category set), so frequent repeats such as greetings skip the safety-model
+round trip.  Unsafe verdicts and failures are never cached.
+
+Checks that miss the cache fan out over the checker's shared HTTP client,
+one request per distinct prompt, with at most SAFETY_MAX_CONCURRENCY in
+flight; identical prompts already queued or in flight share that request.
+Batching across prompts is done by the serving engine (vLLM batches
+concurrent requests continuously).  An optional short hold
+(SAFETY_BATCH_MAX_WAIT_MS, up to SAFETY_BATCH_MAX_SIZE prompts) releases
+concurrent checks together; it is off by default.
 """
 
+import asyncio
+import hashlib
 import logging
+from collections import OrderedDict
 from dataclasses import dataclass, field
+from time import monotonic
 
 from langchain_openai import ChatOpenAI
 
@@ -119,6 +136,133 @@ Provide your safety assessment for Agent in the above conversation:
 categories.<|eot_id|><|start_header_id|>assistant<|end_header_id|>"""
 
 
+def _fingerprint(*parts: str) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+# Policy versions for the verdict cache: editing a template or the category
+# set changes the fingerprint, so verdicts cached under the old policy miss.
+_INPUT_POLICY = _fingerprint("input", INPUT_CHECK_TEMPLATE, LLAMA_GUARD_CATEGORIES)
+_OUTPUT_POLICY = _fingerprint("output", OUTPUT_CHECK_TEMPLATE, LLAMA_GUARD_CATEGORIES)
+
+
+def _normalize(text: str) -> str:
+    """Case- and whitespace-insensitive form of a message for cache keys."""
+    return " ".join(text.split()).casefold()
+
+
+class _VerdictCache:
+    """Bounded LRU of safe verdict keys that expire ``ttl_s`` after caching."""
+
+    def __init__(self, max_entries: int, ttl_s: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        # key -> monotonic expiry time
+        self._entries: OrderedDict[str, float] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_s > 0
+
+    def is_safe(self, key: str) -> bool:
+        """Return True (and count a hit) if ``key`` has an unexpired safe verdict."""
+        expires = self._entries.get(key)
+        if expires is not None and expires > monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True
+        if expires is not None:
+            del self._entries[key]
+        self.misses += 1
+        return False
+
+    def add(self, key: str) -> None:
+        self._entries[key] = monotonic() + self.ttl_s
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+        }
+
+
+class _SafetyDispatcher:
+    """Bounded fan-out of safety-model requests over the checker's shared client.
+
+    ``invoke`` sends one prompt to the safety model.  Each distinct prompt
+    is sent once while it is queued or in flight; later submissions of it
+    await that request and get its response or exception, and a cancelled
+    waiter leaves the request running for the others.  At most
+    ``max_concurrency`` requests are in flight at once.
+
+    With ``max_wait_s`` > 0 (and ``max_batch`` > 1), new prompts are held
+    until ``max_batch`` are pending or ``max_wait_s`` after the first, then
+    released together so the serving engine schedules them in the same
+    step.  Otherwise each prompt is sent as soon as a slot is free.
+    """
+
+    def __init__(
+        self, invoke, *, max_concurrency: int, max_batch: int = 1, max_wait_s: float = 0.0
+    ) -> None:
+        self._invoke = invoke
+        self._slots = asyncio.Semaphore(max(1, max_concurrency))
+        self.max_batch = max(1, max_batch)
+        self.max_wait_s = max_wait_s if self.max_batch > 1 else 0.0
+        self._requests: dict[str, asyncio.Future] = {}
+        # Prompts held for the next release, and the event that releases them.
+        self._held = 0
+        self._release: asyncio.Event | None = None
+        self._timer: asyncio.TimerHandle | None = None
+
+    async def submit(self, prompt: str):
+        request = self._requests.get(prompt)
+        if request is None:
+            request = asyncio.ensure_future(self._send(prompt, self._hold()))
+            self._requests[prompt] = request
+            request.add_done_callback(lambda done: self._finished(prompt, done))
+        return await asyncio.shield(request)
+
+    def _hold(self) -> asyncio.Event | None:
+        """Event releasing a new prompt, or None to send it at once."""
+        if self.max_wait_s <= 0:
+            return None
+        if self._release is None:
+            self._release = asyncio.Event()
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait_s, self._dispatch)
+        release = self._release
+        self._held += 1
+        if self._held >= self.max_batch:
+            self._dispatch()
+        return release
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._release is not None:
+            self._release.set()
+        self._release, self._held = None, 0
+
+    async def _send(self, prompt: str, release: asyncio.Event | None):
+        if release is not None:
+            await release.wait()
+        async with self._slots:
+            return await self._invoke(prompt)
+
+    def _finished(self, prompt: str, request: asyncio.Future) -> None:
+        if self._requests.get(prompt) is request:
+            del self._requests[prompt]
+        if not request.cancelled():
+            request.exception()  # retrieved, even if every waiter was cancelled
+
+
 @dataclass
 class SafetyResult:
     """Result of a Llama Guard safety check."""
@@ -131,7 +275,18 @@ class SafetyResult:
 class SafetyChecker:
     """Thin wrapper around Llama Guard via OpenAI-compatible API."""
 
-    def __init__(self, *, model: str, endpoint: str, api_key: str) -> None:
+    def __init__(
+        self,
+        *,
+        model: str,
+        endpoint: str,
+        api_key: str,
+        cache_max_entries: int = 0,
+        cache_ttl_s: float = 0.0,
+        max_concurrency: int = 128,
+        batch_max_size: int = 1,
+        batch_max_wait_s: float = 0.0,
+    ) -> None:
         self._llm = ChatOpenAI(
             model=model,
             base_url=endpoint,
@@ -139,6 +294,41 @@ class SafetyChecker:
             temperature=0.0,
             max_tokens=100,
         )
+        self._verdicts = _VerdictCache(cache_max_entries, cache_ttl_s)
+        self._requests = _SafetyDispatcher(
+            self._call_model,
+            max_concurrency=max_concurrency,
+            max_batch=batch_max_size,
+            max_wait_s=batch_max_wait_s,
+        )
+
+    async def _call_model(self, prompt: str):
+        return await self._llm.ainvoke(prompt)
+
+    def cache_stats(self) -> dict:
+        """Hit/miss counters and size of the safe-verdict cache."""
+        return self._verdicts.stats()
+
+    async def _check(self, key: str, prompt: str, direction: str) -> SafetyResult:
+        """Run one Llama Guard check, consulting the verdict cache first."""
+        cached = self._verdicts.enabled
+        if cached and self._verdicts.is_safe(key):
+            return SafetyResult(is_safe=True)
+        try:
+            response = await self._requests.submit(prompt)
+            result = self._parse_response(response.content)
+        except Exception:
+            logger.error(
+                "Safety %s check failed, blocking %s (fail-closed)",
+                direction,
+                direction,
+                exc_info=True,
+            )
+            return SafetyResult(is_safe=False, explanation="Safety check unavailable")
+        # Only an explicit "safe" verdict is reused; parse fallbacks are not.
+        if cached and result == SafetyResult(is_safe=True):
+            self._verdicts.add(key)
+        return result
 
     @staticmethod
     def _parse_response(text: str) -> SafetyResult:
@@ -167,12 +357,8 @@ class SafetyChecker:
             categories=LLAMA_GUARD_CATEGORIES,
             user_message=user_message,
         )
-        try:
-            response = await self._llm.ainvoke(prompt)
-            return self._parse_response(response.content)
-        except Exception:
-            logger.error("Safety input check failed, blocking input (fail-closed)", exc_info=True)
-            return SafetyResult(is_safe=False, explanation="Safety check unavailable")
+        key = _fingerprint(_INPUT_POLICY, _normalize(user_message))
+        return await self._check(key, prompt, "input")
 
     async def check_output(self, user_message: str, assistant_response: str) -> SafetyResult:
         """Check an assistant response for unsafe content."""
@@ -181,12 +367,8 @@ class SafetyChecker:
             user_message=user_message,
             assistant_response=assistant_response,
         )
-        try:
-            response = await self._llm.ainvoke(prompt)
-            return self._parse_response(response.content)
-        except Exception:
-            logger.error("Safety output check failed, blocking output (fail-closed)", exc_info=True)
-            return SafetyResult(is_safe=False, explanation="Safety check unavailable")
+        key = _fingerprint(_OUTPUT_POLICY, _normalize(user_message), _normalize(assistant_response))
+        return await self._check(key, prompt, "output")
 
 
 _checker_instance: SafetyChecker | None = None
@@ -206,11 +388,21 @@ def get_safety_checker() -> SafetyChecker | None:
             model=settings.SAFETY_MODEL,
             endpoint=settings.SAFETY_ENDPOINT or settings.LLM_BASE_URL,
             api_key=settings.SAFETY_API_KEY or settings.LLM_API_KEY,
+            cache_max_entries=settings.SAFETY_VERDICT_CACHE_MAX_ENTRIES,
+            cache_ttl_s=settings.SAFETY_VERDICT_CACHE_TTL_S,
+            max_concurrency=settings.SAFETY_MAX_CONCURRENCY,
+            batch_max_size=settings.SAFETY_BATCH_MAX_SIZE,
+            batch_max_wait_s=settings.SAFETY_BATCH_MAX_WAIT_MS / 1000,
         )
 
     return _checker_instance
 
 
+def verdict_cache_stats() -> dict | None:
+    """Verdict cache metrics of the active checker, or None when shields are off."""
+    return _checker_instance.cache_stats() if _checker_instance is not None else None
+
+
 def log_safety_status() -> None:
     """Log whether safety shields are active or degraded. Call at startup."""
     from ..core.config import settings
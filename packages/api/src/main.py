@@ -1,6 +1,8 @@
 # This project was developed with assistance from AI tools.
 """FastAPI application entry point."""
 
+import asyncio
+import contextlib
 import logging
 import uuid
 from contextlib import asynccontextmanager
@@ -60,12 +62,32 @@ async def _auto_seed() -> None:
         logger.warning("Auto-seed failed (non-fatal)", exc_info=True)
 
 
+async def _ensure_audit_partitions() -> None:
+    """Pre-create upcoming monthly audit_events partitions."""
+    from db.database import SessionLocal
+
+    from .services.audit import ensure_audit_partitions
+
+    try:
+        async with SessionLocal() as session:
+            created = await ensure_audit_partitions(session)
+            await session.commit()
+        if created:
+            logger.info("Created %d audit_events partition(s)", created)
+    except Exception:
+        logger.warning("Audit partition maintenance failed (non-fatal)", exc_info=True)
+
+
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     """Application startup/shutdown lifecycle."""
     log_safety_status()
     init_mlflow_tracing()
     log_observability_status()
+    from .agents.registry import warm_agents
+    from .inference.config import watch_config
+    from .inference.router import warm_router
+    from .services.audit_writer import get_audit_writer
     from .services.conversation import get_conversation_service
     from .services.extraction import init_extraction_service
     from .services.storage import init_storage_service
@@ -74,8 +96,43 @@ async def lifespan(_app: FastAPI):
     await conversation_service.initialize(settings.DATABASE_URL)
     init_storage_service(settings)
     init_extraction_service()
+    await _ensure_audit_partitions()
     await _auto_seed()
+    # Pushes models.yaml changes to the router, whose first publish builds the
+    # routing centroids off the request path; keyword rules until done.
+    if settings.MODEL_CONFIG_WATCH_INTERVAL_S > 0:
+        config_task = asyncio.create_task(watch_config(settings.MODEL_CONFIG_WATCH_INTERVAL_S))
+    else:
+        config_task = asyncio.create_task(warm_router())
+    # Builds the agent graphs and embeds tool descriptions off the request path.
+    agents_task = asyncio.create_task(
+        warm_agents(
+            conversation_service.checkpointer if conversation_service.is_initialized else None
+        )
+    )
+    anchor_task = None
+    if settings.AUDIT_MERKLE_ANCHOR_INTERVAL_S > 0:
+        from .services.audit_merkle import run_anchor_loop
+
+        anchor_task = asyncio.create_task(run_anchor_loop())
+    partition_task = None
+    if settings.AUDIT_PARTITION_INTERVAL_S > 0:
+        from .services.audit import run_partition_loop
+
+        partition_task = asyncio.create_task(run_partition_loop())
+    archive_task = None
+    if settings.AUDIT_ARCHIVE_INTERVAL_S > 0:
+        from .services.audit_archive import run_archive_loop
+
+        archive_task = asyncio.create_task(run_archive_loop())
     yield
+    for task in (config_task, agents_task, anchor_task, partition_task, archive_task):
+        if task is None:
+            continue
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    await get_audit_writer().stop()
     await conversation_service.shutdown()
 
 
@@ -0,0 +1,36 @@
+# This project was developed with assistance from AI tools.
+"""CLI entrypoint for rebuilding the daily analytics rollups.
+
+Usage:
+    python -m src.rebuild_analytics                     # Rebuild every day
+    python -m src.rebuild_analytics --since 2026-01-01  # Rebuild from a UTC day on
+"""
+
+import argparse
+import asyncio
+import json
+from datetime import date
+
+from db.database import SessionLocal
+
+from .services.analytics_rollups import rebuild_analytics_rollups
+
+
+async def main(since: date | None = None) -> None:
+    """Recompute rollups from source tables and commit."""
+    async with SessionLocal() as session:
+        counts = await rebuild_analytics_rollups(session, since=since)
+        await session.commit()
+        print(json.dumps(counts, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild daily analytics rollups")
+    parser.add_argument(
+        "--since",
+        type=date.fromisoformat,
+        default=None,
+        help="First UTC day (YYYY-MM-DD) to rebuild; default rebuilds everything",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(since=args.since))
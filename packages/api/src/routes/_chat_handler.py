@@ -3,12 +3,18 @@
 
 Extracts the streaming loop and WebSocket authentication so both chat.py and
 borrower_chat.py share identical event handling + audit writing logic.
+
+Server -> client protocol for one exchange:
+    {"type": "delta", "content": ...}    zero or more cleaned, output-shield
+                                         checked segments of the response
+    {"type": "retract", "content": ...}  a later check blocked the response;
+                                         the content replaces everything streamed
+    {"type": "done", "content": ...}     the complete final response
 """
 
 import asyncio
 import json
 import logging
-import re
 import uuid
 
 import jwt as pyjwt
@@ -16,16 +22,20 @@ from db.enums import UserRole
 from fastapi import APIRouter, Depends, Query, WebSocket
 from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage
 
+from ..agents import budget
+from ..agents.base import SAFETY_REFUSAL_MESSAGE
 from ..agents.registry import get_agent
 from ..core.auth import build_data_scope
 from ..core.config import settings
+from ..inference.safety import get_safety_checker
 from ..middleware.auth import CurrentUser, _decode_token, _resolve_role, require_roles
 from ..middleware.pii import _mask_pii_recursive
 from ..observability import set_trace_context
 from ..schemas.auth import UserContext
 from ..schemas.conversation import ConversationHistoryResponse
-from ..services.audit import write_audit_event
+from ..services.audit_writer import get_audit_writer
 from ..services.conversation import ConversationService, get_conversation_service
+from ._chat_stream import ModeratedStream
 
 logger = logging.getLogger(__name__)
 
@@ -127,7 +137,6 @@ async def run_agent_stream(
         system_context: Optional context string injected as a system message
             before the first user message (e.g. application IDs).
     """
-    from db.database import SessionLocal
 
     async def _send(msg: dict) -> None:
         """Send a JSON message over WebSocket, applying PII masking if needed."""
@@ -136,17 +145,16 @@ async def run_agent_stream(
         await ws.send_json(msg)
 
     async def _audit(event_type: str, event_data: dict | None = None) -> None:
+        # Group-committed with concurrent sessions' events instead of taking
+        # the audit advisory lock once per event.
         try:
-            async with SessionLocal() as db_session:
-                await write_audit_event(
-                    db_session,
-                    event_type=event_type,
-                    session_id=session_id,
-                    user_id=user_id,
-                    user_role=user_role,
-                    event_data=event_data,
-                )
-                await db_session.commit()
+            await get_audit_writer().submit(
+                event_type=event_type,
+                session_id=session_id,
+                user_id=user_id,
+                user_role=user_role,
+                event_data=event_data,
+            )
         except Exception:
             logger.warning("Failed to write audit event %s", event_type, exc_info=True)
 
@@ -154,20 +162,34 @@ async def run_agent_stream(
     agent_task: asyncio.Task | None = None
 
     async def _run_agent(user_text: str, input_messages: list) -> str:
-        """Run the agent graph, buffering until the output shield completes.
+        """Run the agent graph, streaming moderated ``delta`` segments.
 
-        No messages are sent to the client from here -- the caller handles
-        cleanup and sends a single ``done`` message with the final content.
+        Model tokens are cleaned incrementally and released in segments
+        once the output shield passes them (see ``ModeratedStream``).  If a
+        segment or the graph's final output shield is blocked after text
+        was streamed, a ``retract`` message replaces it.  The caller sends
+        the closing ``done`` message.
 
-        Returns the raw response text (caller applies cleanup).
+        Returns the final cleaned response text.
         """
         # Set MLFlow trace context for correlation (autolog handles callbacks)
         set_trace_context(session_id=session_id, user_id=user_id)
         config = {"configurable": {"thread_id": thread_id}}
 
-        full_response = ""
+        stream = ModeratedStream(
+            lambda segment: _send({"type": "delta", "content": segment}),
+            get_safety_checker(),
+            user_message=user_text,
+            segment_sentences=settings.SAFETY_STREAM_SEGMENT_SENTENCES,
+            context_sentences=settings.SAFETY_STREAM_CONTEXT_SENTENCES,
+        )
+        # Speculative-agent tokens wait for the input shield verdict.
+        held: list[str] = []
+        input_blocked_content = ""
         safety_blocked = False
         safety_override_content = ""
+        turn_budget: dict = {}
+        turn_usage: dict = {}
         async for event in graph.astream_events(
             {
                 "messages": input_messages,
@@ -182,22 +204,50 @@ async def run_agent_stream(
             kind = event.get("event")
             node = event.get("metadata", {}).get("langgraph_node")
 
+            if kind == "on_chain_end" and node:
+                # Graph nodes report the turn's budget and usage (the root
+                # graph's final state could still hold a previous turn's).
+                output = event.get("data", {}).get("output")
+                if isinstance(output, dict):
+                    turn_budget = output.get("turn_budget") or turn_budget
+                    turn_usage = output.get("turn_usage") or turn_usage
+
             if kind == "on_chat_model_stream" and node in (
                 "agent",
                 "agent_fast",
                 "agent_capable",
+                "speculative_agent",
             ):
                 chunk = event.get("data", {}).get("chunk")
                 if isinstance(chunk, AIMessageChunk) and chunk.content:
-                    full_response += chunk.content
-
-            elif kind == "on_chain_end" and node == "input_shield":
+                    if node == "speculative_agent":
+                        held.append(chunk.content)
+                    else:
+                        await stream.feed(chunk.content)
+
+            elif kind == "on_chain_end" and node in ("input_shield", "speculative_agent"):
+                # A blocked speculative turn discards any tokens its cancelled
+                # agent call produced; a cleared one releases them.
                 output = event.get("data", {}).get("output")
                 if isinstance(output, dict) and output.get("safety_blocked"):
+                    held.clear()
                     for msg in output.get("messages", []):
                         if hasattr(msg, "content") and msg.content:
-                            full_response = msg.content
+                            input_blocked_content = msg.content
                     await _audit("safety_block", {"shield": "input", "blocked": True})
+                elif event.get("name") == "speculative_agent":
+                    for content in held:
+                        await stream.feed(content)
+                    held.clear()
+
+            elif kind == "on_chain_end" and node == "budget_exhausted":
+                # The partial answer is not a model stream: release it through
+                # the moderated stream after whatever was already streamed.
+                output = event.get("data", {}).get("output")
+                if isinstance(output, dict):
+                    for msg in output.get("messages", [])[-1:]:
+                        if isinstance(msg, AIMessage) and msg.content:
+                            await stream.feed(f"\n\n{msg.content}")
 
             elif kind == "on_chain_end" and node == "tool_auth":
                 output = event.get("data", {}).get("output")
@@ -225,6 +275,11 @@ async def run_agent_stream(
                     },
                 )
 
+            elif kind == "on_chain_start" and event.get("name") == "output_shield":
+                # The response is complete: moderate the tail alongside the
+                # graph's full-response check.
+                await stream.finish()
+
             elif kind == "on_chain_end" and node == "output_shield":
                 output = event.get("data", {}).get("output")
                 if isinstance(output, dict):
@@ -237,10 +292,35 @@ async def run_agent_stream(
                             {"shield": "output", "blocked": True},
                         )
 
+        if turn_usage:
+            await _audit(
+                "agent_turn_budget",
+                {
+                    "limits": turn_budget,
+                    "llm_calls": turn_usage.get("llm_calls", 0),
+                    "tool_calls": turn_usage.get("tool_calls", 0),
+                    "tokens": turn_usage.get("tokens", 0),
+                    "elapsed_s": round(budget.elapsed(turn_usage), 3),
+                    "exhausted": turn_usage.get("exhausted", ""),
+                },
+            )
+
+        if input_blocked_content:
+            return input_blocked_content
+
+        if not safety_blocked:
+            await stream.finish()
+            if stream.blocked:
+                safety_blocked = True
+                safety_override_content = SAFETY_REFUSAL_MESSAGE
+                await _audit("safety_block", {"shield": "output_stream", "blocked": True})
+
         if safety_blocked:
-            full_response = safety_override_content
+            if stream.text:
+                await _send({"type": "retract", "content": safety_override_content})
+            return safety_override_content
 
-        return full_response
+        return stream.text
 
     async def _wait_disconnect() -> None:
         """Block until the WebSocket client disconnects.
@@ -330,14 +410,6 @@ async def run_agent_stream(
                 )
                 continue
 
-            # Strip think tags, markdown bold markers, and stray tool-call
-            # text that small models (e.g. Llama) sometimes emit inline
-            # instead of using the structured tool-calling format.
-            full_response = re.sub(r"<think>.*?</think>", "", full_response, flags=re.DOTALL)
-            full_response = full_response.replace("**", "")
-            full_response = re.sub(r"\[[^\]]*\w+\(.*?\)[^\]]*\]", "", full_response)
-            full_response = full_response.strip()
-
             # Without checkpointer, manually track history for this session
             if not use_checkpointer and full_response:
                 messages_fallback.append(AIMessage(content=full_response))
@@ -0,0 +1,240 @@
+# This project was developed with assistance from AI tools.
+"""Incremental response cleanup and windowed output moderation for chat streaming.
+
+``ResponseCleaner`` is the chunk-at-a-time form of the chat response cleanup
+(think tags, ``**`` bold markers, inline tool-call text): feeding a response
+in any split yields the same text as cleaning it whole.
+
+``ModeratedStream`` splits cleaned text into sentences and releases them to
+the client in segments of ``segment_sentences``.  Before a segment leaves,
+the output shield checks it together with the last ``context_sentences``
+already released, so a check never sees less than a rolling window of the
+response.  Once a segment is blocked nothing more is released and the caller
+retracts whatever the client already received.
+"""
+
+import logging
+import re
+from collections.abc import Awaitable, Callable
+
+from ..inference.safety import SafetyChecker
+
+logger = logging.getLogger(__name__)
+
+_THINK_OPEN = "<think>"
+_THINK_CLOSE = "</think>"
+
+# Bracketed text that contains a function-call shape, e.g. ``[search(q="x")]``.
+_INLINE_TOOL_CALL = re.compile(r"\[[^\]]*\w+\(.*?\)[^\]]*\]")
+
+# Longest bracket held back waiting for its ``]`` before it is emitted as prose.
+_MAX_BRACKET_CHARS = 500
+
+# A sentence ends at terminal punctuation followed by whitespace, or at the
+# last visible character before a line break.
+_SENTENCE_END = re.compile(r"[.!?](?=\s)|\S(?=[^\S\n]*\n)")
+
+
+def _partial_suffix(text: str, token: str) -> int:
+    """Length of the longest suffix of ``text`` that is a proper prefix of ``token``."""
+    for size in range(min(len(token) - 1, len(text)), 0, -1):
+        if text.endswith(token[:size]):
+            return size
+    return 0
+
+
+class ResponseCleaner:
+    """Strip think blocks, bold markers and inline tool calls from streamed text.
+
+    ``feed`` returns the cleaned text that can be emitted so far; anything
+    that might still turn into an artifact (a partial ``<think>``, a trailing
+    ``*``, an open ``[``) is held until the next chunk or ``flush``.  An
+    unterminated think block or bracket is emitted unchanged at ``flush``,
+    as the one-shot regexes would leave it.
+    """
+
+    def __init__(self) -> None:
+        self._raw = ""
+        self._think: str | None = None
+        self._star = False
+        self._bracket: str | None = None
+
+    def feed(self, chunk: str) -> str:
+        """Consume a raw chunk and return newly emittable cleaned text."""
+        return self._brackets(self._bold(self._strip_think(chunk)))
+
+    def flush(self) -> str:
+        """Return everything still held back once the response is complete."""
+        tail = self._raw
+        if self._think is not None:
+            tail = _THINK_OPEN + self._think + tail
+        self._raw, self._think = "", None
+        text = self._bold(tail)
+        if self._star:
+            text += "*"
+            self._star = False
+        text = self._brackets(text)
+        if self._bracket is not None:
+            text += self._bracket
+            self._bracket = None
+        return text
+
+    def _strip_think(self, chunk: str) -> str:
+        self._raw += chunk
+        out = []
+        while self._raw:
+            if self._think is not None:
+                end = self._raw.find(_THINK_CLOSE)
+                if end < 0:
+                    keep = _partial_suffix(self._raw, _THINK_CLOSE)
+                    self._think += self._raw[: len(self._raw) - keep]
+                    self._raw = self._raw[len(self._raw) - keep :]
+                    break
+                self._raw = self._raw[end + len(_THINK_CLOSE) :]
+                self._think = None
+            else:
+                start = self._raw.find(_THINK_OPEN)
+                if start < 0:
+                    keep = _partial_suffix(self._raw, _THINK_OPEN)
+                    out.append(self._raw[: len(self._raw) - keep])
+                    self._raw = self._raw[len(self._raw) - keep :]
+                    break
+                out.append(self._raw[:start])
+                self._raw = self._raw[start + len(_THINK_OPEN) :]
+                self._think = ""
+        return "".join(out)
+
+    def _bold(self, text: str) -> str:
+        # Runs of ``*`` collapse pairwise, so only an odd trailing star waits.
+        if self._star:
+            text = "*" + text
+            self._star = False
+        if not text:
+            return ""
+        run = len(text) - len(text.rstrip("*"))
+        if run % 2:
+            self._star = True
+            text = text[:-1]
+        return text.replace("**", "")
+
+    def _brackets(self, text: str) -> str:
+        out = []
+        while text:
+            if self._bracket is None:
+                start = text.find("[")
+                if start < 0:
+                    out.append(text)
+                    break
+                out.append(text[:start])
+                self._bracket, text = "", text[start:]
+            end = text.find("]")
+            if end < 0:
+                self._bracket += text
+                if len(self._bracket) > _MAX_BRACKET_CHARS:
+                    out.append(self._bracket)
+                    self._bracket = None
+                break
+            candidate = self._bracket + text[: end + 1]
+            text = text[end + 1 :]
+            self._bracket = None
+            if not _INLINE_TOOL_CALL.fullmatch(candidate):
+                # Not a tool call: emit up to the first nested ``[`` and rescan
+                # the rest, which may itself open a tool call.
+                nested = candidate.find("[", 1)
+                if nested < 0:
+                    out.append(candidate)
+                else:
+                    out.append(candidate[:nested])
+                    text = candidate[nested:] + text
+        return "".join(out)
+
+
+class ModeratedStream:
+    """Release a streamed response to the client in output-shield-checked segments.
+
+    Args:
+        send: Coroutine that delivers one released segment to the client.
+        checker: Safety checker for the output shield; ``None`` releases
+            every segment unchecked (shields disabled).
+        user_message: The user's message, passed to each output check.
+        segment_sentences: Sentences released per moderated segment.
+        context_sentences: Already-released sentences checked with each segment.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[None]],
+        checker: SafetyChecker | None,
+        *,
+        user_message: str,
+        segment_sentences: int,
+        context_sentences: int,
+    ) -> None:
+        self._send = send
+        self._checker = checker
+        self._user_message = user_message
+        self._segment_sentences = max(1, segment_sentences)
+        self._context_sentences = max(0, context_sentences)
+        self._cleaner = ResponseCleaner()
+        self._buffer = ""
+        self._pending: list[str] = []
+        self._released: list[str] = []
+        self.blocked = False
+
+    @property
+    def text(self) -> str:
+        """Text released to the client so far."""
+        return "".join(self._released)
+
+    async def feed(self, chunk: str) -> None:
+        """Add a raw model chunk, releasing any segment that is now complete."""
+        if self.blocked:
+            return
+        self._buffer += self._cleaner.feed(chunk)
+        if not self._released and not self._pending:
+            self._buffer = self._buffer.lstrip()
+        cut = 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            self._pending.append(self._buffer[cut : match.end()])
+            cut = match.end()
+        self._buffer = self._buffer[cut:]
+        while len(self._pending) >= self._segment_sentences and not self.blocked:
+            segment = self._pending[: self._segment_sentences]
+            del self._pending[: self._segment_sentences]
+            await self._release(segment)
+
+    async def finish(self) -> str:
+        """Release the remainder of a completed response and return the full text."""
+        if not self.blocked:
+            self._buffer += self._cleaner.flush()
+            if not self._released and not self._pending:
+                self._buffer = self._buffer.lstrip()
+            tail = self._buffer.rstrip()
+            self._buffer = ""
+            if tail:
+                self._pending.append(tail)
+            if self._pending:
+                segment, self._pending = self._pending, []
+                await self._release(segment)
+        return self.text
+
+    async def _release(self, sentences: list[str]) -> None:
+        segment = "".join(sentences)
+        if self._checker is not None:
+            context = (
+                "".join(self._released[-self._context_sentences :])
+                if self._context_sentences
+                else ""
+            )
+            result = await self._checker.check_output(
+                self._user_message, (context + segment).strip()
+            )
+            if not result.is_safe:
+                logger.warning(
+                    "Streaming output shield BLOCKED: categories=%s",
+                    result.violation_categories,
+                )
+                self.blocked = True
+                return
+        self._released.extend(sentences)
+        await self._send(segment)
@@ -20,10 +20,14 @@ router = APIRouter()
 )
 async def pipeline_summary(
     days: int = Query(default=90, ge=1, le=365, description="Time range in days"),
+    whole_days: bool = Query(
+        default=False,
+        description="Start the window at UTC midnight and serve it from the daily rollups",
+    ),
     session: AsyncSession = Depends(get_db),
 ) -> PipelineSummary:
     """Pipeline summary: volume, stage distribution, turn times, pull-through rate."""
-    return await get_pipeline_summary(session, days=days)
+    return await get_pipeline_summary(session, days=days, whole_days=whole_days)
 
 
 @router.get(
@@ -34,11 +38,15 @@ async def pipeline_summary(
 async def denial_trends(
     days: int = Query(default=90, ge=1, le=365, description="Time range in days"),
     product: str | None = Query(default=None, description="Filter by loan type"),
+    whole_days: bool = Query(
+        default=False,
+        description="Start the window at UTC midnight and serve it from the daily rollups",
+    ),
     session: AsyncSession = Depends(get_db),
 ) -> DenialTrends:
     """Denial rate trends: overall rate, time-based trend, top reasons by product."""
     try:
-        return await get_denial_trends(session, days=days, product=product)
+        return await get_denial_trends(session, days=days, product=product, whole_days=whole_days)
     except ValueError as exc:
         raise HTTPException(status_code=422, detail=str(exc)) from exc
 
@@ -51,10 +59,14 @@ async def denial_trends(
 async def lo_performance(
     days: int = Query(default=90, ge=1, le=365, description="Time range in days"),
     product: str | None = Query(default=None, description="Filter by loan type"),
+    whole_days: bool = Query(
+        default=False,
+        description="Start the window at UTC midnight and serve it from the daily rollups",
+    ),
     session: AsyncSession = Depends(get_db),
 ) -> LOPerformanceSummary:
     """LO performance metrics: volume, pull-through, turn times, denial rate per LO."""
     try:
-        return await get_lo_performance(session, days=days, product=product)
+        return await get_lo_performance(session, days=days, product=product, whole_days=whole_days)
     except ValueError as exc:
         raise HTTPException(status_code=422, detail=str(exc)) from exc
@@ -5,10 +5,13 @@ Consolidates all audit endpoints (previously split between admin and analytics).
 CEO and Admin can query; CEO, Admin, and Underwriter can export.
 """
 
+import json
+
 from db import get_db
+from db.database import SessionLocal
 from db.enums import UserRole
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..middleware.auth import CurrentUser, require_roles
@@ -18,6 +21,7 @@ from ..schemas.audit import (
     AuditBySessionResponse,
     AuditChainVerifyResponse,
     AuditEventItem,
+    AuditInclusionProof,
     AuditSearchResponse,
     DecisionTraceResponse,
 )
@@ -27,10 +31,13 @@ from ..services.audit import (
     get_events_by_application,
     get_events_by_decision,
     get_events_by_session,
+    next_audit_cursor,
     search_events,
+    stream_export_events,
     verify_audit_chain,
     write_audit_event,
 )
+from ..services.audit_merkle import get_inclusion_proof
 
 router = APIRouter()
 
@@ -48,6 +55,22 @@ def _to_item(evt) -> AuditEventItem:
     )
 
 
+_PAGE_LIMIT = Query(default=500, ge=1, le=5000, description="Max events per page")
+_PAGE_CURSOR = Query(default=None, description="Opaque cursor from a previous page's next_cursor")
+_INCLUDE_ARCHIVED = Query(
+    default=False, description="Also read events archived to object storage (slower)"
+)
+
+
+async def _page(query, *args, limit: int, cursor: str | None, **kwargs):
+    """Run a keyset-paginated audit query; malformed cursors become 422s."""
+    try:
+        events = await query(*args, limit=limit, cursor=cursor, **kwargs)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    return events, next_audit_cursor(events, limit)
+
+
 # ---------------------------------------------------------------------------
 # Queries (moved from admin router, widened to CEO + Admin)
 # ---------------------------------------------------------------------------
@@ -60,14 +83,19 @@ def _to_item(evt) -> AuditEventItem:
 )
 async def audit_by_session(
     session_id: str = Query(..., description="LangFuse/WebSocket session ID"),
+    limit: int = _PAGE_LIMIT,
+    cursor: str | None = _PAGE_CURSOR,
     session: AsyncSession = Depends(get_db),
 ) -> AuditBySessionResponse:
     """Query audit events by session ID for trace-audit correlation."""
-    events = await get_events_by_session(session, session_id)
+    events, next_cursor = await _page(
+        get_events_by_session, session, session_id, limit=limit, cursor=cursor
+    )
     return AuditBySessionResponse(
         session_id=session_id,
         count=len(events),
         events=[_to_item(e) for e in events],
+        next_cursor=next_cursor,
     )
 
 
@@ -78,14 +106,25 @@ async def audit_by_session(
 )
 async def audit_by_application(
     application_id: int,
+    limit: int = _PAGE_LIMIT,
+    cursor: str | None = _PAGE_CURSOR,
+    include_archived: bool = _INCLUDE_ARCHIVED,
     session: AsyncSession = Depends(get_db),
 ) -> AuditByApplicationResponse:
     """Query audit trail by application ID."""
-    events = await get_events_by_application(session, application_id)
+    events, next_cursor = await _page(
+        get_events_by_application,
+        session,
+        application_id,
+        limit=limit,
+        cursor=cursor,
+        include_archived=include_archived,
+    )
     return AuditByApplicationResponse(
         application_id=application_id,
         count=len(events),
         events=[_to_item(e) for e in events],
+        next_cursor=next_cursor,
     )
 
 
@@ -96,14 +135,25 @@ async def audit_by_application(
 )
 async def audit_by_decision(
     decision_id: int,
+    limit: int = _PAGE_LIMIT,
+    cursor: str | None = _PAGE_CURSOR,
+    include_archived: bool = _INCLUDE_ARCHIVED,
     session: AsyncSession = Depends(get_db),
 ) -> AuditByDecisionResponse:
     """Query audit trail by decision ID (S-5-F13-02)."""
-    events = await get_events_by_decision(session, decision_id)
+    events, next_cursor = await _page(
+        get_events_by_decision,
+        session,
+        decision_id,
+        limit=limit,
+        cursor=cursor,
+        include_archived=include_archived,
+    )
     return AuditByDecisionResponse(
         decision_id=decision_id,
         count=len(events),
         events=[_to_item(e) for e in events],
+        next_cursor=next_cursor,
     )
 
 
@@ -123,6 +173,22 @@ async def decision_trace(
     return DecisionTraceResponse(**trace)
 
 
+@router.get(
+    "/events/{event_id}/proof",
+    response_model=AuditInclusionProof,
+    dependencies=[Depends(require_roles(UserRole.ADMIN, UserRole.CEO))],
+)
+async def audit_event_proof(
+    event_id: int,
+    session: AsyncSession = Depends(get_db),
+) -> AuditInclusionProof:
+    """Merkle inclusion proof for one audit event against its block anchor."""
+    proof = await get_inclusion_proof(session, event_id)
+    if proof is None:
+        raise HTTPException(status_code=404, detail="Event not found or not yet anchored")
+    return AuditInclusionProof(**proof)
+
+
 @router.get(
     "/search",
     response_model=AuditSearchResponse,
@@ -131,14 +197,32 @@ async def decision_trace(
 async def audit_search(
     days: int | None = Query(default=None, ge=1, le=365, description="Time range in days"),
     event_type: str | None = Query(default=None, description="Filter by event type"),
-    limit: int = Query(default=500, ge=1, le=5000, description="Max events to return"),
+    event_data: str | None = Query(
+        default=None,
+        description='JSON object matched by containment, e.g. {"overall_status": "FAIL"}',
+    ),
+    limit: int = _PAGE_LIMIT,
+    cursor: str | None = _PAGE_CURSOR,
     session: AsyncSession = Depends(get_db),
 ) -> AuditSearchResponse:
-    """Search audit events by time range and/or event type (S-5-F13-03)."""
-    events = await search_events(session, days=days, event_type=event_type, limit=limit)
+    """Search audit events by time range, event type and/or event_data (S-5-F13-03)."""
+    try:
+        data_filter = json.loads(event_data) if event_data else None
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail="event_data must be valid JSON") from exc
+    events, next_cursor = await _page(
+        search_events,
+        session,
+        days=days,
+        event_type=event_type,
+        event_data=data_filter,
+        limit=limit,
+        cursor=cursor,
+    )
     return AuditSearchResponse(
         count=len(events),
         events=[_to_item(e) for e in events],
+        next_cursor=next_cursor,
     )
 
 
@@ -148,10 +232,19 @@ async def audit_search(
     dependencies=[Depends(require_roles(UserRole.ADMIN))],
 )
 async def verify_audit(
+    full: bool = Query(
+        default=False,
+        description="Re-walk the whole chain from genesis instead of resuming from the watermark",
+    ),
     session: AsyncSession = Depends(get_db),
 ) -> AuditChainVerifyResponse:
-    """Verify audit trail hash chain integrity."""
-    result = await verify_audit_chain(session)
+    """Verify audit trail hash chain integrity.
+
+    Incremental by default: only events added since the last successful
+    verification are checked.
+    """
+    result = await verify_audit_chain(session, full=full)
+    await session.commit()
     return AuditChainVerifyResponse(**result)
 
 
@@ -160,6 +253,17 @@ async def verify_audit(
 # ---------------------------------------------------------------------------
 
 
+async def _stream_export(**kwargs):
+    """Run a streaming export on its own session.
+
+    The body is produced after the endpoint returns, so it must not depend
+    on the request-scoped session still being open.
+    """
+    async with SessionLocal() as session:
+        async for chunk in stream_export_events(session, **kwargs):
+            yield chunk
+
+
 @router.get(
     "/export",
     dependencies=[Depends(require_roles(UserRole.ADMIN, UserRole.CEO, UserRole.UNDERWRITER))],
@@ -170,38 +274,74 @@ async def audit_export(
     application_id: int | None = Query(default=None, description="Filter by application"),
     days: int | None = Query(default=None, ge=1, le=365, description="Time range in days"),
     limit: int = Query(default=10_000, ge=1, le=50_000, description="Max events"),
+    stream: bool = Query(
+        default=False,
+        description="Stream all matching events (no limit); JSON is sent as NDJSON",
+    ),
+    after_id: int | None = Query(
+        default=None, ge=0, description="Resume a streaming export after this event id"
+    ),
+    include_archived: bool = _INCLUDE_ARCHIVED,
     session: AsyncSession = Depends(get_db),
 ) -> Response:
     """Export audit trail as CSV or JSON (S-5-F15-07).
 
     PII masking is applied by the PIIMaskingMiddleware for JSON responses.
     For CSV format, PII masking is applied in the service layer before serialization.
+
+    With ``stream=true`` events are streamed in id order from a server-side
+    cursor (NDJSON or CSV) and masked in the service layer; ``limit`` is
+    ignored and ``after_id`` resumes an interrupted export.
     """
     pii_mask = getattr(user.data_scope, "pii_mask", False)
-    content, media_type = await export_events(
-        session,
-        fmt=fmt,
-        application_id=application_id,
-        days=days,
-        limit=limit,
-        pii_mask=pii_mask,
-    )
+    if not stream:
+        content, media_type = await export_events(
+            session,
+            fmt=fmt,
+            application_id=application_id,
+            days=days,
+            limit=limit,
+            pii_mask=pii_mask,
+            include_archived=include_archived,
+        )
 
     # Log the export event to the audit trail
+    event_data = {
+        "action": "audit_export",
+        "format": fmt,
+        "application_id": application_id,
+        "days": days,
+    }
+    if include_archived:
+        event_data["include_archived"] = True
+    if stream:
+        event_data.update(stream=True, after_id=after_id)
     await write_audit_event(
         session,
         event_type="data_access",
         user_id=user.user_id,
         user_role=user.role.value,
-        event_data={
-            "action": "audit_export",
-            "format": fmt,
-            "application_id": application_id,
-            "days": days,
-        },
+        event_data=event_data,
     )
     await session.commit()
 
+    if stream:
+        ext, media_type = (
+            ("csv", "text/csv") if fmt == "csv" else ("ndjson", "application/x-ndjson")
+        )
+        return StreamingResponse(
+            _stream_export(
+                fmt=ext,
+                application_id=application_id,
+                days=days,
+                after_id=after_id,
+                pii_mask=pii_mask,
+                include_archived=include_archived,
+            ),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="audit_export.{ext}"'},
+        )
+
     filename = f"audit_export.{fmt}"
     return Response(
         content=content,
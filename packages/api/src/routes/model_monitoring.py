@@ -5,12 +5,14 @@ import httpx
 from db.enums import UserRole
 from fastapi import APIRouter, Depends, HTTPException, Query
 
+from ..inference.safety import verdict_cache_stats
 from ..middleware.auth import require_roles
 from ..schemas.model_monitoring import (
     ErrorMetrics,
     LatencyMetrics,
     ModelMonitoringSummary,
     RoutingDistribution,
+    SafetyVerdictCacheStats,
     TokenUsage,
 )
 from ..services.model_monitoring import (
@@ -109,3 +111,18 @@ async def model_monitoring_routing(
     if summary.routing is None:
         raise HTTPException(status_code=503, detail="LangFuse not configured")
     return summary.routing
+
+
+@router.get(
+    "/model-monitoring/safety-cache",
+    response_model=SafetyVerdictCacheStats,
+    dependencies=[Depends(require_roles(UserRole.ADMIN, UserRole.CEO))],
+)
+async def model_monitoring_safety_cache() -> SafetyVerdictCacheStats:
+    """Safety verdict cache hit rate and size for the worker serving the request."""
+    stats = verdict_cache_stats()
+    if stats is None:
+        return SafetyVerdictCacheStats(enabled=False)
+    checks = stats["hits"] + stats["misses"]
+    hit_rate = stats["hits"] / checks * 100 if checks else 0.0
+    return SafetyVerdictCacheStats(enabled=True, hit_rate=round(hit_rate, 1), **stats)
@@ -37,6 +37,10 @@ class AuditBySessionResponse(BaseModel):
     session_id: str
     count: int
     events: list[AuditEventItem]
+    next_cursor: str | None = Field(
+        default=None,
+        description="Pass as ``cursor`` to fetch the next page; null on the last page",
+    )
 
 
 class AuditByApplicationResponse(BaseModel):
@@ -45,6 +49,10 @@ class AuditByApplicationResponse(BaseModel):
     application_id: int
     count: int
     events: list[AuditEventItem]
+    next_cursor: str | None = Field(
+        default=None,
+        description="Pass as ``cursor`` to fetch the next page; null on the last page",
+    )
 
 
 class AuditByDecisionResponse(BaseModel):
@@ -53,6 +61,10 @@ class AuditByDecisionResponse(BaseModel):
     decision_id: int
     count: int
     events: list[AuditEventItem]
+    next_cursor: str | None = Field(
+        default=None,
+        description="Pass as ``cursor`` to fetch the next page; null on the last page",
+    )
 
 
 class AuditSearchResponse(BaseModel):
@@ -60,6 +72,10 @@ class AuditSearchResponse(BaseModel):
 
     count: int
     events: list[AuditEventItem]
+    next_cursor: str | None = Field(
+        default=None,
+        description="Pass as ``cursor`` to fetch the next page; null on the last page",
+    )
 
 
 class AuditChainVerifyResponse(BaseModel):
@@ -68,6 +84,32 @@ class AuditChainVerifyResponse(BaseModel):
     status: str
     events_checked: int
     first_break_id: int | None = None
+    verified_through_id: int | None = Field(
+        default=None,
+        description="Last event id covered by this or an earlier successful verification",
+    )
+
+
+class MerkleProofStep(BaseModel):
+    """One sibling hash on the path from a leaf to its Merkle root."""
+
+    hash: str
+    position: str = Field(description="Side of the sibling when hashing upwards: left or right")
+
+
+class AuditInclusionProof(BaseModel):
+    """Merkle inclusion proof for a single audit event."""
+
+    event_id: int
+    anchor_id: int
+    first_event_id: int
+    last_event_id: int
+    merkle_root: str
+    leaf_hash: str
+    proof: list[MerkleProofStep]
+    verified: bool = Field(
+        description="Block rebuilt from current rows matches the anchored root",
+    )
 
 
 class DecisionTraceEvent(BaseModel):
@@ -78,6 +120,7 @@ class DecisionTraceEvent(BaseModel):
     user_id: str | None = None
     user_role: str | None = None
     event_data: dict[str, Any] | None = None
+    inclusion_proof: AuditInclusionProof | None = None
 
     @field_validator("event_data", mode="before")
     @classmethod
@@ -107,3 +150,11 @@ class DecisionTraceResponse(BaseModel):
         description="Audit events grouped by event_type",
     )
     total_events: int = 0
+    anchored_events: int = Field(
+        default=0,
+        description="Events covered by a Merkle anchor (and so carrying an inclusion proof)",
+    )
+    proofs_verified: bool | None = Field(
+        default=None,
+        description="True when every inclusion proof verifies; None when nothing is anchored",
+    )
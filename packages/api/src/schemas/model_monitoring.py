@@ -119,6 +119,17 @@ class RoutingDistribution(BaseModel):
     total_calls: int = Field(..., description="Total calls across all models")
 
 
+class SafetyVerdictCacheStats(BaseModel):
+    """Safe-verdict cache counters of this API worker's safety checker."""
+
+    enabled: bool = Field(..., description="Whether safety shields are active")
+    hits: int = Field(default=0, description="Checks answered from the cache")
+    misses: int = Field(default=0, description="Checks sent to the safety model")
+    hit_rate: float = Field(default=0.0, description="Hits as a percentage of checks")
+    entries: int = Field(default=0, description="Safe verdicts currently cached")
+    max_entries: int = Field(default=0, description="Cache capacity (0 = disabled)")
+
+
 class ModelMonitoringSummary(BaseModel):
     """Top-level response combining all monitoring panels."""
 
@@ -2,18 +2,46 @@
 """Analytics service for CEO executive dashboard.
 
 Computes pipeline summary, denial trends, and LO performance metrics
-by querying existing Application, Decision, and AuditEvent tables.
+by querying the Application, Decision, Condition, and
+ApplicationStageHistory tables. Windows are rolling by default. With
+``whole_days=True`` the window starts at UTC midnight and, once the rollups
+have been built (``analytics_rollup_state``), its windowed metrics come from
+the daily rollup tables maintained by ``analytics_rollups`` instead.
 All functions are pure async queries -- no side effects.
+
+The public ``get_*`` functions cache their results in process, keyed by
+their arguments. An entry is served until the analytics data version moves
+on or it is older than ``ANALYTICS_CACHE_MAX_STALENESS_S``. Writers call
+``mark_analytics_changed(session)``; the version is bumped when that session
+commits, so rolled-back writes invalidate nothing. The version is per
+process: writes made by other workers are only picked up once entries age
+out.
 """
 
+import asyncio
+import functools
+import inspect
 import logging
-from datetime import UTC, datetime, timedelta
-
-from db import Application, Decision
+from collections import OrderedDict
+from datetime import UTC, date, datetime, time, timedelta
+from time import monotonic
+
+from db import (
+    AnalyticsDailyDenialReason,
+    AnalyticsDailyRollup,
+    AnalyticsDailyStageRollup,
+    AnalyticsRollupState,
+    Application,
+    ApplicationStageHistory,
+    Decision,
+)
 from db.enums import ApplicationStage, DecisionType, LoanType
-from sqlalchemy import case, func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel
+from sqlalchemy import case, event, func, literal, select, true
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
 
+from ..core.config import settings
 from ..schemas.analytics import (
     DenialReason,
     DenialTrendPoint,
@@ -36,63 +64,265 @@ _TURN_TIME_TRANSITIONS: list[tuple[ApplicationStage, ApplicationStage]] = [
     (ApplicationStage.CLEAR_TO_CLOSE, ApplicationStage.CLOSED),
 ]
 
+# Reasons cited by fewer denials than this are folded into "Other".
+_RARE_REASON_THRESHOLD = 3
+_TOP_REASON_LIMIT = 5
+
+# Decisions of any type in a rollup row.
+_ROLLUP_DECIDED = (
+    AnalyticsDailyRollup.decisions_approved
+    + AnalyticsDailyRollup.decisions_conditional
+    + AnalyticsDailyRollup.decisions_suspended
+    + AnalyticsDailyRollup.decisions_denied
+)
+
+
+# Session.info flag set by writers whose commit changes analytics inputs.
+_CHANGED_KEY = "analytics_changed"
+
+_data_version = 0
+# (function, *arguments) -> (data version, monotonic time computed, result)
+_result_cache: OrderedDict[tuple, tuple[int, float, BaseModel]] = OrderedDict()
+_cache_hits = 0
+_cache_misses = 0
+# Set once analytics_rollup_state shows the rollups built; they stay built.
+_rollups_built = False
+
+
+def data_version() -> int:
+    """Current analytics data version."""
+    return _data_version
+
+
+def bump_data_version() -> int:
+    """Invalidate every cached analytics result. Returns the new version."""
+    global _data_version
+    _data_version += 1
+    return _data_version
+
+
+def mark_analytics_changed(session: AsyncSession) -> None:
+    """Bump the analytics data version once ``session`` commits."""
+    session.info[_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_version_on_commit(session: Session) -> None:
+    if session.info.pop(_CHANGED_KEY, False):
+        bump_data_version()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_change_on_rollback(session: Session) -> None:
+    session.info.pop(_CHANGED_KEY, None)
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters and size of the analytics result cache."""
+    return {
+        "hits": _cache_hits,
+        "misses": _cache_misses,
+        "entries": len(_result_cache),
+        "data_version": _data_version,
+    }
+
+
+def clear_cache() -> None:
+    """Drop cached results and reset the counters (for testing)."""
+    global _cache_hits, _cache_misses, _rollups_built
+    _result_cache.clear()
+    _cache_hits = 0
+    _cache_misses = 0
+    _rollups_built = False
+
+
+def _cached_result(fn):
+    """Cache ``fn``'s result per argument tuple (the session is not part of the key).
+
+    Cached results are shared between callers and must be treated as
+    read-only.
+    """
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    async def wrapper(session: AsyncSession, *args, **kwargs):
+        global _cache_hits, _cache_misses
+        max_age = settings.ANALYTICS_CACHE_MAX_STALENESS_S
+        if max_age <= 0:
+            return await fn(session, *args, **kwargs)
+
+        bound = signature.bind(session, *args, **kwargs)
+        bound.apply_defaults()
+        key = (fn.__name__, *(v for name, v in bound.arguments.items() if name != "session"))
+
+        entry = _result_cache.get(key)
+        if entry is not None and entry[0] == _data_version and monotonic() - entry[1] <= max_age:
+            _result_cache.move_to_end(key)
+            _cache_hits += 1
+            return entry[2]
+
+        _cache_misses += 1
+        # Captured before the queries run, so a commit landing mid-computation
+        # leaves this entry already stale.
+        version, started = _data_version, monotonic()
+        result = await fn(session, *args, **kwargs)
+        _result_cache[key] = (version, started, result)
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > max(settings.ANALYTICS_CACHE_MAX_ENTRIES, 1):
+            _result_cache.popitem(last=False)
+        return result
+
+    return wrapper
+
+
+# (limit, semaphore) bounding concurrent analytics sub-queries per process.
+_query_slots: tuple[int, asyncio.Semaphore] | None = None
 
+
+def _query_semaphore() -> asyncio.Semaphore:
+    global _query_slots
+    limit = max(settings.ANALYTICS_QUERY_CONCURRENCY, 1)
+    if _query_slots is None or _query_slots[0] != limit:
+        _query_slots = (limit, asyncio.Semaphore(limit))
+    return _query_slots[1]
+
+
+def _query(stmt, read):
+    """Query callable executing ``stmt`` and returning ``read(result)``."""
+
+    async def run(session: AsyncSession):
+        return read(await session.execute(stmt))
+
+    return run
+
+
+def _scalar_or_zero(result) -> int:
+    return result.scalar() or 0
+
+
+async def _run_queries(session: AsyncSession, queries: list) -> list:
+    """Run independent read-only queries and return their results in order.
+
+    Each query is an ``async (session) -> value`` callable. With
+    ``ANALYTICS_CONCURRENT_QUERIES`` on, a session bound to an engine and no
+    transaction open on it, every query runs on its own pooled session, at
+    most ``ANALYTICS_QUERY_CONCURRENCY`` at a time per process, so latency
+    tracks the slowest query. Otherwise -- including sessions bound to a
+    single connection, which cannot be shared -- they run in order on
+    ``session``.
+    """
+    engine = session.bind
+    if (
+        not settings.ANALYTICS_CONCURRENT_QUERIES
+        or len(queries) < 2
+        or not isinstance(engine, AsyncEngine)
+        or session.in_transaction()
+    ):
+        return [await query(session) for query in queries]
+
+    semaphore = _query_semaphore()
+
+    async def run(query):
+        async with semaphore, AsyncSession(engine) as own_session:
+            return await query(own_session)
+
+    return list(await asyncio.gather(*(run(query) for query in queries)))
+
+
+async def _window(
+    session: AsyncSession, days: int, whole_days: bool
+) -> tuple[datetime, datetime, date | None]:
+    """Return (now, cutoff, first rollup day) for a ``days``-long window.
+
+    With ``whole_days`` the cutoff moves back to UTC midnight, so the window
+    is a run of whole days ending today, served from the rollups once they
+    are built; otherwise it starts exactly ``days`` before now. The rollup
+    day is None whenever the source tables must be queried.
+    """
+    now = datetime.now(UTC)
+    cutoff = now - timedelta(days=days)
+    if not whole_days:
+        return now, cutoff, None
+    start_day = cutoff.date()
+    cutoff = datetime.combine(start_day, time.min, tzinfo=UTC)
+    if not await _rollups_ready(session):
+        return now, cutoff, None
+    return now, cutoff, start_day
+
+
+async def _rollups_ready(session: AsyncSession) -> bool:
+    """Whether the rollup tables have been backfilled (see ``rebuild_analytics_rollups``)."""
+    global _rollups_built
+    if not _rollups_built:
+        built = await session.scalar(select(AnalyticsRollupState.id).limit(1))
+        _rollups_built = built is not None
+    return _rollups_built
+
+
+def _parse_product(product: str | None) -> LoanType | None:
+    """Validate an optional product filter. Raises ValueError if unknown."""
+    if not product:
+        return None
+    try:
+        return LoanType(product)
+    except ValueError:
+        valid = [lt.value for lt in LoanType]
+        raise ValueError(f"Unknown product '{product}'. Valid: {valid}") from None
+
+
+@_cached_result
 async def get_pipeline_summary(
     session: AsyncSession,
     days: int = 90,
+    *,
+    whole_days: bool = False,
 ) -> PipelineSummary:
     """Compute pipeline summary metrics.
 
     Args:
         session: Database session.
         days: Time range in days for historical metrics (turn times, pull-through).
+        whole_days: Align the window to UTC days and read it from the rollups
+            (once built). Rolling by default.
 
     Returns:
         PipelineSummary with stage counts, pull-through rate, and turn times.
     """
-    now = datetime.now(UTC)
-    cutoff = now - timedelta(days=days)
+    now, cutoff, start_day = await _window(session, days, whole_days)
 
     # Stage distribution -- all current applications
     stage_stmt = select(Application.stage, func.count(Application.id)).group_by(Application.stage)
-    stage_result = await session.execute(stage_stmt)
-    stage_counts = [StageCount(stage=row[0].value, count=row[1]) for row in stage_result.all()]
+    stage_query = _query(
+        stage_stmt, lambda result: [StageCount(stage=r[0].value, count=r[1]) for r in result.all()]
+    )
+
+    if start_day is not None:
+        stage_counts, totals, turn_times = await _run_queries(
+            session,
+            [
+                stage_query,
+                functools.partial(_rollup_pipeline_totals, start_day=start_day),
+                functools.partial(_rollup_turn_times, start_day=start_day),
+            ],
+        )
+        initiated, closed, avg_days_raw = totals
+    else:
+        stage_counts, initiated, closed, avg_days_raw, turn_times = await _run_queries(
+            session,
+            [
+                stage_query,
+                *_pipeline_total_queries(cutoff),
+                # Turn times per stage transition, from application_stage_history
+                functools.partial(_compute_turn_times, cutoff=cutoff),
+            ],
+        )
 
     total = sum(sc.count for sc in stage_counts)
 
     # Pull-through rate: closed / total initiated in period
-    initiated_stmt = select(func.count(Application.id)).where(Application.created_at >= cutoff)
-    initiated_result = await session.execute(initiated_stmt)
-    initiated = initiated_result.scalar() or 0
-
-    closed_stmt = select(func.count(Application.id)).where(
-        Application.stage == ApplicationStage.CLOSED,
-        Application.updated_at >= cutoff,
-    )
-    closed_result = await session.execute(closed_stmt)
-    closed = closed_result.scalar() or 0
-
     pull_through = (closed / initiated * 100) if initiated > 0 else 0.0
-
-    # Average days to close (applications that reached closed in period)
-    avg_close_stmt = select(
-        func.avg(func.extract("epoch", Application.updated_at - Application.created_at) / 86400.0)
-    ).where(
-        Application.stage == ApplicationStage.CLOSED,
-        Application.updated_at >= cutoff,
-    )
-    avg_close_result = await session.execute(avg_close_stmt)
-    avg_days_raw = avg_close_result.scalar()
     avg_days_to_close = round(float(avg_days_raw), 1) if avg_days_raw is not None else None
 
-    # Turn times per stage transition
-    # We approximate using audit events that record stage changes.
-    # Since audit_events track each stage transition with timestamps, we use
-    # the application's updated_at as a proxy for the latest transition.
-    # For MVP, we compute from (created_at -> closed updated_at) overall
-    # and use a simplified per-stage approach based on stage ordering.
-    turn_times = await _compute_turn_times(session, cutoff)
-
     return PipelineSummary(
         total_applications=total,
         by_stage=stage_counts,
@@ -104,72 +334,175 @@ async def get_pipeline_summary(
     )
 
 
-async def _compute_turn_times(
-    session: AsyncSession,
-    cutoff: datetime,
-) -> list[StageTurnTime]:
-    """Compute average turn times between stage transitions using audit events.
+def _pipeline_total_queries(cutoff: datetime) -> list:
+    """Queries for (initiated, closed, avg days to close) since ``cutoff``."""
+    initiated_stmt = select(func.count(Application.id)).where(Application.created_at >= cutoff)
 
-    Looks for pairs of audit events with event_type='stage_transition' that
-    record the from/to stages in event_data. Falls back to empty list if
-    no stage transition events exist (pre-Phase 5 data).
-    """
-    from db import AuditEvent
+    closed_stmt = select(func.count(Application.id)).where(
+        Application.stage == ApplicationStage.CLOSED,
+        Application.updated_at >= cutoff,
+    )
 
-    turn_times: list[StageTurnTime] = []
+    # Average days to close (applications that entered closed in period)
+    avg_close_stmt = (
+        select(
+            func.avg(
+                func.extract("epoch", ApplicationStageHistory.entered_at - Application.created_at)
+                / 86400.0
+            )
+        )
+        .join(Application, ApplicationStageHistory.application_id == Application.id)
+        .where(
+            ApplicationStageHistory.to_stage == ApplicationStage.CLOSED,
+            ApplicationStageHistory.entered_at >= cutoff,
+        )
+    )
+    return [
+        _query(initiated_stmt, _scalar_or_zero),
+        _query(closed_stmt, _scalar_or_zero),
+        _query(avg_close_stmt, lambda result: result.scalar()),
+    ]
 
-    for from_stage, to_stage in _TURN_TIME_TRANSITIONS:
-        # Find audit events where the application transitioned TO to_stage
-        # The event_data should contain {"from_stage": ..., "to_stage": ...}
-        # We pair these with the timestamp of the previous stage entry.
 
-        # Approach: for each application that has reached to_stage, find the
-        # time between the stage_transition event TO from_stage and TO to_stage.
-        to_events = (
-            select(
-                AuditEvent.application_id,
-                AuditEvent.timestamp.label("to_ts"),
-            )
-            .where(
-                AuditEvent.event_type == "stage_transition",
-                AuditEvent.timestamp >= cutoff,
-                AuditEvent.event_data["to_stage"].as_string() == to_stage.value,
+async def _rollup_pipeline_totals(
+    session: AsyncSession,
+    start_day: date,
+) -> tuple[int, int, float | None]:
+    """(initiated, closed, avg days to close) from ``start_day`` on, from the rollups."""
+    rollup = AnalyticsDailyRollup
+    stmt = select(
+        func.sum(rollup.applications_created),
+        func.sum(rollup.closed_count),
+        func.sum(rollup.days_to_close_sum),
+    ).where(rollup.day >= start_day)
+    result = await session.execute(stmt)
+    initiated, closed, days_to_close = result.one()
+    initiated, closed = initiated or 0, closed or 0
+    avg_days = days_to_close / closed if closed else None
+    return initiated, closed, avg_days
+
+
+def _turn_time_steps(
+    cutoff: datetime | None,
+    transitions: list[tuple[ApplicationStage, ApplicationStage]],
+    product_clause: list | None = None,
+):
+    """Stage entries in the window, each paired with its turn-time start.
+
+    For every history row entering one of the transitions' ``to_stage`` on
+    or after ``cutoff``, ``from_ts`` is the latest earlier entry into the
+    matching ``from_stage`` of the same application -- a windowed
+    ``max() FILTER`` over that application's history, ordered by
+    ``entered_at``. Only applications with a qualifying entry in the window
+    are scanned, through the (to_stage, entered_at) index; their full
+    history is read through (application_id, entered_at) so starts before
+    the cutoff still count. With ``cutoff=None`` every application's
+    history is returned (rollup rebuilds).
+    """
+    history = ApplicationStageHistory
+    to_stages = [to_stage for _, to_stage in transitions]
+
+    def _last_entry_into(stage: ApplicationStage):
+        return (
+            func.max(history.entered_at)
+            .filter(history.to_stage == stage)
+            .over(
+                partition_by=history.application_id,
+                order_by=history.entered_at,
+                rows=(None, -1),
             )
-            .subquery("to_events")
         )
 
-        from_events = (
-            select(
-                AuditEvent.application_id,
-                AuditEvent.timestamp.label("from_ts"),
-            )
-            .where(
-                AuditEvent.event_type == "stage_transition",
-                AuditEvent.event_data["to_stage"].as_string() == from_stage.value,
-            )
-            .subquery("from_events")
+    app_filter = []
+    if cutoff is not None:
+        in_window = (
+            select(history.application_id)
+            .where(history.to_stage.in_(to_stages), history.entered_at >= cutoff)
+            .distinct()
         )
+        app_filter.append(history.application_id.in_(in_window))
+    steps = (
+        select(
+            history.from_stage,
+            history.to_stage,
+            history.entered_at,
+            Application.loan_type,
+            Application.assigned_to,
+            case(
+                *[
+                    (history.to_stage == to_stage, _last_entry_into(from_stage))
+                    for from_stage, to_stage in transitions
+                ]
+            ).label("from_ts"),
+        )
+        .join(Application, history.application_id == Application.id)
+        .where(*app_filter, *(product_clause or []))
+        .subquery("steps")
+    )
+    return steps
 
-        avg_stmt = (
-            select(
-                func.avg(
-                    func.extract("epoch", to_events.c.to_ts - from_events.c.from_ts) / 86400.0
-                ),
-                func.count(),
-            )
-            .select_from(to_events)
-            .join(
-                from_events,
-                to_events.c.application_id == from_events.c.application_id,
-            )
-            .where(to_events.c.to_ts > from_events.c.from_ts)
+
+async def _compute_turn_times(
+    session: AsyncSession,
+    cutoff: datetime,
+) -> list[StageTurnTime]:
+    """Compute average turn times between stage transitions in one query.
+
+    Reads application_stage_history (see ``_turn_time_steps``) and groups
+    by destination stage. Returns an empty list when no application entered
+    a tracked stage in the window.
+    """
+    steps = _turn_time_steps(cutoff, _TURN_TIME_TRANSITIONS)
+    avg_stmt = (
+        select(
+            steps.c.to_stage,
+            func.avg(func.extract("epoch", steps.c.entered_at - steps.c.from_ts) / 86400.0),
+            func.count(steps.c.from_ts),
+        )
+        .where(
+            steps.c.entered_at >= cutoff,
+            steps.c.to_stage.in_([to_stage for _, to_stage in _TURN_TIME_TRANSITIONS]),
+            steps.c.from_ts.isnot(None),
         )
+        .group_by(steps.c.to_stage)
+    )
+    result = await session.execute(avg_stmt)
+    return _stage_turn_times({row[0]: (row[1], row[2] or 0) for row in result.all()})
 
-        result = await session.execute(avg_stmt)
-        row = result.one()
-        avg_days = row[0]
-        sample = row[1] or 0
 
+async def _rollup_turn_times(
+    session: AsyncSession,
+    start_day: date,
+) -> list[StageTurnTime]:
+    """Average turn times from ``start_day`` on, from the stage rollups."""
+    stage_rollup = AnalyticsDailyStageRollup
+    stmt = (
+        select(
+            stage_rollup.stage,
+            func.sum(stage_rollup.turn_days_sum),
+            func.sum(stage_rollup.turn_samples),
+        )
+        .where(
+            stage_rollup.day >= start_day,
+            stage_rollup.stage.in_([to_stage for _, to_stage in _TURN_TIME_TRANSITIONS]),
+        )
+        .group_by(stage_rollup.stage)
+    )
+    result = await session.execute(stmt)
+    by_to_stage = {}
+    for stage, days_sum, samples in result.all():
+        samples = samples or 0
+        by_to_stage[stage] = ((days_sum / samples) if samples else None, samples)
+    return _stage_turn_times(by_to_stage)
+
+
+def _stage_turn_times(
+    by_to_stage: dict[ApplicationStage, tuple[float | None, int]],
+) -> list[StageTurnTime]:
+    """StageTurnTime rows, in transition order, for stages with samples."""
+    turn_times: list[StageTurnTime] = []
+    for from_stage, to_stage in _TURN_TIME_TRANSITIONS:
+        avg_days, sample = by_to_stage.get(to_stage, (None, 0))
         if avg_days is not None and sample > 0:
             turn_times.append(
                 StageTurnTime(
@@ -183,10 +516,13 @@ async def _compute_turn_times(
     return turn_times
 
 
+@_cached_result
 async def get_denial_trends(
     session: AsyncSession,
     days: int = 90,
     product: str | None = None,
+    *,
+    whole_days: bool = False,
 ) -> DenialTrends:
     """Compute denial rate metrics.
 
@@ -194,69 +530,136 @@ async def get_denial_trends(
         session: Database session.
         days: Time range in days.
         product: Optional loan type filter (e.g. 'conventional_30').
+        whole_days: Align the window to UTC days and read it from the rollups
+            (once built). Rolling by default.
 
     Returns:
         DenialTrends with overall rate, time-based trend, and top reasons.
     """
-    now = datetime.now(UTC)
-    cutoff = now - timedelta(days=days)
+    loan_type = _parse_product(product)
+    now, cutoff, start_day = await _window(session, days, whole_days)
+    if start_day is not None:
+        queries = _rollup_denial_queries(days, start_day, loan_type)
+    else:
+        queries = _denial_queries(days, cutoff, now, loan_type)
+    totals, trend, top_reasons, *product_rates = await _run_queries(session, queries)
+
+    total_decisions, total_denials = (value or 0 for value in totals)
+    overall_rate = (total_denials / total_decisions * 100) if total_decisions > 0 else 0.0
 
+    return DenialTrends(
+        overall_denial_rate=round(overall_rate, 1),
+        total_decisions=total_decisions,
+        total_denials=total_denials,
+        trend=trend,
+        top_reasons=top_reasons,
+        # Denial rate by product (only when no product filter applied)
+        by_product=product_rates[0] if product_rates else None,
+        time_range_days=days,
+        computed_at=now,
+    )
+
+
+def _denial_queries(
+    days: int,
+    cutoff: datetime,
+    now: datetime,
+    loan_type: LoanType | None,
+) -> list:
+    """Queries for (totals, trend, top reasons[, by product]) since ``cutoff``."""
     # Base query: decisions in the time range, optionally filtered by product
     base_filter = [Decision.created_at >= cutoff]
     needs_app_join = False
-    if product:
-        try:
-            loan_type = LoanType(product)
-        except ValueError:
-            valid = [lt.value for lt in LoanType]
-            raise ValueError(f"Unknown product '{product}'. Valid: {valid}") from None
+    if loan_type:
         base_filter.append(Application.loan_type == loan_type)
         needs_app_join = True
 
-    def _base_stmt(extra_filters: list | None = None):
-        """Build a count(Decision.id) statement with optional join and filters."""
-        stmt = select(func.count(Decision.id))
-        if needs_app_join:
-            stmt = stmt.join(Application, Decision.application_id == Application.id)
-        all_filters = base_filter + (extra_filters or [])
-        return stmt.where(*all_filters)
-
     # Total decisions and denials
-    total_result = await session.execute(_base_stmt())
-    total_decisions = total_result.scalar() or 0
-
-    denial_result = await session.execute(
-        _base_stmt([Decision.decision_type == DecisionType.DENIED])
+    totals_stmt = select(
+        func.count(Decision.id),
+        func.count(Decision.id).filter(Decision.decision_type == DecisionType.DENIED),
     )
-    total_denials = denial_result.scalar() or 0
+    if needs_app_join:
+        totals_stmt = totals_stmt.join(Application, Decision.application_id == Application.id)
+    totals_stmt = totals_stmt.where(*base_filter)
+
+    queries = [
+        _query(totals_stmt, lambda result: result.one()),
+        # Trend: monthly for 90+ days, weekly for shorter periods
+        functools.partial(
+            _compute_denial_trend,
+            base_filter=base_filter,
+            cutoff=cutoff,
+            now=now,
+            monthly=days >= 60,
+            needs_app_join=needs_app_join,
+        ),
+        # Top denial reasons from denial_reasons JSONB
+        functools.partial(
+            _compute_top_denial_reasons, base_filter=base_filter, needs_app_join=needs_app_join
+        ),
+    ]
+    if not loan_type:
+        queries.append(functools.partial(_compute_denial_by_product, cutoff=cutoff))
+    return queries
 
-    overall_rate = (total_denials / total_decisions * 100) if total_decisions > 0 else 0.0
 
-    # Trend: monthly for 90+ days, weekly for shorter periods
-    use_monthly = days >= 60
-    trend = await _compute_denial_trend(
-        session, base_filter, cutoff, now, use_monthly, needs_app_join
-    )
+def _rollup_denial_queries(days: int, start_day: date, loan_type: LoanType | None) -> list:
+    """Queries for (totals, trend, top reasons[, by product]) from the daily rollups."""
+    rollup = AnalyticsDailyRollup
+    filters = [rollup.day >= start_day]
+    if loan_type:
+        filters.append(rollup.loan_type == loan_type)
 
-    # Top denial reasons from denial_reasons JSONB
-    top_reasons = await _compute_top_denial_reasons(session, base_filter, needs_app_join)
+    totals_stmt = select(func.sum(_ROLLUP_DECIDED), func.sum(rollup.decisions_denied)).where(
+        *filters
+    )
 
-    # Denial rate by product (only when no product filter applied)
-    by_product: dict[str, float] | None = None
-    if not product:
-        by_product = await _compute_denial_by_product(session, cutoff)
+    # Trend: monthly for 90+ days, weekly for shorter periods
+    if days >= 60:
+        period_expr = func.to_char(rollup.day, "YYYY-MM")
+    else:
+        period_expr = func.concat("Week ", func.extract("week", rollup.day).cast(str))
+    trend_stmt = (
+        select(
+            period_expr.label("period"),
+            func.sum(_ROLLUP_DECIDED),
+            func.sum(rollup.decisions_denied),
+        )
+        .where(*filters)
+        .group_by(period_expr)
+        .having(func.sum(_ROLLUP_DECIDED) > 0)
+        .order_by(period_expr)
+    )
 
-    return DenialTrends(
-        overall_denial_rate=round(overall_rate, 1),
-        total_decisions=total_decisions,
-        total_denials=total_denials,
-        trend=trend,
-        top_reasons=top_reasons,
-        by_product=by_product,
-        time_range_days=days,
-        computed_at=now,
+    reasons = AnalyticsDailyDenialReason
+    reason_filters = [reasons.day >= start_day]
+    if loan_type:
+        reason_filters.append(reasons.loan_type == loan_type)
+    reason_counts = (
+        select(reasons.reason.label("reason"), func.sum(reasons.count).label("n"))
+        .where(*reason_filters)
+        .group_by(reasons.reason)
+        .having(func.sum(reasons.count) > 0)
     )
 
+    queries = [
+        _query(totals_stmt, lambda result: result.one()),
+        _query(trend_stmt, lambda result: _trend_points(result.all())),
+        _query(
+            _ranked_denial_reasons_stmt(reason_counts.subquery()),
+            lambda result: _denial_reason_rows(result.all()),
+        ),
+    ]
+    if not loan_type:
+        product_stmt = (
+            select(rollup.loan_type, func.sum(_ROLLUP_DECIDED), func.sum(rollup.decisions_denied))
+            .where(rollup.day >= start_day, rollup.loan_type.isnot(None))
+            .group_by(rollup.loan_type)
+        )
+        queries.append(_query(product_stmt, lambda result: _denial_rates_by_product(result.all())))
+    return queries
+
 
 async def _compute_denial_trend(
     session: AsyncSession,
@@ -286,8 +689,13 @@ async def _compute_denial_trend(
     stmt = stmt.where(*base_filter).group_by(period_expr).order_by(period_expr)
 
     result = await session.execute(stmt)
+    return _trend_points(result.all())
+
+
+def _trend_points(rows) -> list[DenialTrendPoint]:
+    """DenialTrendPoint per (period, total, denials) row."""
     points = []
-    for row in result.all():
+    for row in rows:
         total = row[1] or 0
         denials = row[2] or 0
         rate = (denials / total * 100) if total > 0 else 0.0
@@ -302,64 +710,85 @@ async def _compute_denial_trend(
     return points
 
 
+def _denial_reason_values():
+    """Unnest Decision.denial_reasons into one trimmed text value per reason.
+
+    Returns ``(from_clause, reason, filters)``: join ``from_clause`` on true
+    to a statement over Decision and apply ``filters``. JSON arrays are
+    unnested, bare JSON strings count as one reason, anything else and
+    blank reasons are dropped.
+    """
+    reasons_json = case(
+        (func.jsonb_typeof(Decision.denial_reasons) == "array", Decision.denial_reasons),
+        else_=func.jsonb_build_array(Decision.denial_reasons),
+    )
+    values = func.jsonb_array_elements_text(reasons_json).table_valued("value")
+    reason = func.btrim(values.c.value)
+    filters = [
+        func.jsonb_typeof(Decision.denial_reasons).in_(["array", "string"]),
+        reason != "",
+    ]
+    return values, reason, filters
+
+
+def _ranked_denial_reasons_stmt(reason_counts):
+    """Top reasons with rare ones folded into 'Other', ranked in SQL.
+
+    ``reason_counts`` is a subquery with one ``(reason, n)`` row per distinct
+    reason. Yields at most ``_TOP_REASON_LIMIT`` ``(reason, count, percentage)``
+    rows, the percentage being of all bucketed denial reasons.
+    """
+    bucketed = select(
+        case(
+            (reason_counts.c.n < _RARE_REASON_THRESHOLD, literal("Other")),
+            else_=reason_counts.c.reason,
+        ).label("bucket"),
+        reason_counts.c.n,
+    ).subquery()
+    buckets = (
+        select(bucketed.c.bucket, func.sum(bucketed.c.n).label("n"))
+        .group_by(bucketed.c.bucket)
+        .subquery()
+    )
+    percentage = buckets.c.n * 100.0 / func.sum(buckets.c.n).over()
+    return (
+        select(buckets.c.bucket, buckets.c.n, percentage)
+        .order_by(buckets.c.n.desc(), buckets.c.bucket)
+        .limit(_TOP_REASON_LIMIT)
+    )
+
+
 async def _compute_top_denial_reasons(
     session: AsyncSession,
     base_filter: list,
     needs_app_join: bool = False,
 ) -> list[DenialReason]:
-    """Extract top 5 denial reasons from the denial_reasons JSONB field.
+    """Top 5 denial reasons from the denial_reasons JSONB field.
 
     Reasons appearing in fewer than 3 decisions are aggregated into 'Other'.
+    Counting, bucketing and ranking all happen in the database.
     """
-    # Get all denial decisions with their reasons
-    stmt = select(Decision.denial_reasons)
+    values, reason, reason_filters = _denial_reason_values()
+    stmt = select(reason.label("reason"), func.count().label("n")).select_from(Decision)
     if needs_app_join:
         stmt = stmt.join(Application, Decision.application_id == Application.id)
-    stmt = stmt.where(*base_filter, Decision.decision_type == DecisionType.DENIED).where(
-        Decision.denial_reasons.isnot(None)
+    stmt = (
+        stmt.join(values, true())
+        .where(*base_filter, Decision.decision_type == DecisionType.DENIED, *reason_filters)
+        .group_by(reason)
     )
-    result = await session.execute(stmt)
+    result = await session.execute(_ranked_denial_reasons_stmt(stmt.subquery()))
+    return _denial_reason_rows(result.all())
 
-    # Count each reason across all denials
-    reason_counts: dict[str, int] = {}
-    for (reasons_json,) in result.all():
-        if isinstance(reasons_json, list):
-            for reason in reasons_json:
-                r = str(reason).strip()
-                if r:
-                    reason_counts[r] = reason_counts.get(r, 0) + 1
-        elif isinstance(reasons_json, str):
-            r = reasons_json.strip()
-            if r:
-                reason_counts[r] = reason_counts.get(r, 0) + 1
-
-    if not reason_counts:
-        return []
-
-    # Aggregate reasons with < 3 occurrences into "Other"
-    other_count = 0
-    main_reasons: dict[str, int] = {}
-    for reason, count in reason_counts.items():
-        if count < 3:
-            other_count += count
-        else:
-            main_reasons[reason] = count
-
-    if other_count > 0:
-        main_reasons["Other"] = main_reasons.get("Other", 0) + other_count
-
-    total = sum(main_reasons.values())
-
-    # Sort by count descending, take top 5
-    sorted_reasons = sorted(main_reasons.items(), key=lambda x: x[1], reverse=True)[:5]
 
+def _denial_reason_rows(rows) -> list[DenialReason]:
     return [
         DenialReason(
             reason=reason,
-            count=count,
-            percentage=round(count / total * 100, 1) if total > 0 else 0.0,
+            count=int(count),
+            percentage=round(float(percentage), 1),
         )
-        for reason, count in sorted_reasons
+        for reason, count, percentage in rows
     ]
 
 
@@ -375,10 +804,13 @@ _ACTIVE_STAGES = frozenset(
 )
 
 
+@_cached_result
 async def get_lo_performance(
     session: AsyncSession,
     days: int = 90,
     product: str | None = None,
+    *,
+    whole_days: bool = False,
 ) -> LOPerformanceSummary:
     """Compute per-LO performance metrics for CEO dashboard.
 
@@ -386,123 +818,106 @@ async def get_lo_performance(
         session: Database session.
         days: Time range for closed/denied metrics.
         product: Optional loan type filter.
+        whole_days: Align the window to UTC days and read decision counts and
+            turn times from the rollups (once built). Rolling by default.
 
     Returns:
         LOPerformanceSummary with one row per loan officer.
     """
     from db import Condition
 
-    now = datetime.now(UTC)
-    cutoff = now - timedelta(days=days)
-
     # Validate product filter early
-    loan_type_filter = None
-    if product:
-        try:
-            loan_type_filter = LoanType(product)
-        except ValueError:
-            valid = [lt.value for lt in LoanType]
-            raise ValueError(f"Unknown product '{product}'. Valid: {valid}") from None
+    loan_type_filter = _parse_product(product)
+
+    now, cutoff, start_day = await _window(session, days, whole_days)
 
     # Build optional product filter clause
     product_clause = []
     if loan_type_filter:
         product_clause = [Application.loan_type == loan_type_filter]
 
-    # Get all LOs that have any assigned applications
-    lo_stmt = (
-        select(Application.assigned_to)
+    # One grouped query per metric family, keyed by assigned_to, so the
+    # endpoint costs a constant number of round trips regardless of headcount.
+    closed_in_period = (Application.stage == ApplicationStage.CLOSED) & (
+        Application.updated_at >= cutoff
+    )
+    app_stmt = (
+        select(
+            Application.assigned_to,
+            func.count(Application.id).filter(Application.stage.in_(_ACTIVE_STAGES)),
+            func.count(Application.id).filter(closed_in_period),
+            func.count(Application.id).filter(Application.created_at >= cutoff),
+        )
         .where(Application.assigned_to.isnot(None), *product_clause)
         .group_by(Application.assigned_to)
+        .order_by(Application.assigned_to)
     )
-    lo_result = await session.execute(lo_stmt)
-    lo_ids = [row[0] for row in lo_result.all()]
-
-    rows: list[LOPerformanceRow] = []
-    for lo_id in lo_ids:
-        lo_filter = [Application.assigned_to == lo_id, *product_clause]
-
-        # Active count (current pipeline, not time-filtered)
-        active_stmt = select(func.count(Application.id)).where(
-            *lo_filter, Application.stage.in_(_ACTIVE_STAGES)
-        )
-        active_result = await session.execute(active_stmt)
-        active_count = active_result.scalar() or 0
-
-        # Closed count (in time period)
-        closed_stmt = select(func.count(Application.id)).where(
-            *lo_filter,
-            Application.stage == ApplicationStage.CLOSED,
-            Application.updated_at >= cutoff,
-        )
-        closed_result = await session.execute(closed_stmt)
-        closed_count = closed_result.scalar() or 0
-
-        # Total initiated by this LO (in time period) for pull-through
-        initiated_stmt = select(func.count(Application.id)).where(
-            *lo_filter, Application.created_at >= cutoff
+    app_result = await session.execute(app_stmt)
+    app_rows = app_result.all()
+    if not app_rows:
+        return LOPerformanceSummary(loan_officers=[], time_range_days=days, computed_at=now)
+
+    if start_day is not None:
+        decisions_by_lo, avg_to_uw_by_lo = await _rollup_lo_metrics(
+            session, start_day, loan_type_filter
         )
-        initiated_result = await session.execute(initiated_stmt)
-        initiated = initiated_result.scalar() or 0
-
-        pull_through = (closed_count / initiated * 100) if initiated > 0 else 0.0
-
+    else:
         # Denial rate: denied / total decided (in time period)
-        decided_stmt = (
-            select(func.count(Decision.id))
-            .join(Application, Decision.application_id == Application.id)
-            .where(
-                Application.assigned_to == lo_id,
-                Decision.created_at >= cutoff,
-                *([Application.loan_type == loan_type_filter] if loan_type_filter else []),
+        decision_stmt = (
+            select(
+                Application.assigned_to,
+                func.count(Decision.id),
+                func.count(Decision.id).filter(Decision.decision_type == DecisionType.DENIED),
             )
-        )
-        decided_result = await session.execute(decided_stmt)
-        total_decided = decided_result.scalar() or 0
-
-        denied_stmt = (
-            select(func.count(Decision.id))
             .join(Application, Decision.application_id == Application.id)
             .where(
-                Application.assigned_to == lo_id,
+                Application.assigned_to.isnot(None),
                 Decision.created_at >= cutoff,
-                Decision.decision_type == DecisionType.DENIED,
-                *([Application.loan_type == loan_type_filter] if loan_type_filter else []),
+                *product_clause,
             )
+            .group_by(Application.assigned_to)
         )
-        denied_result = await session.execute(denied_stmt)
-        total_denied = denied_result.scalar() or 0
-
-        denial_rate = (total_denied / total_decided * 100) if total_decided > 0 else 0.0
+        decision_result = await session.execute(decision_stmt)
+        decisions_by_lo = {row[0]: (row[1] or 0, row[2] or 0) for row in decision_result.all()}
 
-        # Avg days Application -> Underwriting (from audit events)
-        avg_to_uw = await _lo_avg_turn_time(
+        # Avg days Application -> Underwriting (from stage history)
+        avg_to_uw_by_lo = await _lo_avg_turn_times(
             session,
-            lo_id,
             cutoff,
             ApplicationStage.APPLICATION,
             ApplicationStage.UNDERWRITING,
             product_clause,
         )
 
-        # Avg days conditions issued -> cleared (from Condition timestamps)
-        avg_cond_stmt = (
-            select(
-                func.avg(
-                    func.extract("epoch", Condition.updated_at - Condition.created_at) / 86400.0
-                )
-            )
-            .join(Application, Condition.application_id == Application.id)
-            .where(
-                Application.assigned_to == lo_id,
-                Condition.status == "cleared",
-                Condition.updated_at >= cutoff,
-                *([Application.loan_type == loan_type_filter] if loan_type_filter else []),
-            )
+    # Avg days conditions issued -> cleared (from Condition timestamps)
+    avg_cond_stmt = (
+        select(
+            Application.assigned_to,
+            func.avg(func.extract("epoch", Condition.updated_at - Condition.created_at) / 86400.0),
+        )
+        .join(Application, Condition.application_id == Application.id)
+        .where(
+            Application.assigned_to.isnot(None),
+            Condition.status == "cleared",
+            Condition.updated_at >= cutoff,
+            *product_clause,
         )
-        avg_cond_result = await session.execute(avg_cond_stmt)
-        avg_cond_raw = avg_cond_result.scalar()
-        avg_cond = round(float(avg_cond_raw), 1) if avg_cond_raw is not None else None
+        .group_by(Application.assigned_to)
+    )
+    avg_cond_result = await session.execute(avg_cond_stmt)
+    avg_cond_by_lo = {
+        row[0]: round(float(row[1]), 1) for row in avg_cond_result.all() if row[1] is not None
+    }
+
+    rows: list[LOPerformanceRow] = []
+    for lo_id, active_count, closed_count, initiated in app_rows:
+        active_count = active_count or 0
+        closed_count = closed_count or 0
+        initiated = initiated or 0
+        pull_through = (closed_count / initiated * 100) if initiated > 0 else 0.0
+
+        total_decided, total_denied = decisions_by_lo.get(lo_id, (0, 0))
+        denial_rate = (total_denied / total_decided * 100) if total_decided > 0 else 0.0
 
         rows.append(
             LOPerformanceRow(
@@ -511,8 +926,8 @@ async def get_lo_performance(
                 active_count=active_count,
                 closed_count=closed_count,
                 pull_through_rate=round(pull_through, 1),
-                avg_days_to_underwriting=avg_to_uw,
-                avg_days_conditions_to_cleared=avg_cond,
+                avg_days_to_underwriting=avg_to_uw_by_lo.get(lo_id),
+                avg_days_conditions_to_cleared=avg_cond_by_lo.get(lo_id),
                 denial_rate=round(denial_rate, 1),
             )
         )
@@ -524,55 +939,78 @@ async def get_lo_performance(
     )
 
 
-async def _lo_avg_turn_time(
+async def _rollup_lo_metrics(
     session: AsyncSession,
-    lo_id: str,
-    cutoff: datetime,
-    from_stage: ApplicationStage,
-    to_stage: ApplicationStage,
-    product_clause: list,
-) -> float | None:
-    """Avg days between two stage transitions for a specific LO's applications."""
-    from db import AuditEvent
-
-    to_events = (
+    start_day: date,
+    loan_type: LoanType | None,
+) -> tuple[dict[str, tuple[int, int]], dict[str, float]]:
+    """Per-LO (decided, denied) counts and avg days to underwriting from the rollups."""
+    rollup = AnalyticsDailyRollup
+    decision_stmt = (
         select(
-            AuditEvent.application_id,
-            AuditEvent.timestamp.label("to_ts"),
+            rollup.assigned_to,
+            func.sum(_ROLLUP_DECIDED),
+            func.sum(rollup.decisions_denied),
         )
-        .join(Application, AuditEvent.application_id == Application.id)
         .where(
-            AuditEvent.event_type == "stage_transition",
-            AuditEvent.timestamp >= cutoff,
-            AuditEvent.event_data["to_stage"].as_string() == to_stage.value,
-            Application.assigned_to == lo_id,
-            *product_clause,
+            rollup.assigned_to.isnot(None),
+            rollup.day >= start_day,
+            *([rollup.loan_type == loan_type] if loan_type else []),
         )
-        .subquery("to_events")
+        .group_by(rollup.assigned_to)
     )
+    decision_result = await session.execute(decision_stmt)
+    decisions_by_lo = {row[0]: (row[1] or 0, row[2] or 0) for row in decision_result.all()}
 
-    from_events = (
+    stage_rollup = AnalyticsDailyStageRollup
+    turn_stmt = (
         select(
-            AuditEvent.application_id,
-            AuditEvent.timestamp.label("from_ts"),
+            stage_rollup.assigned_to,
+            func.sum(stage_rollup.turn_days_sum),
+            func.sum(stage_rollup.turn_samples),
         )
         .where(
-            AuditEvent.event_type == "stage_transition",
-            AuditEvent.event_data["to_stage"].as_string() == from_stage.value,
+            stage_rollup.assigned_to.isnot(None),
+            stage_rollup.stage == ApplicationStage.UNDERWRITING,
+            stage_rollup.day >= start_day,
+            *([stage_rollup.loan_type == loan_type] if loan_type else []),
         )
-        .subquery("from_events")
+        .group_by(stage_rollup.assigned_to)
     )
+    turn_result = await session.execute(turn_stmt)
+    avg_to_uw_by_lo = {
+        lo_id: round(days_sum / samples, 1)
+        for lo_id, days_sum, samples in turn_result.all()
+        if samples
+    }
+    return decisions_by_lo, avg_to_uw_by_lo
+
 
+async def _lo_avg_turn_times(
+    session: AsyncSession,
+    cutoff: datetime,
+    from_stage: ApplicationStage,
+    to_stage: ApplicationStage,
+    product_clause: list,
+) -> dict[str, float]:
+    """Avg days between two stage entries, per LO, in one grouped query."""
+    steps = _turn_time_steps(cutoff, [(from_stage, to_stage)], product_clause)
     avg_stmt = (
-        select(func.avg(func.extract("epoch", to_events.c.to_ts - from_events.c.from_ts) / 86400.0))
-        .select_from(to_events)
-        .join(from_events, to_events.c.application_id == from_events.c.application_id)
-        .where(to_events.c.to_ts > from_events.c.from_ts)
+        select(
+            steps.c.assigned_to,
+            func.avg(func.extract("epoch", steps.c.entered_at - steps.c.from_ts) / 86400.0),
+        )
+        .where(
+            steps.c.entered_at >= cutoff,
+            steps.c.to_stage == to_stage,
+            steps.c.from_ts.isnot(None),
+            steps.c.assigned_to.isnot(None),
+        )
+        .group_by(steps.c.assigned_to)
     )
 
     result = await session.execute(avg_stmt)
-    avg_raw = result.scalar()
-    return round(float(avg_raw), 1) if avg_raw is not None else None
+    return {row[0]: round(float(row[1]), 1) for row in result.all() if row[1] is not None}
 
 
 async def _compute_denial_by_product(
@@ -597,8 +1035,13 @@ async def _compute_denial_by_product(
     )
 
     result = await session.execute(stmt)
+    return _denial_rates_by_product(result.all())
+
+
+def _denial_rates_by_product(rows) -> dict[str, float]:
+    """Denial rate per loan type from (loan_type, total, denials) rows."""
     by_product: dict[str, float] = {}
-    for row in result.all():
+    for row in rows:
         loan_type = row[0]
         total = row[1] or 0
         denials = row[2] or 0
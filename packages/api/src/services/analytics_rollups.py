@@ -0,0 +1,433 @@
+# This project was developed with assistance from AI tools.
+"""Daily analytics rollups for the CEO dashboard.
+
+Three tables hold counters at day x loan_type x LO grain (see db.models):
+``analytics_daily_rollups`` (creations, decisions by type, closings),
+``analytics_daily_stage_rollups`` (stage entries/exits, turn-time sums) and
+``analytics_daily_denial_reasons``. Writers bump them with
+``INSERT ... ON CONFLICT DO UPDATE`` in the same unit of work as the event,
+so a rolled-back decision or transition leaves no trace. Days are UTC.
+
+Rows are attributed to the application's current loan type and LO, as in
+the raw analytics queries: when a flush changes either column, the
+application's contributions are subtracted from the old grain and added to
+the new one (``reattribute_application``). ``rebuild_analytics_rollups``
+recomputes from applications, decisions and application_stage_history the
+same way and, on a full rebuild, records it in ``analytics_rollup_state``.
+
+The analytics service reads these tables for day-aligned windows
+(``whole_days=True``) once that state row exists; rolling windows and
+unbuilt rollups query the source tables.
+"""
+
+import logging
+from collections import Counter
+from datetime import UTC, date, datetime
+
+from db import (
+    AnalyticsDailyDenialReason,
+    AnalyticsDailyRollup,
+    AnalyticsDailyStageRollup,
+    AnalyticsRollupState,
+    Application,
+    ApplicationStageHistory,
+    Decision,
+)
+from db.enums import ApplicationStage, DecisionType
+from sqlalchemy import (
+    Date,
+    DateTime,
+    case,
+    cast,
+    delete,
+    event,
+    func,
+    inspect,
+    literal,
+    select,
+    true,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import Session
+
+from .analytics import (
+    _TURN_TIME_TRANSITIONS,
+    _denial_reason_values,
+    _turn_time_steps,
+    mark_analytics_changed,
+)
+
+logger = logging.getLogger(__name__)
+
+_GRAIN = ("day", "loan_type", "assigned_to")
+
+# Rollup column counting each decision type.
+DECISION_COLUMNS: dict[DecisionType, str] = {
+    DecisionType.APPROVED: "decisions_approved",
+    DecisionType.CONDITIONAL_APPROVAL: "decisions_conditional",
+    DecisionType.SUSPENDED: "decisions_suspended",
+    DecisionType.DENIED: "decisions_denied",
+}
+
+# Stage whose latest earlier entry starts the turn time ending at each stage.
+_TURN_TIME_FROM = {to_stage: from_stage for from_stage, to_stage in _TURN_TIME_TRANSITIONS}
+
+_ROLLUP_MODELS = (AnalyticsDailyRollup, AnalyticsDailyStageRollup, AnalyticsDailyDenialReason)
+
+# Application columns that place its rows in the rollup grain.
+_GRAIN_ATTRIBUTES = ("loan_type", "assigned_to")
+
+
+def rollup_day(ts: datetime) -> date:
+    """UTC calendar day a timestamp is rolled up into."""
+    return ts.astimezone(UTC).date()
+
+
+def _day(column):
+    """SQL expression for the UTC calendar day of a timestamptz column."""
+    return cast(func.timezone("UTC", column), Date)
+
+
+def _days_between(later, earlier):
+    return func.extract("epoch", later - earlier) / 86400.0
+
+
+def denial_reason_list(denial_reasons) -> list[str]:
+    """Normalize a Decision.denial_reasons value to non-empty reason strings.
+
+    Accepts a JSON list or a bare string; anything else has no reasons.
+    """
+    if isinstance(denial_reasons, list):
+        values = [str(reason).strip() for reason in denial_reasons]
+    elif isinstance(denial_reasons, str):
+        values = [denial_reasons.strip()]
+    else:
+        values = []
+    return [v for v in values if v]
+
+
+def _grain(app: Application, at: datetime) -> dict:
+    return {"day": rollup_day(at), "loan_type": app.loan_type, "assigned_to": app.assigned_to}
+
+
+async def _bump(session: AsyncSession, model, keys: dict, increments: dict) -> None:
+    """Add ``increments`` to the rollup row at ``keys``, creating it if needed.
+
+    Also marks the session so cached analytics results are invalidated on commit.
+    """
+    mark_analytics_changed(session)
+    table = model.__table__
+    stmt = insert(model).values(**keys, **increments)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={col: table.c[col] + stmt.excluded[col] for col in increments},
+    )
+    await session.execute(stmt)
+
+
+async def record_application_created(
+    session: AsyncSession,
+    app: Application,
+    at: datetime | None = None,
+) -> None:
+    """Count a new application in its creation day's rollup."""
+    keys = _grain(app, at or datetime.now(UTC))
+    await _bump(session, AnalyticsDailyRollup, keys, {"applications_created": 1})
+
+
+async def record_stage_change(
+    session: AsyncSession,
+    app: Application,
+    from_stage: ApplicationStage | None,
+    to_stage: ApplicationStage,
+    at: datetime,
+) -> None:
+    """Roll up one stage change: entry, exit, turn time and closing.
+
+    The turn time runs from the application's latest earlier entry into the
+    tracked predecessor of ``to_stage`` (if any), matching the raw
+    turn-time query.
+    """
+    keys = _grain(app, at)
+    at_param = literal(at, DateTime(timezone=True))
+
+    entered: dict = {"entered": 1}
+    turn_from = _TURN_TIME_FROM.get(to_stage)
+    if turn_from is not None:
+        # Resolved inside the upsert, so the turn time costs no extra round trip.
+        started = (
+            select(func.max(ApplicationStageHistory.entered_at))
+            .where(
+                ApplicationStageHistory.application_id == app.id,
+                ApplicationStageHistory.to_stage == turn_from,
+                ApplicationStageHistory.entered_at < at_param,
+            )
+            .scalar_subquery()
+        )
+        entered["turn_days_sum"] = func.coalesce(_days_between(at_param, started), 0.0)
+        entered["turn_samples"] = case((started.isnot(None), 1), else_=0)
+    await _bump(session, AnalyticsDailyStageRollup, {**keys, "stage": to_stage}, entered)
+
+    if from_stage is not None:
+        await _bump(
+            session, AnalyticsDailyStageRollup, {**keys, "stage": from_stage}, {"exited": 1}
+        )
+
+    if to_stage == ApplicationStage.CLOSED:
+        created_at = select(Application.created_at).where(Application.id == app.id)
+        await _bump(
+            session,
+            AnalyticsDailyRollup,
+            keys,
+            {
+                "closed_count": 1,
+                "days_to_close_sum": _days_between(at_param, created_at.scalar_subquery()),
+            },
+        )
+
+
+async def record_decision(
+    session: AsyncSession,
+    app: Application,
+    decision_type: DecisionType,
+    denial_reasons=None,
+    at: datetime | None = None,
+) -> None:
+    """Count a rendered decision and, for denials, its reasons."""
+    keys = _grain(app, at or datetime.now(UTC))
+    await _bump(session, AnalyticsDailyRollup, keys, {DECISION_COLUMNS[decision_type]: 1})
+    if decision_type != DecisionType.DENIED:
+        return
+    for reason, count in sorted(Counter(denial_reason_list(denial_reasons)).items()):
+        await _bump(
+            session, AnalyticsDailyDenialReason, {**keys, "reason": reason}, {"count": count}
+        )
+
+
+def _upsert_from(model, select_stmt, columns: list[str], increments: list[str]):
+    """INSERT ... SELECT that adds into existing rollup rows on conflict."""
+    table = model.__table__
+    stmt = insert(model).from_select(columns, select_stmt, include_defaults=False)
+    grain = [c for c in columns if c not in increments]
+    return stmt.on_conflict_do_update(
+        index_elements=grain,
+        set_={col: table.c[col] + stmt.excluded[col] for col in increments},
+    )
+
+
+def _rebuild_statements(
+    since: date | None,
+    *,
+    application_id: int | None = None,
+    grain: tuple | None = None,
+    sign: int = 1,
+) -> list:
+    """Upserts re-deriving the rollups from the source tables.
+
+    With ``application_id`` only that application's contributions are
+    derived; ``grain`` then overrides its (loan_type, assigned_to) and
+    ``sign=-1`` subtracts instead of adding (see ``reattribute_application``).
+    """
+    app = Application
+    history = ApplicationStageHistory
+
+    def _since(day_expr) -> list:
+        return [day_expr >= since] if since is not None else []
+
+    def _only(id_column) -> list:
+        return [id_column == application_id] if application_id is not None else []
+
+    def _grain_cols(loan_type, assigned_to) -> tuple[list, list]:
+        """(selected, grouped-by) grain columns."""
+        if grain is None:
+            return [loan_type, assigned_to], [loan_type, assigned_to]
+        return [literal(grain[0], loan_type.type), literal(grain[1], assigned_to.type)], []
+
+    def _signed(*aggregates) -> list:
+        return [agg * sign if sign != 1 else agg for agg in aggregates]
+
+    app_cols, app_group = _grain_cols(app.loan_type, app.assigned_to)
+    statements = []
+
+    created_day = _day(app.created_at)
+    statements.append(
+        _upsert_from(
+            AnalyticsDailyRollup,
+            select(created_day, *app_cols, *_signed(func.count()))
+            .where(*_since(created_day), *_only(app.id))
+            .group_by(created_day, *app_group),
+            [*_GRAIN, "applications_created"],
+            ["applications_created"],
+        )
+    )
+
+    decision_day = _day(Decision.created_at)
+    decision_counts = [
+        func.count().filter(Decision.decision_type == decision_type)
+        for decision_type in DECISION_COLUMNS
+    ]
+    statements.append(
+        _upsert_from(
+            AnalyticsDailyRollup,
+            select(decision_day, *app_cols, *_signed(*decision_counts))
+            .join(app, Decision.application_id == app.id)
+            .where(*_since(decision_day), *_only(app.id))
+            .group_by(decision_day, *app_group),
+            [*_GRAIN, *DECISION_COLUMNS.values()],
+            list(DECISION_COLUMNS.values()),
+        )
+    )
+
+    closed_day = _day(history.entered_at)
+    statements.append(
+        _upsert_from(
+            AnalyticsDailyRollup,
+            select(
+                closed_day,
+                *app_cols,
+                *_signed(
+                    func.count(),
+                    func.sum(_days_between(history.entered_at, app.created_at)),
+                ),
+            )
+            .join(app, history.application_id == app.id)
+            .where(history.to_stage == ApplicationStage.CLOSED, *_since(closed_day), *_only(app.id))
+            .group_by(closed_day, *app_group),
+            [*_GRAIN, "closed_count", "days_to_close_sum"],
+            ["closed_count", "days_to_close_sum"],
+        )
+    )
+
+    # Entries and turn times: the window over each application's full
+    # history runs before the day filter, so turn-time starts before
+    # ``since`` still count.
+    steps = _turn_time_steps(None, _TURN_TIME_TRANSITIONS, _only(app.id))
+    entry_day = _day(steps.c.entered_at)
+    steps_cols, steps_group = _grain_cols(steps.c.loan_type, steps.c.assigned_to)
+    statements.append(
+        _upsert_from(
+            AnalyticsDailyStageRollup,
+            select(
+                entry_day,
+                *steps_cols,
+                steps.c.to_stage,
+                *_signed(
+                    func.count(),
+                    func.coalesce(
+                        func.sum(_days_between(steps.c.entered_at, steps.c.from_ts)), 0.0
+                    ),
+                    func.count(steps.c.from_ts),
+                ),
+            )
+            .where(*_since(entry_day))
+            .group_by(entry_day, *steps_group, steps.c.to_stage),
+            [*_GRAIN, "stage", "entered", "turn_days_sum", "turn_samples"],
+            ["entered", "turn_days_sum", "turn_samples"],
+        )
+    )
+
+    exit_day = _day(history.entered_at)
+    statements.append(
+        _upsert_from(
+            AnalyticsDailyStageRollup,
+            select(exit_day, *app_cols, history.from_stage, *_signed(func.count()))
+            .join(app, history.application_id == app.id)
+            .where(history.from_stage.isnot(None), *_since(exit_day), *_only(app.id))
+            .group_by(exit_day, *app_group, history.from_stage),
+            [*_GRAIN, "stage", "exited"],
+            ["exited"],
+        )
+    )
+
+    # Same normalization as denial_reason_list.
+    values, reason_text, reason_filters = _denial_reason_values()
+    statements.append(
+        _upsert_from(
+            AnalyticsDailyDenialReason,
+            select(decision_day, *app_cols, reason_text, *_signed(func.count()))
+            .select_from(Decision)
+            .join(app, Decision.application_id == app.id)
+            .join(values, true())
+            .where(
+                Decision.decision_type == DecisionType.DENIED,
+                *reason_filters,
+                *_since(decision_day),
+                *_only(app.id),
+            )
+            .group_by(decision_day, *app_group, reason_text),
+            [*_GRAIN, "reason", "count"],
+            ["count"],
+        )
+    )
+    return statements
+
+
+def reattribution_statements(application_id: int, old_grain: tuple, new_grain: tuple) -> list:
+    """Statements moving an application's rollup contributions between grains.
+
+    Each grain is a (loan_type, assigned_to) pair; the grain is written as a
+    literal, so the statements do not depend on the application row itself.
+    """
+    return [
+        *_rebuild_statements(None, application_id=application_id, grain=old_grain, sign=-1),
+        *_rebuild_statements(None, application_id=application_id, grain=new_grain),
+    ]
+
+
+@event.listens_for(Session, "before_flush")
+def reattribute_application(session: Session, _flush_context, _instances) -> None:
+    """Move rollup rows of applications whose loan type or LO this flush changes.
+
+    Runs before the flush, so the stored values are the ones the rollups
+    were attributed with and rows still pending in this flush are not yet
+    counted (their writers bump them under the new values).
+    """
+    for obj in list(session.dirty):
+        if not isinstance(obj, Application) or obj.id is None:
+            continue
+        state = inspect(obj)
+        if not any(state.attrs[attr].history.has_changes() for attr in _GRAIN_ATTRIBUTES):
+            continue
+        old = session.execute(
+            select(Application.loan_type, Application.assigned_to).where(Application.id == obj.id)
+        ).one_or_none()
+        new = (obj.loan_type, obj.assigned_to)
+        if old is None or tuple(old) == new:
+            continue
+        mark_analytics_changed(session)
+        for stmt in reattribution_statements(obj.id, tuple(old), new):
+            session.execute(stmt)
+
+
+async def rebuild_analytics_rollups(
+    session: AsyncSession | AsyncConnection,
+    since: date | None = None,
+) -> dict:
+    """Recompute rollups from source tables for days on or after ``since``.
+
+    Rows for those days are deleted and re-derived; ``since=None`` rebuilds
+    everything and marks the rollups built, so the analytics service starts
+    reading them. The caller commits.
+    """
+    for model in _ROLLUP_MODELS:
+        stmt = delete(model)
+        if since is not None:
+            stmt = stmt.where(model.day >= since)
+        await session.execute(stmt)
+
+    for stmt in _rebuild_statements(since):
+        await session.execute(stmt)
+
+    if since is None:
+        stmt = insert(AnalyticsRollupState).values(id=1)
+        await session.execute(
+            stmt.on_conflict_do_update(index_elements=["id"], set_={"built_at": func.now()})
+        )
+
+    counts = {}
+    for model in _ROLLUP_MODELS:
+        result = await session.execute(select(func.count()).select_from(model))
+        counts[model.__tablename__] = result.scalar_one()
+    logger.info("Rebuilt analytics rollups since %s: %s", since or "the beginning", counts)
+    return counts
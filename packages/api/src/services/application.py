@@ -10,13 +10,20 @@ import logging
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 
-from db import Application, ApplicationBorrower, ApplicationFinancials, Borrower
+from db import (
+    Application,
+    ApplicationBorrower,
+    ApplicationFinancials,
+    ApplicationStageHistory,
+    Borrower,
+)
 from db.enums import ApplicationStage, LoanType
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from ..schemas.auth import UserContext
+from ..services.analytics_rollups import record_application_created, record_stage_change
 from ..services.scope import apply_data_scope
 
 logger = logging.getLogger(__name__)
@@ -152,6 +159,8 @@ async def create_application(
     )
     session.add(application)
     await session.flush()
+    await record_application_created(session, application)
+    await record_stage_entry(session, application, None, application.stage)
 
     # Create junction row linking borrower as primary
     junction = ApplicationBorrower(
@@ -166,6 +175,29 @@ async def create_application(
     return await get_application(session, user, app_id)
 
 
+async def record_stage_entry(
+    session: AsyncSession,
+    app: Application,
+    from_stage: ApplicationStage | None,
+    to_stage: ApplicationStage,
+) -> None:
+    """Record a stage change in application_stage_history and the daily rollups.
+
+    Callers change ``Application.stage`` and call this in the same unit of
+    work, so the history row commits (or rolls back) with the stage itself.
+    """
+    entered_at = datetime.now(UTC)
+    session.add(
+        ApplicationStageHistory(
+            application_id=app.id,
+            from_stage=from_stage,
+            to_stage=to_stage,
+            entered_at=entered_at,
+        )
+    )
+    await record_stage_change(session, app, from_stage, to_stage, entered_at)
+
+
 _UPDATABLE_FIELDS = {
     "loan_type",
     "property_address",
@@ -201,6 +233,7 @@ async def transition_stage(
         )
 
     app.stage = new_stage
+    await record_stage_entry(session, app, current, new_stage)
     await session.commit()
     return await get_application(session, user, application_id)
 
@@ -7,23 +7,58 @@ computation (S-2-F15-05).  Session_id enables LangFuse trace correlation
 (S-1-F18-03).
 """
 
+import asyncio
+import base64
 import csv
 import hashlib
 import io
 import json
 import logging
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime, timedelta
-
-from db import AuditEvent, Decision
-from sqlalchemy import func, select, text
+from decimal import Decimal
+
+from db import (
+    AuditArchiveSegment,
+    AuditChainHead,
+    AuditEvent,
+    AuditVerificationWatermark,
+    Decision,
+)
+from sqlalchemy import func, literal_column, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..core.config import settings
+
 logger = logging.getLogger(__name__)
 
 # Fixed advisory lock key for audit trail serialization.
 # Only audit event inserts are serialized; other DB operations are unaffected.
 AUDIT_LOCK_KEY = 900_001
 
+_RESERVE_SLOTS_SQL = text(
+    "SELECT nextval('audit_events_id_seq') AS id, now() AS ts FROM generate_series(1, :n)"
+)
+
+# event_data keys with btree expression indexes on ``event_data ->> key``;
+# search filters on these use text equality instead of containment.
+_INDEXED_EVENT_DATA_KEYS = frozenset({"tool_name", "to_stage", "overall_status"})
+
+# Columns needed to recompute a chain hash -- lets verification stream plain
+# rows instead of hydrating full ORM objects.
+_CHAIN_COLUMNS = (
+    AuditEvent.id,
+    AuditEvent.timestamp,
+    AuditEvent.event_type,
+    AuditEvent.user_id,
+    AuditEvent.user_role,
+    AuditEvent.application_id,
+    AuditEvent.session_id,
+    AuditEvent.event_data,
+    AuditEvent.prev_hash,
+)
+
 
 def _compute_hash(
     event_id: int,
@@ -50,6 +85,139 @@ def _compute_hash(
     return hashlib.sha256(payload.encode()).hexdigest()
 
 
+def _event_hash(event) -> str:
+    """Compute the chain hash of a persisted audit event (ORM object or row)."""
+    return _compute_hash(
+        event.id,
+        str(event.timestamp),
+        event.event_type,
+        event.user_id,
+        event.user_role,
+        event.application_id,
+        event.session_id,
+        event.event_data,
+    )
+
+
+def _jsonb_number(literal: str) -> int | float:
+    """Parse a JSON float literal as it reads back from a JSONB column.
+
+    JSONB stores numbers as ``numeric`` and prints them without an exponent,
+    keeping only as many fractional digits as the literal had.  ``1e+16``
+    (Python's ``json.dumps(1e16)``) therefore comes back as the integer
+    ``10000000000000000``, while ``1.0`` and ``1.5e-07`` come back as floats.
+    """
+    plain = format(Decimal(literal), "f")
+    return float(plain) if "." in plain else int(plain)
+
+
+def _normalize_event_data(event_data: dict | None) -> dict | None:
+    """Round-trip event_data through JSON so it matches what JSONB hands back.
+
+    The chain hash of a row is computed at write time from this value, so it
+    must serialize identically to the stored row that verification re-reads,
+    numbers included (see ``_jsonb_number``).
+    """
+    if event_data is None:
+        return None
+    return json.loads(json.dumps(event_data, default=str), parse_float=_jsonb_number)
+
+
+async def _chain_tail_hash(session: AsyncSession) -> str:
+    """Return the prev_hash the next audit event must carry.
+
+    Reads the single-row ``audit_chain_head``.  Falls back to scanning for
+    and re-hashing the newest event when there is no head yet (empty table,
+    or rows written before the head existed), then to the newest archive
+    anchor when every event has been archived.
+
+    Callers must hold the audit advisory lock so the tail cannot move
+    between this read and their insert.
+    """
+    head_stmt = select(AuditChainHead.last_hash).where(AuditChainHead.id == 1)
+    head_hash = (await session.execute(head_stmt)).scalar_one_or_none()
+    if head_hash is not None:
+        return head_hash
+
+    latest_stmt = select(AuditEvent).order_by(AuditEvent.id.desc()).limit(1)
+    result = await session.execute(latest_stmt)
+    prev_event = result.scalar_one_or_none()
+    if prev_event is not None:
+        return _event_hash(prev_event)
+    archived = await _latest_archive_segment(session)
+    return archived.last_hash if archived is not None else "genesis"
+
+
+async def _latest_archive_segment(session: AsyncSession) -> AuditArchiveSegment | None:
+    """Newest archive segment; its ``last_hash`` anchors the live chain."""
+    stmt = select(AuditArchiveSegment).order_by(AuditArchiveSegment.last_event_id.desc()).limit(1)
+    return (await session.execute(stmt)).scalar_one_or_none()
+
+
+async def _reserve_event_slots(session: AsyncSession, count: int) -> list:
+    """Reserve ``count`` ascending event ids plus the transaction timestamp.
+
+    The timestamp is ``now()``, i.e. exactly what the column's server default
+    would have produced, so a row's hash can be computed before its insert.
+    """
+    result = await session.execute(_RESERVE_SLOTS_SQL.bindparams(n=count))
+    return sorted(result.all(), key=lambda r: r.id)
+
+
+async def _advance_chain_head(session: AsyncSession, last_id: int, last_hash: str) -> None:
+    """Point the chain head at the newest event (caller holds the advisory lock)."""
+    stmt = pg_insert(AuditChainHead).values(id=1, last_id=last_id, last_hash=last_hash)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AuditChainHead.id],
+        set_={"last_id": stmt.excluded.last_id, "last_hash": stmt.excluded.last_hash},
+    )
+    await session.execute(stmt)
+
+
+async def ensure_audit_partitions(session: AsyncSession, *, months_ahead: int | None = None) -> int:
+    """Pre-create monthly ``audit_events`` partitions through ``months_ahead``.
+
+    Thin wrapper over the ``audit_events_ensure_partitions`` database function
+    (idempotent, serialized with its own advisory lock).  Events for a month
+    without a partition land in ``audit_events_default`` and are never lost,
+    but they miss partition pruning.  The caller commits.
+
+    Returns:
+        Number of partitions created.
+    """
+    if months_ahead is None:
+        months_ahead = settings.AUDIT_PARTITION_MONTHS_AHEAD
+    stmt = text("SELECT audit_events_ensure_partitions(:months_ahead)")
+    result = await session.execute(stmt.bindparams(months_ahead=months_ahead))
+    return result.scalar_one()
+
+
+async def run_partition_loop(session_factory=None, *, interval_s: float | None = None) -> None:
+    """Pre-create audit partitions every ``interval_s`` seconds until cancelled.
+
+    Keeps ``AUDIT_PARTITION_MONTHS_AHEAD`` months of partitions ahead of a
+    long-running process: once a month has rows in ``audit_events_default``
+    its partition can no longer be created.  The first pass is the one run
+    at startup, so this sleeps before each pass.
+    """
+    if session_factory is None:
+        from db.database import SessionLocal
+
+        session_factory = SessionLocal
+    interval_s = interval_s or settings.AUDIT_PARTITION_INTERVAL_S
+
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            async with session_factory() as session:
+                created = await ensure_audit_partitions(session)
+                await session.commit()
+            if created:
+                logger.info("Created %d audit_events partition(s)", created)
+        except Exception:
+            logger.warning("Audit partition maintenance failed", exc_info=True)
+
+
 async def write_audit_event(
     session: AsyncSession,
     *,
@@ -63,7 +231,8 @@ async def write_audit_event(
     """Write a single audit event with hash chain linkage.
 
     Acquires a PostgreSQL advisory lock to serialize hash computation,
-    then computes prev_hash from the most recent event.
+    takes prev_hash from the chain head, stores the new row's own hash,
+    and advances the head to it.
 
     Args:
         session: Database session.
@@ -75,32 +244,19 @@ async def write_audit_event(
         event_data: Arbitrary JSON-serializable event payload.
 
     Returns:
-        The created AuditEvent row (with prev_hash set).
+        The created AuditEvent row (with prev_hash and row_hash set).
     """
     # Advisory lock serializes hash chain computation across concurrent writers.
     # Released automatically when the transaction commits or rolls back.
     await session.execute(text(f"SELECT pg_advisory_xact_lock({AUDIT_LOCK_KEY})"))
 
-    # Fetch the most recent event for hash chain linkage.
-    latest_stmt = select(AuditEvent).order_by(AuditEvent.id.desc()).limit(1)
-    result = await session.execute(latest_stmt)
-    prev_event = result.scalar_one_or_none()
-
-    if prev_event is not None:
-        prev_hash = _compute_hash(
-            prev_event.id,
-            str(prev_event.timestamp),
-            prev_event.event_type,
-            prev_event.user_id,
-            prev_event.user_role,
-            prev_event.application_id,
-            prev_event.session_id,
-            prev_event.event_data,
-        )
-    else:
-        prev_hash = "genesis"
+    prev_hash = await _chain_tail_hash(session)
+    slot = (await session.execute(_RESERVE_SLOTS_SQL.bindparams(n=1))).one()
+    event_data = _normalize_event_data(event_data)
 
     audit = AuditEvent(
+        id=slot.id,
+        timestamp=slot.ts,
         event_type=event_type,
         session_id=session_id,
         user_id=user_id,
@@ -109,53 +265,116 @@ async def write_audit_event(
         event_data=event_data,
         prev_hash=prev_hash,
     )
+    audit.row_hash = _event_hash(audit)
     session.add(audit)
     await session.flush()
+    await _advance_chain_head(session, audit.id, audit.row_hash)
     return audit
 
 
-async def verify_audit_chain(session: AsyncSession) -> dict:
+async def verify_audit_chain(session: AsyncSession, *, full: bool = False) -> dict:
     """Verify the integrity of the audit event hash chain.
 
-    Walks all events in ID order, recomputes each expected prev_hash,
-    and compares against the stored value.
+    Streams events in ID order through a server-side cursor, recomputes each
+    expected prev_hash, and compares against the stored value.  Memory use is
+    bounded regardless of table size, and chains longer than one chunk are
+    hashed across CPU cores (see ``audit_verification``) so the event loop
+    stays responsive during a full re-walk.
+
+    By default verification resumes from the persisted watermark (the last
+    verified event id and its hash), so only events added since the previous
+    successful run are checked.  ``full=True`` ignores the watermark and
+    re-walks the chain from genesis, or from the newest archive anchor once
+    older events have been moved to object storage (archival checks the
+    chain through the rows it archives).  The watermark only advances when
+    the walk finishes without finding a break; the caller commits it.
 
     Returns:
-        {"status": "OK", "events_checked": N} on success, or
+        {"status": "OK", "events_checked": N, "verified_through_id": id} on
+        success, or
         {"status": "TAMPERED", "first_break_id": id, "events_checked": N}
         if a mismatch is found.
     """
-    stmt = select(AuditEvent).order_by(AuditEvent.id.asc())
-    result = await session.execute(stmt)
-    events = list(result.scalars().all())
+    from .audit_verification import verify_chain_chunks
+
+    stmt = select(*_CHAIN_COLUMNS).order_by(AuditEvent.id.asc())
+
+    watermark = None if full else await session.get(AuditVerificationWatermark, 1)
+    archived = await _latest_archive_segment(session)
+    start_id, expected = None, "genesis"
+    if watermark is not None:
+        start_id, expected = watermark.last_verified_id, watermark.last_verified_hash
+    if archived is not None and (start_id is None or start_id < archived.last_event_id):
+        # Everything up to the anchor is gone from the table; resume there.
+        start_id, expected = archived.last_event_id, archived.last_hash
+    if start_id is not None:
+        stmt = stmt.where(AuditEvent.id > start_id)
+
+    chunk_size = settings.AUDIT_VERIFY_CHUNK_SIZE
+    result = await session.stream(stmt.execution_options(yield_per=chunk_size))
+
+    async def _chunks():
+        async for partition in result.partitions(chunk_size):
+            yield [
+                (
+                    r.id,
+                    str(r.timestamp),
+                    r.event_type,
+                    r.user_id,
+                    r.user_role,
+                    r.application_id,
+                    r.session_id,
+                    r.event_data,
+                    r.prev_hash,
+                )
+                for r in partition
+            ]
+
+    try:
+        outcome = await verify_chain_chunks(
+            _chunks(), expected=expected, max_workers=settings.AUDIT_VERIFY_WORKERS
+        )
+    finally:
+        await result.close()
+
+    if not outcome.ok:
+        return {
+            "status": "TAMPERED",
+            "first_break_id": outcome.first_break_id,
+            "events_checked": outcome.events_checked,
+        }
+
+    if outcome.last_id is not None:
+        await _save_verification_watermark(session, outcome.last_id, outcome.last_hash)
+        verified_through_id = outcome.last_id
+    else:
+        verified_through_id = start_id
 
-    if not events:
-        return {"status": "OK", "events_checked": 0}
+    return {
+        "status": "OK",
+        "events_checked": outcome.events_checked,
+        "verified_through_id": verified_through_id,
+    }
 
-    for i, event in enumerate(events):
-        if i == 0:
-            expected = "genesis"
-        else:
-            prev = events[i - 1]
-            expected = _compute_hash(
-                prev.id,
-                str(prev.timestamp),
-                prev.event_type,
-                prev.user_id,
-                prev.user_role,
-                prev.application_id,
-                prev.session_id,
-                prev.event_data,
-            )
-
-        if event.prev_hash != expected:
-            return {
-                "status": "TAMPERED",
-                "first_break_id": event.id,
-                "events_checked": i + 1,
-            }
 
-    return {"status": "OK", "events_checked": len(events)}
+async def _save_verification_watermark(
+    session: AsyncSession, last_verified_id: int, last_verified_hash: str
+) -> None:
+    """Upsert the single-row verification watermark."""
+    stmt = pg_insert(AuditVerificationWatermark).values(
+        id=1,
+        last_verified_id=last_verified_id,
+        last_verified_hash=last_verified_hash,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[AuditVerificationWatermark.id],
+        set_={
+            "last_verified_id": stmt.excluded.last_verified_id,
+            "last_verified_hash": stmt.excluded.last_verified_hash,
+            "verified_at": func.now(),
+        },
+    )
+    await session.execute(stmt)
 
 
 async def get_audit_chain_length(session: AsyncSession) -> int:
@@ -164,20 +383,87 @@ async def get_audit_chain_length(session: AsyncSession) -> int:
     return result.scalar_one()
 
 
+# ---------------------------------------------------------------------------
+# Keyset pagination
+# ---------------------------------------------------------------------------
+
+
+def encode_audit_cursor(event: AuditEvent) -> str:
+    """Opaque cursor pointing just past ``event`` in (timestamp, id) order."""
+    payload = json.dumps({"ts": event.timestamp.isoformat(), "id": event.id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_audit_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor from ``encode_audit_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["ts"]), int(data["id"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise ValueError("Invalid audit cursor") from exc
+
+
+def next_audit_cursor(events: list[AuditEvent], limit: int | None) -> str | None:
+    """Cursor for the page after ``events``, or None if this was the last page.
+
+    A full page always yields a cursor, so the final page may come back empty.
+    """
+    if limit is None or len(events) < limit or not events:
+        return None
+    return encode_audit_cursor(events[-1])
+
+
+def _merge_archived(
+    archived: list[AuditEvent],
+    events: list[AuditEvent],
+    *,
+    limit: int | None,
+    cursor: str | None,
+) -> list[AuditEvent]:
+    """Merge archived events into an ascending keyset page of live events."""
+    if cursor is not None:
+        bound = decode_audit_cursor(cursor)
+        archived = [evt for evt in archived if (evt.timestamp, evt.id) > bound]
+    merged = sorted([*archived, *events], key=lambda evt: (evt.timestamp, evt.id))
+    return merged if limit is None else merged[:limit]
+
+
+def _keyset_page(stmt, *, limit: int | None, cursor: str | None, descending: bool = False):
+    """Order ``stmt`` by (timestamp, id) and resume after ``cursor``."""
+    key = tuple_(AuditEvent.timestamp, AuditEvent.id)
+    if cursor is not None:
+        ts, event_id = decode_audit_cursor(cursor)
+        bound = tuple_(ts, event_id)
+        stmt = stmt.where(key < bound if descending else key > bound)
+    if descending:
+        stmt = stmt.order_by(AuditEvent.timestamp.desc(), AuditEvent.id.desc())
+    else:
+        stmt = stmt.order_by(AuditEvent.timestamp.asc(), AuditEvent.id.asc())
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
 async def get_events_by_session(
     session: AsyncSession,
     session_id: str,
+    *,
+    limit: int | None = None,
+    cursor: str | None = None,
 ) -> list[AuditEvent]:
-    """Return all audit events for a given session_id.
+    """Return audit events for a given session_id, oldest first.
 
     This is the compliance-side query for trace-audit correlation:
     given a session_id from LangFuse, retrieve all audit events.
+    Pass ``limit`` / ``cursor`` to page through long sessions.
     """
-    stmt = (
-        select(AuditEvent)
-        .where(AuditEvent.session_id == session_id)
-        .order_by(AuditEvent.timestamp.asc())
-    )
+    stmt = select(AuditEvent).where(AuditEvent.session_id == session_id)
+    stmt = _keyset_page(stmt, limit=limit, cursor=cursor)
     result = await session.execute(stmt)
     return list(result.scalars().all())
 
@@ -185,20 +471,29 @@ async def get_events_by_session(
 async def get_events_by_application(
     session: AsyncSession,
     application_id: int,
+    *,
+    limit: int | None = None,
+    cursor: str | None = None,
+    include_archived: bool = False,
 ) -> list[AuditEvent]:
-    """Return all audit events for a given application_id.
+    """Return audit events for a given application_id, oldest first.
 
     This is the compliance-side query for per-loan audit trail review:
     given an application_id, retrieve every audit event (stage transitions,
     document flags, communications, etc.) in chronological order.
+    Pass ``limit`` / ``cursor`` to page through long-lived applications,
+    and ``include_archived`` to merge in events moved to object storage.
     """
-    stmt = (
-        select(AuditEvent)
-        .where(AuditEvent.application_id == application_id)
-        .order_by(AuditEvent.timestamp.asc())
-    )
+    stmt = select(AuditEvent).where(AuditEvent.application_id == application_id)
+    stmt = _keyset_page(stmt, limit=limit, cursor=cursor)
     result = await session.execute(stmt)
-    return list(result.scalars().all())
+    events = list(result.scalars().all())
+    if include_archived:
+        from .audit_archive import load_archived_events
+
+        archived = await load_archived_events(session, application_id=application_id)
+        events = _merge_archived(archived, events, limit=limit, cursor=cursor)
+    return events
 
 
 # ---------------------------------------------------------------------------
@@ -209,6 +504,10 @@ async def get_events_by_application(
 async def get_events_by_decision(
     session: AsyncSession,
     decision_id: int,
+    *,
+    limit: int | None = None,
+    cursor: str | None = None,
+    include_archived: bool = False,
 ) -> list[AuditEvent]:
     """Return all audit events linked to a decision (backward trace).
 
@@ -219,13 +518,34 @@ async def get_events_by_decision(
     if dec is None:
         return []
 
-    stmt = (
-        select(AuditEvent)
-        .where(AuditEvent.application_id == dec.application_id)
-        .order_by(AuditEvent.timestamp.asc())
+    return await get_events_by_application(
+        session,
+        dec.application_id,
+        limit=limit,
+        cursor=cursor,
+        include_archived=include_archived,
     )
-    result = await session.execute(stmt)
-    return list(result.scalars().all())
+
+
+def _filter_event_data(stmt, event_data: dict):
+    """Restrict ``stmt`` to events whose event_data contains ``event_data``.
+
+    String values for indexed keys compare with ``->>`` (btree expression
+    index); everything else goes into a single ``@>`` containment test
+    served by the jsonb_path_ops GIN index.
+    """
+    if not isinstance(event_data, dict):
+        raise ValueError("event_data filter must be a JSON object")
+    contained = {}
+    for key, value in event_data.items():
+        if key in _INDEXED_EVENT_DATA_KEYS and isinstance(value, str):
+            # Inline the key: the expression index only matches a literal.
+            stmt = stmt.where(AuditEvent.event_data.op("->>")(literal_column(f"'{key}'")) == value)
+        else:
+            contained[key] = value
+    if contained:
+        stmt = stmt.where(AuditEvent.event_data.contains(contained))
+    return stmt
 
 
 async def search_events(
@@ -233,9 +553,16 @@ async def search_events(
     *,
     days: int | None = None,
     event_type: str | None = None,
+    event_data: dict | None = None,
     limit: int = 500,
+    cursor: str | None = None,
 ) -> list[AuditEvent]:
-    """Search audit events by time range and/or event type."""
+    """Search audit events by time range, event type and event_data, newest first.
+
+    ``event_data`` matches by JSONB containment, e.g. ``{"tool_name":
+    "uw_risk_assessment"}`` or ``{"overall_status": "FAIL"}``; nested
+    objects and arrays match as with PostgreSQL's ``@>``.
+    """
     stmt = select(AuditEvent)
 
     if days is not None:
@@ -245,7 +572,10 @@ async def search_events(
     if event_type is not None:
         stmt = stmt.where(AuditEvent.event_type == event_type)
 
-    stmt = stmt.order_by(AuditEvent.timestamp.desc(), AuditEvent.id.desc()).limit(limit)
+    if event_data is not None:
+        stmt = _filter_event_data(stmt, event_data)
+
+    stmt = _keyset_page(stmt, limit=limit, cursor=cursor, descending=True)
     result = await session.execute(stmt)
     return list(result.scalars().all())
 
@@ -257,13 +587,18 @@ async def get_decision_trace(
     """Build a structured backward trace from a decision.
 
     Returns the decision record plus all contributing audit events grouped
-    by category, or None if the decision doesn't exist.
+    by category, or None if the decision doesn't exist.  Events already
+    covered by a Merkle anchor carry an inclusion proof checked against
+    their block, so the trace is verified without walking the whole chain.
     """
+    from .audit_merkle import get_inclusion_proofs
+
     dec = await session.get(Decision, decision_id)
     if dec is None:
         return None
 
     events = await get_events_by_application(session, dec.application_id)
+    proofs = await get_inclusion_proofs(session, [evt.id for evt in events])
 
     grouped: dict[str, list] = {}
     for evt in events:
@@ -274,6 +609,7 @@ async def get_decision_trace(
                 "user_id": evt.user_id,
                 "user_role": evt.user_role,
                 "event_data": evt.event_data,
+                "inclusion_proof": proofs.get(evt.id),
             }
         )
 
@@ -289,6 +625,8 @@ async def get_decision_trace(
         "decided_by": dec.decided_by,
         "events_by_type": grouped,
         "total_events": len(events),
+        "anchored_events": len(proofs),
+        "proofs_verified": all(p["verified"] for p in proofs.values()) if proofs else None,
     }
 
 
@@ -308,8 +646,13 @@ _EXPORT_COLUMNS = [
 ]
 
 
-def _event_to_export_row(evt: AuditEvent) -> dict:
-    """Convert an AuditEvent to a flat export dict."""
+def _event_to_export_row(evt: AuditEvent, event_data: dict | None = None) -> dict:
+    """Convert an AuditEvent to a flat export dict.
+
+    ``event_data`` overrides the event's payload (e.g. a PII-masked copy).
+    """
+    if event_data is None:
+        event_data = evt.event_data
     return {
         "event_id": evt.id,
         "timestamp": evt.timestamp.isoformat() if evt.timestamp else None,
@@ -317,11 +660,25 @@ def _event_to_export_row(evt: AuditEvent) -> dict:
         "user_id": evt.user_id,
         "user_role": evt.user_role,
         "application_id": evt.application_id,
-        "event_data": json.dumps(evt.event_data, default=str) if evt.event_data else None,
+        "event_data": json.dumps(event_data, default=str) if event_data else None,
         "prev_hash": evt.prev_hash,
     }
 
 
+def _export_cutoff(days: int | None) -> datetime | None:
+    return datetime.now(UTC) - timedelta(days=days) if days is not None else None
+
+
+def _export_query(*, application_id: int | None, since: datetime | None):
+    """Base SELECT for audit exports with the shared filters applied."""
+    stmt = select(AuditEvent)
+    if application_id is not None:
+        stmt = stmt.where(AuditEvent.application_id == application_id)
+    if since is not None:
+        stmt = stmt.where(AuditEvent.timestamp >= since)
+    return stmt
+
+
 async def export_events(
     session: AsyncSession,
     *,
@@ -330,26 +687,27 @@ async def export_events(
     days: int | None = None,
     limit: int = 10_000,
     pii_mask: bool = False,
+    include_archived: bool = False,
 ) -> tuple[str, str]:
     """Export audit events as JSON or CSV.
 
     Returns (content_string, media_type).
     When ``pii_mask`` is True, PII fields in ``event_data`` are masked before
     serialization (covers CSV path which bypasses the HTTP PII middleware).
+    ``include_archived`` also exports matching events from archive segments.
     """
     from ..middleware.pii import _mask_pii_recursive
 
-    stmt = select(AuditEvent)
-
-    if application_id is not None:
-        stmt = stmt.where(AuditEvent.application_id == application_id)
-    if days is not None:
-        cutoff = datetime.now(UTC) - timedelta(days=days)
-        stmt = stmt.where(AuditEvent.timestamp >= cutoff)
-
+    since = _export_cutoff(days)
+    stmt = _export_query(application_id=application_id, since=since)
     stmt = stmt.order_by(AuditEvent.timestamp.asc()).limit(limit)
     result = await session.execute(stmt)
     events = list(result.scalars().all())
+    if include_archived:
+        from .audit_archive import load_archived_events
+
+        archived = await load_archived_events(session, application_id=application_id, since=since)
+        events = sorted([*archived, *events], key=lambda evt: (evt.timestamp, evt.id))[:limit]
 
     rows = [_event_to_export_row(e) for e in events]
 
@@ -364,3 +722,75 @@ async def export_events(
         return buf.getvalue(), "text/csv"
 
     return json.dumps(rows, indent=2, default=str), "application/json"
+
+
+async def stream_export_events(
+    session: AsyncSession,
+    *,
+    fmt: str = "ndjson",
+    application_id: int | None = None,
+    days: int | None = None,
+    after_id: int | None = None,
+    pii_mask: bool = False,
+    include_archived: bool = False,
+) -> AsyncIterator[str]:
+    """Stream audit events as NDJSON or CSV chunks.
+
+    Unlike ``export_events`` there is no row cap: events are read through a
+    server-side cursor in ``AUDIT_EXPORT_CHUNK_SIZE`` batches, masked row by
+    row, and yielded one serialized batch at a time, so memory stays flat
+    regardless of export size.
+
+    Events are ordered by id so an interrupted export can be resumed by
+    passing the last ``event_id`` received as ``after_id``.  With
+    ``include_archived``, matching events from archive segments come first
+    (archived ids always precede live ones), in batches of the same size.
+
+    Yields:
+        Text chunks -- one JSON object per line for ``ndjson``; for ``csv``
+        the header row first, then data rows.
+    """
+    from ..middleware.pii import _mask_pii_recursive
+
+    since = _export_cutoff(days)
+    stmt = _export_query(application_id=application_id, since=since)
+    if after_id is not None:
+        stmt = stmt.where(AuditEvent.id > after_id)
+    chunk_size = settings.AUDIT_EXPORT_CHUNK_SIZE
+    stmt = stmt.order_by(AuditEvent.id.asc()).execution_options(yield_per=chunk_size)
+
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=_EXPORT_COLUMNS) if fmt == "csv" else None
+    if writer is not None:
+        writer.writeheader()
+        yield buf.getvalue()
+
+    def _serialize(events) -> str:
+        buf.seek(0)
+        buf.truncate()
+        for evt in events:
+            if pii_mask:
+                # Mask inside the payload before it is flattened to a JSON string.
+                row = _event_to_export_row(evt, _mask_pii_recursive(evt.event_data))
+                row = _mask_pii_recursive(row)
+            else:
+                row = _event_to_export_row(evt)
+            if writer is not None:
+                writer.writerow(row)
+            else:
+                buf.write(json.dumps(row, default=str))
+                buf.write("\n")
+        return buf.getvalue()
+
+    if include_archived:
+        from .audit_archive import iter_archived_events
+
+        archived = iter_archived_events(
+            session, application_id=application_id, since=since, after_id=after_id
+        )
+        async for events in archived:
+            yield _serialize(events)
+
+    result = await session.stream_scalars(stmt)
+    async for events in result.partitions(chunk_size):
+        yield _serialize(events)
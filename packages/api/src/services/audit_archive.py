@@ -0,0 +1,435 @@
+# This project was developed with assistance from AI tools.
+"""Tiered archival of old audit events to object storage.
+
+``audit_events`` is append-only, so without archival the hot table and its
+indexes grow forever.  Archival moves whole monthly partitions older than
+``AUDIT_ARCHIVE_AFTER_DAYS`` into gzip-compressed NDJSON objects in the
+S3/MinIO bucket, then drops those partitions (via a SECURITY DEFINER
+function that refuses to drop rows not covered by an archive segment).
+
+A run archives the longest stretch of eligible oldest partitions whose
+events form an id prefix of the chain.  A writer that waited on the audit
+lock across a month boundary can leave a lower id in the next month; that
+month then waits until its neighbour is archivable too.  The chain through
+the archived rows is checked before upload, and the segment row keeps the
+hash of the last archived event as the anchor that ``verify_audit_chain``
+resumes from.  Before the partitions are dropped, Merkle anchoring is run
+through the last archived event, so every archived event is covered by an
+anchor; inclusion proofs for archived events are rebuilt from the segments.
+
+Each fetched chunk is chain-checked, JSON-encoded and gzip-compressed in a
+worker thread into a spooled temporary file (spilling to disk past
+``_SPOOL_MAX_BYTES``), which is streamed to storage with a multipart
+upload, so a month of events neither blocks the event loop nor is held in
+memory at once.
+
+Read paths opt in with ``include_archived``: matching segments are
+spooled, checked against their recorded SHA-256, and decoded and filtered
+in batches in a worker thread.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import itertools
+import json
+import logging
+import re
+import tempfile
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+
+from db import AuditArchiveSegment, AuditEvent
+from sqlalchemy import literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from .audit import _latest_archive_segment
+from .audit_merkle import anchor_audit_blocks
+from .audit_verification import verify_chunk
+from .storage import StorageService, get_storage_service
+
+logger = logging.getLogger(__name__)
+
+# Serializes archival runs (e.g. several API replicas); distinct from the
+# chain writers' lock so archiving never blocks audit inserts.
+AUDIT_ARCHIVE_LOCK_KEY = 900_004
+
+_PARTITION_RE = re.compile(r"^audit_events_(\d{4})_(\d{2})$")
+
+_LIST_PARTITIONS_SQL = text(
+    "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+    "WHERE i.inhparent = 'audit_events'::regclass ORDER BY c.relname"
+)
+
+# Rows in monthly partitions below ``upper`` (the default partition is never dropped).
+_IN_ARCHIVED_PARTITIONS = "\"timestamp\" < :upper AND tableoid <> 'audit_events_default'::regclass"
+
+_MAX_ID_SQL = text(f"SELECT max(id) FROM audit_events WHERE {_IN_ARCHIVED_PARTITIONS}")
+
+# Events at or below ``max_id`` that would stay behind if partitions below
+# ``upper`` were dropped, i.e. the archived rows would not be an id prefix.
+_STRAGGLER_SQL = text(
+    "SELECT EXISTS (SELECT 1 FROM audit_events WHERE id <= :max_id AND NOT "
+    f"({_IN_ARCHIVED_PARTITIONS}))"
+)
+
+_DROP_PARTITION_SQL = text("SELECT audit_events_drop_archived_partition(:part_name)")
+
+_ARCHIVE_CONTENT_TYPE = "application/x-ndjson+gzip"
+
+# Compressed segment bytes kept in memory before spilling to a temp file.
+_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+_READ_BLOCK_BYTES = 1024 * 1024
+
+
+class AuditArchiveError(RuntimeError):
+    """Archival refused to run, or an archived segment failed its integrity check."""
+
+
+class _DigestWriter:
+    """File wrapper that SHA-256s everything written through it."""
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+        self.digest = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self.digest.update(data)
+        return self._fileobj.write(data)
+
+    def flush(self) -> None:
+        self._fileobj.flush()
+
+
+def _partition_end(part_name: str) -> datetime | None:
+    """Exclusive upper bound of a monthly partition, from its name."""
+    match = _PARTITION_RE.match(part_name)
+    if match is None:
+        return None
+    year, month = int(match[1]), int(match[2])
+    return datetime(year + month // 12, month % 12 + 1, 1, tzinfo=UTC)
+
+
+async def _archivable_partitions(
+    session: AsyncSession, cutoff: datetime
+) -> tuple[list[str], datetime | None]:
+    """Oldest monthly partitions that end by ``cutoff`` and form an id prefix.
+
+    Returns:
+        (partition names, exclusive timestamp upper bound of the last one).
+    """
+    names = (await session.execute(_LIST_PARTITIONS_SQL)).scalars().all()
+    eligible = []
+    for name in names:
+        end = _partition_end(name)
+        if end is None or end > cutoff:
+            continue
+        eligible.append((name, end))
+
+    chosen: list[str] = []
+    upper = None
+    for i, (_name, end) in enumerate(eligible):
+        max_id = (await session.execute(_MAX_ID_SQL.bindparams(upper=end))).scalar_one()
+        if max_id is not None:
+            straggler = await session.execute(_STRAGGLER_SQL.bindparams(max_id=max_id, upper=end))
+            if straggler.scalar_one():
+                continue
+        chosen = [n for n, _ in eligible[: i + 1]]
+        upper = end
+    return chosen, upper
+
+
+def _archive_record(row) -> dict:
+    return {
+        "id": row.id,
+        "timestamp": row.timestamp.isoformat(),
+        "prev_hash": row.prev_hash,
+        "row_hash": row.row_hash,
+        "user_id": row.user_id,
+        "user_role": row.user_role,
+        "event_type": row.event_type,
+        "application_id": row.application_id,
+        "decision_id": row.decision_id,
+        "session_id": row.session_id,
+        "event_data": row.event_data,
+    }
+
+
+def _chain_row(row) -> tuple:
+    return (
+        row.id,
+        str(row.timestamp),
+        row.event_type,
+        row.user_id,
+        row.user_role,
+        row.application_id,
+        row.session_id,
+        row.event_data,
+        row.prev_hash,
+    )
+
+
+class _SegmentWriter:
+    """Verifies and gzip-encodes id-ordered chunks of events into a segment.
+
+    ``write`` and ``close`` run in a worker thread, one call at a time.
+    """
+
+    def __init__(self, fileobj, expected: str):
+        self._gz = gzip.GzipFile(fileobj=fileobj, mode="wb", mtime=0)
+        self.expected = expected
+        self.count = 0
+        self.first = self.last = None
+        self.first_ts = self.last_ts = None
+        self.application_ids: set[int] = set()
+
+    def write(self, rows) -> int | None:
+        """Append one chunk; returns the id of the first event breaking the chain."""
+        _checked, break_id, expected = verify_chunk(
+            [_chain_row(r) for r in rows], None, self.expected
+        )
+        if break_id is not None:
+            return break_id
+        self.expected = expected
+        for r in rows:
+            self._gz.write(json.dumps(_archive_record(r), default=str).encode())
+            self._gz.write(b"\n")
+            if r.application_id is not None:
+                self.application_ids.add(r.application_id)
+            self.first_ts = (
+                r.timestamp if self.first_ts is None else min(self.first_ts, r.timestamp)
+            )
+            self.last_ts = r.timestamp if self.last_ts is None else max(self.last_ts, r.timestamp)
+        if self.first is None:
+            self.first = rows[0]
+        self.last = rows[-1]
+        self.count += len(rows)
+        return None
+
+    def close(self) -> None:
+        self._gz.close()
+
+
+def archive_object_key(first_event_id: int, last_event_id: int, last_hash: str) -> str:
+    """Object key of a segment, unique to the chain it was cut from.
+
+    Event ids restart when the chain is reset (demo reseeding truncates
+    ``audit_events``), so the key also carries the hash of the last archived
+    event: a new chain never overwrites an old segment's object, while a
+    retried run over the same rows writes the same key.
+    """
+    return (
+        f"{settings.AUDIT_ARCHIVE_PREFIX}{first_event_id:012d}-{last_event_id:012d}-"
+        f"{last_hash[:16]}.ndjson.gz"
+    )
+
+
+async def archive_audit_events(
+    session: AsyncSession,
+    *,
+    older_than_days: int | None = None,
+    storage: StorageService | None = None,
+) -> dict | None:
+    """Move audit partitions older than ``older_than_days`` to object storage.
+
+    Uploads one segment covering every archivable partition, records it in
+    ``audit_archive_segments``, anchors Merkle blocks through the last
+    archived event, and drops the partitions.  The upload happens before
+    the segment row is written, so a failed commit leaves at most an
+    orphaned object that the next run overwrites.  The caller commits.
+
+    Returns:
+        Summary of the run, or None if nothing was old enough to archive.
+
+    Raises:
+        AuditArchiveError: If the chain through the rows to archive is broken.
+    """
+    if older_than_days is None:
+        older_than_days = settings.AUDIT_ARCHIVE_AFTER_DAYS
+    await session.execute(text(f"SELECT pg_advisory_xact_lock({AUDIT_ARCHIVE_LOCK_KEY})"))
+
+    cutoff = datetime.now(UTC) - timedelta(days=older_than_days)
+    partitions, upper = await _archivable_partitions(session, cutoff)
+    if not partitions:
+        return None
+
+    previous = await _latest_archive_segment(session)
+    first_prev_hash = previous.last_hash if previous is not None else "genesis"
+
+    stmt = (
+        select(*AuditEvent.__table__.c)
+        .where(AuditEvent.timestamp < upper)
+        .where(literal_column("tableoid") != literal_column("'audit_events_default'::regclass"))
+        .order_by(AuditEvent.id.asc())
+    )
+    chunk_size = settings.AUDIT_EXPORT_CHUNK_SIZE
+    result = await session.stream(stmt.execution_options(yield_per=chunk_size))
+
+    spool = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES)
+    writer = _DigestWriter(spool)
+    encoder = _SegmentWriter(writer, first_prev_hash)
+    try:
+        async for rows in result.partitions(chunk_size):
+            # Hashing, JSON encoding and compression are CPU-bound; a month
+            # of events must not stall every other request on the loop.
+            break_id = await asyncio.to_thread(encoder.write, rows)
+            if break_id is not None:
+                raise AuditArchiveError(
+                    f"Audit chain broken at event {break_id}; refusing to archive"
+                )
+        await asyncio.to_thread(encoder.close)
+
+        if encoder.count:
+            object_key = archive_object_key(encoder.first.id, encoder.last.id, encoder.expected)
+            storage = storage or get_storage_service()
+            spool.seek(0)
+            await storage.upload_fileobj(spool, object_key, _ARCHIVE_CONTENT_TYPE)
+    finally:
+        await result.close()
+        spool.close()
+
+    first, last = encoder.first, encoder.last
+    segment = None
+    if encoder.count:
+        segment = AuditArchiveSegment(
+            first_event_id=first.id,
+            last_event_id=last.id,
+            event_count=encoder.count,
+            first_timestamp=encoder.first_ts,
+            last_timestamp=encoder.last_ts,
+            first_prev_hash=first_prev_hash,
+            last_hash=encoder.expected,
+            object_key=object_key,
+            content_sha256=writer.digest.hexdigest(),
+            application_ids=sorted(encoder.application_ids),
+        )
+        session.add(segment)
+        await session.flush()
+        await anchor_audit_blocks(session, through_id=last.id)
+
+    for part_name in partitions:
+        await session.execute(_DROP_PARTITION_SQL.bindparams(part_name=part_name))
+
+    return {
+        "partitions": partitions,
+        "events_archived": encoder.count,
+        "first_event_id": first.id if first is not None else None,
+        "last_event_id": last.id if last is not None else None,
+        "object_key": segment.object_key if segment is not None else None,
+    }
+
+
+def _file_sha256(fileobj) -> str:
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    while block := fileobj.read(_READ_BLOCK_BYTES):
+        digest.update(block)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def _decode_lines(lines, size: int) -> list[AuditEvent]:
+    """Decode up to ``size`` NDJSON lines into transient AuditEvents."""
+    events = []
+    for line in itertools.islice(lines, size):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        record["timestamp"] = datetime.fromisoformat(record["timestamp"])
+        events.append(AuditEvent(**record))
+    return events
+
+
+async def iter_archive_segment(
+    segment: AuditArchiveSegment,
+    storage: StorageService | None = None,
+    *,
+    batch_size: int | None = None,
+) -> AsyncIterator[list[AuditEvent]]:
+    """Yield one segment's events in batches, as transient (never persisted) AuditEvents.
+
+    The object is spooled (to disk past ``_SPOOL_MAX_BYTES``) and checked
+    against its recorded digest before anything is decoded; it is then
+    decompressed and decoded line by line in a worker thread, so neither
+    the segment nor its decoded events are held in memory at once.
+
+    Raises:
+        AuditArchiveError: If the object does not match the recorded digest.
+    """
+    storage = storage or get_storage_service()
+    batch_size = batch_size or settings.AUDIT_EXPORT_CHUNK_SIZE
+    with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES) as spool:
+        await storage.download_fileobj(segment.object_key, spool)
+        if await asyncio.to_thread(_file_sha256, spool) != segment.content_sha256:
+            raise AuditArchiveError(
+                f"Archived audit segment {segment.object_key} failed its digest"
+            )
+        with gzip.GzipFile(fileobj=spool, mode="rb") as gz:
+            while events := await asyncio.to_thread(_decode_lines, gz, batch_size):
+                yield events
+
+
+async def iter_archived_events(
+    session: AsyncSession,
+    *,
+    application_id: int | None = None,
+    since: datetime | None = None,
+    after_id: int | None = None,
+    through_id: int | None = None,
+    storage: StorageService | None = None,
+) -> AsyncIterator[list[AuditEvent]]:
+    """Yield matching archived events in id-ordered batches, segment by segment."""
+    stmt = select(AuditArchiveSegment).order_by(AuditArchiveSegment.first_event_id.asc())
+    if application_id is not None:
+        stmt = stmt.where(AuditArchiveSegment.application_ids.contains([application_id]))
+    if since is not None:
+        stmt = stmt.where(AuditArchiveSegment.last_timestamp >= since)
+    if after_id is not None:
+        stmt = stmt.where(AuditArchiveSegment.last_event_id > after_id)
+    if through_id is not None:
+        stmt = stmt.where(AuditArchiveSegment.first_event_id <= through_id)
+    segments = list((await session.execute(stmt)).scalars().all())
+
+    for segment in segments:
+        async for batch in iter_archive_segment(segment, storage):
+            events = [
+                evt
+                for evt in batch
+                if (application_id is None or evt.application_id == application_id)
+                and (since is None or evt.timestamp >= since)
+                and (after_id is None or evt.id > after_id)
+                and (through_id is None or evt.id <= through_id)
+            ]
+            if events:
+                yield events
+
+
+async def load_archived_events(session: AsyncSession, **filters) -> list[AuditEvent]:
+    """All matching archived events (see ``iter_archived_events``), in id order."""
+    return [evt async for batch in iter_archived_events(session, **filters) for evt in batch]
+
+
+async def run_archive_loop(session_factory=None, *, interval_s: float | None = None) -> None:
+    """Archive old audit partitions every ``interval_s`` seconds until cancelled."""
+    if session_factory is None:
+        from db.database import SessionLocal
+
+        session_factory = SessionLocal
+    interval_s = interval_s or settings.AUDIT_ARCHIVE_INTERVAL_S
+
+    while True:
+        try:
+            async with session_factory() as session:
+                summary = await archive_audit_events(session)
+                await session.commit()
+            if summary:
+                logger.info(
+                    "Archived %d audit event(s) from %s",
+                    summary["events_archived"],
+                    ", ".join(summary["partitions"]),
+                )
+        except Exception:
+            logger.warning("Audit archival failed", exc_info=True)
+        await asyncio.sleep(interval_s)
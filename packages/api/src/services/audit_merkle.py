@@ -0,0 +1,309 @@
+# This project was developed with assistance from AI tools.
+"""Merkle anchors and inclusion proofs for the audit trail.
+
+The hash chain proves the whole trail is intact, but checking one event
+with it means re-walking everything before it.  Anchoring periodically
+computes a Merkle root over each fixed-size block of consecutive events
+(``AUDIT_MERKLE_BLOCK_SIZE``, in id order) and stores it in
+``audit_merkle_anchors``.  Proving one event then only touches its own
+block: recompute the block's leaves, check the root against the anchor,
+and return the O(log n) sibling path.
+
+Only events at or below the chain head are anchored.  The head is
+advanced under the audit lock in the same transaction as the insert, so
+every locked writer's event up to it has committed and no later commit
+can land inside an anchored block.  Each anchor also records the exact
+ids it covers, and a block is re-read by those ids rather than by id
+range.  An out-of-order commit from a writer that skips the audit lock
+therefore never invalidates an anchored block.  Such an event is simply
+left unanchored.
+
+Archival (``audit_archive``) anchors everything it is about to archive
+first, closing a short final block at the cut if anchoring lags behind,
+so every archived event stays provable.  Blocks at or below the archive
+cut are rebuilt from the archive segments, plus the live table for the
+block that straddles the cut.
+
+Leaves are the event's chain hash, recomputed from row data, so a proof
+covers exactly the fields the hash chain covers.  Leaf and interior
+hashes are domain-separated (0x00 / 0x01 prefixes), and an unpaired node
+is promoted to the next level rather than duplicated.
+"""
+
+import asyncio
+import bisect
+import hashlib
+import logging
+from collections.abc import Iterable
+
+from db import AuditArchiveSegment, AuditChainHead, AuditEvent, AuditMerkleAnchor
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from .audit import _CHAIN_COLUMNS, _event_hash
+
+logger = logging.getLogger(__name__)
+
+# Serializes anchoring runs (e.g. several API replicas); distinct from the
+# chain writers' lock so anchoring never blocks audit inserts.
+AUDIT_ANCHOR_LOCK_KEY = 900_003
+
+
+def merkle_leaf(event_hash: str) -> str:
+    """Leaf hash for an event's chain hash."""
+    return hashlib.sha256(b"\x00" + bytes.fromhex(event_hash)).hexdigest()
+
+
+def _merkle_node(left: str, right: str) -> str:
+    return hashlib.sha256(b"\x01" + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+
+def merkle_levels(leaves: list[str]) -> list[list[str]]:
+    """Build every level of the tree, leaves first and the root last."""
+    if not leaves:
+        raise ValueError("cannot build a Merkle tree with no leaves")
+    levels = [leaves]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [_merkle_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def merkle_root(leaves: list[str]) -> str:
+    return merkle_levels(leaves)[-1][0]
+
+
+def merkle_proof(levels: list[list[str]], index: int) -> list[dict]:
+    """Sibling path from leaf ``index`` to the root.
+
+    Each step is ``{"hash": sibling, "position": "left" | "right"}`` --
+    the side the sibling sits on when hashing upwards.  Levels where the
+    node was promoted without a sibling contribute no step.
+    """
+    proof = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            position = "left" if sibling < index else "right"
+            proof.append({"hash": level[sibling], "position": position})
+        index //= 2
+    return proof
+
+
+def verify_merkle_proof(leaf: str, proof: Iterable[dict], root: str) -> bool:
+    """Fold a sibling path onto ``leaf`` and compare with ``root``."""
+    node = leaf
+    for step in proof:
+        if step["position"] == "left":
+            node = _merkle_node(step["hash"], node)
+        else:
+            node = _merkle_node(node, step["hash"])
+    return node == root
+
+
+async def _load_block(session: AsyncSession, anchor: AuditMerkleAnchor) -> list:
+    stmt = (
+        select(*_CHAIN_COLUMNS)
+        .where(AuditEvent.id.between(anchor.first_event_id, anchor.last_event_id))
+        .order_by(AuditEvent.id.asc())
+    )
+    if anchor.event_ids is not None:
+        stmt = stmt.where(AuditEvent.id.in_(anchor.event_ids))
+    return list((await session.execute(stmt)).all())
+
+
+def _in_block(anchor: AuditMerkleAnchor, event_id: int) -> bool:
+    if anchor.event_ids is not None:
+        return event_id in anchor.event_ids
+    return anchor.first_event_id <= event_id <= anchor.last_event_id
+
+
+async def _load_archived_blocks(
+    session: AsyncSession, anchors: list[AuditMerkleAnchor]
+) -> dict[int, list]:
+    """Archived events of each anchor (keyed by anchor id), from one pass over the segments."""
+    from .audit_archive import iter_archived_events
+
+    by_anchor: dict[int, list] = {a.id: [] for a in anchors}
+    lasts = [a.last_event_id for a in anchors]
+    async for batch in iter_archived_events(
+        session,
+        after_id=anchors[0].first_event_id - 1,
+        through_id=anchors[-1].last_event_id,
+    ):
+        for evt in batch:
+            pos = bisect.bisect_left(lasts, evt.id)
+            if pos < len(anchors) and _in_block(anchors[pos], evt.id):
+                by_anchor[anchors[pos].id].append(evt)
+    return by_anchor
+
+
+def _block_ids_match(anchor: AuditMerkleAnchor, rows: list) -> bool:
+    """Whether ``rows`` are exactly the events the anchor covered."""
+    if anchor.event_ids is None:
+        return len(rows) == anchor.event_count
+    return [r.id for r in rows] == list(anchor.event_ids)
+
+
+async def anchor_audit_blocks(
+    session: AsyncSession, *, block_size: int | None = None, through_id: int | None = None
+) -> int:
+    """Anchor every complete, not-yet-anchored block of audit events.
+
+    Only events up to the chain head are considered (see module docstring).
+    A trailing partial block is left for a later run, unless ``through_id``
+    is given: then anchoring stops at that id and the events left before it
+    are anchored as a short final block, so an anchor boundary falls exactly
+    on ``through_id``.  The caller commits.
+
+    Returns:
+        Number of anchors created.
+    """
+    block_size = block_size or settings.AUDIT_MERKLE_BLOCK_SIZE
+    await session.execute(text(f"SELECT pg_advisory_xact_lock({AUDIT_ANCHOR_LOCK_KEY})"))
+
+    last_anchored = await session.scalar(select(func.max(AuditMerkleAnchor.last_event_id)))
+    last_anchored = last_anchored or 0
+    head_id = await session.scalar(select(AuditChainHead.last_id).where(AuditChainHead.id == 1))
+    if head_id is None:
+        return 0
+    upper = head_id if through_id is None else min(head_id, through_id)
+
+    def _anchor(rows) -> None:
+        session.add(
+            AuditMerkleAnchor(
+                first_event_id=rows[0].id,
+                last_event_id=rows[-1].id,
+                event_count=len(rows),
+                event_ids=[r.id for r in rows],
+                merkle_root=merkle_root([merkle_leaf(_event_hash(r)) for r in rows]),
+            )
+        )
+
+    created = 0
+    while True:
+        stmt = (
+            select(*_CHAIN_COLUMNS)
+            .where(AuditEvent.id > last_anchored)
+            .where(AuditEvent.id <= upper)
+            .order_by(AuditEvent.id.asc())
+            .limit(block_size)
+        )
+        rows = (await session.execute(stmt)).all()
+        if len(rows) < block_size:
+            break
+        _anchor(rows)
+        last_anchored = rows[-1].id
+        created += 1
+
+    if through_id is not None and rows:
+        _anchor(rows)
+        created += 1
+
+    if created:
+        await session.flush()
+    return created
+
+
+async def get_inclusion_proofs(session: AsyncSession, event_ids: Iterable[int]) -> dict[int, dict]:
+    """Inclusion proofs for the given events, keyed by event id.
+
+    Events in the same block share one block load and one tree build.
+    Events not covered by an anchor yet (or missing) are omitted.
+
+    Each proof carries ``verified``: True when the block rebuilt from the
+    current rows reproduces the anchored root and the path checks out.
+    Any change to, or removal of, an event in the block makes it False.
+    Blocks that start at or below the newest archive segment are rebuilt
+    from the archived events, plus the live ones for the block straddling
+    the archive cut.
+    """
+    ids = sorted(set(event_ids))
+    if not ids:
+        return {}
+
+    stmt = (
+        select(AuditMerkleAnchor)
+        .where(AuditMerkleAnchor.last_event_id >= ids[0])
+        .where(AuditMerkleAnchor.first_event_id <= ids[-1])
+        .order_by(AuditMerkleAnchor.last_event_id.asc())
+    )
+    anchors = list((await session.execute(stmt)).scalars().all())
+    if not anchors:
+        return {}
+
+    by_anchor: dict[int, list[int]] = {}
+    lasts = [a.last_event_id for a in anchors]
+    for event_id in ids:
+        pos = bisect.bisect_left(lasts, event_id)
+        if pos < len(anchors) and anchors[pos].first_event_id <= event_id:
+            by_anchor.setdefault(pos, []).append(event_id)
+
+    archived_through = await session.scalar(select(func.max(AuditArchiveSegment.last_event_id)))
+    archived_rows: dict[int, list] = {}
+    if archived_through is not None:
+        archived = [
+            anchors[pos]
+            for pos in sorted(by_anchor)
+            if anchors[pos].first_event_id <= archived_through
+        ]
+        if archived:
+            archived_rows = await _load_archived_blocks(session, archived)
+
+    proofs: dict[int, dict] = {}
+    for pos, block_ids in by_anchor.items():
+        anchor = anchors[pos]
+        rows = archived_rows.get(anchor.id, [])
+        if archived_through is None or anchor.last_event_id > archived_through:
+            rows = rows + await _load_block(session, anchor)
+        if not rows:
+            continue
+        levels = merkle_levels([merkle_leaf(_event_hash(r)) for r in rows])
+        block_intact = _block_ids_match(anchor, rows) and levels[-1][0] == anchor.merkle_root
+        index_of = {r.id: i for i, r in enumerate(rows)}
+        for event_id in block_ids:
+            index = index_of.get(event_id)
+            if index is None:
+                continue
+            leaf = levels[0][index]
+            path = merkle_proof(levels, index)
+            proofs[event_id] = {
+                "event_id": event_id,
+                "anchor_id": anchor.id,
+                "first_event_id": anchor.first_event_id,
+                "last_event_id": anchor.last_event_id,
+                "merkle_root": anchor.merkle_root,
+                "leaf_hash": leaf,
+                "proof": path,
+                "verified": block_intact and verify_merkle_proof(leaf, path, anchor.merkle_root),
+            }
+    return proofs
+
+
+async def get_inclusion_proof(session: AsyncSession, event_id: int) -> dict | None:
+    """Inclusion proof for one event, or None if it is not anchored yet."""
+    return (await get_inclusion_proofs(session, [event_id])).get(event_id)
+
+
+async def run_anchor_loop(session_factory=None, *, interval_s: float | None = None) -> None:
+    """Anchor new audit blocks every ``interval_s`` seconds until cancelled."""
+    if session_factory is None:
+        from db.database import SessionLocal
+
+        session_factory = SessionLocal
+    interval_s = interval_s or settings.AUDIT_MERKLE_ANCHOR_INTERVAL_S
+
+    while True:
+        try:
+            async with session_factory() as session:
+                created = await anchor_audit_blocks(session)
+                await session.commit()
+            if created:
+                logger.info("Anchored %d audit block(s)", created)
+        except Exception:
+            logger.warning("Audit Merkle anchoring failed", exc_info=True)
+        await asyncio.sleep(interval_s)
@@ -0,0 +1,151 @@
+# This project was developed with assistance from AI tools.
+"""Chunked, multi-process audit hash chain verification engine.
+
+Hashing the chain (SHA-256 over ``json.dumps(sort_keys=True)``) is CPU-bound,
+so running it inline blocks the event loop for every other request during a
+full re-verification.  This engine never hashes on the event loop: it splits
+the id-ordered chain into chunks and hashes them in a ``ProcessPoolExecutor``,
+or in a worker thread when the whole chain fits in one chunk.
+
+Each chunk is shipped together with the last row of the previous chunk (the
+boundary row), so a worker can recompute the expected ``prev_hash`` for its
+first row without waiting on its neighbour.  Every adjacent pair of events is
+therefore checked exactly once, and merging chunk results in id order yields
+the same ``first_break_id`` / ``events_checked`` a sequential walk would.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from .audit import _compute_hash
+
+# (id, str(timestamp), event_type, user_id, user_role, application_id,
+#  session_id, event_data, prev_hash) -- plain tuples so chunks pickle cheaply.
+ChainRow = tuple
+
+
+@dataclass
+class ChainVerification:
+    """Outcome of walking a (possibly partial) hash chain."""
+
+    events_checked: int
+    first_break_id: int | None = None
+    last_id: int | None = None
+    last_hash: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.first_break_id is None
+
+
+def _row_hash(row: ChainRow) -> str:
+    return _compute_hash(*row[:8])
+
+
+def verify_chunk(
+    rows: list[ChainRow],
+    boundary: ChainRow | None,
+    expected_first: str | None,
+) -> tuple[int, int | None, str | None]:
+    """Verify one chunk of consecutive events.
+
+    Runs in a worker process.  The expected prev_hash of ``rows[0]`` comes
+    from hashing ``boundary`` when given, else from ``expected_first``.
+
+    Returns:
+        (events_checked, first_break_id, hash_of_last_row).  On a break,
+        events_checked counts through the breaking row and the hash is None.
+    """
+    expected = _row_hash(boundary) if boundary is not None else expected_first
+    for i, row in enumerate(rows):
+        if row[8] != expected:
+            return i + 1, row[0], None
+        expected = _row_hash(row)
+    return len(rows), None, expected
+
+
+async def verify_chain_chunks(
+    chunks: AsyncIterator[list[ChainRow]],
+    *,
+    expected: str = "genesis",
+    max_workers: int | None = None,
+) -> ChainVerification:
+    """Verify a chain delivered as id-ordered chunks.
+
+    A chain that fits in a single chunk is hashed in a worker thread; the
+    process pool is only started once a second chunk arrives.  At most ``2 * max_workers``
+    chunks are in flight so memory stays bounded for arbitrarily long chains.
+
+    Args:
+        chunks: Consecutive, non-overlapping chunks of the chain in id order.
+        expected: prev_hash the first row must carry ("genesis" or the hash
+            of the event preceding the first chunk).
+        max_workers: Worker process count (defaults to the CPU count).
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    loop = asyncio.get_running_loop()
+    pool: ProcessPoolExecutor | None = None
+    in_flight: deque[tuple[asyncio.Future, list[ChainRow]]] = deque()
+    outcome = ChainVerification(events_checked=0)
+    first_rows: list[ChainRow] | None = None
+    boundary: ChainRow | None = None
+
+    def _merge(result: tuple[int, int | None, str | None], rows: list[ChainRow]) -> bool:
+        checked, break_id, last_hash = result
+        outcome.events_checked += checked
+        if break_id is not None:
+            outcome.first_break_id = break_id
+            return False
+        outcome.last_id = rows[-1][0]
+        outcome.last_hash = last_hash
+        return True
+
+    def _submit(rows: list[ChainRow]) -> None:
+        nonlocal boundary
+        fut = loop.run_in_executor(
+            pool, verify_chunk, rows, boundary, expected if boundary is None else None
+        )
+        in_flight.append((fut, rows))
+        boundary = rows[-1]
+
+    try:
+        async for rows in chunks:
+            if not rows:
+                continue
+            if first_rows is None and pool is None:
+                first_rows = rows
+                continue
+            if pool is None:
+                # Spawned, not forked: a forked worker inherits the API process's
+                # whole heap, and its garbage collector copies it page by page.
+                pool = ProcessPoolExecutor(
+                    max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                _submit(first_rows)
+                first_rows = None
+            _submit(rows)
+            while len(in_flight) >= 2 * max_workers:
+                fut, done_rows = in_flight.popleft()
+                if not _merge(await fut, done_rows):
+                    return outcome
+
+        if first_rows is not None:
+            # Whole chain fit in one chunk -- not worth a process pool, but
+            # still hashed off the event loop.
+            result = await asyncio.to_thread(verify_chunk, first_rows, None, expected)
+            _merge(result, first_rows)
+            return outcome
+
+        while in_flight:
+            fut, done_rows = in_flight.popleft()
+            if not _merge(await fut, done_rows):
+                return outcome
+        return outcome
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
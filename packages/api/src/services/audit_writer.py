@@ -0,0 +1,205 @@
+# This project was developed with assistance from AI tools.
+"""Group-commit audit writer.
+
+``write_audit_event`` takes the global audit advisory lock once per event,
+so high-frequency standalone events (tool calls, safety blocks) queue up
+behind each other.  The writer here lets callers enqueue events and get a
+future back; a single flusher task drains the queue in batches.  Each batch
+takes the advisory lock once, extends the hash chain in memory, and inserts
+every row with one multi-row INSERT.
+
+Chain semantics are identical to ``write_audit_event``: ids and the
+transaction timestamp are reserved up front so each row's hash can be
+computed before the insert, exactly as ``verify_audit_chain`` recomputes it,
+and the chain head is advanced once to the batch's last row.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from db import AuditEvent
+from sqlalchemy import insert, text
+
+from ..core.config import settings
+from .audit import (
+    AUDIT_LOCK_KEY,
+    _advance_chain_head,
+    _chain_tail_hash,
+    _compute_hash,
+    _normalize_event_data,
+    _reserve_event_slots,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingEvent:
+    """A queued audit event and the future its caller is awaiting."""
+
+    fields: dict[str, Any]
+    future: asyncio.Future = field(repr=False)
+
+
+class AuditWriter:
+    """Batches standalone audit events into group commits.
+
+    The flusher task starts lazily on the first ``submit`` and runs until
+    ``stop`` is called (app shutdown), at which point the queue is drained.
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        *,
+        max_batch_size: int | None = None,
+        max_wait_ms: float | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._max_batch_size = max_batch_size or settings.AUDIT_WRITER_MAX_BATCH_SIZE
+        wait_ms = settings.AUDIT_WRITER_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms
+        self._max_wait = wait_ms / 1000
+        self._queue: asyncio.Queue[_PendingEvent | None] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the flusher task is active."""
+        return self._task is not None and not self._task.done()
+
+    def submit(
+        self,
+        *,
+        event_type: str,
+        session_id: str | None = None,
+        user_id: str | None = None,
+        user_role: str | None = None,
+        application_id: int | None = None,
+        event_data: dict | None = None,
+    ) -> asyncio.Future:
+        """Enqueue an audit event for the next group commit.
+
+        Takes the same fields as ``write_audit_event``.
+
+        Returns:
+            A future resolving to the new event's id once its batch commits,
+            or raising the flush error if the batch failed.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(
+            _PendingEvent(
+                fields={
+                    "event_type": event_type,
+                    "session_id": session_id,
+                    "user_id": user_id,
+                    "user_role": user_role,
+                    "application_id": application_id,
+                    "event_data": _normalize_event_data(event_data),
+                },
+                future=future,
+            )
+        )
+        if not self.is_running:
+            self._task = asyncio.create_task(self._run())
+        return future
+
+    async def stop(self) -> None:
+        """Flush everything queued so far and stop the flusher task."""
+        if not self.is_running:
+            return
+        self._queue.put_nowait(None)
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        """Drain the queue in batches until the stop sentinel arrives."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = loop.time() + self._max_wait
+            while len(batch) < self._max_batch_size:
+                try:
+                    if self._queue.empty():
+                        remaining = deadline - loop.time()
+                        if remaining <= 0:
+                            break
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[_PendingEvent]) -> None:
+        """Write one batch under a single advisory lock and resolve its futures."""
+        session_factory = self._session_factory
+        if session_factory is None:
+            from db.database import SessionLocal
+
+            session_factory = SessionLocal
+
+        try:
+            async with session_factory() as session:
+                await session.execute(text(f"SELECT pg_advisory_xact_lock({AUDIT_LOCK_KEY})"))
+                prev_hash = await _chain_tail_hash(session)
+
+                reserved = await _reserve_event_slots(session, len(batch))
+
+                rows = []
+                for slot, pending in zip(reserved, batch, strict=True):
+                    event_id, ts, f = slot.id, slot.ts, pending.fields
+                    row_hash = _compute_hash(
+                        event_id,
+                        str(ts),
+                        f["event_type"],
+                        f["user_id"],
+                        f["user_role"],
+                        f["application_id"],
+                        f["session_id"],
+                        f["event_data"],
+                    )
+                    rows.append(
+                        {
+                            "id": event_id,
+                            "timestamp": ts,
+                            "prev_hash": prev_hash,
+                            "row_hash": row_hash,
+                            **f,
+                        }
+                    )
+                    prev_hash = row_hash
+
+                await session.execute(insert(AuditEvent).values(rows))
+                await _advance_chain_head(session, rows[-1]["id"], prev_hash)
+                await session.commit()
+        except Exception as exc:
+            logger.warning("Audit batch of %d events failed", len(batch), exc_info=True)
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(exc)
+            return
+
+        for row, pending in zip(rows, batch, strict=True):
+            if not pending.future.done():
+                pending.future.set_result(row["id"])
+
+
+_writer: AuditWriter | None = None
+
+
+def get_audit_writer() -> AuditWriter:
+    """Return the process-wide AuditWriter, creating it on first use."""
+    global _writer  # noqa: PLW0603
+    if _writer is None:
+        _writer = AuditWriter()
+    return _writer
@@ -23,6 +23,7 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..schemas.auth import UserContext
+from ..services.analytics import mark_analytics_changed
 from ..services.application import get_application
 from ..services.audit import write_audit_event
 
@@ -132,6 +133,7 @@ async def respond_to_condition(
         },
     )
 
+    mark_analytics_changed(session)
     await session.commit()
     await session.refresh(condition)
 
@@ -187,6 +189,7 @@ async def link_document_to_condition(
     if condition.status == ConditionStatus.OPEN:
         condition.status = ConditionStatus.RESPONDED
 
+    mark_analytics_changed(session)
     await session.commit()
     await session.refresh(condition)
 
@@ -370,6 +373,7 @@ async def issue_condition(
         },
     )
 
+    mark_analytics_changed(session)
     await session.commit()
     await session.refresh(condition)
 
@@ -418,6 +422,7 @@ async def review_condition(
         event_data={"condition_id": condition_id},
     )
 
+    mark_analytics_changed(session)
     await session.commit()
     await session.refresh(condition)
 
@@ -466,6 +471,7 @@ async def clear_condition(
         event_data={"condition_id": condition_id, "cleared_by": user.user_id},
     )
 
+    mark_analytics_changed(session)
     await session.commit()
     await session.refresh(condition)
 
@@ -528,6 +534,7 @@ async def waive_condition(
         },
     )
 
+    mark_analytics_changed(session)
     await session.commit()
     await session.refresh(condition)
 
@@ -590,6 +597,7 @@ async def return_condition(
         },
     )
 
+    mark_analytics_changed(session)
     await session.commit()
     await session.refresh(condition)
 
@@ -13,7 +13,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..schemas.auth import UserContext
-from ..services.application import get_application
+from ..services.analytics_rollups import record_decision
+from ..services.application import get_application, record_stage_entry
 from ..services.audit import write_audit_event
 from ..services.condition import get_outstanding_count
 
@@ -322,9 +323,11 @@ async def render_decision(
         contributing_factors=contributing_factors,
     )
     session.add(decision_record)
+    await record_decision(session, app, decision_type, denial_reasons)
 
     # Transition stage
     if new_stage is not None:
+        await record_stage_entry(session, app, app.stage, new_stage)
         app.stage = new_stage
 
     # Write decision audit event
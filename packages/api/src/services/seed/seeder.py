@@ -16,6 +16,7 @@ from db import (
     Application,
     ApplicationBorrower,
     ApplicationFinancials,
+    ApplicationStageHistory,
     Borrower,
     Condition,
     Decision,
@@ -27,6 +28,8 @@ from db import (
 from sqlalchemy import delete, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..analytics import bump_data_version
+from ..analytics_rollups import rebuild_analytics_rollups
 from ..audit import write_audit_event
 from ..compliance.knowledge_base.ingestion import clear_kb_content, ingest_kb_content
 from ..compliance.seed_hmda import clear_hmda_demographics, seed_hmda_demographics
@@ -89,9 +92,23 @@ async def _clear_demo_data(session: AsyncSession, compliance_session: AsyncSessi
                     ApplicationFinancials.application_id.in_(app_ids)
                 )
             )
-            # Truncate ALL audit events + violations to start clean hash chain.
-            # TRUNCATE bypasses row triggers (no need to disable them).
-            await session.execute(text("TRUNCATE TABLE audit_violations, audit_events CASCADE"))
+            await session.execute(
+                delete(ApplicationStageHistory).where(
+                    ApplicationStageHistory.application_id.in_(app_ids)
+                )
+            )
+            # Truncate ALL audit events + violations to start clean hash chain,
+            # along with the chain head, verification watermark, Merkle anchors, and
+            # archive segments that pointed into the old one (their objects stay in
+            # storage; keys carry the chain hash, so the new chain never reuses
+            # them). TRUNCATE bypasses row triggers (no need to disable them).
+            await session.execute(
+                text(
+                    "TRUNCATE TABLE audit_violations, audit_events, audit_chain_head, "
+                    "audit_verification_watermark, audit_merkle_anchors, "
+                    "audit_archive_segments CASCADE"
+                )
+            )
             # Delete HMDA demographics via compliance module (isolation boundary)
             await clear_hmda_demographics(compliance_session, app_ids)
             # Delete junction rows
@@ -141,6 +158,9 @@ async def _seed_applications(
         )
         session.add(app)
         await session.flush()  # Get app.id
+        session.add(
+            ApplicationStageHistory(application_id=app.id, from_stage=None, to_stage=app.stage)
+        )
 
         # Create primary borrower junction row
         primary_junction = ApplicationBorrower(
@@ -482,16 +502,29 @@ async def seed_demo_data(
     # re-run with --force to clear and re-seed.
     await session.commit()
 
-    # Apply timestamp overrides via engine connection to bypass ORM entirely
-    if ts_overrides:
-        from db.database import engine
-
-        async with engine.begin() as conn:
-            for ts in ts_overrides:
-                await conn.execute(
-                    text("UPDATE applications SET created_at = :c, updated_at = :u WHERE id = :id"),
-                    ts,
-                )
+    # Apply timestamp overrides via engine connection to bypass ORM entirely.
+    # Seeded rows bypass the incremental rollup writers and carry backdated
+    # timestamps, so the dashboard rollups are derived from the final data in
+    # the same transaction.
+    from db.database import engine
+
+    async with engine.begin() as conn:
+        for ts in ts_overrides:
+            await conn.execute(
+                text("UPDATE applications SET created_at = :c, updated_at = :u WHERE id = :id"),
+                ts,
+            )
+            # Seeded apps enter their stage at the overridden updated_at,
+            # so days-to-close matches the fixture timeline.
+            await conn.execute(
+                text(
+                    "UPDATE application_stage_history SET entered_at = :u "
+                    "WHERE application_id = :id"
+                ),
+                ts,
+            )
+        await rebuild_analytics_rollups(conn)
+    bump_data_version()
 
     try:
         await compliance_session.commit()
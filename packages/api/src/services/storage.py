@@ -10,6 +10,7 @@ import asyncio
 import logging
 import os
 from functools import partial
+from typing import BinaryIO
 
 import boto3
 from botocore.config import Config as BotoConfig
@@ -76,6 +77,21 @@ class StorageService:
         )
         return object_key
 
+    async def upload_fileobj(self, fileobj: BinaryIO, object_key: str, content_type: str) -> str:
+        """Stream a file object to S3 (multipart for large files) and return the object key."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None,
+            partial(
+                self._client.upload_fileobj,
+                fileobj,
+                self._bucket,
+                object_key,
+                ExtraArgs={"ContentType": content_type},
+            ),
+        )
+        return object_key
+
     async def download_file(self, object_key: str) -> bytes:
         """Download file bytes from S3."""
         loop = asyncio.get_running_loop()
@@ -85,6 +101,14 @@ class StorageService:
         )
         return response["Body"].read()
 
+    async def download_fileobj(self, object_key: str, fileobj: BinaryIO) -> None:
+        """Stream an S3 object into a writable file object."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None,
+            partial(self._client.download_fileobj, self._bucket, object_key, fileobj),
+        )
+
     async def get_download_url(self, object_key: str, expires_in: int = 3600) -> str:
         """Return a presigned GET URL for the given object key."""
         loop = asyncio.get_running_loop()
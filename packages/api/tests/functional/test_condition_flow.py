@@ -66,7 +66,8 @@ def _make_respond_session(application, condition):
     The respond service runs these queries:
       1. Application lookup -> unique().scalar_one_or_none()
       2. Condition lookup -> scalar_one_or_none()
-      3+ Audit event writes (advisory lock, latest event query, flush)
+      3+ Audit event writes (advisory lock, chain head, latest event fallback,
+         id/timestamp reservation, flush, chain head upsert)
     Then commits and refreshes.
     """
     session = AsyncMock()
@@ -77,13 +78,27 @@ def _make_respond_session(application, condition):
     cond_result = MagicMock()
     cond_result.scalar_one_or_none.return_value = condition
 
-    # Audit event queries return generic mocks (advisory lock, latest event)
+    # Audit event queries return generic mocks (advisory lock, chain head,
+    # latest event, slot reservation, chain head upsert)
     audit_lock_result = MagicMock()
+    audit_head_result = MagicMock()
+    audit_head_result.scalar_one_or_none.return_value = None  # No chain head yet
     audit_latest_result = MagicMock()
     audit_latest_result.scalar_one_or_none.return_value = None  # No prior events
+    audit_slot_result = MagicMock()
+    audit_slot_result.one.return_value = MagicMock(id=1, ts="2026-03-01 12:00:00+00:00")
+    audit_head_upsert_result = MagicMock()
 
     session.execute = AsyncMock(
-        side_effect=[app_result, cond_result, audit_lock_result, audit_latest_result]
+        side_effect=[
+            app_result,
+            cond_result,
+            audit_lock_result,
+            audit_head_result,
+            audit_latest_result,
+            audit_slot_result,
+            audit_head_upsert_result,
+        ]
     )
     return session
 
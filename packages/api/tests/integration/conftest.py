@@ -420,7 +420,11 @@ async def truncate_all(async_engine):
                 "TRUNCATE TABLE kb_chunks, kb_documents, "
                 "document_extractions, documents, conditions, decisions, "
                 "credit_reports, prequalification_decisions, "
-                "rate_locks, application_financials, application_borrowers, applications, "
-                "borrowers, audit_events, audit_violations, demo_data_manifest CASCADE"
+                "rate_locks, application_financials, application_borrowers, "
+                "application_stage_history, applications, analytics_daily_rollups, "
+                "analytics_daily_stage_rollups, analytics_daily_denial_reasons, "
+                "borrowers, audit_events, audit_violations, audit_chain_head, "
+                "audit_verification_watermark, audit_merkle_anchors, audit_archive_segments, "
+                "demo_data_manifest CASCADE"
             )
         )
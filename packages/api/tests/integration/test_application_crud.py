@@ -105,8 +105,11 @@ async def test_list_applications(client_factory, seed_data):
     await client.aclose()
 
 
-async def test_update_stage(client_factory, seed_data):
-    """PATCH as LO with stage change succeeds."""
+async def test_update_stage(client_factory, db_session, seed_data):
+    """PATCH as LO with stage change succeeds and records stage history."""
+    from db import ApplicationStageHistory
+    from db.enums import ApplicationStage
+
     from tests.functional.personas import loan_officer
 
     client = await client_factory(loan_officer())
@@ -118,6 +121,13 @@ async def test_update_stage(client_factory, seed_data):
     assert resp.json()["stage"] == "processing"
     await client.aclose()
 
+    result = await db_session.execute(
+        select(ApplicationStageHistory.from_stage, ApplicationStageHistory.to_stage).where(
+            ApplicationStageHistory.application_id == seed_data.sarah_app1.id
+        )
+    )
+    assert result.all() == [(ApplicationStage.APPLICATION, ApplicationStage.PROCESSING)]
+
 
 async def test_update_empty_body_returns_400(client_factory, seed_data):
     """PATCH with empty body returns 400."""
@@ -0,0 +1,82 @@
+# This project was developed with assistance from AI tools.
+"""Merkle anchor + inclusion proof integration tests with real PostgreSQL.
+
+Relies on db_session's savepoint rollback for isolation, like the hash
+chain tests.
+"""
+
+import pytest
+from sqlalchemy import text
+
+from src.services.audit import write_audit_event
+from src.services.audit_merkle import (
+    anchor_audit_blocks,
+    get_inclusion_proof,
+    verify_merkle_proof,
+)
+
+pytestmark = pytest.mark.integration
+
+
+async def _write_events(db_session, n: int) -> list:
+    return [
+        await write_audit_event(db_session, event_type=f"merkle_{i}", event_data={"i": i})
+        for i in range(n)
+    ]
+
+
+async def test_anchor_and_prove_event(db_session):
+    """Complete blocks are anchored and their events carry a valid proof."""
+    events = await _write_events(db_session, 5)
+
+    assert await anchor_audit_blocks(db_session, block_size=2) == 2
+    assert await anchor_audit_blocks(db_session, block_size=2) == 0
+
+    proof = await get_inclusion_proof(db_session, events[2].id)
+    assert proof is not None
+    assert proof["verified"] is True
+    assert (proof["first_event_id"], proof["last_event_id"]) == (events[2].id, events[3].id)
+    assert verify_merkle_proof(proof["leaf_hash"], proof["proof"], proof["merkle_root"])
+
+    # The trailing event is not in a complete block yet.
+    assert await get_inclusion_proof(db_session, events[4].id) is None
+
+
+async def test_proof_detects_tampered_block(db_session):
+    """Changing an anchored event invalidates proofs for its whole block."""
+    events = await _write_events(db_session, 4)
+    await anchor_audit_blocks(db_session, block_size=2)
+
+    conn = await db_session.connection()
+    await conn.execute(text("ALTER TABLE audit_events DISABLE TRIGGER audit_events_no_update"))
+    await db_session.execute(
+        text("UPDATE audit_events SET event_data = cast(:data as jsonb) WHERE id = :id").bindparams(
+            data='{"i": "TAMPERED"}', id=events[0].id
+        )
+    )
+    await conn.execute(text("ALTER TABLE audit_events ENABLE TRIGGER audit_events_no_update"))
+    db_session.expire_all()
+
+    assert (await get_inclusion_proof(db_session, events[1].id))["verified"] is False
+    assert (await get_inclusion_proof(db_session, events[2].id))["verified"] is True
+
+
+async def test_late_commit_inside_anchored_range_keeps_block_verified(db_session):
+    """An event that commits after its id range was anchored is not part of the block."""
+    first = await write_audit_event(db_session, event_type="merkle_0", event_data={"i": 0})
+    # A writer that bypasses the audit lock takes an id but commits later.
+    late_id = (await db_session.execute(text("SELECT nextval('audit_events_id_seq')"))).scalar()
+    await _write_events(db_session, 2)
+    assert await anchor_audit_blocks(db_session, block_size=3) == 1
+
+    await db_session.execute(
+        text(
+            "INSERT INTO audit_events (id, event_type, event_data) "
+            "VALUES (:id, 'late_writer', '{}'::jsonb)"
+        ).bindparams(id=late_id)
+    )
+
+    proof = await get_inclusion_proof(db_session, first.id)
+    assert proof["first_event_id"] < late_id < proof["last_event_id"]
+    assert proof["verified"] is True
+    assert await get_inclusion_proof(db_session, late_id) is None
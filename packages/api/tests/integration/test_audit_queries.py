@@ -18,7 +18,9 @@ from src.services.audit import (
     get_decision_trace,
     get_events_by_application,
     get_events_by_decision,
+    next_audit_cursor,
     search_events,
+    stream_export_events,
 )
 
 pytestmark = pytest.mark.integration
@@ -145,6 +147,20 @@ class TestAuditByApplication:
         events = await get_events_by_application(db_session, 999999)
         assert events == []
 
+    async def test_should_page_through_events_with_cursor(self, db_session):
+        ids = await _seed_audit_data(db_session)
+        first = await get_events_by_application(db_session, ids["app1_id"], limit=2)
+        cursor = next_audit_cursor(first, 2)
+        assert cursor is not None
+
+        rest = await get_events_by_application(db_session, ids["app1_id"], limit=2, cursor=cursor)
+        assert next_audit_cursor(rest, 2) is None
+        assert [e.event_type for e in first + rest] == [
+            "stage_transition",
+            "tool_call",
+            "decision",
+        ]
+
 
 # ---------------------------------------------------------------------------
 # Query by decision
@@ -192,6 +208,32 @@ class TestAuditSearch:
         events = await search_events(db_session, days=30, limit=2)
         assert len(events) == 2
 
+    async def test_should_filter_by_event_data_containment(self, db_session):
+        await _seed_audit_data(db_session)
+        events = await search_events(db_session, event_data={"to_stage": "application"})
+        assert len(events) == 2
+        assert all(e.event_data["to_stage"] == "application" for e in events)
+
+        events = await search_events(
+            db_session, event_type="tool_call", event_data={"tool": "risk_assessment"}
+        )
+        assert [e.event_data["result"] for e in events] == ["low_risk"]
+
+        assert await search_events(db_session, event_data={"tool": "nonexistent"}) == []
+
+    async def test_should_page_newest_first_without_overlap(self, db_session):
+        await _seed_audit_data(db_session)
+        seen, cursor = [], None
+        while True:
+            page = await search_events(db_session, days=30, limit=2, cursor=cursor)
+            seen.extend(page)
+            cursor = next_audit_cursor(page, 2)
+            if cursor is None:
+                break
+        assert len({e.id for e in seen}) == len(seen) == 5
+        stamps = [e.timestamp for e in seen]
+        assert stamps == sorted(stamps, reverse=True)
+
 
 # ---------------------------------------------------------------------------
 # Decision backward trace
@@ -255,3 +297,25 @@ class TestAuditExport:
         content, _ = await export_events(db_session, fmt="json", days=30)
         data = json.loads(content)
         assert len(data) == 5
+
+    async def test_should_stream_ndjson_and_resume_after_id(self, db_session):
+        ids = await _seed_audit_data(db_session)
+        chunks = stream_export_events(db_session, application_id=ids["app1_id"])
+        lines = "".join([c async for c in chunks]).splitlines()
+        rows = [json.loads(line) for line in lines]
+        assert len(rows) == 3
+        assert [r["event_id"] for r in rows] == sorted(r["event_id"] for r in rows)
+
+        resumed = stream_export_events(
+            db_session, application_id=ids["app1_id"], after_id=rows[0]["event_id"]
+        )
+        rest = [json.loads(line) for line in "".join([c async for c in resumed]).splitlines()]
+        assert [r["event_id"] for r in rest] == [r["event_id"] for r in rows[1:]]
+
+    async def test_should_stream_csv_with_headers(self, db_session):
+        ids = await _seed_audit_data(db_session)
+        chunks = stream_export_events(db_session, fmt="csv", application_id=ids["app1_id"])
+        content = "".join([c async for c in chunks])
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert len(rows) == 3
+        assert "prev_hash" in rows[0]
@@ -0,0 +1,137 @@
+# This project was developed with assistance from AI tools.
+"""Tests for the token-budgeted agent conversation context."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from src.agents import context
+
+
+def _turn(i: int, tool_output: str = "") -> list:
+    messages = [HumanMessage(content=f"question {i}")]
+    if tool_output:
+        messages += [
+            AIMessage(content="", tool_calls=[{"name": "lookup", "args": {}, "id": f"c{i}"}]),
+            ToolMessage(content=tool_output, tool_call_id=f"c{i}", name="lookup"),
+        ]
+    messages.append(AIMessage(content=f"answer {i}"))
+    return messages
+
+
+def _conversation(turns: int, tool_output: str = "") -> list:
+    return [m for i in range(turns) for m in _turn(i, tool_output)]
+
+
+def _options(**overrides) -> dict:
+    return {"budget": 10_000, "keep_turns": 2, "tool_chars": 20, **overrides}
+
+
+def test_estimate_tokens_counts_content_and_tool_calls():
+    """should grow with message content and tool-call arguments."""
+    short = context.estimate_tokens([HumanMessage(content="x" * 40)])
+    long = context.estimate_tokens([HumanMessage(content="x" * 400)])
+    call = AIMessage(
+        content="", tool_calls=[{"name": "lookup", "args": {"q": "y" * 80}, "id": "1"}]
+    )
+    assert long - short == 90
+    assert context.estimate_tokens([call]) > 20
+
+
+def test_prompt_compacts_tool_outputs_outside_recent_turns():
+    """should cut old tool outputs and keep recent turns verbatim."""
+    messages = _conversation(4, tool_output="R" * 100)
+
+    prompt = context.prompt_messages("sys", messages, summary="", summarized_upto=0, **_options())
+
+    tool_contents = [m.content for m in prompt if isinstance(m, ToolMessage)]
+    assert all("omitted" in c for c in tool_contents[:2])
+    assert tool_contents[2:] == ["R" * 100, "R" * 100]
+    assert len(prompt) == len(messages) + 1
+
+
+def test_prompt_uses_summary_and_keeps_pinned_system_context():
+    """should replace the summarized prefix with the summary, keeping system context."""
+    messages = [SystemMessage(content="[System context] app #7"), *_conversation(3)]
+
+    prompt = context.prompt_messages(
+        "sys", messages, summary="Earlier: asked about app 7.", summarized_upto=3, **_options()
+    )
+
+    assert "Earlier: asked about app 7." in prompt[0].content
+    assert prompt[1].content == "[System context] app #7"
+    assert [m.content for m in prompt[2:]] == ["question 1", "answer 1", "question 2", "answer 2"]
+
+
+def test_fold_point_waits_until_over_budget():
+    """should not fold while the prompt fits the budget."""
+    messages = _conversation(6)
+    assert (
+        context.fold_point(
+            messages, system_prompt="sys", summary="", summarized_upto=0, **_options()
+        )
+        is None
+    )
+
+    tight = _options(budget=30)
+    end = context.fold_point(messages, system_prompt="sys", summary="", summarized_upto=0, **tight)
+    assert end == context.verbatim_start(messages, 2)
+    assert isinstance(messages[end], HumanMessage)
+
+
+def test_fold_point_never_folds_recent_turns():
+    """should keep at least keep_turns turns verbatim even when over budget."""
+    messages = _conversation(2, tool_output="R" * 10_000)
+    assert (
+        context.fold_point(
+            messages, system_prompt="sys", summary="", summarized_upto=0, **_options(budget=10)
+        )
+        is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_summarize_falls_back_to_extractive_summary():
+    """should keep an extractive summary when the summarizer call fails."""
+    llm = MagicMock()
+    llm.ainvoke = AsyncMock(side_effect=ConnectionError("down"))
+
+    summary = await context.summarize(llm, "previous", _turn(1, "tool data"), 20)
+
+    assert summary.startswith("previous")
+    assert "User: question 1" in summary
+    assert "Tool lookup: tool data" in summary
+
+
+@pytest.mark.asyncio
+async def test_graph_folds_history_into_summary(monkeypatch):
+    """should summarize old turns once over budget and send a bounded prompt."""
+    from src.agents.base import build_routed_graph
+
+    monkeypatch.setattr("src.agents.base.get_safety_checker", lambda: None)
+    monkeypatch.setattr("src.inference.router.classify_query", lambda q: "capable_large")
+    monkeypatch.setattr("src.core.config.settings.AGENT_CONTEXT_KEEP_TURNS", 1)
+
+    summarizer = MagicMock()
+    summarizer.ainvoke = AsyncMock(return_value=AIMessage(content="Summary of turns 0-4."))
+    agent_llm = MagicMock()
+    agent_llm.ainvoke = AsyncMock(return_value=AIMessage(content="final answer"))
+    agent_llm.bind_tools.return_value = agent_llm
+
+    graph = build_routed_graph(
+        system_prompt="sys",
+        tools=[],
+        llms={"fast_small": summarizer, "capable_large": agent_llm},
+        context_budgets={"capable_large": 40},
+    )
+    history = _conversation(5, tool_output="R" * 200)
+    result = await graph.ainvoke({"messages": [*history, HumanMessage(content="new question")]})
+
+    assert result["context_summary"] == "Summary of turns 0-4."
+    assert result["summarized_upto"] == len(history)
+    sent = agent_llm.ainvoke.await_args.args[0]
+    assert "Summary of turns 0-4." in sent[0].content
+    assert [m.content for m in sent[1:]] == ["new question"]
+    # Checkpointed history itself is never trimmed
+    assert len(result["messages"]) == len(history) + 2
@@ -7,7 +7,8 @@ name returns the same graph instance when cached.
 
 import pytest
 
-from src.agents.registry import clear_agent_cache, get_agent, list_agents
+from src.agents import registry
+from src.agents.registry import clear_agent_cache, get_agent, list_agents, warm_agents
 
 
 def test_get_agent_returns_graph():
@@ -63,3 +64,28 @@ def test_get_agent_unknown_raises():
     clear_agent_cache()
     with pytest.raises(FileNotFoundError):
         get_agent("nonexistent-agent")
+
+
+@pytest.mark.asyncio
+async def test_warm_agents_preloads_graphs_and_tool_descriptions(monkeypatch):
+    """warm_agents builds each registered agent, survives failures, then warms selectors."""
+    built = []
+
+    def fake_get_agent(agent_name, checkpointer=None):
+        built.append((agent_name, checkpointer))
+        if agent_name == "ceo-assistant":
+            raise ValueError("bad config")
+
+    warmed = []
+
+    async def fake_warm():
+        warmed.append(True)
+
+    monkeypatch.setattr(registry, "list_agents", lambda: ["ceo-assistant", "public-assistant", "x"])
+    monkeypatch.setattr(registry, "get_agent", fake_get_agent)
+    monkeypatch.setattr("src.agents.tool_selection.warm_tool_selectors", fake_warm)
+
+    await warm_agents(checkpointer="saver")
+
+    assert built == [("ceo-assistant", "saver"), ("public-assistant", "saver")]
+    assert warmed == [True]
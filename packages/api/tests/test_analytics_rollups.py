@@ -0,0 +1,332 @@
+# This project was developed with assistance from AI tools.
+"""Tests for daily analytics rollups and the whole-day analytics read path."""
+
+from datetime import UTC, date, datetime, time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from db.enums import ApplicationStage, DecisionType, LoanType
+from sqlalchemy.dialects import postgresql
+
+from src.services.analytics import _window, clear_cache, get_denial_trends, get_pipeline_summary
+from src.services.analytics_rollups import (
+    denial_reason_list,
+    reattribute_application,
+    reattribution_statements,
+    rebuild_analytics_rollups,
+    record_decision,
+    record_stage_change,
+    rollup_day,
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    """Start each test with an empty analytics result cache."""
+    clear_cache()
+    yield
+    clear_cache()
+
+
+def _app():
+    return SimpleNamespace(id=7, loan_type=LoanType.FHA, assigned_to="lo-james")
+
+
+def _executed_sql(session) -> list[str]:
+    return [
+        str(call.args[0].compile(dialect=postgresql.dialect()))
+        for call in session.execute.await_args_list
+    ]
+
+
+def _built_session(built: bool = True):
+    """Mock session whose analytics_rollup_state lookup reports ``built``."""
+    session = AsyncMock()
+    session.scalar = AsyncMock(return_value=1 if built else None)
+    return session
+
+
+def _result(*, one=None, all_=None):
+    result = MagicMock()
+    result.one.return_value = one
+    result.all.return_value = all_ or []
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_window_snaps_to_utc_midnight_for_whole_days():
+    now, cutoff, start_day = await _window(_built_session(), 30, whole_days=True)
+    assert start_day is not None
+    assert cutoff == datetime.combine(start_day, time.min, tzinfo=UTC)
+    assert (now.date() - start_day).days == 30
+
+
+@pytest.mark.asyncio
+async def test_window_is_rolling_by_default():
+    session = _built_session()
+    now, cutoff, start_day = await _window(session, 30, whole_days=False)
+    assert start_day is None
+    assert (now - cutoff).days == 30
+    session.scalar.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_window_keeps_source_tables_until_rollups_are_built():
+    now, cutoff, start_day = await _window(_built_session(False), 30, whole_days=True)
+    assert start_day is None
+    assert cutoff.time() == time.min
+    assert (now.date() - cutoff.date()).days == 30
+
+
+@pytest.mark.asyncio
+async def test_window_remembers_built_rollups():
+    session = _built_session()
+    await _window(session, 30, whole_days=True)
+    await _window(session, 7, whole_days=True)
+    session.scalar.assert_awaited_once()
+
+
+def test_rollup_day_uses_utc():
+    from datetime import timedelta, timezone
+
+    late_evening_pacific = datetime(2026, 3, 1, 20, 0, tzinfo=timezone(timedelta(hours=-8)))
+    assert rollup_day(late_evening_pacific) == date(2026, 3, 2)
+
+
+def test_denial_reason_list_normalizes_shapes():
+    assert denial_reason_list(["High DTI", " ", "Low score "]) == ["High DTI", "Low score"]
+    assert denial_reason_list("High DTI") == ["High DTI"]
+    assert denial_reason_list(None) == []
+    assert denial_reason_list({"reason": "x"}) == []
+
+
+# ---------------------------------------------------------------------------
+# Incremental writers
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_record_decision_bumps_decision_and_reason_counters():
+    session = AsyncMock()
+    await record_decision(
+        session, _app(), DecisionType.DENIED, ["High DTI", "High DTI", "Low score"]
+    )
+
+    sql = _executed_sql(session)
+    assert len(sql) == 3
+    assert "INSERT INTO analytics_daily_rollups" in sql[0]
+    assert "decisions_denied = (analytics_daily_rollups.decisions_denied" in sql[0]
+    assert all("INSERT INTO analytics_daily_denial_reasons" in s for s in sql[1:])
+    params = [call.args[0].compile().params for call in session.execute.await_args_list[1:]]
+    assert [(p["reason"], p["count"]) for p in params] == [("High DTI", 2), ("Low score", 1)]
+
+
+@pytest.mark.asyncio
+async def test_record_decision_skips_reasons_for_approvals():
+    session = AsyncMock()
+    await record_decision(session, _app(), DecisionType.APPROVED, ["ignored"])
+
+    sql = _executed_sql(session)
+    assert len(sql) == 1
+    assert "decisions_approved" in sql[0]
+
+
+@pytest.mark.asyncio
+async def test_record_stage_change_to_closed_rolls_up_turn_time_and_close():
+    session = AsyncMock()
+    await record_stage_change(
+        session,
+        _app(),
+        ApplicationStage.CLEAR_TO_CLOSE,
+        ApplicationStage.CLOSED,
+        datetime.now(UTC),
+    )
+
+    sql = _executed_sql(session)
+    assert len(sql) == 3
+    # Entry into CLOSED with its turn time resolved in the same statement
+    assert "INSERT INTO analytics_daily_stage_rollups" in sql[0]
+    assert "FROM application_stage_history" in sql[0]
+    assert "turn_samples = (analytics_daily_stage_rollups.turn_samples" in sql[0]
+    # Exit from CLEAR_TO_CLOSE
+    assert "exited = (analytics_daily_stage_rollups.exited" in sql[1]
+    # Closing counted with days to close
+    assert "closed_count = (analytics_daily_rollups.closed_count" in sql[2]
+
+
+@pytest.mark.asyncio
+async def test_record_stage_change_without_turn_time_stage():
+    session = AsyncMock()
+    await record_stage_change(session, _app(), None, ApplicationStage.INQUIRY, datetime.now(UTC))
+
+    sql = _executed_sql(session)
+    assert len(sql) == 1
+    assert "application_stage_history" not in sql[0]
+
+
+# ---------------------------------------------------------------------------
+# Whole-day read path
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_pipeline_summary_reads_rollups_for_whole_days():
+    session = _built_session()
+    session.execute = AsyncMock(
+        side_effect=[
+            _result(all_=[(ApplicationStage.CLOSED, 4)]),
+            _result(one=(10, 4, 100.0)),
+            _result(all_=[(ApplicationStage.UNDERWRITING, 12.0, 3)]),
+        ]
+    )
+
+    result = await get_pipeline_summary(session, days=30, whole_days=True)
+
+    assert result.pull_through_rate == 40.0
+    assert result.avg_days_to_close == 25.0
+    turn = {t.from_stage: t.avg_days for t in result.turn_times}
+    assert turn["application"] == 4.0
+    sql = _executed_sql(session)
+    assert "analytics_daily_rollups" in sql[1]
+    assert "analytics_daily_stage_rollups" in sql[2]
+
+
+@pytest.mark.asyncio
+async def test_denial_trends_reads_rollups_for_whole_days():
+    session = _built_session()
+    session.execute = AsyncMock(
+        side_effect=[
+            _result(one=(20, 5)),
+            _result(all_=[("2026-03", 20, 5)]),
+            _result(all_=[("High DTI", 4, 80.0), ("Other", 1, 20.0)]),
+            _result(all_=[(LoanType.FHA, 10, 5)]),
+        ]
+    )
+
+    result = await get_denial_trends(session, days=90, whole_days=True)
+
+    assert result.total_decisions == 20
+    assert result.overall_denial_rate == 25.0
+    assert result.by_product == {"fha": 50.0}
+    assert "analytics_daily_denial_reasons" in _executed_sql(session)[2]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_summary_falls_back_to_source_tables_while_unbuilt():
+    session = _built_session(False)
+    session.execute = AsyncMock(
+        side_effect=[
+            _result(all_=[(ApplicationStage.CLOSED, 4)]),
+            MagicMock(**{"scalar.return_value": 10}),
+            MagicMock(**{"scalar.return_value": 4}),
+            MagicMock(**{"scalar.return_value": 25.0}),
+            _result(all_=[]),
+        ]
+    )
+
+    result = await get_pipeline_summary(session, days=30, whole_days=True)
+
+    assert result.pull_through_rate == 40.0
+    assert not any("analytics_daily" in sql for sql in _executed_sql(session))
+
+
+# ---------------------------------------------------------------------------
+# Rebuild and re-attribution
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_full_rebuild_marks_rollups_built():
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=MagicMock(**{"scalar_one.return_value": 0}))
+
+    await rebuild_analytics_rollups(session)
+
+    assert any("INSERT INTO analytics_rollup_state" in sql for sql in _executed_sql(session))
+
+
+@pytest.mark.asyncio
+async def test_partial_rebuild_leaves_state_alone():
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=MagicMock(**{"scalar_one.return_value": 0}))
+
+    await rebuild_analytics_rollups(session, since=date(2026, 3, 1))
+
+    assert not any("analytics_rollup_state" in sql for sql in _executed_sql(session))
+
+
+def _param_values(stmt) -> set:
+    params = stmt.compile(dialect=postgresql.dialect()).params.values()
+    return {value for value in params if not isinstance(value, list)}
+
+
+def test_reattribution_subtracts_old_grain_and_adds_new():
+    statements = reattribution_statements(7, (LoanType.FHA, "lo-james"), (LoanType.VA, "lo-maria"))
+
+    half = len(statements) // 2
+    assert half == 6
+    for stmt in statements:
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "applications.id = " in sql
+        # The grain is a bound literal, not grouped from the current row
+        assert "GROUP BY applications.loan_type" not in sql
+    removed = [_param_values(stmt) for stmt in statements[:half]]
+    added = [_param_values(stmt) for stmt in statements[half:]]
+    assert all({LoanType.FHA, "lo-james", -1} <= values for values in removed)
+    assert all({LoanType.VA, "lo-maria"} <= values for values in added)
+    assert not any(-1 in values for values in added)
+
+
+def _flush_session(app, stored: tuple | None):
+    session = MagicMock()
+    session.info = {}
+    session.dirty = [app]
+    session.execute.return_value.one_or_none.return_value = stored
+    return session
+
+
+def _changed(attrs: set):
+    def inspect(_obj):
+        return SimpleNamespace(
+            attrs={
+                name: SimpleNamespace(
+                    history=SimpleNamespace(has_changes=lambda name=name: name in attrs)
+                )
+                for name in ("loan_type", "assigned_to")
+            }
+        )
+
+    return inspect
+
+
+def test_flush_reattributes_changed_loan_officer(monkeypatch):
+    from db import Application
+
+    app = Application(id=7, loan_type=LoanType.FHA, assigned_to="lo-maria")
+    session = _flush_session(app, (LoanType.FHA, "lo-james"))
+    monkeypatch.setattr("src.services.analytics_rollups.inspect", _changed({"assigned_to"}))
+
+    reattribute_application(session, None, None)
+
+    # One lookup of the stored grain, then the 12 move statements
+    assert session.execute.call_count == 13
+    assert session.info["analytics_changed"] is True
+
+
+def test_flush_ignores_unchanged_grain(monkeypatch):
+    from db import Application
+
+    app = Application(id=7, loan_type=LoanType.FHA, assigned_to="lo-james")
+    session = _flush_session(app, (LoanType.FHA, "lo-james"))
+    monkeypatch.setattr("src.services.analytics_rollups.inspect", _changed(set()))
+
+    reattribute_application(session, None, None)
+
+    session.execute.assert_not_called()
+    assert "analytics_changed" not in session.info
@@ -5,6 +5,7 @@ Verifies that audit events are written with session_id matching the LangFuse
 trace session_id, enabling cross-lookup between observability and compliance.
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -16,7 +17,13 @@ from fastapi.testclient import TestClient
 from src.middleware.auth import get_current_user
 from src.routes.audit import router as audit_router
 from src.schemas.auth import DataScope, UserContext
-from src.services.audit import get_events_by_session, write_audit_event
+from src.services.audit import (
+    _compute_hash,
+    ensure_audit_partitions,
+    get_events_by_session,
+    run_partition_loop,
+    write_audit_event,
+)
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -48,17 +55,34 @@ def _make_borrower() -> UserContext:
 # ---------------------------------------------------------------------------
 
 
-def _mock_audit_session(prev_event=None):
-    """Build a mock session that supports advisory lock + latest-event query."""
+def _mock_audit_session(prev_event=None, head_hash=None):
+    """Build a mock session for lock, chain-head/latest-event, slot reservation, head upsert."""
+    import datetime
+    from types import SimpleNamespace
+
     mock_session = AsyncMock()
-    # execute is called twice: advisory lock, then latest-event query
-    lock_result = MagicMock()
-    query_result = MagicMock()
-    query_result.scalar_one_or_none.return_value = prev_event
-    mock_session.execute = AsyncMock(side_effect=[lock_result, query_result])
+
+    async def _execute(stmt):
+        sql = str(stmt)
+        result = MagicMock()
+        if "nextval" in sql:
+            result.one.return_value = SimpleNamespace(
+                id=100, ts=datetime.datetime(2026, 3, 1, 12, 0, tzinfo=datetime.UTC)
+            )
+        elif sql.startswith("SELECT audit_chain_head"):
+            result.scalar_one_or_none.return_value = head_hash
+        else:
+            result.scalar_one_or_none.return_value = prev_event
+        return result
+
+    mock_session.execute = AsyncMock(side_effect=_execute)
     return mock_session
 
 
+def _executed_sql(mock_session) -> list[str]:
+    return [str(c.args[0]) for c in mock_session.execute.await_args_list]
+
+
 @pytest.mark.asyncio
 async def test_write_audit_event_creates_row():
     """write_audit_event adds an AuditEvent with session_id and prev_hash."""
@@ -83,6 +107,43 @@ async def test_write_audit_event_creates_row():
     assert added_obj.user_role == "prospect"
     assert added_obj.event_data["tool_name"] == "product_info"
     assert added_obj.prev_hash == "genesis"
+    assert added_obj.id == 100
+    assert added_obj.row_hash == _compute_hash(
+        100,
+        "2026-03-01 12:00:00+00:00",
+        "tool_invocation",
+        "test-user",
+        "prospect",
+        None,
+        "sess-abc-123",
+        {"tool_name": "product_info", "result_length": 42},
+    )
+
+
+@pytest.mark.asyncio
+async def test_write_audit_event_hashes_numbers_as_jsonb_returns_them():
+    """row_hash matches event_data as read back from JSONB, which drops float exponents."""
+    import json
+
+    mock_session = _mock_audit_session(prev_event=None)
+
+    await write_audit_event(
+        mock_session,
+        event_type="calc",
+        event_data={"big": 1e16, "huge": 2.5e20, "ratio": 1.0, "rate": 0.065, "tiny": 1.5e-7},
+    )
+
+    added_obj = mock_session.add.call_args[0][0]
+    # Postgres prints these numerics as below; the driver json-decodes that text.
+    stored = json.loads(
+        '{"big": 10000000000000000, "huge": 250000000000000000000, "rate": 0.065, '
+        '"ratio": 1.0, "tiny": 0.00000015}'
+    )
+    assert added_obj.event_data == stored
+    assert type(added_obj.event_data["big"]) is int
+    assert added_obj.row_hash == _compute_hash(
+        100, "2026-03-01 12:00:00+00:00", "calc", None, None, None, None, stored
+    )
 
 
 @pytest.mark.asyncio
@@ -103,9 +164,7 @@ async def test_write_audit_event_without_event_data():
 
 @pytest.mark.asyncio
 async def test_write_audit_event_chains_from_previous():
-    """prev_hash is computed from the previous event when one exists."""
-    from src.services.audit import _compute_hash
-
+    """Without a chain head, prev_hash is computed from the previous event."""
     prev = MagicMock()
     prev.id = 42
     prev.timestamp = "2026-01-15T10:00:00+00:00"
@@ -137,6 +196,71 @@ async def test_write_audit_event_chains_from_previous():
     assert added_obj.prev_hash == expected_hash
 
 
+@pytest.mark.asyncio
+async def test_write_audit_event_uses_chain_head():
+    """prev_hash comes from audit_chain_head without re-reading the previous row."""
+    mock_session = _mock_audit_session(head_hash="f" * 64)
+
+    await write_audit_event(mock_session, event_type="tool_invocation", user_id="test-user")
+
+    added_obj = mock_session.add.call_args[0][0]
+    assert added_obj.prev_hash == "f" * 64
+    executed = _executed_sql(mock_session)
+    assert not any(sql.startswith("SELECT audit_events") for sql in executed)
+    head_upserts = [sql for sql in executed if sql.startswith("INSERT INTO audit_chain_head")]
+    assert len(head_upserts) == 1
+
+
+@pytest.mark.asyncio
+async def test_ensure_audit_partitions_calls_db_function():
+    """Partition maintenance delegates to the database function."""
+    mock_session = AsyncMock()
+    mock_result = MagicMock()
+    mock_result.scalar_one.return_value = 2
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
+    created = await ensure_audit_partitions(mock_session, months_ahead=6)
+
+    assert created == 2
+    stmt = mock_session.execute.await_args.args[0]
+    assert "audit_events_ensure_partitions" in str(stmt)
+    assert stmt.compile().params == {"months_ahead": 6}
+
+
+@pytest.mark.asyncio
+async def test_partition_loop_keeps_creating_partitions():
+    """A long-running process creates each new month's partition as it comes into range."""
+    created = iter([1, 0, RuntimeError("db down"), 1])
+    sessions = []
+
+    def _factory():
+        session = AsyncMock()
+
+        async def _execute(stmt):
+            value = next(created)
+            if isinstance(value, Exception):
+                raise value
+            result = MagicMock()
+            result.scalar_one.return_value = value
+            return result
+
+        session.execute = AsyncMock(side_effect=_execute)
+        sessions.append(session)
+        cm = MagicMock()
+        cm.__aenter__ = AsyncMock(return_value=session)
+        cm.__aexit__ = AsyncMock(return_value=False)
+        return cm
+
+    sleeps = AsyncMock(side_effect=[None, None, None, None, asyncio.CancelledError])
+    with patch("src.services.audit.asyncio.sleep", sleeps), pytest.raises(asyncio.CancelledError):
+        await run_partition_loop(_factory, interval_s=3600)
+
+    # One pass per interval, and a failed pass does not stop the next one.
+    assert [c.args for c in sleeps.await_args_list] == [(3600,)] * 5
+    assert len(sessions) == 4
+    assert [s.commit.await_count for s in sessions] == [1, 1, 0, 1]
+
+
 @pytest.mark.asyncio
 async def test_get_events_by_session_queries_by_session_id():
     """get_events_by_session filters by session_id."""
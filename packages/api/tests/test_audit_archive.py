@@ -0,0 +1,282 @@
+# This project was developed with assistance from AI tools.
+"""Tests for tiered audit archival to object storage."""
+
+import datetime
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from db import AuditArchiveSegment
+
+from src.services.audit import _event_hash, get_events_by_application, verify_audit_chain
+from src.services.audit_archive import (
+    AuditArchiveError,
+    _partition_end,
+    archive_audit_events,
+    iter_archive_segment,
+)
+
+_TS = datetime.datetime(2025, 1, 15, 12, 0, tzinfo=datetime.UTC)
+
+
+def _chain(n: int, prev_hash: str = "genesis", start=_TS) -> list[SimpleNamespace]:
+    rows = []
+    for i in range(1, n + 1):
+        row = SimpleNamespace(
+            id=i,
+            timestamp=start + datetime.timedelta(minutes=i),
+            prev_hash=prev_hash,
+            row_hash=None,
+            user_id="u",
+            user_role="borrower",
+            event_type="evt",
+            application_id=7 if i % 2 else 8,
+            decision_id=None,
+            session_id="s",
+            event_data={"i": i},
+        )
+        row.row_hash = _event_hash(row)
+        prev_hash = row.row_hash
+        rows.append(row)
+    return rows
+
+
+class _FakeStorage:
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+
+    async def upload_file(self, file_data, object_key, content_type):
+        self.objects[object_key] = file_data
+        return object_key
+
+    async def upload_fileobj(self, fileobj, object_key, content_type):
+        self.objects[object_key] = fileobj.read()
+        return object_key
+
+    async def download_fileobj(self, object_key, fileobj):
+        fileobj.write(self.objects[object_key])
+
+
+async def _read(segment, storage, **kwargs):
+    return [
+        evt async for batch in iter_archive_segment(segment, storage, **kwargs) for evt in batch
+    ]
+
+
+def _archive_session(rows, *, partitions=("audit_events_2025_01",), straggler=False):
+    session = AsyncMock()
+    session.add = MagicMock()
+    dropped = []
+
+    async def _execute(stmt):
+        sql = str(stmt)
+        result = MagicMock()
+        if "pg_inherits" in sql:
+            result.scalars.return_value.all.return_value = [*partitions, "audit_events_default"]
+        elif "max(id)" in sql:
+            result.scalar_one.return_value = rows[-1].id if rows else None
+        elif "EXISTS" in sql:
+            result.scalar_one.return_value = straggler
+        elif "audit_events_drop_archived_partition" in sql:
+            dropped.append(stmt.compile().params["part_name"])
+        elif "audit_archive_segments" in sql:
+            result.scalar_one_or_none.return_value = None
+        return result
+
+    class _StreamResult:
+        async def partitions(self, size=None):
+            for start in range(0, len(rows), size):
+                yield rows[start : start + size]
+
+        async def close(self):
+            pass
+
+    session.execute = AsyncMock(side_effect=_execute)
+    session.stream = AsyncMock(return_value=_StreamResult())
+    return session, dropped
+
+
+@pytest.fixture(autouse=True)
+def _anchor():
+    with patch("src.services.audit_archive.anchor_audit_blocks", AsyncMock()) as anchor:
+        yield anchor
+
+
+def test_partition_end_rolls_over_year():
+    assert _partition_end("audit_events_2025_12") == datetime.datetime(
+        2026, 1, 1, tzinfo=datetime.UTC
+    )
+    assert _partition_end("audit_events_default") is None
+
+
+@pytest.mark.asyncio
+async def test_archive_uploads_segment_and_drops_partition(_anchor):
+    rows = _chain(5)
+    storage = _FakeStorage()
+    session, dropped = _archive_session(rows)
+
+    summary = await archive_audit_events(session, older_than_days=30, storage=storage)
+
+    assert summary["events_archived"] == 5
+    assert dropped == ["audit_events_2025_01"]
+    segment = session.add.call_args[0][0]
+    assert (segment.first_event_id, segment.last_event_id) == (1, 5)
+    assert segment.first_prev_hash == "genesis"
+    assert segment.last_hash == rows[-1].row_hash
+    assert segment.application_ids == [7, 8]
+    assert set(storage.objects) == {segment.object_key}
+    # Every archived event is Merkle-anchored before its partition goes.
+    _anchor.assert_awaited_once_with(session, through_id=5)
+
+
+@pytest.mark.asyncio
+async def test_reset_chain_does_not_reuse_archive_keys():
+    """A chain restarted from id 1 (reseeding) archives to new keys; a rerun does not."""
+    storage = _FakeStorage()
+    reseeded = _TS + datetime.timedelta(days=1)
+    for rows in (_chain(3), _chain(3), _chain(3, start=reseeded)):
+        session, _ = _archive_session(rows)
+        await archive_audit_events(session, older_than_days=30, storage=storage)
+
+    assert len(storage.objects) == 2
+
+
+@pytest.mark.asyncio
+async def test_archived_segment_round_trips_with_chain_hashes():
+    rows = _chain(4)
+    storage = _FakeStorage()
+    session, _ = _archive_session(rows)
+    await archive_audit_events(session, older_than_days=30, storage=storage)
+    segment = session.add.call_args[0][0]
+
+    events = await _read(segment, storage)
+
+    assert [e.id for e in events] == [1, 2, 3, 4]
+    assert [_event_hash(e) for e in events] == [r.row_hash for r in rows]
+
+
+@pytest.mark.asyncio
+async def test_read_rejects_modified_segment():
+    storage = _FakeStorage()
+    session, _ = _archive_session(_chain(3))
+    await archive_audit_events(session, older_than_days=30, storage=storage)
+    segment = session.add.call_args[0][0]
+    storage.objects[segment.object_key] += b"x"
+
+    with pytest.raises(AuditArchiveError):
+        await _read(segment, storage)
+
+
+@pytest.mark.asyncio
+async def test_archive_refuses_broken_chain():
+    rows = _chain(4)
+    rows[2].event_data = {"i": "TAMPERED"}
+    storage = _FakeStorage()
+    session, dropped = _archive_session(rows)
+
+    with pytest.raises(AuditArchiveError):
+        await archive_audit_events(session, older_than_days=30, storage=storage)
+    assert storage.objects == {}
+    assert dropped == []
+
+
+@pytest.mark.asyncio
+async def test_archive_spills_large_segments_to_disk(monkeypatch):
+    """The compressed segment is spooled, not held whole in memory, and its digest matches."""
+    monkeypatch.setattr("src.services.audit_archive._SPOOL_MAX_BYTES", 64)
+    rows = _chain(50)
+    storage = _FakeStorage()
+    session, _ = _archive_session(rows)
+
+    await archive_audit_events(session, older_than_days=30, storage=storage)
+    segment = session.add.call_args[0][0]
+
+    assert len(await _read(segment, storage)) == 50
+
+
+@pytest.mark.asyncio
+async def test_archive_encodes_chunks_off_the_event_loop(monkeypatch):
+    """Chain checks and compression run in a worker thread, not on the loop."""
+    from src.services import audit_archive
+
+    threads = []
+    write = audit_archive._SegmentWriter.write
+
+    def _spy(self, rows):
+        threads.append(threading.get_ident())
+        return write(self, rows)
+
+    monkeypatch.setattr(audit_archive._SegmentWriter, "write", _spy)
+    monkeypatch.setattr(audit_archive.settings, "AUDIT_EXPORT_CHUNK_SIZE", 4)
+    session, _ = _archive_session(_chain(10))
+
+    await archive_audit_events(session, older_than_days=30, storage=_FakeStorage())
+
+    assert len(threads) == 3
+    assert threading.get_ident() not in threads
+
+
+@pytest.mark.asyncio
+async def test_segment_is_decoded_in_batches():
+    rows = _chain(10)
+    storage = _FakeStorage()
+    session, _ = _archive_session(rows)
+    await archive_audit_events(session, older_than_days=30, storage=storage)
+    segment = session.add.call_args[0][0]
+
+    batches = [
+        [e.id for e in batch]
+        async for batch in iter_archive_segment(segment, storage, batch_size=4)
+    ]
+
+    assert batches == [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10]]
+
+
+@pytest.mark.asyncio
+async def test_archive_waits_when_partition_is_not_an_id_prefix():
+    session, dropped = _archive_session(_chain(3), straggler=True)
+
+    assert await archive_audit_events(session, older_than_days=30) is None
+    assert dropped == []
+
+
+@pytest.mark.asyncio
+async def test_verify_resumes_from_archive_anchor():
+    anchor = AuditArchiveSegment(last_event_id=500, last_hash="a" * 64)
+    session = AsyncMock()
+    session.get = AsyncMock(return_value=None)
+    anchor_result = MagicMock()
+    anchor_result.scalar_one_or_none.return_value = anchor
+    session.execute = AsyncMock(return_value=anchor_result)
+
+    class _Empty:
+        async def partitions(self, size=None):
+            return
+            yield
+
+        async def close(self):
+            pass
+
+    session.stream = AsyncMock(return_value=_Empty())
+
+    result = await verify_audit_chain(session, full=True)
+
+    assert result == {"status": "OK", "events_checked": 0, "verified_through_id": 500}
+    stmt = session.stream.await_args.args[0]
+    assert stmt.compile().params["id_1"] == 500
+
+
+@pytest.mark.asyncio
+async def test_events_by_application_merges_archived():
+    live = [SimpleNamespace(id=9, timestamp=_TS + datetime.timedelta(days=400))]
+    archived = [SimpleNamespace(id=2, timestamp=_TS), SimpleNamespace(id=4, timestamp=_TS)]
+    session = AsyncMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = live
+    session.execute = AsyncMock(return_value=result)
+
+    with patch("src.services.audit_archive.load_archived_events", AsyncMock(return_value=archived)):
+        events = await get_events_by_application(session, 7, limit=2, include_archived=True)
+
+    assert [e.id for e in events] == [2, 4]
@@ -0,0 +1,238 @@
+# This project was developed with assistance from AI tools.
+"""Tests for Merkle-anchored audit blocks and inclusion proofs."""
+
+import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from db import AuditMerkleAnchor
+
+from src.services.audit import _event_hash
+from src.services.audit_merkle import (
+    anchor_audit_blocks,
+    get_inclusion_proofs,
+    merkle_leaf,
+    merkle_levels,
+    merkle_proof,
+    merkle_root,
+    verify_merkle_proof,
+)
+
+_TS = datetime.datetime(2026, 3, 1, 12, 0, tzinfo=datetime.UTC)
+
+
+def _row(i: int, data: dict | None = None) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=i,
+        timestamp=_TS,
+        event_type="evt",
+        user_id="u",
+        user_role="borrower",
+        application_id=7,
+        session_id="s",
+        event_data=data if data is not None else {"i": i},
+        prev_hash="x",
+    )
+
+
+def _leaves(rows) -> list[str]:
+    return [merkle_leaf(_event_hash(r)) for r in rows]
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 5, 8, 13])
+def test_every_leaf_proves_against_root(n):
+    leaves = _leaves([_row(i) for i in range(1, n + 1)])
+    levels = merkle_levels(leaves)
+    root = levels[-1][0]
+    for index, leaf in enumerate(leaves):
+        assert verify_merkle_proof(leaf, merkle_proof(levels, index), root)
+
+
+def test_proof_length_is_logarithmic():
+    levels = merkle_levels(_leaves([_row(i) for i in range(1, 1025)]))
+    assert len(merkle_proof(levels, 513)) == 10
+
+
+def test_proof_rejects_other_leaf():
+    leaves = _leaves([_row(i) for i in range(1, 9)])
+    levels = merkle_levels(leaves)
+    assert not verify_merkle_proof(leaves[3], merkle_proof(levels, 2), levels[-1][0])
+
+
+def test_leaf_and_node_hashes_are_domain_separated():
+    """A two-leaf root is not itself a valid leaf of the same tree."""
+    leaves = _leaves([_row(1), _row(2)])
+    assert merkle_root(leaves) not in leaves
+    assert merkle_leaf(_event_hash(_row(1))) != _event_hash(_row(1))
+
+
+def _anchor_session(rows: list, last_anchored: int | None = None, head_id: int | None = None):
+    session = AsyncMock()
+    session.add = MagicMock()
+    head_id = rows[-1].id if head_id is None and rows else head_id
+    session.scalar = AsyncMock(side_effect=[last_anchored, head_id])
+
+    async def _execute(stmt):
+        result = MagicMock()
+        params = stmt.compile().params if hasattr(stmt, "selected_columns") else {}
+        after = params.get("id_1", 0)
+        upto = params.get("id_2", 0)
+        limit = params.get("param_1", len(rows))
+        result.all.return_value = [r for r in rows if after < r.id <= upto][:limit]
+        return result
+
+    session.execute = AsyncMock(side_effect=_execute)
+    return session
+
+
+@pytest.mark.asyncio
+async def test_anchor_creates_complete_blocks_only():
+    """Full blocks are anchored; a trailing partial block waits for a later run."""
+    rows = [_row(i) for i in range(1, 11)]
+    session = _anchor_session(rows)
+
+    created = await anchor_audit_blocks(session, block_size=4)
+
+    assert created == 2
+    anchors = [c.args[0] for c in session.add.call_args_list]
+    assert [(a.first_event_id, a.last_event_id) for a in anchors] == [(1, 4), (5, 8)]
+    assert anchors[1].event_ids == [5, 6, 7, 8]
+    assert anchors[1].merkle_root == merkle_root(_leaves(rows[4:8]))
+    session.flush.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_anchor_stops_at_chain_head():
+    """Events past the chain head may still have uncommitted neighbours; they wait."""
+    rows = [_row(i) for i in range(1, 11)]
+    session = _anchor_session(rows, head_id=6)
+
+    assert await anchor_audit_blocks(session, block_size=4) == 1
+    assert session.add.call_args.args[0].last_event_id == 4
+
+
+@pytest.mark.asyncio
+async def test_anchor_resumes_after_last_anchor():
+    rows = [_row(i) for i in range(1, 11)]
+    session = _anchor_session(rows, last_anchored=8)
+
+    assert await anchor_audit_blocks(session, block_size=4) == 0
+    session.add.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_anchor_through_id_closes_short_final_block():
+    """Anchoring for archival puts a block boundary exactly on the archive cut."""
+    rows = [_row(i) for i in range(1, 11)]
+    session = _anchor_session(rows)
+
+    assert await anchor_audit_blocks(session, block_size=4, through_id=6) == 2
+    anchors = [c.args[0] for c in session.add.call_args_list]
+    assert [a.event_ids for a in anchors] == [[1, 2, 3, 4], [5, 6]]
+
+
+def _proof_session(anchor: AuditMerkleAnchor, block: list, archived_through: int | None = None):
+    session = AsyncMock()
+    session.scalar = AsyncMock(return_value=archived_through)
+    anchors_result = MagicMock()
+    anchors_result.scalars.return_value.all.return_value = [anchor]
+    block_result = MagicMock()
+    block_result.all.return_value = block
+    session.execute = AsyncMock(side_effect=[anchors_result, block_result])
+    return session
+
+
+@pytest.mark.asyncio
+async def test_inclusion_proofs_share_one_block_load():
+    rows = [_row(i) for i in range(1, 9)]
+    anchor = AuditMerkleAnchor(
+        id=1,
+        first_event_id=1,
+        last_event_id=8,
+        event_count=8,
+        merkle_root=merkle_root(_leaves(rows)),
+    )
+    session = _proof_session(anchor, rows)
+
+    proofs = await get_inclusion_proofs(session, [3, 6, 42])
+
+    assert set(proofs) == {3, 6}
+    assert all(p["verified"] for p in proofs.values())
+    assert proofs[3]["merkle_root"] == anchor.merkle_root
+    assert session.execute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_inclusion_proof_flags_tampered_block():
+    rows = [_row(i) for i in range(1, 9)]
+    anchor = AuditMerkleAnchor(
+        id=1,
+        first_event_id=1,
+        last_event_id=8,
+        event_count=8,
+        merkle_root=merkle_root(_leaves(rows)),
+    )
+    tampered = list(rows)
+    tampered[5] = _row(6, data={"i": "TAMPERED"})
+    session = _proof_session(anchor, tampered)
+
+    proofs = await get_inclusion_proofs(session, [2, 6])
+
+    assert not proofs[2]["verified"]
+    assert not proofs[6]["verified"]
+
+
+@pytest.mark.asyncio
+async def test_inclusion_proof_flags_missing_event():
+    """A block that lost one of its anchored events no longer verifies."""
+    rows = [_row(i) for i in range(1, 9)]
+    anchor = AuditMerkleAnchor(
+        id=1,
+        first_event_id=1,
+        last_event_id=8,
+        event_count=8,
+        event_ids=list(range(1, 9)),
+        merkle_root=merkle_root(_leaves(rows)),
+    )
+    session = _proof_session(anchor, rows[:3] + rows[4:])
+
+    proofs = await get_inclusion_proofs(session, [2])
+
+    assert not proofs[2]["verified"]
+
+
+@pytest.mark.asyncio
+async def test_inclusion_proofs_rebuild_block_straddling_archive_cut():
+    """Archived events are read back from their segment and merged with live ones."""
+    rows = [_row(i) for i in range(1, 9)]
+    anchor = AuditMerkleAnchor(
+        id=1,
+        first_event_id=1,
+        last_event_id=8,
+        event_count=8,
+        event_ids=list(range(1, 9)),
+        merkle_root=merkle_root(_leaves(rows)),
+    )
+    session = _proof_session(anchor, rows[5:], archived_through=5)
+    seen = {}
+
+    async def _archived(_session, **filters):
+        seen.update(filters)
+        yield rows[:5]
+
+    with patch("src.services.audit_archive.iter_archived_events", _archived):
+        proofs = await get_inclusion_proofs(session, [2, 7])
+
+    assert proofs[2]["verified"] and proofs[7]["verified"]
+    assert seen == {"after_id": 0, "through_id": 8}
+
+
+@pytest.mark.asyncio
+async def test_inclusion_proofs_empty_without_anchors():
+    session = AsyncMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = []
+    session.execute = AsyncMock(return_value=result)
+
+    assert await get_inclusion_proofs(session, [1, 2]) == {}
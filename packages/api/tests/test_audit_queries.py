@@ -10,10 +10,15 @@ import pytest
 from db.enums import DecisionType
 
 from src.services.audit import (
+    decode_audit_cursor,
+    encode_audit_cursor,
     export_events,
     get_decision_trace,
+    get_events_by_application,
     get_events_by_decision,
+    next_audit_cursor,
     search_events,
+    stream_export_events,
 )
 
 # ---------------------------------------------------------------------------
@@ -47,6 +52,30 @@ def _make_audit_event(
     return evt
 
 
+def _no_anchors_result():
+    """Result for the Merkle anchor lookup when nothing is anchored yet."""
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = []
+    return result
+
+
+def _mock_stream_session(*partitions):
+    """Session whose stream_scalars() yields the given event batches."""
+
+    class _StreamResult:
+        async def partitions(self, size=None):
+            for partition in partitions:
+                yield partition
+
+    session = AsyncMock()
+    session.stream_scalars = AsyncMock(return_value=_StreamResult())
+    return session
+
+
+async def _collect(chunks) -> str:
+    return "".join([chunk async for chunk in chunks])
+
+
 def _make_decision(id=1, application_id=10, decision_type=DecisionType.DENIED):
     dec = MagicMock()
     dec.id = id
@@ -124,6 +153,83 @@ class TestSearchEvents:
         result = await search_events(session, days=7, event_type="nonexistent")
         assert result == []
 
+    @pytest.mark.asyncio
+    async def test_should_filter_event_data_by_containment(self):
+        """Indexed keys compare with ->>; other fields go into one @> test."""
+        from sqlalchemy.dialects import postgresql
+
+        session = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        session.execute = AsyncMock(return_value=mock_result)
+
+        await search_events(
+            session,
+            event_type="agent_tool_called",
+            event_data={"tool_name": "uw_risk_assessment", "result": {"ok": True}},
+        )
+
+        sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "(audit_events.event_data ->> 'tool_name') =" in sql
+        assert "audit_events.event_data @>" in sql
+
+    @pytest.mark.asyncio
+    async def test_should_reject_non_object_event_data(self):
+        with pytest.raises(ValueError, match="JSON object"):
+            await search_events(AsyncMock(), event_data=["FAIL"])
+
+
+# ---------------------------------------------------------------------------
+# Service: keyset pagination
+# ---------------------------------------------------------------------------
+
+
+class TestKeysetPagination:
+    def test_cursor_round_trips(self):
+        evt = _make_audit_event(id=42)
+        assert decode_audit_cursor(encode_audit_cursor(evt)) == (evt.timestamp, 42)
+
+    @pytest.mark.parametrize("cursor", ["", "not-base64!", "eyJ0cyI6IDF9", "bnVsbA"])
+    def test_invalid_cursor_raises_value_error(self, cursor):
+        with pytest.raises(ValueError, match="Invalid audit cursor"):
+            decode_audit_cursor(cursor)
+
+    def test_next_cursor_only_on_full_page(self):
+        evts = [_make_audit_event(id=i) for i in (1, 2)]
+        assert next_audit_cursor(evts, 2) == encode_audit_cursor(evts[-1])
+        assert next_audit_cursor(evts, 3) is None
+        assert next_audit_cursor(evts, None) is None
+
+    @pytest.mark.asyncio
+    async def test_application_page_seeks_past_cursor(self):
+        """The cursor becomes a (timestamp, id) row comparison, not an OFFSET."""
+        session = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        session.execute = AsyncMock(return_value=mock_result)
+        cursor = encode_audit_cursor(_make_audit_event(id=7))
+
+        await get_events_by_application(session, 10, limit=50, cursor=cursor)
+
+        sql = str(session.execute.call_args.args[0])
+        assert "(audit_events.timestamp, audit_events.id) >" in sql
+        assert "ORDER BY audit_events.timestamp ASC, audit_events.id ASC" in sql
+        assert "OFFSET" not in sql
+
+    @pytest.mark.asyncio
+    async def test_search_pages_newest_first(self):
+        session = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        session.execute = AsyncMock(return_value=mock_result)
+        cursor = encode_audit_cursor(_make_audit_event(id=7))
+
+        await search_events(session, event_type="decision", limit=10, cursor=cursor)
+
+        sql = str(session.execute.call_args.args[0])
+        assert "(audit_events.timestamp, audit_events.id) <" in sql
+        assert "ORDER BY audit_events.timestamp DESC, audit_events.id DESC" in sql
+
 
 # ---------------------------------------------------------------------------
 # Service: get_decision_trace
@@ -145,7 +251,7 @@ class TestDecisionTrace:
         ]
         mock_result = MagicMock()
         mock_result.scalars.return_value.all.return_value = evts
-        session.execute = AsyncMock(return_value=mock_result)
+        session.execute = AsyncMock(side_effect=[mock_result, _no_anchors_result()])
 
         result = await get_decision_trace(session, 5)
         assert result is not None
@@ -155,6 +261,8 @@ class TestDecisionTrace:
         assert result["total_events"] == 3
         assert len(result["events_by_type"]["tool_call"]) == 2
         assert len(result["events_by_type"]["stage_transition"]) == 1
+        assert result["anchored_events"] == 0
+        assert result["proofs_verified"] is None
 
     @pytest.mark.asyncio
     async def test_should_return_none_for_missing_decision(self):
@@ -217,6 +325,50 @@ class TestExportEvents:
         assert data == []
 
 
+class TestStreamExportEvents:
+    @pytest.mark.asyncio
+    async def test_should_stream_ndjson_one_chunk_per_batch(self):
+        """Each cursor batch becomes one chunk of newline-delimited JSON."""
+        session = _mock_stream_session(
+            [_make_audit_event(id=1), _make_audit_event(id=2)],
+            [_make_audit_event(id=3)],
+        )
+
+        chunks = [c async for c in stream_export_events(session, fmt="ndjson")]
+        assert len(chunks) == 2
+        lines = "".join(chunks).splitlines()
+        assert [json.loads(line)["event_id"] for line in lines] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_should_stream_csv_with_single_header(self):
+        """CSV streams emit the header once, then data rows."""
+        session = _mock_stream_session([_make_audit_event(id=1)], [_make_audit_event(id=2)])
+
+        content = await _collect(stream_export_events(session, fmt="csv"))
+        rows = list(csv.DictReader(io.StringIO(content)))
+        assert [r["event_id"] for r in rows] == ["1", "2"]
+        assert content.count("event_id") == 1
+
+    @pytest.mark.asyncio
+    async def test_should_resume_after_id_in_id_order(self):
+        """after_id filters on the event id and orders the cursor by id."""
+        session = _mock_stream_session()
+
+        await _collect(stream_export_events(session, after_id=42))
+        stmt = session.stream_scalars.await_args.args[0]
+        sql = str(stmt.compile(compile_kwargs={"literal_binds": True}))
+        assert "audit_events.id > 42" in sql
+        assert "ORDER BY audit_events.id ASC" in sql
+
+    @pytest.mark.asyncio
+    async def test_should_mask_pii_per_row(self):
+        """PII in event_data is masked before serialization."""
+        session = _mock_stream_session([_make_audit_event(id=1, event_data={"ssn": "123-45-6789"})])
+
+        content = await _collect(stream_export_events(session, pii_mask=True))
+        assert "123-45-6789" not in content
+
+
 # ---------------------------------------------------------------------------
 # REST endpoint tests (functional, with mock DB)
 # ---------------------------------------------------------------------------
@@ -288,7 +440,7 @@ class TestAuditEndpointsFunctional:
         ]
         mock_result = MagicMock()
         mock_result.scalars.return_value.all.return_value = evts
-        session.execute = AsyncMock(return_value=mock_result)
+        session.execute = AsyncMock(side_effect=[mock_result, _no_anchors_result()])
 
         client = self._make_client(session)
         response = client.get("/api/audit/decision/5/trace")
@@ -322,6 +474,51 @@ class TestAuditEndpointsFunctional:
         body = response.json()
         assert body["count"] == 1
 
+    def test_should_return_next_cursor_on_full_page(self):
+        """A page filled to ``limit`` carries a cursor for the next one."""
+        session = AsyncMock()
+        evts = [_make_audit_event(id=i, application_id=10) for i in (1, 2)]
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = evts
+        session.execute = AsyncMock(return_value=mock_result)
+
+        client = self._make_client(session)
+        response = client.get("/api/audit/application/10", params={"limit": 2})
+        assert response.status_code == 200
+        cursor = response.json()["next_cursor"]
+        assert decode_audit_cursor(cursor) == (evts[-1].timestamp, 2)
+
+        response = client.get("/api/audit/application/10", params={"limit": 3})
+        assert response.json()["next_cursor"] is None
+
+    def test_should_search_by_event_data(self):
+        """GET /api/audit/search?event_data=... forwards the parsed filter."""
+        session = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [
+            _make_audit_event(id=1, event_type="compliance_check"),
+        ]
+        session.execute = AsyncMock(return_value=mock_result)
+
+        client = self._make_client(session)
+        response = client.get(
+            "/api/audit/search", params={"event_data": json.dumps({"overall_status": "FAIL"})}
+        )
+        assert response.status_code == 200
+        assert "overall_status" in str(session.execute.call_args.args[0])
+
+    @pytest.mark.parametrize("raw", ["{not json", "[1, 2]"])
+    def test_should_reject_bad_event_data_filter(self, raw):
+        client = self._make_client(AsyncMock())
+        response = client.get("/api/audit/search", params={"event_data": raw})
+        assert response.status_code == 422
+
+    def test_should_reject_invalid_cursor(self):
+        """A malformed cursor is a 422, not a 500."""
+        client = self._make_client(AsyncMock())
+        response = client.get("/api/audit/search", params={"cursor": "garbage"})
+        assert response.status_code == 422
+
     def test_should_export_json(self):
         """GET /api/audit/export?fmt=json returns JSON attachment."""
         session = AsyncMock()
@@ -350,6 +547,31 @@ class TestAuditEndpointsFunctional:
         assert response.status_code == 200
         assert "text/csv" in response.headers.get("content-type", "")
 
+    def test_should_stream_export(self, monkeypatch):
+        """GET /api/audit/export?stream=true streams NDJSON from its own session."""
+        from contextlib import asynccontextmanager
+
+        import src.routes.audit as audit_routes
+
+        stream_session = _mock_stream_session([_make_audit_event(id=7)])
+
+        @asynccontextmanager
+        async def _session_local():
+            yield stream_session
+
+        monkeypatch.setattr(audit_routes, "SessionLocal", _session_local)
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=MagicMock())
+        session.commit = AsyncMock()
+
+        client = self._make_client(session)
+        response = client.get("/api/audit/export", params={"stream": True, "after_id": 6})
+        assert response.status_code == 200
+        assert "application/x-ndjson" in response.headers.get("content-type", "")
+        assert "audit_export.ndjson" in response.headers.get("content-disposition", "")
+        assert json.loads(response.text.splitlines()[0])["event_id"] == 7
+        session.commit.assert_awaited()
+
     def test_should_reject_invalid_export_format(self):
         """GET /api/audit/export?fmt=xml returns 422."""
         session = AsyncMock()
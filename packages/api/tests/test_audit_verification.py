@@ -0,0 +1,114 @@
+# This project was developed with assistance from AI tools.
+"""Tests for the chunked, multi-process audit chain verification engine."""
+
+import asyncio
+
+import pytest
+
+from src.services.audit import _compute_hash
+from src.services.audit_verification import verify_chain_chunks, verify_chunk
+
+
+def _build_chain(n: int, start_id: int = 1, prev_hash: str = "genesis") -> list[tuple]:
+    rows = []
+    for i in range(start_id, start_id + n):
+        row = (
+            i,
+            f"2026-03-01 12:00:{i % 60:02d}+00:00",
+            "evt",
+            "user",
+            "borrower",
+            i % 7,
+            "sess",
+            {"i": i},
+            prev_hash,
+        )
+        rows.append(row)
+        prev_hash = _compute_hash(*row[:8])
+    return rows
+
+
+def _tamper(rows: list[tuple], index: int) -> None:
+    row = list(rows[index])
+    row[7] = {"i": "TAMPERED"}
+    rows[index] = tuple(row)
+
+
+async def _chunked(rows: list[tuple], size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def test_verify_chunk_uses_boundary_row():
+    """The first row's expected hash comes from the overlapping boundary row."""
+    rows = _build_chain(10)
+    checked, break_id, last_hash = verify_chunk(rows[5:], rows[4], None)
+    assert (checked, break_id) == (5, None)
+    assert last_hash == _compute_hash(*rows[-1][:8])
+
+
+@pytest.mark.asyncio
+async def test_single_chunk_hashed_off_the_event_loop(monkeypatch):
+    """A chain that fits in one chunk is still hashed in a worker thread."""
+    calls = []
+    to_thread = asyncio.to_thread
+
+    async def _to_thread(fn, *args):
+        calls.append(fn)
+        return await to_thread(fn, *args)
+
+    monkeypatch.setattr("src.services.audit_verification.asyncio.to_thread", _to_thread)
+    rows = _build_chain(20)
+    outcome = await verify_chain_chunks(_chunked(rows, 100), max_workers=2)
+    assert calls == [verify_chunk]
+    assert outcome.ok
+    assert outcome.events_checked == 20
+    assert outcome.last_id == 20
+
+
+@pytest.mark.asyncio
+async def test_multi_chunk_chain_ok():
+    rows = _build_chain(250)
+    outcome = await verify_chain_chunks(_chunked(rows, 40), max_workers=2)
+    assert outcome.ok
+    assert outcome.events_checked == 250
+    assert outcome.last_hash == _compute_hash(*rows[-1][:8])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("tampered_index", [0, 39, 40, 41, 130, 249])
+async def test_break_matches_sequential_walk(tampered_index):
+    """Breaks inside a chunk or on a boundary row report like a sequential walk."""
+    rows = _build_chain(250)
+    _tamper(rows, tampered_index)
+    sequential = verify_chunk(rows, None, "genesis")
+
+    outcome = await verify_chain_chunks(_chunked(rows, 40), max_workers=2)
+
+    if tampered_index == 249:
+        # Tampering the tail row is only detectable once a successor exists.
+        assert outcome.ok
+    else:
+        assert not outcome.ok
+        assert outcome.first_break_id == rows[tampered_index + 1][0]
+        assert (outcome.events_checked, outcome.first_break_id) == sequential[:2]
+
+
+@pytest.mark.asyncio
+async def test_resumes_from_expected_hash():
+    """A chain segment verifies against the hash of the event before it."""
+    head = _build_chain(10)
+    tail = _build_chain(90, start_id=11, prev_hash=_compute_hash(*head[-1][:8]))
+    outcome = await verify_chain_chunks(
+        _chunked(tail, 25), expected=_compute_hash(*head[-1][:8]), max_workers=2
+    )
+    assert outcome.ok
+    assert outcome.events_checked == 90
+
+
+@pytest.mark.asyncio
+async def test_empty_chain():
+    outcome = await verify_chain_chunks(_chunked([], 10))
+    assert outcome.ok
+    assert outcome.events_checked == 0
+    assert outcome.last_id is None
@@ -0,0 +1,146 @@
+# This project was developed with assistance from AI tools.
+"""Tests for the group-commit audit writer."""
+
+import asyncio
+import datetime
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.services.audit import _compute_hash
+from src.services.audit_writer import AuditWriter
+
+_TS = datetime.datetime(2026, 3, 1, 12, 0, 0, tzinfo=datetime.UTC)
+
+
+def _mock_session_factory(ids: list[int], prev_event=None, fail_insert: bool = False):
+    """Session factory whose session answers lock, tail, reserve, and insert calls."""
+    session = AsyncMock()
+    inserts: list = []
+
+    async def _execute(stmt):
+        sql = str(stmt)
+        result = MagicMock()
+        if "pg_advisory_xact_lock" in sql:
+            return result
+        if "nextval" in sql:
+            result.all.return_value = [
+                SimpleNamespace(id=i, ts=_TS) for i in ids[: stmt.compile().params["n"]]
+            ]
+            return result
+        if sql.startswith("INSERT INTO audit_chain_head"):
+            return result
+        if sql.startswith("INSERT"):
+            if fail_insert:
+                raise RuntimeError("insert failed")
+            inserts.append(stmt)
+            return result
+        # Neither a chain head nor a previous event: fresh chain.
+        result.scalar_one_or_none.return_value = prev_event
+        return result
+
+    session.execute = AsyncMock(side_effect=_execute)
+
+    @asynccontextmanager
+    async def _factory():
+        yield session
+
+    return _factory, session, inserts
+
+
+@pytest.mark.asyncio
+async def test_batch_takes_lock_once_and_inserts_once():
+    """Events queued together share one advisory lock and one INSERT."""
+    factory, session, inserts = _mock_session_factory(ids=[10, 11, 12])
+    writer = AuditWriter(factory, max_batch_size=10, max_wait_ms=20)
+
+    futures = [writer.submit(event_type=f"evt_{i}", user_id="u") for i in range(3)]
+    ids = await asyncio.gather(*futures)
+    await writer.stop()
+
+    assert ids == [10, 11, 12]
+    lock_calls = [c for c in session.execute.await_args_list if "pg_advisory" in str(c.args[0])]
+    assert len(lock_calls) == 1
+    assert len(inserts) == 1
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_batch_extends_chain_in_memory():
+    """Each row's prev_hash is the hash of the row before it in the batch."""
+    factory, _session, inserts = _mock_session_factory(ids=[7, 8])
+    writer = AuditWriter(factory, max_batch_size=10, max_wait_ms=20)
+
+    f1 = writer.submit(event_type="first", session_id="s1", event_data={"n": 1})
+    f2 = writer.submit(event_type="second", session_id="s1", event_data={"n": 2})
+    await asyncio.gather(f1, f2)
+    await writer.stop()
+
+    params = inserts[0].compile().params
+    assert params["prev_hash_m0"] == "genesis"
+    assert params["prev_hash_m1"] == _compute_hash(
+        7, str(_TS), "first", None, None, None, "s1", {"n": 1}
+    )
+    assert params["row_hash_m0"] == params["prev_hash_m1"]
+
+
+@pytest.mark.asyncio
+async def test_batch_advances_chain_head_once():
+    """The chain head is moved once, to the batch's last row and hash."""
+    factory, session, inserts = _mock_session_factory(ids=[3, 4, 5])
+    writer = AuditWriter(factory, max_batch_size=10, max_wait_ms=20)
+
+    await asyncio.gather(*[writer.submit(event_type="evt") for _ in range(3)])
+    await writer.stop()
+
+    head_calls = [
+        c.args[0]
+        for c in session.execute.await_args_list
+        if str(c.args[0]).startswith("INSERT INTO audit_chain_head")
+    ]
+    assert len(head_calls) == 1
+    head_params = head_calls[0].compile().params
+    assert head_params["last_id"] == 5
+    assert head_params["last_hash"] == inserts[0].compile().params["row_hash_m2"]
+
+
+@pytest.mark.asyncio
+async def test_batch_respects_max_batch_size():
+    """Queued events beyond max_batch_size are written in a later batch."""
+    factory, session, inserts = _mock_session_factory(ids=[1, 2, 3])
+    writer = AuditWriter(factory, max_batch_size=2, max_wait_ms=20)
+
+    futures = [writer.submit(event_type="evt") for _ in range(3)]
+    await asyncio.gather(*futures)
+    await writer.stop()
+
+    assert len(inserts) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_propagates_to_futures():
+    """A failed flush surfaces the error on every future in the batch."""
+    factory, _session, _inserts = _mock_session_factory(ids=[1, 2], fail_insert=True)
+    writer = AuditWriter(factory, max_batch_size=10, max_wait_ms=20)
+
+    futures = [writer.submit(event_type="evt") for _ in range(2)]
+    results = await asyncio.gather(*futures, return_exceptions=True)
+    await writer.stop()
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_queue():
+    """stop() flushes events that were queued but not yet awaited."""
+    factory, _session, inserts = _mock_session_factory(ids=[1])
+    writer = AuditWriter(factory, max_batch_size=10, max_wait_ms=0)
+
+    future = writer.submit(event_type="evt")
+    await writer.stop()
+
+    assert future.result() == 1
+    assert len(inserts) == 1
+    assert not writer.is_running
@@ -338,6 +338,49 @@ async def test_audit_trail_empty(mock_audit, mock_get_events, mock_session_cls):
     assert "No audit events found" in result
 
 
+@pytest.mark.asyncio
+@patch("src.agents.ceo_tools._AUDIT_TRAIL_PAGE_SIZE", 2)
+@patch("src.agents.ceo_tools.SessionLocal")
+@patch("src.agents.ceo_tools.get_events_by_application")
+@patch("src.agents.ceo_tools.write_audit_event", new_callable=AsyncMock)
+async def test_audit_trail_full_page_offers_cursor(mock_audit, mock_get_events, mock_session_cls):
+    ctx, mock_session = _mock_session_ctx()
+    mock_session_cls.return_value = ctx
+
+    events = []
+    for i in (1, 2):
+        evt = MagicMock()
+        evt.id = i
+        evt.timestamp = datetime(2026, 2, 1, 10, i, 0, tzinfo=UTC)
+        evt.event_type = "stage_transition"
+        evt.user_id = None
+        events.append(evt)
+    mock_get_events.return_value = events
+
+    from src.agents.ceo_tools import ceo_audit_trail
+
+    result = await ceo_audit_trail.ainvoke({"application_id": 100, "state": _CEO_STATE})
+
+    assert "More events remain" in result
+    assert "cursor=" in result
+
+
+@pytest.mark.asyncio
+@patch("src.agents.ceo_tools.SessionLocal")
+@patch("src.agents.ceo_tools.write_audit_event", new_callable=AsyncMock)
+async def test_audit_trail_invalid_cursor(mock_audit, mock_session_cls):
+    ctx, mock_session = _mock_session_ctx()
+    mock_session_cls.return_value = ctx
+
+    from src.agents.ceo_tools import ceo_audit_trail
+
+    result = await ceo_audit_trail.ainvoke(
+        {"application_id": 100, "cursor": "garbage", "state": _CEO_STATE}
+    )
+
+    assert "cursor is not valid" in result
+
+
 # ---------------------------------------------------------------------------
 # ceo_decision_trace
 # ---------------------------------------------------------------------------
@@ -225,6 +225,219 @@ async def test_output_shield_replaces_unsafe_response(_fresh_graph, monkeypatch)
     mock_checker.check_output.assert_awaited_once()
 
 
+# -- Speculative input shield --
+
+
+def _speculative_graph(agent_llm, tools=None):
+    from unittest.mock import MagicMock
+
+    from src.agents.base import build_routed_graph
+    from src.agents.tools import affordability_calc, product_info
+
+    mock_fast = MagicMock()
+    mock_fast.bind = MagicMock(return_value=mock_fast)
+    return build_routed_graph(
+        system_prompt="test",
+        tools=tools or [product_info, affordability_calc],
+        llms={"fast_small": mock_fast, "capable_large": agent_llm},
+        speculative_input_shield=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_speculative_shield_overlaps_agent_call(_fresh_graph, monkeypatch):
+    """should start the agent call before the input shield verdict arrives."""
+    import asyncio
+    from unittest.mock import AsyncMock, MagicMock
+
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    from src.inference.safety import SafetyChecker, SafetyResult
+
+    events: list[str] = []
+
+    async def check_input(_msg):
+        events.append("shield_start")
+        await asyncio.sleep(0.05)
+        events.append("shield_done")
+        return SafetyResult(is_safe=True)
+
+    async def agent_call(_messages):
+        events.append("agent_start")
+        return AIMessage(content="Hello! How can I help?")
+
+    mock_checker = AsyncMock(spec=SafetyChecker)
+    mock_checker.check_input.side_effect = check_input
+    mock_checker.check_output.return_value = SafetyResult(is_safe=True)
+    monkeypatch.setattr("src.agents.base.get_safety_checker", lambda: mock_checker)
+    monkeypatch.setattr("src.inference.router.classify_query", lambda q: "capable_large")
+
+    agent_llm = MagicMock()
+    agent_llm.ainvoke = AsyncMock(side_effect=agent_call)
+    agent_llm.bind_tools.return_value = agent_llm
+
+    result = await _speculative_graph(agent_llm).ainvoke(
+        {"messages": [HumanMessage(content="Hello")]}
+    )
+
+    assert events.index("agent_start") < events.index("shield_done")
+    assert not result.get("safety_blocked")
+    assert result["messages"][-1].content == "Hello! How can I help?"
+    mock_checker.check_output.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_speculative_shield_block_cancels_agent_and_tools(_fresh_graph, monkeypatch):
+    """should cancel the agent call and never run tools when the input is unsafe."""
+    import asyncio
+    from unittest.mock import AsyncMock, MagicMock
+
+    from langchain_core.messages import AIMessage, HumanMessage
+    from langchain_core.tools import tool
+
+    from src.agents.base import SAFETY_REFUSAL_MESSAGE
+    from src.inference.safety import SafetyChecker, SafetyResult
+
+    cancelled = asyncio.Event()
+    tool_ran = False
+
+    @tool
+    def lookup(query: str) -> str:
+        """Look something up."""
+        nonlocal tool_ran
+        tool_ran = True
+        return "result"
+
+    async def agent_call(_messages):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return AIMessage(
+            content="", tool_calls=[{"name": "lookup", "args": {"query": "x"}, "id": "1"}]
+        )
+
+    async def check_input(_msg):
+        await asyncio.sleep(0.01)  # let the agent call start
+        return SafetyResult(is_safe=False, violation_categories=["S1"])
+
+    mock_checker = AsyncMock(spec=SafetyChecker)
+    mock_checker.check_input.side_effect = check_input
+    monkeypatch.setattr("src.agents.base.get_safety_checker", lambda: mock_checker)
+    monkeypatch.setattr("src.inference.router.classify_query", lambda q: "capable_large")
+
+    agent_llm = MagicMock()
+    agent_llm.ainvoke = AsyncMock(side_effect=agent_call)
+    agent_llm.bind_tools.return_value = agent_llm
+
+    result = await _speculative_graph(agent_llm, tools=[lookup]).ainvoke(
+        {"messages": [HumanMessage(content="harmful request")]}
+    )
+
+    assert result.get("safety_blocked") is True
+    assert result["messages"][-1].content == SAFETY_REFUSAL_MESSAGE
+    assert cancelled.is_set()
+    assert tool_ran is False
+    mock_checker.check_output.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_speculative_shield_error_fails_closed(_fresh_graph, monkeypatch):
+    """should surface a shield error instead of the speculative agent output."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    from src.inference.safety import SafetyChecker
+
+    mock_checker = AsyncMock(spec=SafetyChecker)
+    mock_checker.check_input.side_effect = RuntimeError("guard down")
+    monkeypatch.setattr("src.agents.base.get_safety_checker", lambda: mock_checker)
+    monkeypatch.setattr("src.inference.router.classify_query", lambda q: "capable_large")
+
+    agent_llm = MagicMock()
+    agent_llm.ainvoke = AsyncMock(return_value=AIMessage(content="unverified"))
+    agent_llm.bind_tools.return_value = agent_llm
+
+    with pytest.raises(RuntimeError, match="guard down"):
+        await _speculative_graph(agent_llm).ainvoke({"messages": [HumanMessage(content="Hi")]})
+
+
+@pytest.mark.asyncio
+async def test_speculative_mode_summarizes_only_after_the_verdict(_fresh_graph, monkeypatch):
+    """should run the shield before the context summarizer when a fold is due."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    from src.inference.safety import SafetyChecker, SafetyResult
+
+    events: list[str] = []
+
+    async def check_input(_msg):
+        events.append("shield")
+        return SafetyResult(is_safe=True)
+
+    async def summarize(_llm, _previous, _messages, _tool_chars):
+        events.append("summarize")
+        return "summary"
+
+    async def agent_call(_messages):
+        events.append("agent")
+        return AIMessage(content="Answer")
+
+    mock_checker = AsyncMock(spec=SafetyChecker)
+    mock_checker.check_input.side_effect = check_input
+    mock_checker.check_output.return_value = SafetyResult(is_safe=True)
+    monkeypatch.setattr("src.agents.base.get_safety_checker", lambda: mock_checker)
+    monkeypatch.setattr("src.inference.router.classify_query", lambda q: "capable_large")
+    monkeypatch.setattr("src.agents.context.fold_point", lambda messages, **_: 1)
+    monkeypatch.setattr("src.agents.context.summarize", summarize)
+
+    agent_llm = MagicMock()
+    agent_llm.ainvoke = AsyncMock(side_effect=agent_call)
+    agent_llm.bind_tools.return_value = agent_llm
+
+    result = await _speculative_graph(agent_llm).ainvoke(
+        {"messages": [HumanMessage(content="Earlier"), HumanMessage(content="Now")]}
+    )
+
+    assert events == ["shield", "summarize", "agent"]
+    assert result["context_summary"] == "summary"
+
+
+@pytest.mark.asyncio
+async def test_speculative_mode_never_summarizes_blocked_input(_fresh_graph, monkeypatch):
+    """should not send a blocked message's conversation to the summarizer."""
+    from unittest.mock import AsyncMock, MagicMock
+
+    from langchain_core.messages import HumanMessage
+
+    from src.agents.base import SAFETY_REFUSAL_MESSAGE
+    from src.inference.safety import SafetyChecker, SafetyResult
+
+    mock_checker = AsyncMock(spec=SafetyChecker)
+    mock_checker.check_input.return_value = SafetyResult(is_safe=False, violation_categories=["S1"])
+    monkeypatch.setattr("src.agents.base.get_safety_checker", lambda: mock_checker)
+    monkeypatch.setattr("src.inference.router.classify_query", lambda q: "capable_large")
+    monkeypatch.setattr("src.agents.context.fold_point", lambda messages, **_: 1)
+    summarize = AsyncMock(return_value="summary")
+    monkeypatch.setattr("src.agents.context.summarize", summarize)
+
+    agent_llm = MagicMock()
+    agent_llm.ainvoke = AsyncMock()
+    agent_llm.bind_tools.return_value = agent_llm
+
+    result = await _speculative_graph(agent_llm).ainvoke(
+        {"messages": [HumanMessage(content="Earlier"), HumanMessage(content="Now")]}
+    )
+
+    assert result["messages"][-1].content == SAFETY_REFUSAL_MESSAGE
+    summarize.assert_not_awaited()
+    agent_llm.ainvoke.assert_not_awaited()
+
+
 # -- Rule-based model routing --
 
 
@@ -0,0 +1,249 @@
+# This project was developed with assistance from AI tools.
+"""Tests for moderated token streaming over the chat WebSocket."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import WebSocketDisconnect
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from src.agents import budget
+from src.agents.base import SAFETY_REFUSAL_MESSAGE
+from src.inference.safety import SafetyChecker, SafetyResult
+from src.routes._chat_handler import run_agent_stream
+from src.routes._chat_stream import ModeratedStream
+
+
+def _checker(*verdicts: bool):
+    checker = AsyncMock(spec=SafetyChecker)
+    checker.check_output.side_effect = [SafetyResult(is_safe=v) for v in verdicts]
+    return checker
+
+
+async def _stream(chunks, checker=None, *, segment=2, context=2):
+    sent: list[str] = []
+
+    async def send(segment_text):
+        sent.append(segment_text)
+
+    stream = ModeratedStream(
+        send,
+        checker,
+        user_message="hi",
+        segment_sentences=segment,
+        context_sentences=context,
+    )
+    for chunk in chunks:
+        await stream.feed(chunk)
+    await stream.finish()
+    return stream, sent
+
+
+# -- ModeratedStream --
+
+
+@pytest.mark.asyncio
+async def test_releases_segments_of_whole_sentences():
+    """should release text in sentence segments that concatenate to the response."""
+    chunks = ["  One. Tw", "o! Three", "? Four.", " Fi", "ve"]
+    stream, sent = await _stream(chunks)
+
+    assert sent == ["One. Two!", " Three? Four.", " Five"]
+    assert stream.text == "One. Two! Three? Four. Five"
+
+
+@pytest.mark.asyncio
+async def test_checks_each_segment_with_released_context():
+    """should check each segment together with the last released sentences."""
+    checker = _checker(True, True)
+    await _stream(["A. B. C. D."], checker, context=1)
+
+    windows = [call.args[1] for call in checker.check_output.await_args_list]
+    assert windows == ["A. B.", "B. C. D."]
+
+
+@pytest.mark.asyncio
+async def test_blocked_segment_stops_release():
+    """should release nothing after a blocked segment."""
+    checker = _checker(True, False)
+    stream, sent = await _stream(["A. B. C. D. E. F."], checker)
+
+    assert stream.blocked
+    assert sent == ["A. B."]
+    assert checker.check_output.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cleans_artifacts_before_release():
+    """should strip think blocks and bold markers split across chunks."""
+    _, sent = await _stream(["<thi", "nk>plan</th", "ink>**Hi", "** there."])
+    assert sent == ["Hi there."]
+
+
+# -- run_agent_stream --
+
+
+class _Graph:
+    def __init__(self, events):
+        self._events = events
+
+    async def astream_events(self, *_args, **_kwargs):
+        for event in self._events:
+            yield event
+
+
+def _token(text, node="agent_capable"):
+    return {
+        "event": "on_chat_model_stream",
+        "metadata": {"langgraph_node": node},
+        "data": {"chunk": AIMessageChunk(content=text)},
+    }
+
+
+def _node_start(node):
+    return {"event": "on_chain_start", "name": node, "metadata": {"langgraph_node": node}}
+
+
+def _node_end(node, output=None):
+    return {
+        "event": "on_chain_end",
+        "name": node,
+        "metadata": {"langgraph_node": node},
+        "data": {"output": output or {}},
+    }
+
+
+async def _exchange(monkeypatch, events, checker=None, audit=None) -> list[dict]:
+    monkeypatch.setattr("src.routes._chat_handler.get_safety_checker", lambda: checker)
+    monkeypatch.setattr("src.routes._chat_handler.get_audit_writer", lambda: audit or AsyncMock())
+    calls = 0
+
+    async def receive_text():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            return json.dumps({"type": "message", "content": "hi"})
+        if calls == 2:
+            await asyncio.Event().wait()  # disconnect watcher, cancelled after the turn
+        raise WebSocketDisconnect()
+
+    ws = MagicMock()
+    ws.receive_text = AsyncMock(side_effect=receive_text)
+    ws.send_json = AsyncMock()
+    await run_agent_stream(
+        ws,
+        _Graph(events),
+        thread_id="t",
+        session_id="s",
+        user_role="prospect",
+        user_id="u",
+        use_checkpointer=True,
+        messages_fallback=None,
+    )
+    return [call.args[0] for call in ws.send_json.await_args_list]
+
+
+@pytest.mark.asyncio
+async def test_run_agent_stream_sends_deltas_then_done(monkeypatch):
+    """should stream delta segments before the done message."""
+    sent = await _exchange(
+        monkeypatch,
+        [_token("First. Sec"), _token("ond. Third."), _node_end("output_shield")],
+    )
+
+    assert sent == [
+        {"type": "delta", "content": "First. Second."},
+        {"type": "delta", "content": " Third."},
+        {"type": "done", "content": "First. Second. Third."},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_agent_stream_retracts_on_blocked_segment(monkeypatch):
+    """should replace streamed text with the refusal when a later segment is blocked."""
+    sent = await _exchange(
+        monkeypatch,
+        [_token("Fine. Fine. Bad. Bad."), _node_end("output_shield")],
+        checker=_checker(True, False),
+    )
+
+    assert sent == [
+        {"type": "delta", "content": "Fine. Fine."},
+        {"type": "retract", "content": SAFETY_REFUSAL_MESSAGE},
+        {"type": "done", "content": SAFETY_REFUSAL_MESSAGE},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_agent_stream_retracts_on_graph_output_shield_block(monkeypatch):
+    """should retract streamed text when the final output shield blocks."""
+    refusal = {"messages": [AIMessage(content=SAFETY_REFUSAL_MESSAGE)]}
+    sent = await _exchange(
+        monkeypatch,
+        [_token("One. Two."), _node_start("output_shield"), _node_end("output_shield", refusal)],
+    )
+
+    assert [m["type"] for m in sent] == ["delta", "retract", "done"]
+    assert sent[-1]["content"] == SAFETY_REFUSAL_MESSAGE
+
+
+@pytest.mark.asyncio
+async def test_run_agent_stream_discards_speculative_tokens_when_input_blocked(monkeypatch):
+    """should never stream speculative-agent tokens for a blocked input."""
+    blocked = {"safety_blocked": True, "messages": [AIMessage(content=SAFETY_REFUSAL_MESSAGE)]}
+    sent = await _exchange(
+        monkeypatch,
+        [
+            _token("Leaked. Text.", node="speculative_agent"),
+            _node_end("speculative_agent", blocked),
+        ],
+    )
+
+    assert sent == [{"type": "done", "content": SAFETY_REFUSAL_MESSAGE}]
+
+
+@pytest.mark.asyncio
+async def test_run_agent_stream_releases_speculative_tokens_after_verdict(monkeypatch):
+    """should stream held speculative-agent tokens once the input shield passes."""
+    sent = await _exchange(
+        monkeypatch,
+        [
+            _token("Hello. There.", node="speculative_agent"),
+            _node_end("speculative_agent"),
+            _node_end("output_shield"),
+        ],
+    )
+
+    assert sent == [
+        {"type": "delta", "content": "Hello. There."},
+        {"type": "done", "content": "Hello. There."},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_agent_stream_appends_budget_partial_answer_and_audits(monkeypatch):
+    """should stream the budget-exhausted answer after earlier text and audit the turn."""
+    usage = {**budget.new_usage(), "llm_calls": 8, "exhausted": "max_llm_calls"}
+    partial = {"messages": [AIMessage(content="Out of budget.")]}
+    audit = AsyncMock()
+    sent = await _exchange(
+        monkeypatch,
+        [
+            _node_end("classify", {"turn_budget": {"max_llm_calls": 8}}),
+            _token("Checking now."),
+            _node_end("agent_capable", {"turn_usage": usage}),
+            _node_end("budget_exhausted", partial),
+            _node_start("output_shield"),
+            _node_end("output_shield"),
+        ],
+        audit=audit,
+    )
+
+    assert sent[-1] == {"type": "done", "content": "Checking now.\n\nOut of budget."}
+    (call,) = [
+        c for c in audit.submit.await_args_list if c.kwargs["event_type"] == "agent_turn_budget"
+    ]
+    assert call.kwargs["event_data"]["limits"] == {"max_llm_calls": 8}
+    assert call.kwargs["event_data"]["exhausted"] == "max_llm_calls"
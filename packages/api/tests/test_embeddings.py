@@ -1,6 +1,7 @@
 # This project was developed with assistance from AI tools.
 """Tests for the embedding provider abstraction."""
 
+import asyncio
 import time
 from unittest.mock import MagicMock, patch
 
@@ -46,6 +47,25 @@ class TestLocalEmbeddingProvider:
             normalize_embeddings=True,
         )
 
+    @pytest.mark.asyncio
+    async def test_encodes_off_the_event_loop(self):
+        """A slow CPU encode must not block the event loop, or callers'
+        timeouts (e.g. the 250 ms routing budget) could never fire."""
+        provider = LocalEmbeddingProvider("test-model", dimensions=1)
+
+        def slow_encode(texts, normalize_embeddings):
+            time.sleep(0.5)
+            return np.array([[1.0]])
+
+        fake_model = MagicMock()
+        fake_model.encode.side_effect = slow_encode
+        provider._model = fake_model
+
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(provider.embed(["hello"]), 0.05)
+        assert time.monotonic() - started < 0.3
+
     @pytest.mark.asyncio
     async def test_lazy_loads_model(self):
         """Model must not load at construction time -- only on first embed
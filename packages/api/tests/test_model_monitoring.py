@@ -463,3 +463,50 @@ class TestModelMonitoringErrorHandling:
         assert response.status_code == 200
         data = response.json()
         assert "p50_ms" in data
+
+
+class TestSafetyCacheEndpoint:
+    """GET /api/analytics/model-monitoring/safety-cache."""
+
+    @pytest.fixture(autouse=True)
+    def _clean(self):
+        from src.main import app
+
+        yield
+        app.dependency_overrides.clear()
+
+    def _make_client(self):
+        from fastapi.testclient import TestClient
+
+        from src.main import app
+        from tests.functional.mock_db import configure_app_for_persona, make_mock_session
+        from tests.functional.personas import ceo
+
+        configure_app_for_persona(app, ceo(), make_mock_session())
+        return TestClient(app)
+
+    @patch("src.routes.model_monitoring.verdict_cache_stats")
+    def test_should_report_cache_counters(self, mock_stats):
+        """Should expose the checker's verdict cache counters with a hit rate."""
+        mock_stats.return_value = {"hits": 3, "misses": 1, "entries": 2, "max_entries": 8}
+
+        response = self._make_client().get("/api/analytics/model-monitoring/safety-cache")
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "enabled": True,
+            "hits": 3,
+            "misses": 1,
+            "hit_rate": 75.0,
+            "entries": 2,
+            "max_entries": 8,
+        }
+
+    @patch("src.routes.model_monitoring.verdict_cache_stats", return_value=None)
+    def test_should_report_disabled_when_shields_are_off(self, _mock_stats):
+        """Should report enabled=False without counters when no safety model is set."""
+        response = self._make_client().get("/api/analytics/model-monitoring/safety-cache")
+
+        assert response.status_code == 200
+        assert response.json()["enabled"] is False
+        assert response.json()["hits"] == 0
@@ -1,14 +1,19 @@
 # This project was developed with assistance from AI tools.
 """Tests for model routing config loading and query classification."""
 
+import asyncio
+import os
 import textwrap
 from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+import yaml
 
 from src.inference import config as config_mod
+from src.inference import router as router_mod
 from src.inference.config import _resolve_env_vars, load_config
-from src.inference.router import classify_query
+from src.inference.router import EmbeddingRouter, classify_query, route_query, warm_router
 
 
 @pytest.fixture(autouse=True)
@@ -16,11 +21,13 @@ def _reset_config_cache():
     """Reset the config module cache before each test."""
     config_mod._cached_config = None
     config_mod._cached_mtime = 0.0
+    router_mod._compiled = None
     original_path = config_mod._CONFIG_PATH
     yield
     config_mod._CONFIG_PATH = original_path
     config_mod._cached_config = None
     config_mod._cached_mtime = 0.0
+    router_mod._compiled = None
 
 
 def _write_standard_config(tmp_path: Path) -> None:
@@ -189,6 +196,31 @@ def test_classify_complex_keyword_takes_precedence(tmp_path):
     assert classify_query("DTI limit?") == "capable_large"
 
 
+def test_compiled_pattern_matches_like_substring_checks():
+    """Should match exactly where any keyword is a substring of the query."""
+    words = ["hi", "hello", "thanks", "thank you", "what is", "dti", "debt-to-income", "w-2", "1.5"]
+    pattern = router_mod._trie_pattern(words)
+    queries = [
+        "hi",
+        "oh hello",
+        "thank u",
+        "thank you!",
+        "what's this",
+        "what is dti",
+        "debt to income",
+        "my debt-to-income",
+        "w2 form",
+        "a w-2 form",
+        "rate 1x5",
+        "rate 1.5",
+        "",
+    ]
+
+    for query in queries:
+        assert bool(pattern.search(query)) == any(w in query for w in words), query
+    assert router_mod._trie_pattern([]) is None
+
+
 # -- Hot-reload --
 
 
@@ -225,6 +257,40 @@ def test_hot_reload_picks_up_mtime_change(tmp_path):
     assert cfg2["models"]["fast_small"]["model_name"] == "updated-small"
 
 
+async def _eventually(predicate, timeout: float = 5.0) -> None:
+    """Yield to the event loop until ``predicate()`` holds, failing after ``timeout``."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            pytest.fail(f"condition not met within {timeout}s")
+        await asyncio.sleep(0.005)
+
+
+@pytest.mark.asyncio
+async def test_watched_config_pushes_recompiled_rules(tmp_path, monkeypatch):
+    """Should route from the pushed rules without stat calls, and pick up file changes."""
+    _write_standard_config(tmp_path)
+    cfg_path = config_mod._CONFIG_PATH
+    task = asyncio.create_task(config_mod.watch_config(0.01))
+    await _eventually(config_mod.is_watching)
+
+    # The per-message path does not reload (or stat) the config
+    reload = config_mod._reload
+    monkeypatch.setattr(config_mod, "_reload", MagicMock(side_effect=AssertionError))
+    assert classify_query("hello") == "fast_small"
+    monkeypatch.setattr(config_mod, "_reload", reload)
+
+    cfg_path.write_text(cfg_path.read_text().replace('"ecoa"', '"ecoa", "hello"'))
+    mtime = cfg_path.stat().st_mtime + 1
+    os.utime(cfg_path, (mtime, mtime))
+    await _eventually(lambda: classify_query("hello") == "capable_large")
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert not config_mod.is_watching()
+
+
 def test_hot_reload_keeps_cached_on_bad_yaml(tmp_path):
     """Broken YAML during hot-reload falls back to last valid config."""
     from src.inference.config import get_config
@@ -298,3 +364,148 @@ def test_startup_fails_on_invalid_config(tmp_path):
     config_mod._CONFIG_PATH = cfg
     with pytest.raises(ValueError, match="must contain a 'models' section"):
         get_config()
+
+
+# -- Embedding routing --
+
+_INTENTS = {
+    "greeting": {"tier": "simple", "examples": ["hello", "hello there"]},
+    "status": {"tier": "complex", "examples": ["loan status", "my loan status"]},
+}
+
+
+def _axis_vectors(texts: list[str]) -> list[list[float]]:
+    """Two-axis embedding: greeting words vs loan words."""
+    return [
+        [
+            float(sum(w in t for w in ("hello", "hi"))),
+            float(sum(w in t for w in ("loan", "status"))),
+        ]
+        for t in texts
+    ]
+
+
+async def _axis_embed(texts: list[str]) -> list[list[float]]:
+    return _axis_vectors(texts)
+
+
+def _write_embedding_config(tmp_path: Path) -> None:
+    _write_standard_config(tmp_path)
+    cfg = config_mod._CONFIG_PATH
+    cfg.write_text(
+        cfg.read_text().replace(
+            "strategy: rule_based",
+            "strategy: embedding\n    embedding:\n      examples: examples.yaml",
+        )
+    )
+    (tmp_path / "examples.yaml").write_text(yaml.safe_dump({"intents": _INTENTS}))
+
+
+@pytest.fixture
+def _reset_router():
+    yield
+    router_mod._router = None
+
+
+@pytest.mark.asyncio
+async def test_embedding_router_picks_nearest_intent_tier():
+    """Should label a query with the tier of its nearest intent centroid."""
+    router = EmbeddingRouter(_INTENTS, min_margin=0.1, embed=_axis_embed)
+    await router.build()
+
+    assert await router.classify("hello!") == "simple"
+    assert await router.classify("where is my loan") == "complex"
+
+
+@pytest.mark.asyncio
+async def test_embedding_router_abstains_on_close_calls():
+    """Should return None when simple and complex intents are within min_margin."""
+    router = EmbeddingRouter(_INTENTS, min_margin=0.1, embed=_axis_embed)
+    await router.build()
+
+    assert await router.classify("hi, loan question") is None
+
+
+def test_embedding_router_requires_both_tiers():
+    """Should reject intents that cannot route to both tiers."""
+    with pytest.raises(ValueError, match="both simple and complex"):
+        EmbeddingRouter({"greeting": _INTENTS["greeting"]}, min_margin=0.1)
+
+
+@pytest.mark.asyncio
+async def test_route_query_uses_centroids_over_keywords(tmp_path, monkeypatch, _reset_router):
+    """Should route by embedding once warmed, even when a keyword would say complex."""
+    _write_embedding_config(tmp_path)
+    monkeypatch.setattr(router_mod, "_default_embed", _axis_embed)
+
+    # Before warm-up the keyword rules decide ("application" is complex)
+    assert await route_query("hello application") == "capable_large"
+    await warm_router()
+    assert await route_query("hello application") == "fast_small"
+
+
+@pytest.mark.asyncio
+async def test_route_query_falls_back_to_rules_on_embedding_error(
+    tmp_path, monkeypatch, _reset_router
+):
+    """Should use the keyword rules when the query embedding fails."""
+    _write_embedding_config(tmp_path)
+    monkeypatch.setattr(router_mod, "_default_embed", _axis_embed)
+    await warm_router()
+    monkeypatch.setattr(
+        router_mod._router, "_embed", AsyncMock(side_effect=ConnectionError("down"))
+    )
+
+    assert await route_query("What is my rate?") == "fast_small"
+
+
+@pytest.mark.asyncio
+async def test_route_query_times_out_on_slow_local_encode(tmp_path, monkeypatch, _reset_router):
+    """Should fall back to the keyword rules within the timeout when the
+    in-process model is slow, since encoding runs off the event loop."""
+    import time
+
+    import numpy as np
+
+    from src.inference.embeddings import LocalEmbeddingProvider
+
+    provider = LocalEmbeddingProvider("test-model", dimensions=2)
+
+    def encode(texts, normalize_embeddings):
+        if len(texts) == 1:
+            time.sleep(1.0)
+        return np.array(_axis_vectors(texts))
+
+    provider._model = MagicMock(encode=MagicMock(side_effect=encode))
+    _write_embedding_config(tmp_path)
+    monkeypatch.setattr(router_mod, "_default_embed", provider.embed)
+    await warm_router()
+    assert router_mod._router.ready
+
+    started = time.monotonic()
+    assert await route_query("hello application") == "capable_large"
+    assert time.monotonic() - started < 0.8
+
+
+@pytest.mark.asyncio
+async def test_route_query_ignores_router_for_rule_based_strategy(
+    tmp_path, monkeypatch, _reset_router
+):
+    """Should not embed anything when the rule_based strategy is configured."""
+    _write_standard_config(tmp_path)
+    embed = AsyncMock(side_effect=_axis_embed)
+    router_mod._router = EmbeddingRouter(_INTENTS, min_margin=0.1, embed=embed)
+    await router_mod._router.build()
+    embed.reset_mock()
+
+    assert await route_query("hello application") == "capable_large"
+    embed.assert_not_awaited()
+
+
+def test_load_config_rejects_unknown_strategy(tmp_path):
+    """Should reject an unknown classification strategy."""
+    _write_standard_config(tmp_path)
+    text = config_mod._CONFIG_PATH.read_text().replace("rule_based", "llm_judge")
+    config_mod._CONFIG_PATH.write_text(text)
+    with pytest.raises(ValueError, match="strategy"):
+        load_config(config_mod._CONFIG_PATH)
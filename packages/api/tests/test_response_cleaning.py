@@ -1,21 +1,24 @@
 # This project was developed with assistance from AI tools.
 """Tests for response cleaning logic applied to LLM output.
 
-The chat handler applies a series of regex transformations to raw LLM output
+The chat handler cleans raw LLM output incrementally (``ResponseCleaner``)
 before sending it to the client or storing it in conversation history.  These
-tests verify the cleaning pipeline in isolation.
+tests verify the cleaning pipeline in isolation, whole and chunk by chunk.
 """
 
-import re
+import pytest
+
+from src.routes._chat_stream import ResponseCleaner
+
+
+def _clean_chunks(chunks) -> str:
+    cleaner = ResponseCleaner()
+    return ("".join(cleaner.feed(c) for c in chunks) + cleaner.flush()).strip()
 
 
 def _clean_response(raw: str) -> str:
-    """Mirror the cleaning pipeline from _chat_handler.py lines 402-408."""
-    text = re.sub(r"<think>.*?</think>", "", raw, flags=re.DOTALL)
-    text = text.replace("**", "")
-    text = re.sub(r"\[[^\]]*\w+\(.*?\)[^\]]*\]", "", text)
-    text = text.strip()
-    return text
+    """Clean a whole response the way the chat handler does."""
+    return _clean_chunks([raw])
 
 
 class TestThinkTagStripping:
@@ -112,3 +115,45 @@ class TestCombinedCleaning:
         """should return empty string when all content is artifacts."""
         raw = "<think>just thinking</think>"
         assert _clean_response(raw) == ""
+
+
+class TestIncrementalCleaning:
+    """Chunk boundaries must not change the cleaned output."""
+
+    @pytest.mark.parametrize(
+        "raw",
+        [
+            "<think>reasoning here</think>Hello!",
+            "<think>first</think>Hello!<think>second</think> Goodbye!",
+            "Here are our **mortgage products**:",
+            "a***b and ****c",
+            'Let me check. [lo_search_applications(query="active")] You have 3 loans.',
+            "Interest rates are [currently competitive].",
+            "Nested [x [tool_a(x=1)] y] text",
+            "Unclosed <think>still thinking",
+            "Unclosed [bracket text",
+            "Trailing star*",
+        ],
+    )
+    def test_matches_whole_response_at_every_split(self, raw):
+        """should clean a response the same way however it is split."""
+        whole = _clean_response(raw)
+        for cut in range(len(raw) + 1):
+            assert _clean_chunks([raw[:cut], raw[cut:]]) == whole
+        assert _clean_chunks(list(raw)) == whole
+
+    def test_holds_back_partial_think_tag(self):
+        """should not emit a prefix that may open a think block."""
+        cleaner = ResponseCleaner()
+        assert cleaner.feed("Hi <thi") == "Hi "
+        assert cleaner.feed("nk>hidden</think> there") == " there"
+
+    def test_unterminated_think_block_is_kept(self):
+        """should leave an unterminated think block as text, like the regex."""
+        assert _clean_response("Answer <think>partial") == "Answer <think>partial"
+
+    def test_long_bracket_is_released_as_prose(self):
+        """should stop holding an unclosed bracket once it grows too long."""
+        cleaner = ResponseCleaner()
+        text = "[" + "x" * 600
+        assert cleaner.feed(text) == text
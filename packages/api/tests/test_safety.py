@@ -187,3 +187,260 @@ def test_get_safety_checker_caches_instance(monkeypatch):
     first = get_safety_checker()
     second = get_safety_checker()
     assert first is second
+
+
+# -- Verdict cache --
+
+
+def _cached_checker(content="safe", **kwargs):
+    mock_llm = AsyncMock()
+    mock_llm.ainvoke.return_value = AsyncMock(content=content)
+    checker = SafetyChecker(
+        model="test",
+        endpoint="http://test",
+        api_key="key",
+        cache_max_entries=kwargs.get("max_entries", 8),
+        cache_ttl_s=kwargs.get("ttl_s", 60.0),
+    )
+    checker._llm = mock_llm
+    return checker, mock_llm
+
+
+@pytest.mark.asyncio
+async def test_safe_verdict_is_reused_for_normalized_repeat():
+    """should skip the safety model for a repeat differing only in case/whitespace."""
+    checker, mock_llm = _cached_checker()
+
+    first = await checker.check_input("Hi there")
+    second = await checker.check_input("  hi   THERE ")
+
+    assert first.is_safe and second.is_safe
+    assert mock_llm.ainvoke.await_count == 1
+    assert checker.cache_stats() == {"hits": 1, "misses": 1, "entries": 1, "max_entries": 8}
+
+
+@pytest.mark.asyncio
+async def test_unsafe_and_failed_verdicts_are_not_cached():
+    """should call the safety model again after unsafe verdicts and failures."""
+    checker, mock_llm = _cached_checker(content="unsafe\nS1")
+    await checker.check_input("bad")
+    await checker.check_input("bad")
+    assert mock_llm.ainvoke.await_count == 2
+
+    mock_llm.ainvoke.side_effect = ConnectionError("down")
+    await checker.check_output("q", "a")
+    mock_llm.ainvoke.side_effect = None
+    mock_llm.ainvoke.return_value = AsyncMock(content="")
+    await checker.check_output("q", "a")
+    assert mock_llm.ainvoke.await_count == 4
+    assert checker.cache_stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_verdict_cache_separates_input_and_output_checks():
+    """should key input and output checks (and output context) separately."""
+    checker, mock_llm = _cached_checker()
+
+    await checker.check_input("thanks")
+    await checker.check_output("thanks", "You're welcome!")
+    await checker.check_output("other question", "You're welcome!")
+    await checker.check_output("thanks", "You're welcome!")
+
+    assert mock_llm.ainvoke.await_count == 3
+    assert checker.cache_stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_verdict_cache_expires_and_evicts(monkeypatch):
+    """should miss after the TTL and evict least recently used entries."""
+    import src.inference.safety as safety_mod
+
+    now = [1000.0]
+    monkeypatch.setattr(safety_mod, "monotonic", lambda: now[0])
+    checker, mock_llm = _cached_checker(max_entries=2, ttl_s=10.0)
+
+    await checker.check_input("a")
+    now[0] += 11
+    await checker.check_input("a")
+    assert mock_llm.ainvoke.await_count == 2
+
+    await checker.check_input("b")
+    await checker.check_input("c")
+    await checker.check_input("a")
+    assert mock_llm.ainvoke.await_count == 5
+    assert checker.cache_stats()["entries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_verdict_cache_disabled_by_default():
+    """should call the safety model every time when no cache size is given."""
+    mock_llm = AsyncMock()
+    mock_llm.ainvoke.return_value = AsyncMock(content="safe")
+    checker = SafetyChecker(model="test", endpoint="http://test", api_key="key")
+    checker._llm = mock_llm
+
+    await checker.check_input("hi")
+    await checker.check_input("hi")
+    assert mock_llm.ainvoke.await_count == 2
+
+
+# -- Bounded fan-out --
+
+
+def _sharing_checker(invoke, **kwargs):
+    checker = SafetyChecker(model="test", endpoint="http://test", api_key="key", **kwargs)
+    mock_llm = AsyncMock()
+    mock_llm.ainvoke.side_effect = invoke
+    checker._llm = mock_llm
+    return checker, mock_llm
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_checks_share_one_request():
+    """should send each distinct in-flight prompt once and resolve every waiter."""
+    import asyncio
+
+    async def invoke(prompt):
+        await asyncio.sleep(0.01)
+        return AsyncMock(content="unsafe\nS1" if "bad" in prompt else "safe")
+
+    checker, mock_llm = _sharing_checker(invoke)
+
+    results = await asyncio.gather(
+        checker.check_input("hi"),
+        checker.check_input("hi"),
+        checker.check_input("bad"),
+    )
+
+    assert [r.is_safe for r in results] == [True, True, False]
+    assert mock_llm.ainvoke.await_count == 2
+    assert checker._requests._requests == {}
+
+
+@pytest.mark.asyncio
+async def test_requests_respect_concurrency_cap():
+    """should keep at most max_concurrency safety requests in flight."""
+    import asyncio
+
+    in_flight = peak = 0
+
+    async def invoke(_prompt):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return AsyncMock(content="safe")
+
+    checker, mock_llm = _sharing_checker(invoke, max_concurrency=4)
+
+    results = await asyncio.gather(*(checker.check_input(f"msg {i}") for i in range(16)))
+    assert all(r.is_safe for r in results)
+    assert peak == 4
+    assert mock_llm.ainvoke.await_count == 16
+
+
+@pytest.mark.asyncio
+async def test_queued_duplicates_share_one_request():
+    """should share a request that is still waiting for a slot."""
+    import asyncio
+
+    async def invoke(_prompt):
+        await asyncio.sleep(0.01)
+        return AsyncMock(content="safe")
+
+    checker, mock_llm = _sharing_checker(invoke, max_concurrency=1)
+
+    await asyncio.gather(
+        checker.check_input("a"), checker.check_input("b"), checker.check_input("b")
+    )
+    assert mock_llm.ainvoke.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_checks_are_sent_at_once_without_a_hold():
+    """should not wait on a timer when SAFETY_BATCH_MAX_WAIT_MS is 0."""
+    import asyncio
+
+    sent = asyncio.Event()
+
+    async def invoke(_prompt):
+        sent.set()
+        return AsyncMock(content="safe")
+
+    checker, _ = _sharing_checker(invoke, batch_max_size=8, batch_max_wait_s=0.0)
+
+    task = asyncio.create_task(checker.check_input("hi"))
+    await asyncio.wait_for(sent.wait(), timeout=0.05)
+    assert (await task).is_safe is True
+
+
+@pytest.mark.asyncio
+async def test_held_checks_are_released_together():
+    """should hold checks until max_batch are pending, or max_wait_s has passed."""
+    import asyncio
+
+    sent: list[str] = []
+
+    async def invoke(prompt):
+        sent.append(prompt)
+        return AsyncMock(content="safe")
+
+    checker, _ = _sharing_checker(invoke, batch_max_size=3, batch_max_wait_s=10.0)
+    first = asyncio.create_task(checker.check_input("a"))
+    await asyncio.sleep(0.01)
+    assert sent == []
+
+    # The third distinct prompt fills the batch and releases all three.
+    results = await asyncio.wait_for(
+        asyncio.gather(first, checker.check_input("b"), checker.check_input("c")), timeout=1.0
+    )
+    assert all(r.is_safe for r in results)
+    assert len(sent) == 3
+
+    checker, _ = _sharing_checker(invoke, batch_max_size=3, batch_max_wait_s=0.02)
+    result = await asyncio.wait_for(checker.check_input("lonely"), timeout=1.0)
+    assert result.is_safe is True
+
+
+@pytest.mark.asyncio
+async def test_shared_failure_fails_closed_per_prompt():
+    """should fail closed only the checks whose request failed."""
+    import asyncio
+
+    async def invoke(prompt):
+        if "boom" in prompt:
+            raise ConnectionError("down")
+        return AsyncMock(content="safe")
+
+    checker, _ = _sharing_checker(invoke)
+
+    ok, failed, failed_too = await asyncio.gather(
+        checker.check_input("fine"), checker.check_input("boom"), checker.check_input("boom")
+    )
+    assert ok.is_safe is True
+    assert failed.is_safe is False
+    assert failed_too.explanation == "Safety check unavailable"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_shared_request_running():
+    """should keep serving other waiters when one of them is cancelled."""
+    import asyncio
+
+    release = asyncio.Event()
+
+    async def invoke(_prompt):
+        await release.wait()
+        return AsyncMock(content="safe")
+
+    checker, mock_llm = _sharing_checker(invoke)
+
+    first = asyncio.create_task(checker.check_input("hi"))
+    second = asyncio.create_task(checker.check_input("hi"))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert (await second).is_safe is True
+    assert mock_llm.ainvoke.await_count == 1
@@ -0,0 +1,185 @@
+# This project was developed with assistance from AI tools.
+"""Tests for per-turn tool subset selection."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import tool
+
+from src.agents.tool_selection import ToolSelector, recent_tool_names, warm_tool_selectors
+
+# One-hot "embeddings": a text maps to the axis of the first keyword it contains.
+_AXES = ["pipeline", "credit", "document", "rate", "email", "calendar"]
+
+
+async def _embed(texts: list[str]) -> list[list[float]]:
+    vectors = []
+    for text in texts:
+        hits = [axis for axis in _AXES if axis in text.lower()]
+        vectors.append([1.0 if hits and axis == hits[0] else 0.0 for axis in _AXES])
+    return vectors
+
+
+def _tools():
+    @tool
+    def pipeline_summary() -> str:
+        """Summarize the pipeline."""
+        return ""
+
+    @tool
+    def pull_credit() -> str:
+        """Pull a credit report."""
+        return ""
+
+    @tool
+    def document_review() -> str:
+        """Review uploaded documents."""
+        return ""
+
+    @tool
+    def rate_lock() -> str:
+        """Check the rate lock."""
+        return ""
+
+    @tool
+    def send_email() -> str:
+        """Send an email to the borrower."""
+        return ""
+
+    @tool
+    def calendar_date() -> str:
+        """Today's date from the calendar."""
+        return ""
+
+    return [pipeline_summary, pull_credit, document_review, rate_lock, send_email, calendar_date]
+
+
+def _names(tools) -> list[str]:
+    return [t.name for t in tools]
+
+
+@pytest.mark.asyncio
+async def test_selects_pinned_and_most_similar_tools():
+    """should bind the pinned tools plus the top_k most similar, in original order."""
+    selector = ToolSelector(_tools(), top_k=1, pinned=["calendar_date"], embed=_embed)
+
+    selected = await selector.select("Pull credit for app 12")
+
+    assert _names(selected) == ["pull_credit", "calendar_date"]
+
+
+@pytest.mark.asyncio
+async def test_keeps_recently_used_tools():
+    """should keep tools used in recent turns for follow-up questions."""
+    selector = ToolSelector(_tools(), top_k=1, embed=_embed)
+
+    selected = await selector.select("and the same for #13?", recent={"document_review"})
+
+    assert "document_review" in _names(selected)
+
+
+@pytest.mark.asyncio
+async def test_embeds_descriptions_once_and_caches_queries():
+    """should embed tool descriptions once and reuse query embeddings within a turn."""
+    embed = AsyncMock(side_effect=_embed)
+    selector = ToolSelector(_tools(), top_k=2, embed=embed)
+
+    for _ in range(3):
+        await selector.select("Check my rate")
+
+    assert embed.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_warm_up_embeds_descriptions_before_first_turn():
+    """should embed tool descriptions at warm-up so a turn embeds only its query."""
+    embed = AsyncMock(side_effect=_embed)
+    selector = ToolSelector(_tools(), top_k=2, embed=embed)
+
+    await warm_tool_selectors()
+    assert embed.await_count == 1
+    embed.reset_mock()
+
+    await selector.select("Check my rate")
+    assert [call.args[0] for call in embed.await_args_list] == [["Check my rate"]]
+
+
+@pytest.mark.asyncio
+async def test_warm_up_failure_is_retried_on_first_turn():
+    """should log a warm-up failure and embed descriptions on the first select."""
+    calls = iter([ConnectionError("down")])
+
+    async def flaky_embed(texts):
+        error = next(calls, None)
+        if error is not None:
+            raise error
+        return await _embed(texts)
+
+    selector = ToolSelector(_tools(), top_k=1, pinned=["calendar_date"], embed=flaky_embed)
+
+    await selector.warm()
+    assert _names(await selector.select("Pull credit")) == ["pull_credit", "calendar_date"]
+
+
+@pytest.mark.asyncio
+async def test_embedding_failure_binds_every_tool():
+    """should fall back to every tool when embedding fails."""
+    tools = _tools()
+    selector = ToolSelector(tools, top_k=2, embed=AsyncMock(side_effect=ConnectionError("down")))
+
+    assert await selector.select("Pull credit") == tools
+
+
+@pytest.mark.asyncio
+async def test_small_tool_sets_skip_embedding():
+    """should bind every tool without embedding when few enough remain."""
+    embed = AsyncMock(side_effect=_embed)
+    tools = _tools()
+    selector = ToolSelector(tools, top_k=4, pinned=["pull_credit", "rate_lock"], embed=embed)
+
+    assert await selector.select("Pull credit") == tools
+    embed.assert_not_awaited()
+
+
+def test_recent_tool_names_covers_last_turns():
+    """should collect tool calls from the last N user turns only."""
+
+    def turn(i, name):
+        return [
+            HumanMessage(content=f"q{i}"),
+            AIMessage(content="", tool_calls=[{"name": name, "args": {}, "id": f"c{i}"}]),
+            ToolMessage(content="ok", tool_call_id=f"c{i}", name=name),
+            AIMessage(content=f"a{i}"),
+        ]
+
+    messages = [*turn(0, "old_tool"), *turn(1, "recent_tool"), HumanMessage(content="q2")]
+
+    assert recent_tool_names(messages, turns=2) == {"recent_tool"}
+    assert recent_tool_names(messages, turns=3) == {"old_tool", "recent_tool"}
+
+
+@pytest.mark.asyncio
+async def test_graph_binds_selected_subset_and_caches_binding(monkeypatch):
+    """should bind the selected subset to the capable model, once per subset."""
+    from src.agents.base import build_routed_graph
+
+    monkeypatch.setattr("src.agents.base.get_safety_checker", lambda: None)
+    monkeypatch.setattr("src.inference.router.classify_query", lambda q: "capable_large")
+    monkeypatch.setattr("src.agents.tool_selection._default_embed", _embed)
+
+    capable = MagicMock()
+    capable.ainvoke = AsyncMock(return_value=AIMessage(content="done"))
+    capable.bind_tools.return_value = capable
+    graph = build_routed_graph(
+        system_prompt="sys",
+        tools=_tools(),
+        llms={"fast_small": MagicMock(), "capable_large": capable},
+        tool_selection={"top_k": 1, "pinned": ["calendar_date"]},
+    )
+
+    for _ in range(2):
+        await graph.ainvoke({"messages": [HumanMessage(content="Send an email")]})
+
+    capable.bind_tools.assert_called_once()
+    assert _names(capable.bind_tools.call_args.args[0]) == ["send_email", "calendar_date"]
@@ -0,0 +1,183 @@
+# This project was developed with assistance from AI tools.
+"""Tests for the per-turn compute budget of the agent graph."""
+
+import asyncio
+import itertools
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import tool
+
+from src.agents import budget
+from src.agents.base import build_routed_graph
+
+
+@tool
+def lookup(app_id: int) -> str:
+    """Look up an application."""
+    return f"application {app_id}"
+
+
+def _tool_call_responses():
+    """Capable model that asks for another lookup on every call."""
+    for i in itertools.count():
+        yield AIMessage(
+            content="", tool_calls=[{"name": "lookup", "args": {"app_id": i}, "id": f"c{i}"}]
+        )
+
+
+def _graph(monkeypatch, capable, **limits):
+    monkeypatch.setattr("src.agents.base.get_safety_checker", lambda: None)
+    monkeypatch.setattr("src.inference.router.classify_query", lambda q: "capable_large")
+    capable.bind_tools.return_value = capable
+    return build_routed_graph(
+        system_prompt="sys",
+        tools=[lookup],
+        llms={"fast_small": MagicMock(), "capable_large": capable},
+        turn_budget=limits,
+    )
+
+
+def _usage(**counters):
+    return {**budget.new_usage(), **counters}
+
+
+def test_exhausted_reports_first_spent_limit():
+    """should name the spent limit, and nothing while within budget."""
+    limits = {"max_llm_calls": 3, "max_tool_calls": 0, "max_tokens": 100, "max_seconds": 0}
+
+    assert budget.exhausted(limits, _usage(llm_calls=2, tokens=99)) == ""
+    assert budget.exhausted(limits, _usage(llm_calls=3)) == "max_llm_calls"
+    assert budget.exhausted(limits, _usage(tokens=100)) == "max_tokens"
+    assert budget.exhausted({"max_seconds": 5}, _usage(started_at=0)) == "max_seconds"
+
+
+def test_record_llm_call_prefers_reported_usage():
+    """should count reported tokens, estimating only when none are reported."""
+    prompt = [HumanMessage(content="x" * 400)]
+    reported = AIMessage(
+        content="ok", usage_metadata={"input_tokens": 90, "output_tokens": 10, "total_tokens": 100}
+    )
+
+    assert budget.record_llm_call(_usage(), prompt, reported)["tokens"] == 100
+    estimated = budget.record_llm_call(_usage(), prompt, AIMessage(content="ok"))
+    assert (estimated["llm_calls"], estimated["tokens"]) == (1, 108)
+
+
+@pytest.mark.asyncio
+async def test_tool_loop_stops_at_llm_call_limit(monkeypatch):
+    """should end a runaway tools loop with a partial answer at max_llm_calls."""
+    capable = MagicMock()
+    capable.ainvoke = AsyncMock(side_effect=_tool_call_responses())
+    graph = _graph(monkeypatch, capable, max_llm_calls=3, max_tool_calls=0)
+
+    result = await graph.ainvoke({"messages": [HumanMessage(content="check everything")]})
+
+    assert capable.ainvoke.await_count == 3
+    assert result["turn_usage"]["exhausted"] == "max_llm_calls"
+    final = result["messages"][-1]
+    assert final.content.startswith(budget.BUDGET_EXHAUSTED_MESSAGE)
+    assert "lookup" in final.content
+    # Tools requested by the last allowed call still ran
+    assert result["messages"][-2].content == "application 2"
+
+
+@pytest.mark.asyncio
+async def test_tool_call_limit_skips_pending_calls(monkeypatch):
+    """should not run tool calls beyond max_tool_calls."""
+    capable = MagicMock()
+    capable.ainvoke = AsyncMock(side_effect=_tool_call_responses())
+    graph = _graph(monkeypatch, capable, max_tool_calls=2)
+
+    result = await graph.ainvoke({"messages": [HumanMessage(content="check everything")]})
+
+    ran = [m for m in result["messages"] if isinstance(m, ToolMessage)]
+    assert [m.content for m in ran[:2]] == ["application 0", "application 1"]
+    assert ran[2].content.startswith("Not run")
+    assert result["turn_usage"]["tool_calls"] == 2
+    assert result["turn_usage"]["exhausted"] == "max_tool_calls"
+
+
+@pytest.mark.asyncio
+async def test_deadline_cuts_off_slow_model_call(monkeypatch):
+    """should cut a model call off at max_seconds and answer partially."""
+
+    async def slow(_messages):
+        await asyncio.sleep(10)
+
+    capable = MagicMock()
+    capable.ainvoke = AsyncMock(side_effect=slow)
+    graph = _graph(monkeypatch, capable, max_seconds=0.05)
+
+    result = await asyncio.wait_for(
+        graph.ainvoke({"messages": [HumanMessage(content="hi")]}), timeout=2
+    )
+
+    assert result["turn_usage"]["exhausted"] == "max_seconds"
+    assert result["messages"][-1].content.startswith(budget.BUDGET_EXHAUSTED_MESSAGE)
+
+
+@pytest.mark.asyncio
+async def test_deadline_cuts_off_slow_tool(monkeypatch):
+    """should cancel a tool still running at max_seconds and end the turn there."""
+
+    @tool
+    async def slow_lookup(app_id: int) -> str:
+        """Look up an application slowly."""
+        await asyncio.sleep(10)
+        return f"application {app_id}"
+
+    monkeypatch.setattr("src.agents.base.get_safety_checker", lambda: None)
+    monkeypatch.setattr("src.inference.router.classify_query", lambda q: "capable_large")
+    capable = MagicMock()
+    capable.ainvoke = AsyncMock(
+        return_value=AIMessage(
+            content="", tool_calls=[{"name": "slow_lookup", "args": {"app_id": 1}, "id": "c1"}]
+        )
+    )
+    capable.bind_tools.return_value = capable
+    graph = build_routed_graph(
+        system_prompt="sys",
+        tools=[slow_lookup],
+        llms={"fast_small": MagicMock(), "capable_large": capable},
+        turn_budget={"max_seconds": 0.2},
+    )
+
+    started = time.monotonic()
+    result = await asyncio.wait_for(
+        graph.ainvoke({"messages": [HumanMessage(content="check it")]}), timeout=2
+    )
+
+    assert time.monotonic() - started < 1
+    assert capable.ainvoke.await_count == 1
+    assert result["turn_usage"]["exhausted"] == "max_seconds"
+    assert result["messages"][-2].content.startswith("Not run")
+    assert result["messages"][-1].content.startswith(budget.BUDGET_EXHAUSTED_MESSAGE)
+
+
+@pytest.mark.asyncio
+async def test_budget_resets_each_turn(monkeypatch):
+    """should start every turn with fresh counters and the configured limits."""
+    from langgraph.checkpoint.memory import MemorySaver
+
+    monkeypatch.setattr("src.agents.base.get_safety_checker", lambda: None)
+    monkeypatch.setattr("src.inference.router.classify_query", lambda q: "capable_large")
+    capable = MagicMock()
+    capable.ainvoke = AsyncMock(side_effect=lambda _messages: AIMessage(content="answer"))
+    capable.bind_tools.return_value = capable
+    graph = build_routed_graph(
+        system_prompt="sys",
+        tools=[lookup],
+        llms={"fast_small": MagicMock(), "capable_large": capable},
+        checkpointer=MemorySaver(),
+        turn_budget={"max_llm_calls": 1},
+    )
+    config = {"configurable": {"thread_id": "t"}}
+
+    for text in ("first", "second"):
+        result = await graph.ainvoke({"messages": [HumanMessage(content=text)]}, config=config)
+        assert result["messages"][-1].content == "answer"
+        assert result["turn_usage"]["llm_calls"] == 1
+        assert result["turn_budget"]["max_llm_calls"] == 1
@@ -0,0 +1,119 @@
+# This project was developed with assistance from AI tools.
+"""add audit_archive_segments and archived-partition drop function
+
+- audit_archive_segments: one row per archived run of audit events (an id
+  prefix of the chain) written to object storage. ``last_hash`` is the chain
+  anchor the live table is verified from once older rows are gone.
+  Append-only: app roles get SELECT + INSERT only
+- audit_events_drop_archived_partition(part_name): SECURITY DEFINER helper
+  that detaches and drops a monthly audit_events partition, but only when
+  every row in it is covered by an archive segment. DROP TABLE does not
+  fire the append-only row triggers, and lending_app still has no DELETE
+
+Revision ID: a4b5c6d7e8f9
+Revises: f3a4b5c6d7e8
+Create Date: 2026-03-10 09:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "a4b5c6d7e8f9"
+down_revision = "f3a4b5c6d7e8"
+branch_labels = None
+depends_on = None
+
+_DROP_SIGNATURE = "audit_events_drop_archived_partition(text)"
+
+DROP_ARCHIVED_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION audit_events_drop_archived_partition(part_name text)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    archived_through integer;
+    uncovered boolean;
+BEGIN
+    -- Same key as audit_events_ensure_partitions: partition DDL is serialized.
+    PERFORM pg_advisory_xact_lock(900002);
+
+    IF part_name !~ '^audit_events_[0-9]{4}_[0-9]{2}$' OR NOT EXISTS (
+        SELECT 1 FROM pg_inherits
+        WHERE inhparent = 'audit_events'::regclass
+          AND inhrelid = to_regclass(part_name)
+    ) THEN
+        RAISE EXCEPTION '% is not a monthly audit_events partition', part_name;
+    END IF;
+
+    SELECT max(last_event_id) INTO archived_through FROM audit_archive_segments;
+    EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I WHERE id > $1)', part_name)
+        INTO uncovered
+        USING coalesce(archived_through, 0);
+    IF uncovered THEN
+        RAISE EXCEPTION '% holds audit events not covered by an archive segment', part_name;
+    END IF;
+
+    EXECUTE format('ALTER TABLE audit_events DETACH PARTITION %I', part_name);
+    EXECUTE format('DROP TABLE %I', part_name);
+END;
+$$;
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_archive_segments",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("first_event_id", sa.Integer(), nullable=False),
+        sa.Column("last_event_id", sa.Integer(), nullable=False),
+        sa.Column("event_count", sa.Integer(), nullable=False),
+        sa.Column("first_timestamp", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_timestamp", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("first_prev_hash", sa.String(64), nullable=False),
+        sa.Column("last_hash", sa.String(64), nullable=False),
+        sa.Column("object_key", sa.String(500), nullable=False),
+        sa.Column("content_sha256", sa.String(64), nullable=False),
+        sa.Column(
+            "application_ids",
+            postgresql.ARRAY(sa.Integer()),
+            server_default="{}",
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("last_event_id", name="uq_audit_archive_segments_last_event_id"),
+    )
+    op.create_index(
+        "ix_audit_archive_segments_application_ids",
+        "audit_archive_segments",
+        ["application_ids"],
+        postgresql_using="gin",
+    )
+
+    # Default privileges grant ALL on new tables; keep segments append-only.
+    op.execute("REVOKE UPDATE, DELETE ON audit_archive_segments FROM lending_app")
+    op.execute("GRANT SELECT, INSERT ON audit_archive_segments TO lending_app")
+    op.execute("GRANT USAGE ON SEQUENCE audit_archive_segments_id_seq TO lending_app")
+    op.execute("GRANT SELECT ON audit_archive_segments TO compliance_app")
+
+    op.execute(DROP_ARCHIVED_PARTITION_FUNCTION)
+    op.execute(f"REVOKE ALL ON FUNCTION {_DROP_SIGNATURE} FROM PUBLIC")
+    op.execute(f"GRANT EXECUTE ON FUNCTION {_DROP_SIGNATURE} TO lending_app")
+
+
+def downgrade() -> None:
+    # Rows in dropped partitions live on only in object storage; they are
+    # not restored here.
+    op.execute(f"DROP FUNCTION IF EXISTS {_DROP_SIGNATURE}")
+    op.drop_index("ix_audit_archive_segments_application_ids", table_name="audit_archive_segments")
+    op.drop_table("audit_archive_segments")
@@ -0,0 +1,44 @@
+# This project was developed with assistance from AI tools.
+"""add audit_verification_watermark table
+
+Single-row table recording the last audit event id verified by
+verify_audit_chain and its hash, so later runs only walk new events.
+
+Revision ID: a8b9c0d1e2f3
+Revises: e7f8a9b0c1d2
+Create Date: 2026-03-06 10:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a8b9c0d1e2f3"
+down_revision = "e7f8a9b0c1d2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_verification_watermark",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("last_verified_id", sa.Integer(), nullable=False),
+        sa.Column("last_verified_hash", sa.String(64), nullable=False),
+        sa.Column(
+            "verified_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.CheckConstraint("id = 1", name="ck_audit_verification_watermark_single_row"),
+    )
+
+    op.execute("GRANT SELECT, INSERT, UPDATE ON audit_verification_watermark TO lending_app")
+    op.execute("GRANT SELECT ON audit_verification_watermark TO compliance_app")
+
+
+def downgrade() -> None:
+    op.drop_table("audit_verification_watermark")
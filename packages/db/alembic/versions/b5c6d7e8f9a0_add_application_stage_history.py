@@ -0,0 +1,106 @@
+# This project was developed with assistance from AI tools.
+"""add application_stage_history
+
+- application_stage_history: one row per stage an application entered
+  (application_id, from_stage, to_stage, entered_at). Turn-time and
+  days-to-close analytics read it with window functions instead of
+  self-joining stage_transition audit events
+- Backfill: every stage_transition audit event still in audit_events
+  becomes a history row (event_data carries lowercase stage values; the
+  stage columns store enum names). Applications with no transition events
+  get a single row for their current stage at updated_at, which is what
+  days-to-close used before
+
+Revision ID: b5c6d7e8f9a0
+Revises: a4b5c6d7e8f9
+Create Date: 2026-03-17 09:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b5c6d7e8f9a0"
+down_revision = "a4b5c6d7e8f9"
+branch_labels = None
+depends_on = None
+
+_STAGES = (
+    "inquiry",
+    "prequalification",
+    "application",
+    "processing",
+    "underwriting",
+    "conditional_approval",
+    "clear_to_close",
+    "closed",
+    "denied",
+    "withdrawn",
+)
+_STAGE_LIST = ", ".join(f"'{s}'" for s in _STAGES)
+
+BACKFILL_FROM_AUDIT = f"""
+INSERT INTO application_stage_history (application_id, from_stage, to_stage, entered_at)
+SELECT
+    e.application_id,
+    CASE WHEN e.event_data ->> 'from_stage' IN ({_STAGE_LIST})
+         THEN upper(e.event_data ->> 'from_stage') END,
+    upper(e.event_data ->> 'to_stage'),
+    e."timestamp"
+FROM audit_events e
+JOIN applications a ON a.id = e.application_id
+WHERE e.event_type = 'stage_transition'
+  AND e.event_data ->> 'to_stage' IN ({_STAGE_LIST})
+ORDER BY e.id
+"""
+
+BACKFILL_CURRENT_STAGE = """
+INSERT INTO application_stage_history (application_id, from_stage, to_stage, entered_at)
+SELECT a.id, NULL, a.stage, a.updated_at
+FROM applications a
+WHERE NOT EXISTS (
+    SELECT 1 FROM application_stage_history h WHERE h.application_id = a.id
+)
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "application_stage_history",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("application_id", sa.Integer(), nullable=False),
+        sa.Column("from_stage", sa.String(50), nullable=True),
+        sa.Column("to_stage", sa.String(50), nullable=False),
+        sa.Column(
+            "entered_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["application_id"], ["applications.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_application_stage_history_app_entered",
+        "application_stage_history",
+        ["application_id", "entered_at"],
+    )
+    op.create_index(
+        "ix_application_stage_history_stage_entered",
+        "application_stage_history",
+        ["to_stage", "entered_at"],
+    )
+
+    op.execute(BACKFILL_FROM_AUDIT)
+    op.execute(BACKFILL_CURRENT_STAGE)
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_application_stage_history_stage_entered", table_name="application_stage_history"
+    )
+    op.drop_index(
+        "ix_application_stage_history_app_entered", table_name="application_stage_history"
+    )
+    op.drop_table("application_stage_history")
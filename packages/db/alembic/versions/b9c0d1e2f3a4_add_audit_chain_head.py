@@ -0,0 +1,71 @@
+# This project was developed with assistance from AI tools.
+"""add audit_events.row_hash and audit_chain_head
+
+- audit_events.row_hash: each row's own chain hash, written at insert time
+- audit_chain_head: single row (last_id, last_hash) advanced by every
+  audit writer under the advisory lock
+- Seed the head from the newest existing event. Older rows keep a NULL
+  row_hash; verification recomputes hashes from row data either way.
+
+Revision ID: b9c0d1e2f3a4
+Revises: a8b9c0d1e2f3
+Create Date: 2026-03-06 14:00:00.000000
+
+"""
+
+import hashlib
+import json
+from datetime import UTC
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b9c0d1e2f3a4"
+down_revision = "a8b9c0d1e2f3"
+branch_labels = None
+depends_on = None
+
+
+def _event_hash(row) -> str:
+    # Frozen copy of services.audit._compute_hash (migrations must not import app code).
+    payload = (
+        f"{row.id}|{row.timestamp.astimezone(UTC)}|{row.event_type}|"
+        f"{row.user_id or ''}|{row.user_role or ''}|{row.application_id or ''}|"
+        f"{row.session_id or ''}|{json.dumps(row.event_data, sort_keys=True, default=str)}"
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column("audit_events", sa.Column("row_hash", sa.String(64), nullable=True))
+
+    op.create_table(
+        "audit_chain_head",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("last_id", sa.Integer(), nullable=False),
+        sa.Column("last_hash", sa.String(64), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.CheckConstraint("id = 1", name="ck_audit_chain_head_single_row"),
+    )
+
+    op.execute("GRANT SELECT, INSERT, UPDATE ON audit_chain_head TO lending_app")
+    op.execute("GRANT SELECT, INSERT, UPDATE ON audit_chain_head TO compliance_app")
+
+    conn = op.get_bind()
+    latest = conn.execute(
+        sa.text(
+            "SELECT id, timestamp, event_type, user_id, user_role, application_id, "
+            "session_id, event_data FROM audit_events ORDER BY id DESC LIMIT 1"
+        )
+    ).first()
+    if latest is not None:
+        conn.execute(
+            sa.text("INSERT INTO audit_chain_head (id, last_id, last_hash) VALUES (1, :id, :h)"),
+            {"id": latest.id, "h": _event_hash(latest)},
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("audit_chain_head")
+    op.drop_column("audit_events", "row_hash")
@@ -0,0 +1,211 @@
+# This project was developed with assistance from AI tools.
+"""partition audit_events by month with a BRIN timestamp index
+
+- audit_events becomes a RANGE-partitioned table on "timestamp", one
+  partition per UTC month plus audit_events_default as a catch-all
+- Primary key widens to (id, timestamp) -- Postgres requires the partition
+  key in unique constraints. id stays globally unique via audit_events_id_seq,
+  so the hash chain (ordered by id) is unaffected by partition boundaries
+- BRIN index on "timestamp" (the table is append-only, so timestamps are
+  physically correlated with insert order)
+- audit_events_ensure_partitions(months_ahead, from_ts): SECURITY DEFINER
+  maintenance function that pre-creates monthly partitions; executable by
+  lending_app so the API can call it on startup
+- Existing rows are copied verbatim (including timestamps), so stored
+  prev_hash / row_hash values stay valid
+
+Revision ID: c0d1e2f3a4b5
+Revises: b9c0d1e2f3a4
+Create Date: 2026-03-07 10:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c0d1e2f3a4b5"
+down_revision = "b9c0d1e2f3a4"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = (
+    'id, "timestamp", prev_hash, row_hash, user_id, user_role, event_type, '
+    "application_id, decision_id, event_data, session_id"
+)
+
+_ENSURE_SIGNATURE = "audit_events_ensure_partitions(integer, timestamptz)"
+
+CREATE_PARTITIONED = """
+CREATE TABLE audit_events (
+    id integer NOT NULL DEFAULT nextval('audit_events_id_seq'),
+    "timestamp" timestamptz NOT NULL DEFAULT now(),
+    prev_hash varchar(64),
+    row_hash varchar(64),
+    user_id varchar(255),
+    user_role varchar(50),
+    event_type varchar(100) NOT NULL,
+    application_id integer,
+    decision_id integer,
+    event_data jsonb,
+    session_id varchar(255),
+    CONSTRAINT audit_events_pkey PRIMARY KEY (id, "timestamp")
+) PARTITION BY RANGE ("timestamp")
+"""
+
+ENSURE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION audit_events_ensure_partitions(
+    months_ahead integer DEFAULT 3,
+    from_ts timestamptz DEFAULT now()
+)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+    month_start timestamp := date_trunc('month', from_ts AT TIME ZONE 'UTC');
+    last_month timestamp := date_trunc('month', now() AT TIME ZONE 'UTC')
+        + make_interval(months => months_ahead);
+    lower_bound timestamptz;
+    upper_bound timestamptz;
+    part_name text;
+    created integer := 0;
+BEGIN
+    -- Serialize concurrent callers (several API replicas starting at once).
+    PERFORM pg_advisory_xact_lock(900002);
+
+    WHILE month_start <= last_month LOOP
+        part_name := 'audit_events_' || to_char(month_start, 'YYYY_MM');
+        lower_bound := month_start AT TIME ZONE 'UTC';
+        upper_bound := (month_start + interval '1 month') AT TIME ZONE 'UTC';
+
+        IF to_regclass(part_name) IS NULL THEN
+            -- A month that already spilled into the default partition cannot
+            -- be carved out without moving rows (which the append-only
+            -- trigger forbids); leave those rows in the default partition.
+            IF EXISTS (
+                SELECT 1 FROM audit_events_default
+                WHERE "timestamp" >= lower_bound AND "timestamp" < upper_bound
+            ) THEN
+                RAISE WARNING 'audit_events_default holds rows for %; not creating %',
+                    to_char(month_start, 'YYYY-MM'), part_name;
+            ELSE
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF audit_events FOR VALUES FROM (%L) TO (%L)',
+                    part_name, lower_bound, upper_bound
+                );
+                -- Default privileges grant ALL on new tables; keep partitions append-only.
+                EXECUTE format(
+                    'REVOKE UPDATE, DELETE ON %I FROM lending_app, compliance_app',
+                    part_name
+                );
+                created := created + 1;
+            END IF;
+        END IF;
+
+        month_start := month_start + interval '1 month';
+    END LOOP;
+
+    RETURN created;
+END;
+$$;
+"""
+
+TRIGGER_UPDATE = """
+CREATE TRIGGER audit_events_no_update
+    BEFORE UPDATE ON audit_events
+    FOR EACH ROW
+    EXECUTE FUNCTION audit_events_prevent_mutation();
+"""
+
+TRIGGER_DELETE = """
+CREATE TRIGGER audit_events_no_delete
+    BEFORE DELETE ON audit_events
+    FOR EACH ROW
+    EXECUTE FUNCTION audit_events_prevent_mutation();
+"""
+
+
+def _grant_append_only(table: str) -> None:
+    # Mirrors c3d4e5f6a7b8: default privileges grant ALL on new tables.
+    op.execute(f"REVOKE UPDATE, DELETE ON {table} FROM lending_app")
+    op.execute(f"REVOKE UPDATE, DELETE ON {table} FROM compliance_app")
+    op.execute(f"GRANT INSERT, SELECT ON {table} TO lending_app")
+    op.execute(f"GRANT INSERT, SELECT ON {table} TO compliance_app")
+
+
+def upgrade() -> None:
+    # Move the existing table aside; keep its sequence alive for the new one.
+    op.execute("ALTER TABLE audit_events RENAME TO audit_events_unpartitioned")
+    op.execute("ALTER SEQUENCE audit_events_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE audit_events_unpartitioned DROP CONSTRAINT audit_events_pkey")
+    op.execute("DROP INDEX ix_audit_events_event_type")
+    op.execute("DROP INDEX ix_audit_events_application_id")
+    op.execute("DROP INDEX ix_audit_events_session_id")
+
+    op.execute(CREATE_PARTITIONED)
+    op.execute("CREATE TABLE audit_events_default PARTITION OF audit_events DEFAULT")
+    op.execute("CREATE INDEX ix_audit_events_event_type ON audit_events (event_type)")
+    op.execute("CREATE INDEX ix_audit_events_application_id ON audit_events (application_id)")
+    op.execute("CREATE INDEX ix_audit_events_session_id ON audit_events (session_id)")
+    op.execute(
+        'CREATE INDEX ix_audit_events_timestamp_brin ON audit_events USING brin ("timestamp")'
+    )
+
+    # Monthly partitions from the oldest existing event through three months ahead,
+    # created before the copy so historical rows land in their own month.
+    op.execute(ENSURE_PARTITIONS_FUNCTION)
+    op.execute(f"REVOKE ALL ON FUNCTION {_ENSURE_SIGNATURE} FROM PUBLIC")
+    op.execute(f"GRANT EXECUTE ON FUNCTION {_ENSURE_SIGNATURE} TO lending_app")
+    op.execute(
+        "SELECT audit_events_ensure_partitions("
+        '3, coalesce((SELECT min("timestamp") FROM audit_events_unpartitioned), now()))'
+    )
+
+    op.execute(
+        f"INSERT INTO audit_events ({_COLUMNS}) "
+        f"SELECT {_COLUMNS} FROM audit_events_unpartitioned ORDER BY id"
+    )
+    # DROP TABLE does not fire the row-level append-only triggers.
+    op.execute("DROP TABLE audit_events_unpartitioned")
+    op.execute("ALTER SEQUENCE audit_events_id_seq OWNED BY audit_events.id")
+
+    # Triggers on the parent are cloned onto every current and future partition.
+    op.execute(TRIGGER_UPDATE)
+    op.execute(TRIGGER_DELETE)
+
+    _grant_append_only("audit_events")
+    _grant_append_only("audit_events_default")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE audit_events RENAME TO audit_events_partitioned")
+    op.execute("ALTER SEQUENCE audit_events_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE audit_events_partitioned DROP CONSTRAINT audit_events_pkey")
+    op.execute("DROP INDEX ix_audit_events_event_type")
+    op.execute("DROP INDEX ix_audit_events_application_id")
+    op.execute("DROP INDEX ix_audit_events_session_id")
+    op.execute("DROP INDEX ix_audit_events_timestamp_brin")
+
+    op.execute(
+        CREATE_PARTITIONED.replace('PRIMARY KEY (id, "timestamp")', "PRIMARY KEY (id)").replace(
+            'PARTITION BY RANGE ("timestamp")', ""
+        )
+    )
+    op.execute("CREATE INDEX ix_audit_events_event_type ON audit_events (event_type)")
+    op.execute("CREATE INDEX ix_audit_events_application_id ON audit_events (application_id)")
+    op.execute("CREATE INDEX ix_audit_events_session_id ON audit_events (session_id)")
+
+    op.execute(
+        f"INSERT INTO audit_events ({_COLUMNS}) "
+        f"SELECT {_COLUMNS} FROM audit_events_partitioned ORDER BY id"
+    )
+    # Dropping the parent drops every partition with it.
+    op.execute("DROP TABLE audit_events_partitioned")
+    op.execute("ALTER SEQUENCE audit_events_id_seq OWNED BY audit_events.id")
+    op.execute(f"DROP FUNCTION IF EXISTS {_ENSURE_SIGNATURE}")
+
+    op.execute(TRIGGER_UPDATE)
+    op.execute(TRIGGER_DELETE)
+
+    _grant_append_only("audit_events")
@@ -0,0 +1,115 @@
+# This project was developed with assistance from AI tools.
+"""add analytics daily rollup tables
+
+- analytics_daily_rollups: application creations, decisions by type,
+  closings and days-to-close sums per day x loan_type x LO
+- analytics_daily_stage_rollups: stage entries, exits and turn-time sums
+  per day x loan_type x LO x stage
+- analytics_daily_denial_reasons: denial reason counts per
+  day x loan_type x LO x reason
+
+Grains are unique with NULLS NOT DISTINCT (PostgreSQL 15+) so unassigned
+applications and applications without a loan type share one row per day
+and the incremental writers can upsert with ON CONFLICT.
+
+The tables start empty; backfill with ``python -m src.rebuild_analytics``
+(e8f9a0b1c2d3 keeps analytics on the source tables until then).
+
+Revision ID: c6d7e8f9a0b1
+Revises: b5c6d7e8f9a0
+Create Date: 2026-03-24 09:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c6d7e8f9a0b1"
+down_revision = "b5c6d7e8f9a0"
+branch_labels = None
+depends_on = None
+
+
+def _counter(name: str, type_=sa.Integer()) -> sa.Column:
+    return sa.Column(name, type_, server_default="0", nullable=False)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analytics_daily_rollups",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("loan_type", sa.String(50), nullable=True),
+        sa.Column("assigned_to", sa.String(255), nullable=True),
+        _counter("applications_created"),
+        _counter("decisions_approved"),
+        _counter("decisions_conditional"),
+        _counter("decisions_suspended"),
+        _counter("decisions_denied"),
+        _counter("closed_count"),
+        _counter("days_to_close_sum", sa.Float()),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "day",
+            "loan_type",
+            "assigned_to",
+            name="uq_analytics_daily_rollups_grain",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    op.create_table(
+        "analytics_daily_stage_rollups",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("loan_type", sa.String(50), nullable=True),
+        sa.Column("assigned_to", sa.String(255), nullable=True),
+        sa.Column("stage", sa.String(50), nullable=False),
+        _counter("entered"),
+        _counter("exited"),
+        _counter("turn_days_sum", sa.Float()),
+        _counter("turn_samples"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "day",
+            "loan_type",
+            "assigned_to",
+            "stage",
+            name="uq_analytics_daily_stage_rollups_grain",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+    op.create_index(
+        "ix_analytics_daily_stage_rollups_stage_day",
+        "analytics_daily_stage_rollups",
+        ["stage", "day"],
+    )
+
+    op.create_table(
+        "analytics_daily_denial_reasons",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("loan_type", sa.String(50), nullable=True),
+        sa.Column("assigned_to", sa.String(255), nullable=True),
+        sa.Column("reason", sa.Text(), nullable=False),
+        _counter("count"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "day",
+            "loan_type",
+            "assigned_to",
+            "reason",
+            name="uq_analytics_daily_denial_reasons_grain",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("analytics_daily_denial_reasons")
+    op.drop_index(
+        "ix_analytics_daily_stage_rollups_stage_day", table_name="analytics_daily_stage_rollups"
+    )
+    op.drop_table("analytics_daily_stage_rollups")
+    op.drop_table("analytics_daily_rollups")
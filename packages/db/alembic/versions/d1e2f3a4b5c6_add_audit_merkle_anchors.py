@@ -0,0 +1,50 @@
+# This project was developed with assistance from AI tools.
+"""add audit_merkle_anchors table
+
+Merkle roots over fixed-size blocks of consecutive audit events, so a
+single event's integrity can be proven from its block alone. Append-only:
+app roles get SELECT + INSERT only.
+
+Revision ID: d1e2f3a4b5c6
+Revises: c0d1e2f3a4b5
+Create Date: 2026-03-07 14:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d1e2f3a4b5c6"
+down_revision = "c0d1e2f3a4b5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_merkle_anchors",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("first_event_id", sa.Integer(), nullable=False),
+        sa.Column("last_event_id", sa.Integer(), nullable=False),
+        sa.Column("event_count", sa.Integer(), nullable=False),
+        sa.Column("merkle_root", sa.String(64), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("last_event_id", name="uq_audit_merkle_anchors_last_event_id"),
+    )
+
+    # Default privileges grant ALL on new tables; keep anchors append-only.
+    op.execute("REVOKE UPDATE, DELETE ON audit_merkle_anchors FROM lending_app")
+    op.execute("GRANT SELECT, INSERT ON audit_merkle_anchors TO lending_app")
+    op.execute("GRANT USAGE ON SEQUENCE audit_merkle_anchors_id_seq TO lending_app")
+    op.execute("GRANT SELECT ON audit_merkle_anchors TO compliance_app")
+
+
+def downgrade() -> None:
+    op.drop_table("audit_merkle_anchors")
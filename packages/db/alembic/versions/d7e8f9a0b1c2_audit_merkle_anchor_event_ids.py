@@ -0,0 +1,35 @@
+# This project was developed with assistance from AI tools.
+"""add event_ids to audit_merkle_anchors
+
+Records exactly which events each Merkle block covers.  A block used to
+be re-read as every event with an id between its bounds, so an event
+whose id fell inside an anchored range but committed after anchoring
+made the block fail verification forever.  Anchors written before this
+column existed keep NULL and are still re-read by id range.
+
+Revision ID: d7e8f9a0b1c2
+Revises: c6d7e8f9a0b1
+Create Date: 2026-03-26 10:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "d7e8f9a0b1c2"
+down_revision = "c6d7e8f9a0b1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "audit_merkle_anchors",
+        sa.Column("event_ids", postgresql.ARRAY(sa.Integer()), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("audit_merkle_anchors", "event_ids")
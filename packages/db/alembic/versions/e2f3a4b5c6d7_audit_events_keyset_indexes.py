@@ -0,0 +1,56 @@
+# This project was developed with assistance from AI tools.
+"""composite (filter, timestamp, id) indexes on audit_events for keyset paging
+
+The audit query APIs page on (timestamp, id). Each single-column index on
+application_id / session_id / event_type is replaced by a composite one
+with (timestamp, id) appended, which still serves lookups on the leading
+column alone. (timestamp, id) covers unfiltered, time-ordered search.
+
+Indexes are created on the partitioned parent, which builds them on every
+partition.
+
+Revision ID: e2f3a4b5c6d7
+Revises: d1e2f3a4b5c6
+Create Date: 2026-03-08 09:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e2f3a4b5c6d7"
+down_revision = "d1e2f3a4b5c6"
+branch_labels = None
+depends_on = None
+
+_REPLACED = {
+    "ix_audit_events_application_id": "application_id",
+    "ix_audit_events_session_id": "session_id",
+    "ix_audit_events_event_type": "event_type",
+}
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_audit_events_application_ts_id",
+        "audit_events",
+        ["application_id", "timestamp", "id"],
+    )
+    op.create_index(
+        "ix_audit_events_session_ts_id", "audit_events", ["session_id", "timestamp", "id"]
+    )
+    op.create_index(
+        "ix_audit_events_event_type_ts_id", "audit_events", ["event_type", "timestamp", "id"]
+    )
+    op.create_index("ix_audit_events_ts_id", "audit_events", ["timestamp", "id"])
+    for name in _REPLACED:
+        op.drop_index(name, table_name="audit_events")
+
+
+def downgrade() -> None:
+    for name, column in _REPLACED.items():
+        op.create_index(name, "audit_events", [column])
+    op.drop_index("ix_audit_events_ts_id", table_name="audit_events")
+    op.drop_index("ix_audit_events_event_type_ts_id", table_name="audit_events")
+    op.drop_index("ix_audit_events_session_ts_id", table_name="audit_events")
+    op.drop_index("ix_audit_events_application_ts_id", table_name="audit_events")
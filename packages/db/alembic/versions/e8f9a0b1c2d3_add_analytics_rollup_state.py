@@ -0,0 +1,45 @@
+# This project was developed with assistance from AI tools.
+"""add analytics_rollup_state
+
+One row recording that the analytics rollup tables have been built.  The
+rollup tables from c6d7e8f9a0b1 start empty, so until
+``python -m src.rebuild_analytics`` backfills them the analytics service
+keeps reading the source tables.  A database with no applications yet has
+nothing to backfill and is marked built here.
+
+Revision ID: e8f9a0b1c2d3
+Revises: d7e8f9a0b1c2
+Create Date: 2026-03-27 09:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e8f9a0b1c2d3"
+down_revision = "d7e8f9a0b1c2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analytics_rollup_state",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "built_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute(
+        "INSERT INTO analytics_rollup_state (id) "
+        "SELECT 1 WHERE NOT EXISTS (SELECT 1 FROM applications)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("analytics_rollup_state")
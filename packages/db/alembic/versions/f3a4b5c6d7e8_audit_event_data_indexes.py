@@ -0,0 +1,51 @@
+# This project was developed with assistance from AI tools.
+"""GIN and expression indexes on audit_events.event_data
+
+Audit search filters on event_data by JSONB containment (@>), served by a
+GIN index using jsonb_path_ops (smaller and faster than the default opclass,
+and containment is the only operator we need). The keys looked up by
+equality most often -- tool_name, to_stage, overall_status -- also get
+btree expression indexes on ``event_data ->> key``, which the analytics
+stage-transition queries use as well.
+
+Indexes are created on the partitioned parent, which builds them on every
+partition.
+
+Revision ID: f3a4b5c6d7e8
+Revises: e2f3a4b5c6d7
+Create Date: 2026-03-09 09:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f3a4b5c6d7e8"
+down_revision = "e2f3a4b5c6d7"
+branch_labels = None
+depends_on = None
+
+_HOT_KEYS = ("tool_name", "to_stage", "overall_status")
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_audit_events_event_data_gin",
+        "audit_events",
+        ["event_data"],
+        postgresql_using="gin",
+        postgresql_ops={"event_data": "jsonb_path_ops"},
+    )
+    for key in _HOT_KEYS:
+        op.create_index(
+            f"ix_audit_events_{key}",
+            "audit_events",
+            [sa.text(f"(event_data ->> '{key}')")],
+        )
+
+
+def downgrade() -> None:
+    for key in _HOT_KEYS:
+        op.drop_index(f"ix_audit_events_{key}", table_name="audit_events")
+    op.drop_index("ix_audit_events_event_data_gin", table_name="audit_events")
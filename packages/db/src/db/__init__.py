@@ -21,10 +21,19 @@ from .enums import (
     UserRole,
 )
 from .models import (
+    AnalyticsDailyDenialReason,
+    AnalyticsDailyRollup,
+    AnalyticsDailyStageRollup,
+    AnalyticsRollupState,
     Application,
     ApplicationBorrower,
     ApplicationFinancials,
+    ApplicationStageHistory,
+    AuditArchiveSegment,
+    AuditChainHead,
     AuditEvent,
+    AuditMerkleAnchor,
+    AuditVerificationWatermark,
     AuditViolation,
     Borrower,
     ComplianceResult,
@@ -62,10 +71,19 @@ __all__ = [
     "ConditionStatus",
     "DecisionType",
     # Models
+    "AnalyticsDailyDenialReason",
+    "AnalyticsDailyRollup",
+    "AnalyticsDailyStageRollup",
+    "AnalyticsRollupState",
     "Application",
     "ApplicationBorrower",
     "ApplicationFinancials",
+    "ApplicationStageHistory",
+    "AuditArchiveSegment",
+    "AuditChainHead",
     "AuditEvent",
+    "AuditMerkleAnchor",
+    "AuditVerificationWatermark",
     "AuditViolation",
     "Borrower",
     "ComplianceResult",
@@ -7,21 +7,23 @@ documents, underwriting conditions/decisions, and audit trail.
 """
 
 from sqlalchemy import (
-    JSON,
     Boolean,
     Column,
+    Date,
     DateTime,
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
     UniqueConstraint,
     func,
+    text,
 )
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import relationship
 
 from pgvector.sqlalchemy import Vector
@@ -126,6 +128,10 @@ class Application(Base):
     compliance_results = relationship(
         "ComplianceResult", back_populates="application", cascade="all, delete-orphan",
     )
+    stage_history = relationship(
+        "ApplicationStageHistory", back_populates="application", cascade="all, delete-orphan",
+        order_by="ApplicationStageHistory.entered_at",
+    )
 
     def __repr__(self):
         return f"<Application(id={self.id}, stage='{self.stage}')>"
@@ -190,6 +196,41 @@ class ApplicationFinancials(Base):
         return f"<ApplicationFinancials(app_id={self.application_id}, credit={self.credit_score})>"
 
 
+class ApplicationStageHistory(Base):
+    """One row per stage an application entered, for turn-time analytics.
+
+    ``from_stage`` is NULL for the stage an application was created in.
+    """
+
+    __tablename__ = "application_stage_history"
+    __table_args__ = (
+        Index("ix_application_stage_history_app_entered", "application_id", "entered_at"),
+        Index("ix_application_stage_history_stage_entered", "to_stage", "entered_at"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    application_id = Column(
+        Integer, ForeignKey("applications.id", ondelete="CASCADE"), nullable=False,
+    )
+    from_stage = Column(
+        Enum(ApplicationStage, name="application_stage", native_enum=False),
+        nullable=True,
+    )
+    to_stage = Column(
+        Enum(ApplicationStage, name="application_stage", native_enum=False),
+        nullable=False,
+    )
+    entered_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    application = relationship("Application", back_populates="stage_history")
+
+    def __repr__(self):
+        return (
+            f"<ApplicationStageHistory(app_id={self.application_id}, "
+            f"{self.from_stage} -> {self.to_stage})>"
+        )
+
+
 class RateLock(Base):
     """Rate lock on an application."""
 
@@ -339,20 +380,47 @@ class DocumentExtraction(Base):
 
 
 class AuditEvent(Base):
-    """Append-only audit trail. INSERT + SELECT only -- no UPDATE or DELETE."""
+    """Append-only audit trail. INSERT + SELECT only -- no UPDATE or DELETE.
+
+    Range-partitioned by month on ``timestamp`` (see migration c0d1e2f3a4b5),
+    so the database primary key is (id, timestamp). ``id`` alone is still
+    unique (single sequence) and remains the ORM identity.
+    """
 
     __tablename__ = "audit_events"
+    # Composite (filter, timestamp, id) indexes back keyset pagination in the
+    # audit query APIs; each also serves plain lookups on its leading column.
+    __table_args__ = (
+        Index("ix_audit_events_application_ts_id", "application_id", "timestamp", "id"),
+        Index("ix_audit_events_session_ts_id", "session_id", "timestamp", "id"),
+        Index("ix_audit_events_event_type_ts_id", "event_type", "timestamp", "id"),
+        Index("ix_audit_events_ts_id", "timestamp", "id"),
+        # Containment (@>) search on event_data, plus btree expression
+        # indexes for the keys queried by equality most often.
+        Index(
+            "ix_audit_events_event_data_gin",
+            "event_data",
+            postgresql_using="gin",
+            postgresql_ops={"event_data": "jsonb_path_ops"},
+        ),
+        Index("ix_audit_events_tool_name", text("(event_data ->> 'tool_name')")),
+        Index("ix_audit_events_to_stage", text("(event_data ->> 'to_stage')")),
+        Index("ix_audit_events_overall_status", text("(event_data ->> 'overall_status')")),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     prev_hash = Column(String(64), nullable=True)
+    # Hash of this row, stored at write time so the next insert need not
+    # re-read and re-hash it. NULL on rows written before the chain head.
+    row_hash = Column(String(64), nullable=True)
     user_id = Column(String(255), nullable=True)
     user_role = Column(String(50), nullable=True)
-    event_type = Column(String(100), nullable=False, index=True)
-    application_id = Column(Integer, nullable=True, index=True)
+    event_type = Column(String(100), nullable=False)
+    application_id = Column(Integer, nullable=True)
     decision_id = Column(Integer, nullable=True)
-    event_data = Column(JSON, nullable=True)
-    session_id = Column(String(255), nullable=True, index=True)
+    event_data = Column(JSONB, nullable=True)
+    session_id = Column(String(255), nullable=True)
 
     def __repr__(self):
         return f"<AuditEvent(id={self.id}, type='{self.event_type}')>"
@@ -370,6 +438,187 @@ class AuditViolation(Base):
     audit_event_id = Column(Integer, nullable=True)
 
 
+class AuditChainHead(Base):
+    """Single-row pointer to the newest audit event and its hash.
+
+    Read and advanced under the audit advisory lock by every writer, so an
+    insert looks up one tiny row instead of scanning for the latest event.
+    """
+
+    __tablename__ = "audit_chain_head"
+
+    id = Column(Integer, primary_key=True, default=1)
+    last_id = Column(Integer, nullable=False)
+    last_hash = Column(String(64), nullable=False)
+
+
+class AuditVerificationWatermark(Base):
+    """Single-row high-water mark of the last verified audit chain position.
+
+    Lets ``verify_audit_chain`` resume from the last verified event instead of
+    re-walking the chain from genesis on every run.
+    """
+
+    __tablename__ = "audit_verification_watermark"
+
+    id = Column(Integer, primary_key=True, default=1)
+    last_verified_id = Column(Integer, nullable=False)
+    last_verified_hash = Column(String(64), nullable=False)
+    verified_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class AuditMerkleAnchor(Base):
+    """Merkle root over a fixed-size block of consecutive audit events.
+
+    Blocks cover the events listed in ``event_ids`` (all within
+    ``first_event_id..last_event_id``), in id order. An event's inclusion
+    proof only needs its own block, not the whole chain. Append-only like
+    audit_events.
+    """
+
+    __tablename__ = "audit_merkle_anchors"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    first_event_id = Column(Integer, nullable=False)
+    last_event_id = Column(Integer, nullable=False, unique=True)
+    event_count = Column(Integer, nullable=False)
+    # NULL for anchors written before the column existed (re-read by id range).
+    event_ids = Column(ARRAY(Integer), nullable=True)
+    merkle_root = Column(String(64), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class AuditArchiveSegment(Base):
+    """One archived run of audit events held in object storage.
+
+    Covers events ``first_event_id..last_event_id`` (always a prefix of the
+    chain by id, so every older event is archived too). ``last_hash`` is the
+    chain hash of the last archived event: verification of the live table
+    resumes from it. Append-only like audit_events.
+    """
+
+    __tablename__ = "audit_archive_segments"
+    __table_args__ = (
+        Index(
+            "ix_audit_archive_segments_application_ids",
+            "application_ids",
+            postgresql_using="gin",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    first_event_id = Column(Integer, nullable=False)
+    last_event_id = Column(Integer, nullable=False, unique=True)
+    event_count = Column(Integer, nullable=False)
+    first_timestamp = Column(DateTime(timezone=True), nullable=False)
+    last_timestamp = Column(DateTime(timezone=True), nullable=False)
+    # prev_hash of the first archived event, i.e. the previous segment's last_hash.
+    first_prev_hash = Column(String(64), nullable=False)
+    last_hash = Column(String(64), nullable=False)
+    object_key = Column(String(500), nullable=False)
+    content_sha256 = Column(String(64), nullable=False)
+    # Lets per-application reads skip segments that cannot contain a match.
+    application_ids = Column(ARRAY(Integer), nullable=False, server_default="{}")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class AnalyticsDailyRollup(Base):
+    """Per-day decision, creation and closing counters at day x loan_type x LO.
+
+    Maintained incrementally by services.analytics_rollups when applications
+    are created, decisions rendered and stages change; rebuilt from source
+    tables by ``python -m src.rebuild_analytics``. ``loan_type`` and
+    ``assigned_to`` are the application's current values; changing either
+    moves its counts to the new grain.
+    """
+
+    __tablename__ = "analytics_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "day", "loan_type", "assigned_to",
+            name="uq_analytics_daily_rollups_grain",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    day = Column(Date, nullable=False)
+    loan_type = Column(Enum(LoanType, name="loan_type", native_enum=False), nullable=True)
+    assigned_to = Column(String(255), nullable=True)
+    applications_created = Column(Integer, nullable=False, server_default="0", default=0)
+    decisions_approved = Column(Integer, nullable=False, server_default="0", default=0)
+    decisions_conditional = Column(Integer, nullable=False, server_default="0", default=0)
+    decisions_suspended = Column(Integer, nullable=False, server_default="0", default=0)
+    decisions_denied = Column(Integer, nullable=False, server_default="0", default=0)
+    closed_count = Column(Integer, nullable=False, server_default="0", default=0)
+    # Sum of (closed - created) in days over closed_count applications.
+    days_to_close_sum = Column(Float, nullable=False, server_default="0", default=0.0)
+
+
+class AnalyticsDailyStageRollup(Base):
+    """Per-day stage entries, exits and turn-time sums at day x loan_type x LO x stage.
+
+    ``turn_days_sum`` / ``turn_samples`` cover entries into ``stage`` that
+    have a tracked turn-time predecessor (see services.analytics).
+    """
+
+    __tablename__ = "analytics_daily_stage_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "day", "loan_type", "assigned_to", "stage",
+            name="uq_analytics_daily_stage_rollups_grain",
+            postgresql_nulls_not_distinct=True,
+        ),
+        Index("ix_analytics_daily_stage_rollups_stage_day", "stage", "day"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    day = Column(Date, nullable=False)
+    loan_type = Column(Enum(LoanType, name="loan_type", native_enum=False), nullable=True)
+    assigned_to = Column(String(255), nullable=True)
+    stage = Column(
+        Enum(ApplicationStage, name="application_stage", native_enum=False),
+        nullable=False,
+    )
+    entered = Column(Integer, nullable=False, server_default="0", default=0)
+    exited = Column(Integer, nullable=False, server_default="0", default=0)
+    turn_days_sum = Column(Float, nullable=False, server_default="0", default=0.0)
+    turn_samples = Column(Integer, nullable=False, server_default="0", default=0)
+
+
+class AnalyticsDailyDenialReason(Base):
+    """Per-day denial reason counts at day x loan_type x LO x reason."""
+
+    __tablename__ = "analytics_daily_denial_reasons"
+    __table_args__ = (
+        UniqueConstraint(
+            "day", "loan_type", "assigned_to", "reason",
+            name="uq_analytics_daily_denial_reasons_grain",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    day = Column(Date, nullable=False)
+    loan_type = Column(Enum(LoanType, name="loan_type", native_enum=False), nullable=True)
+    assigned_to = Column(String(255), nullable=True)
+    reason = Column(Text, nullable=False)
+    count = Column(Integer, nullable=False, server_default="0", default=0)
+
+
+class AnalyticsRollupState(Base):
+    """Single row recording when the analytics rollups were last fully built.
+
+    Absent until ``python -m src.rebuild_analytics`` has run over existing
+    data; the analytics service reads the source tables until then.
+    """
+
+    __tablename__ = "analytics_rollup_state"
+
+    id = Column(Integer, primary_key=True)
+    built_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
 class DemoDataManifest(Base):
     """Tracks demo data seeding for idempotency."""
 
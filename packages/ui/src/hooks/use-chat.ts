@@ -114,11 +114,28 @@ export function useChat({ path, historyPath, wsOptions }: UseChatOptions) {
                         }
                         break;
 
+                    case 'delta':
+                    case 'retract': {
+                        // Moderated segments append to the streaming
+                        // placeholder; a retraction replaces everything
+                        // streamed so far.
+                        const text = msg.content ?? '';
+                        const replace = msg.type === 'retract';
+                        setMessages((prev) => {
+                            const last = prev[prev.length - 1];
+                            if (last?.role !== 'assistant' || !isStreamingMsg(last)) return prev;
+                            const content = replace ? text : last.content + text;
+                            return [...prev.slice(0, -1), { ...last, content }];
+                        });
+                        break;
+                    }
+
                     case 'done': {
-                        // The server sends a single done message with the
-                        // complete, cleaned response (no preceding token
-                        // messages). This eliminates the Firefox microtask
-                        // race that caused blank responses.
+                        // The done message always carries the complete,
+                        // cleaned response and replaces any streamed
+                        // deltas, so a dropped or reordered delta render
+                        // (e.g. the Firefox microtask race that caused
+                        // blank responses) cannot leave a wrong answer.
                         const doneContent = msg.content ?? '';
                         setMessages((prev) => {
                             const last = prev[prev.length - 1];
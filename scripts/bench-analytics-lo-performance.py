@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# This project was developed with assistance from AI tools.
+"""Benchmark: get_lo_performance latency and round trips at portfolio scale.
+
+Creates the applications, decisions, conditions and application_stage_history
+tables in a throwaway ``bench_analytics`` schema (the ORM is pointed at it
+with a schema_translate_map), loads a synthetic portfolio -- by default 200
+loan officers and 50,000 applications with decisions, cleared conditions and
+stage history -- then times get_lo_performance and counts
+the SQL statements it issues.  The scratch schema is dropped afterwards;
+real tables are not touched.
+
+Requires a PostgreSQL reachable at DATABASE_URL.
+
+Usage (from packages/api):
+  uv run python ../../scripts/bench-analytics-lo-performance.py
+  uv run python ../../scripts/bench-analytics-lo-performance.py --los 500 --apps 200000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "packages" / "api"))
+
+from db import Application, ApplicationStageHistory, Base, Condition, Decision  # noqa: E402
+from db.enums import (  # noqa: E402
+    ApplicationStage,
+    ConditionSeverity,
+    ConditionStatus,
+    DecisionType,
+    LoanType,
+)
+from sqlalchemy import event, insert, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from src.core.config import settings  # noqa: E402
+from src.services.analytics import get_lo_performance  # noqa: E402
+
+SCHEMA = "bench_analytics"
+TABLES = [t.__table__ for t in (Application, Decision, Condition, ApplicationStageHistory)]
+BATCH = 5_000
+
+_PATH = [
+    ApplicationStage.APPLICATION,
+    ApplicationStage.PROCESSING,
+    ApplicationStage.UNDERWRITING,
+    ApplicationStage.CONDITIONAL_APPROVAL,
+    ApplicationStage.CLEAR_TO_CLOSE,
+    ApplicationStage.CLOSED,
+]
+
+
+def _portfolio(los: int, apps: int, rng: random.Random):
+    """Synthetic rows: (applications, decisions, conditions, stage history)."""
+    now = datetime.now(UTC)
+    applications, decisions, conditions, history = [], [], [], []
+    for app_id in range(1, apps + 1):
+        created = now - timedelta(days=rng.uniform(0, 365))
+        reached = rng.randint(0, len(_PATH) - 1)
+        stage = _PATH[reached]
+        if reached >= 3 and rng.random() < 0.15:
+            stage = ApplicationStage.DENIED
+        ts = created
+        history.append(
+            {"application_id": app_id, "from_stage": None, "to_stage": _PATH[0], "entered_at": ts}
+        )
+        for from_stage, to_stage in zip(_PATH[: reached + 1], _PATH[1 : reached + 1], strict=False):
+            ts += timedelta(days=rng.uniform(1, 10))
+            history.append(
+                {
+                    "application_id": app_id,
+                    "from_stage": from_stage,
+                    "to_stage": to_stage,
+                    "entered_at": ts,
+                }
+            )
+        applications.append(
+            {
+                "id": app_id,
+                "stage": stage,
+                "loan_type": rng.choice(list(LoanType)),
+                "assigned_to": f"lo-{app_id % los:04d}",
+                "created_at": created,
+                "updated_at": ts,
+            }
+        )
+        if reached >= 3:
+            denied = stage == ApplicationStage.DENIED
+            decisions.append(
+                {
+                    "application_id": app_id,
+                    "decision_type": DecisionType.DENIED if denied else DecisionType.APPROVED,
+                    "created_at": ts,
+                }
+            )
+            for _ in range(rng.randint(0, 3)):
+                conditions.append(
+                    {
+                        "application_id": app_id,
+                        "description": "bench condition",
+                        "severity": ConditionSeverity.PRIOR_TO_DOCS,
+                        "status": ConditionStatus.CLEARED,
+                        "created_at": ts - timedelta(days=rng.uniform(1, 5)),
+                        "updated_at": ts,
+                    }
+                )
+    return applications, decisions, conditions, history
+
+
+async def _load(conn, table, rows: list[dict]) -> None:
+    for start in range(0, len(rows), BATCH):
+        await conn.execute(insert(table), rows[start : start + BATCH])
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--los", type=int, default=200)
+    parser.add_argument("--apps", type=int, default=50_000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="Keep the bench_analytics schema")
+    args = parser.parse_args()
+
+    base_engine = create_async_engine(settings.DATABASE_URL)
+    engine = base_engine.execution_options(schema_translate_map={None: SCHEMA})
+
+    statements = 0
+
+    @event.listens_for(base_engine.sync_engine, "before_cursor_execute")
+    def _count(*_args, **_kwargs):
+        nonlocal statements
+        statements += 1
+
+    try:
+        async with base_engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda c: Base.metadata.create_all(c, tables=TABLES))
+            t0 = time.perf_counter()
+            applications, decisions, conditions, history = _portfolio(
+                args.los, args.apps, random.Random(args.seed)
+            )
+            for table, rows in zip(
+                TABLES, (applications, decisions, conditions, history), strict=True
+            ):
+                await _load(conn, table, rows)
+            for table in TABLES:
+                await conn.execute(text(f"ANALYZE {SCHEMA}.{table.name}"))
+            print(
+                f"Loaded {len(applications):,} applications, {len(decisions):,} decisions, "
+                f"{len(conditions):,} conditions, {len(history):,} stage history rows "
+                f"for {args.los} LOs in {time.perf_counter() - t0:.1f}s"
+            )
+
+        samples = []
+        async with AsyncSession(engine) as session:
+            await get_lo_performance(session, days=args.days)  # warm up
+            for _ in range(args.repeat):
+                statements = 0
+                t0 = time.perf_counter()
+                result = await get_lo_performance(session, days=args.days)
+                samples.append(time.perf_counter() - t0)
+
+        print(f"\nget_lo_performance(days={args.days})")
+        print(f"  loan officers   {len(result.loan_officers):>10,}")
+        print(f"  SQL statements  {statements:>10,}")
+        print(f"  median latency  {statistics.median(samples) * 1000:>10.1f} ms")
+        print(f"  max latency     {max(samples) * 1000:>10.1f} ms")
+    finally:
+        if not args.keep:
+            async with base_engine.begin() as conn:
+                await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await base_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
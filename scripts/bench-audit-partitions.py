@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# This project was developed with assistance from AI tools.
+"""Benchmark: audit_events time-range queries, plain table vs monthly partitions.
+
+Loads the same synthetic audit trail into two scratch tables in a
+throwaway ``bench_audit`` schema -- one shaped like the old audit_events
+(btree on event_type, no timestamp index) and one range-partitioned by
+month with a BRIN index on timestamp -- then times the query shapes used
+by search_events, export_events(days=...) and the analytics turn-time
+queries.  The scratch schema is dropped afterwards; real tables are not
+touched.
+
+Requires a PostgreSQL reachable at DATABASE_URL.
+
+Usage (from packages/api):
+  uv run python ../../scripts/bench-audit-partitions.py
+  uv run python ../../scripts/bench-audit-partitions.py --rows 10000000 --months 24
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "packages" / "api"))
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+from src.core.config import settings  # noqa: E402
+
+SCHEMA = "bench_audit"
+
+COLUMNS = """
+    id bigint NOT NULL,
+    "timestamp" timestamptz NOT NULL,
+    prev_hash varchar(64),
+    user_id varchar(255),
+    user_role varchar(50),
+    event_type varchar(100) NOT NULL,
+    application_id integer,
+    event_data jsonb
+"""
+
+# Spread rows evenly over the last ``months`` months, in insert (id) order.
+LOAD_SQL = """
+INSERT INTO {table}
+SELECT
+    i,
+    now() - make_interval(
+        secs => (CAST(:rows AS float8) - i) * CAST(:span_secs AS float8) / CAST(:rows AS float8)
+    ),
+    md5(i::text) || md5((i + 1)::text),
+    'user-' || (i % 50),
+    (ARRAY['loan_officer', 'underwriter', 'borrower', 'system'])[1 + i % 4],
+    (ARRAY['agent_tool_called', 'stage_transition', 'decision', 'data_access',
+           'safety_block'])[1 + i % 5],
+    i % 5000,
+    jsonb_build_object('seq', i)
+FROM generate_series(:start, :stop) AS i
+"""
+
+QUERIES = {
+    "search days=30 + event_type": """
+        SELECT * FROM {table}
+        WHERE "timestamp" >= :cutoff_30 AND event_type = 'decision'
+        ORDER BY "timestamp" DESC, id DESC LIMIT 500
+    """,
+    "export days=7 (count)": """
+        SELECT count(*) FROM {table} WHERE "timestamp" >= :cutoff_7
+    """,
+    "turn times days=90": """
+        SELECT application_id, min("timestamp"), max("timestamp") FROM {table}
+        WHERE event_type = 'stage_transition' AND "timestamp" >= :cutoff_90
+        GROUP BY application_id
+    """,
+}
+
+
+async def _setup(conn, rows: int, months: int) -> None:
+    await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+
+    await conn.execute(text(f"CREATE TABLE {SCHEMA}.plain ({COLUMNS}, PRIMARY KEY (id))"))
+    await conn.execute(
+        text(
+            f'CREATE TABLE {SCHEMA}.partitioned ({COLUMNS}, PRIMARY KEY (id, "timestamp")) '
+            'PARTITION BY RANGE ("timestamp")'
+        )
+    )
+    month = datetime.now(UTC).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    for _ in range(months + 1):
+        nxt = (month + timedelta(days=32)).replace(day=1)
+        await conn.execute(
+            text(
+                f"CREATE TABLE {SCHEMA}.partitioned_{month:%Y_%m} PARTITION OF "
+                f"{SCHEMA}.partitioned FOR VALUES FROM ('{month.isoformat()}') "
+                f"TO ('{nxt.isoformat()}')"
+            )
+        )
+        month = (month - timedelta(days=1)).replace(day=1)
+    await conn.execute(
+        text(f"CREATE TABLE {SCHEMA}.partitioned_default PARTITION OF {SCHEMA}.partitioned DEFAULT")
+    )
+
+    span_secs = months * 30 * 86400
+    batch = 1_000_000
+    for table in ("plain", "partitioned"):
+        t0 = time.perf_counter()
+        for start in range(1, rows + 1, batch):
+            stop = min(start + batch - 1, rows)
+            await conn.execute(
+                text(LOAD_SQL.format(table=f"{SCHEMA}.{table}")),
+                {"rows": rows, "span_secs": span_secs, "start": start, "stop": stop},
+            )
+        print(f"  loaded {table:<12} in {time.perf_counter() - t0:6.1f}s")
+
+    # Index layout before vs after the partitioning migration.
+    for table in ("plain", "partitioned"):
+        await conn.execute(text(f"CREATE INDEX ON {SCHEMA}.{table} (event_type)"))
+        await conn.execute(text(f"CREATE INDEX ON {SCHEMA}.{table} (application_id)"))
+    await conn.execute(text(f'CREATE INDEX ON {SCHEMA}.partitioned USING brin ("timestamp")'))
+    await conn.execute(text(f"ANALYZE {SCHEMA}.plain"))
+    await conn.execute(text(f"ANALYZE {SCHEMA}.partitioned"))
+
+
+async def _time(conn, sql: str, params: dict, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await conn.execute(text(sql), params)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="Keep the bench_audit schema")
+    args = parser.parse_args()
+
+    engine = create_async_engine(settings.DATABASE_URL)
+    now = datetime.now(UTC)
+    params = {
+        "cutoff_7": now - timedelta(days=7),
+        "cutoff_30": now - timedelta(days=30),
+        "cutoff_90": now - timedelta(days=90),
+    }
+    try:
+        async with engine.begin() as conn:
+            print(f"Loading {args.rows:,} events over {args.months} months...")
+            await _setup(conn, args.rows, args.months)
+
+        async with engine.connect() as conn:
+            print(f"\n{'query':<30}{'plain ms':>12}{'partitioned ms':>16}{'speedup':>10}")
+            for name, sql in QUERIES.items():
+                plain = await _time(conn, sql.format(table=f"{SCHEMA}.plain"), params, args.repeat)
+                parted = await _time(
+                    conn, sql.format(table=f"{SCHEMA}.partitioned"), params, args.repeat
+                )
+                print(f"{name:<30}{plain:>12.1f}{parted:>16.1f}{plain / parted:>9.1f}x")
+    finally:
+        if not args.keep:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# This project was developed with assistance from AI tools.
+"""Benchmark: sequential vs multi-process audit chain verification.
+
+Builds a synthetic, valid hash chain in memory and verifies it with a
+single inline walk (the pre-engine behaviour of verify_audit_chain), then
+through the chunked engine once per ``--workers`` count.  For each run it
+reports wall time, speedup over the inline walk, and the longest stall of
+a 1 ms ticker task on the same event loop -- i.e. how long every other
+request would have waited.  No database is needed.
+
+Wall-time speedup needs as many physical cores as workers; the loop-stall
+column shows the engine's benefit even on a single core.
+
+Usage (from packages/api):
+  uv run python ../../scripts/bench-audit-verify.py
+  uv run python ../../scripts/bench-audit-verify.py --events 1000000 --workers 1 2 4 8
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "packages" / "api"))
+
+from src.services.audit import _compute_hash  # noqa: E402
+from src.services.audit_verification import verify_chain_chunks, verify_chunk  # noqa: E402
+
+
+def build_chain(n: int) -> list[tuple]:
+    rows = []
+    prev_hash = "genesis"
+    for i in range(1, n + 1):
+        row = (
+            i,
+            f"2026-03-01 12:{(i // 60) % 60:02d}:{i % 60:02d}.{i % 1_000_000:06d}+00:00",
+            "agent_tool_called",
+            f"user-{i % 50}",
+            "loan_officer",
+            i % 5_000,
+            f"sess-{i % 2_000}",
+            {"tool_name": "uw_risk_assessment", "result_length": i % 4096, "seq": i},
+            prev_hash,
+        )
+        rows.append(row)
+        prev_hash = _compute_hash(*row[:8])
+    return rows
+
+
+async def _chunks(rows: list[tuple], size: int):
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+async def _timed(work) -> tuple[float, float]:
+    """Run ``work()`` and return (wall seconds, longest event-loop stall in seconds)."""
+    stall = 0.0
+    stop = asyncio.Event()
+
+    async def _ticker():
+        nonlocal stall
+        last = time.perf_counter()
+        while not stop.is_set():
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stall = max(stall, now - last - 0.001)
+            last = now
+
+    ticker = asyncio.create_task(_ticker())
+    await asyncio.sleep(0)
+    t0 = time.perf_counter()
+    await work()
+    wall = time.perf_counter() - t0
+    stop.set()
+    await ticker
+    return wall, stall
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    print(f"Building {args.events:,} synthetic events ({os.cpu_count()} CPUs)...")
+    t0 = time.perf_counter()
+    rows = build_chain(args.events)
+    print(f"  built in {time.perf_counter() - t0:.1f}s")
+
+    async def _inline():
+        checked, break_id, _ = verify_chunk(rows, None, "genesis")
+        assert break_id is None and checked == args.events
+
+    sequential, stall = await _timed(_inline)
+    print(f"{'run':<22}{'wall':>9}{'speedup':>9}{'max loop stall':>16}")
+    print(f"{'inline walk':<22}{sequential:8.2f}s{1:8.2f}x{stall * 1000:13.0f} ms")
+
+    for workers in dict.fromkeys(args.workers):
+
+        async def _engine(workers=workers):
+            outcome = await verify_chain_chunks(_chunks(rows, args.chunk_size), max_workers=workers)
+            assert outcome.ok and outcome.events_checked == args.events
+
+        wall, stall = await _timed(_engine)
+        label = f"engine, {workers} worker(s)"
+        print(f"{label:<22}{wall:8.2f}s{sequential / wall:8.2f}x{stall * 1000:13.0f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
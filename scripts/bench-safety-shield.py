@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# This project was developed with assistance from AI tools.
+"""Benchmark: shield check latency and throughput under concurrent sessions.
+
+Runs --checks input-shield checks from --sessions concurrent sessions
+through SafetyChecker against a simulated safety model: each request takes
+--latency-ms, and at most --server-slots requests are served at once (the
+serving engine's batch capacity; further requests queue server-side).  A
+--duplicates fraction of the messages repeats a small set of greetings, the
+traffic that request sharing collapses.  The verdict cache is off so every
+check reaches the dispatcher, configured by --max-concurrency (requests in
+flight) and --batch-max-size / --batch-wait-ms (the optional hold).  The
+model is simulated: the numbers compare dispatcher settings against each
+other, not against a real serving engine.
+
+Reports the requests the safety model received, per-check latency
+percentiles and checks per second.
+
+Usage (from packages/api):
+  uv run python ../../scripts/bench-safety-shield.py
+  uv run python ../../scripts/bench-safety-shield.py --sessions 200 --latency-ms 40
+  uv run python ../../scripts/bench-safety-shield.py --max-concurrency 16 --batch-wait-ms 2
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "packages" / "api"))
+
+from src.inference.safety import SafetyChecker  # noqa: E402
+
+GREETINGS = ["hi", "hello", "thanks", "ok", "yes"]
+
+
+class _SimulatedModel:
+    """Stands in for ChatOpenAI: fixed latency, bounded server-side parallelism."""
+
+    def __init__(self, latency_s: float, slots: int) -> None:
+        self._latency_s = latency_s
+        self._slots = asyncio.Semaphore(slots)
+        self.requests = 0
+
+    async def ainvoke(self, _prompt: str):
+        self.requests += 1
+        async with self._slots:
+            await asyncio.sleep(self._latency_s)
+        return SimpleNamespace(content="safe")
+
+
+async def _run(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    messages = [
+        rng.choice(GREETINGS)
+        if rng.random() < args.duplicates
+        else f"question {i} about my loan application"
+        for i in range(args.checks)
+    ]
+    checker = SafetyChecker(
+        model="bench",
+        endpoint="http://bench",
+        api_key="bench",
+        max_concurrency=args.max_concurrency,
+        batch_max_size=args.batch_max_size,
+        batch_max_wait_s=args.batch_wait_ms / 1000,
+    )
+    model = _SimulatedModel(args.latency_ms / 1000, args.server_slots)
+    checker._llm = model
+
+    queue = iter(messages)
+    latencies: list[float] = []
+
+    async def session() -> None:
+        for message in queue:
+            started = time.perf_counter()
+            await checker.check_input(message)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(session() for _ in range(args.sessions)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{args.checks} checks, {args.sessions} sessions, {args.latency_ms:.0f} ms model, "
+        f"{args.server_slots} server slots, {args.duplicates:.0%} duplicates"
+    )
+    print(
+        f"  dispatcher      {args.max_concurrency} in flight, hold "
+        f"{args.batch_wait_ms:g} ms / {args.batch_max_size} checks"
+    )
+    print(f"  requests sent   {model.requests}")
+    print(f"  latency p50     {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"  latency p95     {p95 * 1000:.1f} ms")
+    print(f"  throughput      {args.checks / elapsed:.0f} checks/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checks", type=int, default=5000)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--server-slots", type=int, default=256)
+    parser.add_argument("--duplicates", type=float, default=0.2)
+    parser.add_argument("--max-concurrency", type=int, default=128)
+    parser.add_argument("--batch-max-size", type=int, default=32)
+    parser.add_argument("--batch-wait-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
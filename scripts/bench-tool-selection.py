@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# This project was developed with assistance from AI tools.
+"""Benchmark: capable-model tool prompt size with and without tool selection.
+
+For each agent with tool selection enabled, runs a set of sample user
+messages through ToolSelector and reports the tool-schema prompt tokens
+(estimated from the OpenAI tool JSON at ~4 characters per token) for every
+tool versus the selected subset, plus the selection latency.  Embeddings
+come from the configured embedding provider (config/models.yaml).
+
+With --live, also sends each message to the capable_large model with every
+tool bound and with the selected subset bound, and reports the prompt
+tokens the model actually billed and the end-to-end call latency.
+
+Usage (from packages/api):
+  uv run python ../../scripts/bench-tool-selection.py
+  uv run python ../../scripts/bench-tool-selection.py --agent loan-officer-assistant --live
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "packages" / "api"))
+
+from langchain_core.messages import HumanMessage, SystemMessage  # noqa: E402
+from langchain_core.utils.function_calling import convert_to_openai_tool  # noqa: E402
+
+from src.agents.registry import _AGENT_MODULES, load_agent_config  # noqa: E402
+from src.agents.tool_selection import ToolSelector  # noqa: E402
+from src.core.config import settings  # noqa: E402
+
+QUERIES = {
+    "loan-officer-assistant": [
+        "Summarize my pipeline",
+        "Which documents on application 1042 need to be resubmitted?",
+        "Is #1042 ready for underwriting?",
+        "Pull credit for the Johnson application",
+        "Draft an email asking the borrower for their latest pay stub",
+        "What are the TRID rules for sending the loan estimate?",
+    ],
+    "borrower-assistant": [
+        "What's the status of my application?",
+        "Which documents am I still missing?",
+        "When does my rate lock expire?",
+        "I uploaded the bank statement for my open condition",
+        "How much house can I afford on $95,000 a year?",
+    ],
+    "underwriter-assistant": [
+        "Show me my queue",
+        "Run a risk assessment on application 2201",
+        "Issue a condition for a verification of employment",
+        "Draft the adverse action notice for 2201",
+        "Generate the closing disclosure",
+    ],
+    "ceo-assistant": [
+        "How is the pipeline looking this quarter?",
+        "Show denial trends by loan type",
+        "Which loan officers have the best pull-through rate?",
+        "What's our model error rate over the last day?",
+        "Show me the audit trail for application 1042",
+    ],
+}
+
+
+def _schema_tokens(tools: list) -> int:
+    chars = sum(len(json.dumps(convert_to_openai_tool(t))) for t in tools)
+    return chars // 4
+
+
+def _agent_tools(agent: str, config: dict) -> list:
+    module = importlib.import_module("src.agents" + _AGENT_MODULES[agent])
+    return [getattr(module, cfg["name"]) for cfg in config.get("tools", [])]
+
+
+async def _live_call(llm, system_prompt: str, query: str, tools: list) -> tuple[int, float]:
+    start = time.perf_counter()
+    response = await llm.bind_tools(tools).ainvoke(
+        [SystemMessage(content=system_prompt), HumanMessage(content=query)]
+    )
+    elapsed = time.perf_counter() - start
+    return (response.usage_metadata or {}).get("input_tokens", 0), elapsed
+
+
+async def _bench_agent(agent: str, top_k: int, live_llm) -> None:
+    config = load_agent_config(agent)
+    tools = _agent_tools(agent, config)
+    pinned = (config.get("tool_selection") or {}).get("pinned", [])
+    selector = ToolSelector(tools, top_k=top_k, pinned=pinned)
+    full_tokens = _schema_tokens(tools)
+
+    print(f"\n== {agent}: {len(tools)} tools, {full_tokens} schema tokens, top_k={top_k}")
+    print(f"   pinned: {', '.join(pinned) or '-'}")
+
+    start = time.perf_counter()
+    await selector.select("warm up")
+    print(f"   description embedding (once per process): {time.perf_counter() - start:.3f}s")
+
+    latencies = []
+    for query in QUERIES.get(agent, []):
+        start = time.perf_counter()
+        subset = await selector.select(query)
+        latencies.append(time.perf_counter() - start)
+        tokens = _schema_tokens(subset)
+        print(
+            f"   {len(subset):2d} tools {tokens:5d} tokens "
+            f"(-{100 * (full_tokens - tokens) / full_tokens:4.1f}%)  {query}"
+        )
+        if live_llm is not None:
+            system_prompt = config.get("system_prompt", "")
+            full_in, full_s = await _live_call(live_llm, system_prompt, query, tools)
+            sub_in, sub_s = await _live_call(live_llm, system_prompt, query, subset)
+            print(
+                f"      live prompt tokens {full_in} -> {sub_in}, "
+                f"latency {full_s:.2f}s -> {sub_s:.2f}s"
+            )
+    if latencies:
+        print(
+            f"   selection latency: median {statistics.median(latencies) * 1000:.1f} ms, "
+            f"max {max(latencies) * 1000:.1f} ms"
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--agent", choices=sorted(QUERIES), help="Benchmark one agent only")
+    parser.add_argument("--top-k", type=int, default=settings.AGENT_TOOL_SELECTION_TOP_K)
+    parser.add_argument(
+        "--live", action="store_true", help="Also call capable_large with both tool sets"
+    )
+    args = parser.parse_args()
+
+    live_llm = None
+    if args.live:
+        from langchain_openai import ChatOpenAI
+
+        from src.inference.config import get_model_config
+
+        model_cfg = get_model_config("capable_large")
+        live_llm = ChatOpenAI(
+            model=model_cfg["model_name"],
+            base_url=model_cfg["endpoint"],
+            api_key=model_cfg.get("api_key", "not-needed"),
+        )
+
+    for agent in [args.agent] if args.agent else sorted(QUERIES):
+        await _bench_agent(agent, args.top_k, live_llm)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# This project was developed with assistance from AI tools.
+"""Offline evaluation of query routing on a labelled query set.
+
+Runs every labelled query (default: scripts/routing-eval-queries.yaml)
+through the keyword rules and the embedding router configured in
+config/models.yaml, and reports for each strategy:
+
+- accuracy against the labels
+- the projected fast-tier share (queries sent to fast_small)
+- complex queries routed to the fast tier, which are the costly mistakes
+  because the fast model has no tools
+- for the embedding strategy, how often it deferred to the keyword rules
+
+Embeddings come from the configured embedding provider.  --rules-only
+skips them.
+
+Usage (from packages/api):
+  uv run python ../../scripts/eval-routing.py
+  uv run python ../../scripts/eval-routing.py --margin 0.05 --show-errors
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "packages" / "api"))
+
+from src.inference.config import get_routing_config  # noqa: E402
+from src.inference.router import classify_query, load_router  # noqa: E402
+
+DEFAULT_QUERIES = Path(__file__).resolve().parent / "routing-eval-queries.yaml"
+
+
+def _report(name: str, labelled: list[tuple[str, str]], routed: list[str]) -> None:
+    total = len(labelled)
+    correct = sum(1 for (_, label), tier in zip(labelled, routed, strict=True) if tier == label)
+    fast = routed.count("simple")
+    missed = sum(
+        1
+        for (_, label), tier in zip(labelled, routed, strict=True)
+        if label == "complex" and tier == "simple"
+    )
+    complex_total = sum(1 for _, label in labelled if label == "complex")
+    print(f"\n== {name}")
+    print(f"   accuracy:            {correct}/{total} ({100 * correct / total:.1f}%)")
+    print(f"   fast-tier share:     {fast}/{total} ({100 * fast / total:.1f}%)")
+    print(f"   complex -> fast:     {missed}/{complex_total}")
+
+
+def _errors(labelled: list[tuple[str, str]], routed: list[str]) -> None:
+    for (query, label), tier in zip(labelled, routed, strict=True):
+        if tier != label:
+            print(f"     expected {label:7s} got {tier:7s}  {query}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--queries", type=Path, default=DEFAULT_QUERIES)
+    parser.add_argument("--margin", type=float, help="Override embedding min_margin")
+    parser.add_argument("--rules-only", action="store_true", help="Skip the embedding router")
+    parser.add_argument("--show-errors", action="store_true", help="List misrouted queries")
+    args = parser.parse_args()
+
+    data = yaml.safe_load(args.queries.read_text())
+    labelled = [(query, label) for label in ("simple", "complex") for query in data[label]]
+    routing = get_routing_config()
+    fast_tier = "fast_small"
+
+    def _label(tier: str) -> str:
+        return "simple" if tier == fast_tier else "complex"
+
+    rules = [_label(classify_query(query)) for query, _ in labelled]
+    _report("keyword rules", labelled, rules)
+    if args.show_errors:
+        _errors(labelled, rules)
+
+    if args.rules_only:
+        return
+
+    router = load_router(routing, min_margin=args.margin)
+    await router.build()
+
+    routed, deferred = [], 0
+    for (query, _), rule_label in zip(labelled, rules, strict=True):
+        label = await router.classify(query)
+        if label is None:
+            deferred += 1
+            label = rule_label
+        routed.append(label)
+    _report("embedding router (keyword fallback)", labelled, routed)
+    print(f"   deferred to rules:   {deferred}/{len(labelled)}")
+    if args.show_errors:
+        _errors(labelled, routed)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())